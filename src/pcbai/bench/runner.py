@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import gc
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# setup(scale, tmpdir) -> (timed callable, items processed per call)
+Setup = Callable[[float, str], Tuple[Callable[[], Any], int]]
+
+
+@dataclass
+class Benchmark:
+    name: str
+    module: str                   # step module the workload exercises
+    setup: Setup
+    requires: Tuple[str, ...] = ()  # optional packages; skipped when missing
+
+
+@dataclass
+class BenchResult:
+    name: str
+    module: str
+    items: int
+    best: float   # seconds, fastest run
+    mean: float
+    runs: int
+
+    @property
+    def per_item_us(self) -> float:
+        return self.best * 1e6 / self.items if self.items else self.best * 1e6
+
+
+@dataclass
+class Comparison:
+    name: str
+    baseline_us: float  # per item
+    current_us: float
+    ratio: float        # current / baseline; >1 is slower
+    regression: bool
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, module: str, requires: Sequence[str] = ()) -> Callable[[Setup], Setup]:
+    """Register a workload: `@benchmark("footprints.generate", "footprint_generator")`."""
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = Benchmark(name, module, setup, tuple(requires))
+        return setup
+    return register
+
+
+def _available(bench: Benchmark) -> bool:
+    return all(importlib.util.find_spec(mod) is not None for mod in bench.requires)
+
+
+def select(patterns: Optional[Iterable[str]] = None) -> List[Benchmark]:
+    """Registered benchmarks whose name starts with any of `patterns` (all by default)."""
+    import pcbai.bench.suite  # noqa: F401  (registers the built-in workloads)
+
+    pats = list(patterns or [])
+    return [b for n, b in BENCHMARKS.items() if not pats or any(n.startswith(p) for p in pats)]
+
+
+def run_benchmarks(patterns: Optional[Iterable[str]] = None, scale: float = 1.0, repeat: int = 3,
+                   on_result: Optional[Callable[[BenchResult], None]] = None,
+                   on_skip: Optional[Callable[[Benchmark], None]] = None) -> Dict[str, BenchResult]:
+    """Time each selected benchmark: one warm-up call, then best and mean of `repeat` runs.
+
+    `scale` shrinks or grows every workload (1.0 = the documented sizes).
+    """
+    results: Dict[str, BenchResult] = {}
+    for bench in select(patterns):
+        if not _available(bench):
+            if on_skip is not None:
+                on_skip(bench)
+            continue
+        tmpdir = tempfile.mkdtemp(prefix=f"pcbai-bench-{bench.name}-")
+        try:
+            fn, items = bench.setup(scale, tmpdir)
+            fn()  # warm caches, imports and worker pools
+            times = []
+            for _ in range(max(1, repeat)):
+                gc.collect()
+                t0 = time.perf_counter()
+                fn()
+                times.append(time.perf_counter() - t0)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+        res = results[bench.name] = BenchResult(bench.name, bench.module, items, min(times),
+                                                sum(times) / len(times), len(times))
+        if on_result is not None:
+            on_result(res)
+    return results
+
+
+def save_baseline(results: Dict[str, BenchResult], path: str, scale: float = 1.0) -> str:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    data = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "platform": platform.platform(), "cpus": os.cpu_count(), "scale": scale,
+                 "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": {name: {**asdict(r), "per_item_us": r.per_item_us} for name, r in results.items()},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results: Dict[str, BenchResult], baseline: Dict[str, Dict[str, Any]],
+            threshold: float = 0.25) -> List[Comparison]:
+    """Compare per-item times; a benchmark regressed if it is more than `threshold` slower.
+
+    Per-item time keeps runs at different `scale` roughly comparable.
+    Benchmarks missing from either side are left out.
+    """
+    out = []
+    for name, res in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("per_item_us"):
+            continue
+        ratio = res.per_item_us / base["per_item_us"]
+        out.append(Comparison(name, base["per_item_us"], res.per_item_us, ratio, ratio > 1.0 + threshold))
+    return out
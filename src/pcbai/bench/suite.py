@@ -0,0 +1,353 @@
+"""Built-in benchmark workloads, one or more per step module.
+
+Sizes are for `scale=1.0`. Steps that need the network or external tools
+(datasheet fetching, kicad-cli Gerber export) are not benchmarked here.
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+
+from pcbai.bench import workloads
+from pcbai.bench.runner import benchmark
+
+
+def _n(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+
+@benchmark("footprints.generate", "footprint_generator/footprint_qfn_qfp/footprint_bga")
+def footprints_generate(scale, tmpdir):
+    from pcbai.steps.footprint_batch import FOOTPRINT_KINDS, params_from_row
+
+    jobs = []
+    for row in workloads.footprint_rows(_n(10000, scale)):
+        params = params_from_row(row)
+        jobs.append((FOOTPRINT_KINDS[row["type"]][1], params))
+
+    def run():
+        for gen, params in jobs:
+            gen(params)
+    return run, len(jobs)
+
+
+@benchmark("footprints.batch", "footprint_batch")
+def footprints_batch(scale, tmpdir):
+    from pcbai.steps.footprint_batch import generate_batch
+
+    rows = workloads.footprint_rows(_n(10000, scale))
+    out = os.path.join(tmpdir, "lib.pretty")
+
+    def run():
+        for res in generate_batch(rows, out):
+            if not res.ok:
+                raise RuntimeError(res.error)
+    return run, len(rows)
+
+
+@benchmark("footprints.cache_warm", "footprint_cache")
+def footprints_cache_warm(scale, tmpdir):
+    from pcbai.steps.footprint_batch import generate_batch
+    from pcbai.steps.footprint_cache import FootprintCache
+
+    rows = workloads.footprint_rows(_n(10000, scale))
+    out = os.path.join(tmpdir, "lib.pretty")
+    cachedir = os.path.join(tmpdir, "cache")
+
+    def run():
+        with FootprintCache(cachedir) as cache:
+            for _ in generate_batch(rows, out, cache=cache):
+                pass
+    return run, len(rows)  # the warm-up call fills the cache
+
+
+@benchmark("bga.grid_1024", "footprint_bga/pad_array")
+def bga_grid(scale, tmpdir):
+    from pcbai.steps.footprint_bga import BgaParams, generate_bga
+
+    params = BgaParams(name="BGA-1024", rows=32, cols=32, pitch=0.8, body_l=27.0, body_w=27.0, pad_d=0.4)
+    reps = _n(50, scale)
+    balls = generate_bga(params).count("(pad ")
+
+    def run():
+        for _ in range(reps):
+            generate_bga(params)
+    return run, balls * reps
+
+
+# Per-pad cost should stay flat as arrays grow: compare these per item with bga.grid_1024
+@benchmark("bga.grid_3600", "footprint_bga/pad_array")
+def bga_grid_large(scale, tmpdir):
+    from pcbai.steps.footprint_bga import BgaParams, generate_bga
+
+    params = BgaParams(name="BGA-3600", rows=60, cols=60, pitch=0.8, body_l=49.0, body_w=49.0, pad_d=0.4)
+    reps = _n(15, scale)
+
+    def run():
+        for _ in range(reps):
+            generate_bga(params)
+    return run, 3600 * reps
+
+
+@benchmark("qfp.pins_2500", "footprint_qfn_qfp/pad_array")
+def qfp_large(scale, tmpdir):
+    from pcbai.steps.footprint_qfn_qfp import QfpParams, generate_qfp
+
+    params = QfpParams(name="QFP-2500", pins=2500, pitch=0.4, body_l=250.0, body_w=250.0, pad_l=1.5, pad_w=0.2)
+    reps = _n(20, scale)
+
+    def run():
+        for _ in range(reps):
+            generate_qfp(params)
+    return run, 2500 * reps
+
+
+@benchmark("extractor.scan_500p", "datasheet_package_extractor")
+def extractor_scan(scale, tmpdir):
+    from pcbai.steps.datasheet_package_extractor import PackageGuess, guess_from_text, is_complete, merge_guess
+
+    pages = workloads.page_texts(_n(500, scale))
+
+    def run():
+        guess = PackageGuess(pkg_type="unknown")
+        for text in pages:
+            merge_guess(guess, guess_from_text(text))
+            if is_complete(guess):
+                break
+        return guess
+    return run, len(pages)
+
+
+@benchmark("extractor.pdf_500p", "datasheet_package_extractor", requires=("pdfminer",))
+def extractor_pdf(scale, tmpdir):
+    from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf
+
+    pages = workloads.page_texts(_n(500, scale))
+    path = os.path.join(tmpdir, "datasheet.pdf")
+    with open(path, "wb") as f:
+        f.write(workloads.text_pdf_bytes(pages))
+    return (lambda: extract_package_params_from_pdf(path)), len(pages)
+
+
+@benchmark("requirements.parse_10k", "requirements_parser/keyword_matcher")
+def requirements_parse(scale, tmpdir):
+    from pcbai.steps.requirements_parser import parse_requirements_batch
+
+    texts = workloads.descriptions(_n(10000, scale))
+    return (lambda: parse_requirements_batch(texts)), len(texts)
+
+
+@benchmark("catalog.import_10k", "catalog")
+def catalog_import(scale, tmpdir):
+    from pcbai.steps.catalog import Catalog
+
+    rows = workloads.catalog_rows(_n(10000, scale))
+    runs = iter(range(1 << 30))
+
+    def run():
+        with Catalog(os.path.join(tmpdir, f"import-{next(runs)}.db")) as cat:
+            cat.import_rows(rows)
+    return run, len(rows)
+
+
+@benchmark("bom.generate_10k", "bom_generator/catalog")
+def bom_generate(scale, tmpdir):
+    from pcbai.steps.bom_generator import generate_bom
+    from pcbai.steps.catalog import Catalog
+    from pcbai.steps.requirements_parser import parse_requirements_batch
+
+    db = os.path.join(tmpdir, "catalog.db")
+    with Catalog(db) as cat:
+        cat.import_rows(workloads.catalog_rows(_n(10000, scale)))
+    # Three categories per description: ~10k components at scale 1.0
+    reqs = parse_requirements_batch(workloads.descriptions(_n(3334, scale)))
+    items = sum(len(r["keywords"]) for r in reqs)
+
+    def run():
+        with Catalog(db, readonly=True) as cat:
+            for req in reqs:
+                generate_bom(req, catalog=cat)
+    return run, items
+
+
+@benchmark("netlist.synthesize_10k", "schematic_synthesizer")
+def netlist_synthesize(scale, tmpdir):
+    from pcbai.steps.schematic_synthesizer import synthesize_schematic
+
+    bom = workloads.bom(_n(10000, scale))
+    return (lambda: synthesize_schematic(bom)), len(bom)
+
+
+@benchmark("netlist.native_500_designs", "skidl_schematic/netlist")
+def netlist_native_designs(scale, tmpdir):
+    from pcbai.steps.skidl_schematic import bom_to_schematic
+
+    boms = [workloads.bom(20, seed=i) for i in range(_n(500, scale))]
+
+    def run():
+        for bom in boms:
+            bom_to_schematic(bom)
+    return run, len(boms)
+
+
+@benchmark("netlist.write_100k_pins", "netlist")
+def netlist_write(scale, tmpdir):
+    from pcbai.steps.netlist import write_netlist
+
+    nl = workloads.netlist(_n(10000, scale))
+    kicad, js = os.path.join(tmpdir, "board.net"), os.path.join(tmpdir, "board.json")
+
+    def run():
+        write_netlist(nl, kicad)
+        write_netlist(nl, js)
+    return run, nl.n_pins
+
+
+def _maze(scale, reach):
+    from pcbai.steps.maze_router import MazeRouter
+
+    nets = workloads.routing_nets(_n(300, scale), reach=reach)
+
+    def run():
+        result = MazeRouter(100.0, 100.0).route(nets)
+        # Longer nets congest the board; rip-up may give up on the odd one
+        if result.unrouted > len(nets) // 100:
+            raise RuntimeError(f"{result.unrouted} nets unrouted")
+    return run, len(nets)
+
+
+@benchmark("router.maze_300_nets", "maze_router")
+def router_maze(scale, tmpdir):
+    return _maze(scale, reach=20.0)  # the workload's default reach
+
+
+@benchmark("router.maze_300_nets_local", "maze_router")
+def router_maze_local(scale, tmpdir):
+    return _maze(scale, reach=10.0)
+
+
+@benchmark("placement.place_1000", "placement")
+def placement_place(scale, tmpdir):
+    from pcbai.steps.placement import place
+
+    n = _n(1000, scale)
+    nl, sizes = workloads.placement_netlist(n)
+    side = 150.0 * (n / 1000) ** 0.5 + 10  # about 40% courtyard utilization
+
+    def run():
+        p = place(nl, sizes, (side, side))
+        if p.overlap:
+            raise RuntimeError(f"{p.overlap:.2f} mm^2 of courtyard overlap left")
+    return run, n
+
+
+@benchmark("drc.board_2000_parts", "drc")
+def drc_board(scale, tmpdir):
+    from pcbai.steps.drc import Drc
+    from pcbai.steps.footprint_generator import SoicParams, generate_soic
+
+    n = _n(2000, scale)
+    soic = generate_soic(SoicParams("SOIC-8", 8, 1.27, 4.9, 3.9, 1.55, 0.6, 2.7))
+    side = max(1, int(n ** 0.5))
+    # 7.5 x 8.5 mm lattice with jitter: mostly clean, some neighbours too close
+    rng = random.Random(0)
+    positions = {f"U{i}": ((i % side) * 7.5 + rng.uniform(-0.5, 0.5), (i // side) * 8.5 + rng.uniform(-0.5, 0.5))
+                 for i in range(n)}
+    moves = [(f"U{rng.randrange(n)}", rng.uniform(0, side * 7.5), rng.uniform(0, side * 8.5)) for _ in range(200)]
+
+    def run():
+        drc = Drc.from_board(positions, {ref: soic for ref in positions})
+        drc.check()
+        for ref, x, y in moves:
+            drc.move(ref, x, y)
+    return run, n
+
+
+@benchmark("gerber.write_2000_parts", "gerber_writer")
+def gerber_write(scale, tmpdir):
+    from pcbai.steps.footprint_generator import SoicParams, generate_soic
+    from pcbai.steps.gerber_writer import BoardArtwork, write_gerbers
+
+    n = _n(2000, scale)
+    soic = generate_soic(SoicParams("SOIC-8", 8, 1.27, 4.9, 3.9, 1.55, 0.6, 2.7))
+    side = max(1, int(n ** 0.5))
+    positions = {f"U{i}": ((i % side) * 7.5 + 5, (i // side) * 8.5 + 5) for i in range(n)}
+    # one short track per pad row on alternating layers, a via at every fourth
+    tracks = [{"net": f"N{i}", "layer": i % 2, "start": (x - 2, y + 3.5), "end": (x + 2, y + 3.5), "width": 0.25}
+              for i, (x, y) in enumerate(positions.values())]
+    vias = [{"net": t["net"], "at": t["end"], "diameter": 0.6} for t in tracks[::4]]
+    art = BoardArtwork.from_layout(positions, {ref: soic for ref in positions}, (side * 7.5 + 10, side * 8.5 + 10),
+                                   routing={"tracks": tracks, "vias": vias})
+    outdir = os.path.join(tmpdir, "gerbers")
+    return (lambda: write_gerbers(art, outdir)), n
+
+
+def _footprint_library(n, tmpdir):
+    from pcbai.steps.footprint_batch import generate_batch
+
+    lib = os.path.join(tmpdir, "Bench.pretty")
+    for res in generate_batch(workloads.footprint_rows(n), lib, workers=1):
+        if not res.ok:
+            raise RuntimeError(res.error)
+    return lib
+
+
+@benchmark("library.index_cold_2000", "footprint_library/sexpr")
+def library_index_cold(scale, tmpdir):
+    from pcbai.steps.footprint_library import FootprintIndex
+
+    n = _n(2000, scale)
+    lib = _footprint_library(n, tmpdir)
+    db = os.path.join(tmpdir, "cold.db")
+
+    def run():
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(db + suffix):
+                os.remove(db + suffix)
+        with FootprintIndex(db) as index:
+            index.update([lib], workers=1)
+    return run, n
+
+
+@benchmark("library.index_warm_2000", "footprint_library")
+def library_index_warm(scale, tmpdir):
+    from pcbai.steps.footprint_library import FootprintIndex
+
+    n = _n(2000, scale)
+    lib = _footprint_library(n, tmpdir)
+    db = os.path.join(tmpdir, "warm.db")
+
+    def run():
+        with FootprintIndex(db) as index:
+            index.update([lib])
+    return run, n  # the warm-up call builds the index
+
+
+@benchmark("synthesize.batch_500_designs", "synthesize_batch")
+def synthesize_batch(scale, tmpdir):
+    from pcbai.pipeline.synthesize_batch import run_synthesis_batch
+    from pcbai.steps.catalog import Catalog
+
+    db = os.path.join(tmpdir, "catalog.db")
+    with Catalog(db) as cat:
+        cat.import_rows(workloads.catalog_rows(_n(10000, scale)))
+    n = _n(500, scale)
+    designs = os.path.join(tmpdir, "designs.jsonl")
+    with open(designs, "w", encoding="utf-8") as f:
+        for i, text in enumerate(workloads.descriptions(n)):
+            f.write(json.dumps({"name": f"variant-{i}", "description": text, "quantity": 1 + i % 50}) + "\n")
+    out = os.path.join(tmpdir, "designs")
+    return (lambda: run_synthesis_batch(designs, out, catalog_db=db)), n
+
+
+@benchmark("vision.rank_200p", "datasheet_vision", requires=("pdfminer",))
+def vision_rank(scale, tmpdir):
+    from pcbai.steps.datasheet_vision import rank_pages
+
+    pages = workloads.page_texts(_n(200, scale), package_page=_n(200, scale) * 3 // 4)
+    path = os.path.join(tmpdir, "datasheet.pdf")
+    with open(path, "wb") as f:
+        f.write(workloads.text_pdf_bytes(pages))
+    cache = os.path.join(tmpdir, "pages")
+    return (lambda: rank_pages(path, cache_dir=cache)), len(pages)  # page texts come from the cache after warm-up
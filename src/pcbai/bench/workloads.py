@@ -0,0 +1,185 @@
+"""Deterministic synthetic workloads for the benchmark suite.
+
+Everything is generated from a seeded RNG, so a given size always produces
+the same library, text or BOM and timings are comparable across runs.
+"""
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Dict, List, Sequence
+
+CATEGORIES = ["mcu", "buck", "ldo", "opamp", "adc", "usb", "wifi", "bluetooth", "lipo", "mosfet"]
+PACKAGES = ["SOIC-8", "QFN-16", "QFN-32", "SOT-23-5", "LQFP-48", "TSSOP-20", "0603", "0402"]
+
+_FILLER = ("The device operates from a wide supply range and integrates protection features. "
+           "Refer to the application information for layout guidance and thermal considerations. ")
+_PACKAGE_PAGE = ("Package outline QFN {pins} pins\n"
+                 "Pitch: 0.5 mm  Body length: {body} mm  Body width: {body} mm\n"
+                 "Terminal length: 0.4 mm  Terminal width: 0.25 mm\n"
+                 "Exposed pad length: 3.1 mm  Exposed pad width: 3.1 mm")
+
+
+def footprint_rows(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """`n` footprint-manifest rows cycling through every generator kind."""
+    rng = random.Random(seed)
+    rows: List[Dict[str, Any]] = []
+    for i in range(n):
+        kind = ("smd_rc", "soic", "qfn", "qfp", "bga")[i % 5]
+        if kind == "smd_rc":
+            row = dict(body_l=1.6, body_w=0.8, pad_l=0.9, pad_w=0.8, gap=round(rng.uniform(0.5, 1.0), 3))
+        elif kind == "soic":
+            pins = rng.choice((8, 14, 16, 20))
+            row = dict(pins=pins, pitch=1.27, body_l=pins * 0.635, body_w=3.9, pad_l=1.5, pad_w=0.6, row_offset=2.7)
+        elif kind == "qfn":
+            pins = rng.choice((16, 24, 32, 48))
+            row = dict(pins=pins, pitch=0.5, body_l=pins / 8, body_w=pins / 8, pad_l=0.6, pad_w=0.25, ep_l=2.0, ep_w=2.0)
+        elif kind == "qfp":
+            pins = rng.choice((32, 44, 64, 100, 144))
+            row = dict(pins=pins, pitch=0.5, body_l=pins / 8, body_w=pins / 8, pad_l=1.5, pad_w=0.3)
+        else:
+            side = rng.choice((8, 10, 12, 16))
+            row = dict(rows=side, cols=side, pitch=0.8, body_l=side * 0.8 + 1, body_w=side * 0.8 + 1, pad_d=0.4)
+        rows.append({"type": kind, "name": f"{kind.upper()}_{i:05d}", **row})
+    return rows
+
+
+def page_texts(pages: int, package_page: int = -1, seed: int = 0) -> List[str]:
+    """Datasheet-like page texts with the package outline on `package_page` (default: last)."""
+    rng = random.Random(seed)
+    out = []
+    for i in range(pages):
+        lines = [f"Page {i + 1}. Supply {rng.choice((1.8, 3.3, 5.0))} V, {rng.randint(10, 900)} mA typical."]
+        lines += [_FILLER] * rng.randint(8, 16)
+        out.append("\n".join(lines))
+    out[package_page] = _PACKAGE_PAGE.format(pins=32, body=5.0)
+    return out
+
+
+def catalog_rows(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        lo = round(rng.uniform(1.0, 5.0), 1)
+        rows.append({
+            "mpn": f"P{i:07d}", "category": rng.choice(CATEGORIES), "package": rng.choice(PACKAGES),
+            "voltage": f"{lo}-{rng.randint(6, 60)}V", "current": f"{round(rng.uniform(0.05, 10), 2)}A",
+            "price": round(rng.uniform(0.05, 12), 2), "stock": rng.randint(0, 10000),
+        })
+    return rows
+
+
+def descriptions(n: int, seed: int = 0) -> List[str]:
+    """Natural-language requirement lines mentioning categories and specs."""
+    rng = random.Random(seed)
+    words = ["board", "sensor node", "with", "and", "powered from", "low noise", "small", "battery", "module"]
+    out = []
+    for _ in range(n):
+        parts = rng.sample(CATEGORIES, 3) + rng.sample(words, 3)
+        rng.shuffle(parts)
+        out.append(" ".join(parts) + f", input {rng.randint(5, 36)}V, at least {rng.randint(100, 3000)} mA")
+    return out
+
+
+def bom(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """`n`-component BOM shaped like generate_bom output."""
+    return [{"mpn": r["mpn"], "package": r["package"], "voltage": r["voltage"]} for r in catalog_rows(n, seed)]
+
+
+def netlist(parts: int, pins_per_part: int = 10, nets: int = 0, seed: int = 0):
+    """A `Netlist` of `parts` parts: pin 1 on GND, the rest spread over `nets` signal nets (default parts * 2)."""
+    from pcbai.steps.netlist import NetlistBuilder
+
+    rng = random.Random(seed)
+    nets = nets or parts * 2
+    b = NetlistBuilder()
+    for i, row in enumerate(catalog_rows(parts, seed), start=1):
+        ref = f"U{i}"
+        b.add_part(ref, row["mpn"], row["package"])
+        b.connect("GND", ref, "1")
+        for pin in range(2, pins_per_part + 1):
+            b.connect(f"N{rng.randrange(nets)}", ref, str(pin))
+    return b.build()
+
+
+def placement_netlist(parts: int, seed: int = 0):
+    """(`Netlist`, sizes) for placement: parts on a square lattice wired to their right and lower
+    neighbours plus a shared GND, with courtyards from 1.6x0.8 mm up to 5x5 mm."""
+    from pcbai.steps.netlist import NetlistBuilder
+
+    rng = random.Random(seed)
+    side = max(1, int(math.isqrt(parts)))
+    b = NetlistBuilder()
+    for i in range(parts):
+        b.add_part(f"U{i}")
+    for i in range(parts):
+        if (i + 1) % side and i + 1 < parts:
+            b.connect(f"H{i}", f"U{i}", "1")
+            b.connect(f"H{i}", f"U{i + 1}", "2")
+        if i + side < parts:
+            b.connect(f"V{i}", f"U{i}", "3")
+            b.connect(f"V{i}", f"U{i + side}", "4")
+        b.connect("GND", f"U{i}", "5")
+    sizes = {f"U{i}": (rng.choice((1.6, 2.0, 3.0, 5.0)), rng.choice((0.8, 1.25, 3.0, 5.0))) for i in range(parts)}
+    return b.build(), sizes
+
+
+def routing_nets(n: int, width: float = 100.0, height: float = 100.0, reach: float = 20.0, seed: int = 0):
+    """`n` two- and three-pad nets of SMD pads on a 1.27 mm lattice, pads of one net within `reach` mm."""
+    from pcbai.steps.maze_router import Pad
+
+    rng = random.Random(seed)
+    pitch = 1.27
+    cols, rows = int(width / pitch) - 2, int(height / pitch) - 2
+    used = set()
+
+    def site(near=None):
+        while True:
+            if near is None:
+                c, r = rng.randrange(1, cols), rng.randrange(1, rows)
+            else:
+                k = int(reach / pitch)
+                c = min(cols - 1, max(1, near[0] + rng.randint(-k, k)))
+                r = min(rows - 1, max(1, near[1] + rng.randint(-k, k)))
+            if (c, r) not in used:
+                used.add((c, r))
+                return c, r
+
+    nets = {}
+    for i in range(n):
+        first = site()
+        cells = [first] + [site(first) for _ in range(rng.choice((1, 1, 2)))]
+        nets[f"N{i}"] = [Pad(c * pitch, r * pitch, 0.6, 0.6) for c, r in cells]
+    return nets
+
+
+def text_pdf_bytes(pages: Sequence[str]) -> bytes:
+    """Build a minimal text-only PDF, one string (lines split on '\\n') per page."""
+    objs = []
+    n_pages = len(pages)
+    font_id = 3 + 2 * n_pages
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(n_pages))
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(f"<< /Type /Pages /Kids [{kids}] /Count {n_pages} >>".encode())
+    for i, text in enumerate(pages):
+        ops = ["BT /F1 10 Tf 14 TL 50 750 Td"]
+        for line in text.split("\n"):
+            esc = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({esc}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {4 + 2 * i} 0 R >>".encode())
+        objs.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
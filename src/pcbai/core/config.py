@@ -14,12 +14,21 @@ class Settings:
     llm_provider: str = os.getenv("PCB_AI_LLM_PROVIDER", "openai")
     openai_api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
     ollama_host: str = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+    llm_model: str = os.getenv("PCB_AI_LLM_MODEL", "gpt-4o-mini")
+    llm_cache_dir: Optional[str] = os.getenv("PCB_AI_LLM_CACHE")  # persistent response cache
+    llm_max_concurrency: int = int(os.getenv("PCB_AI_LLM_CONCURRENCY", "4"))
 
     # Paths
     workdir: str = os.getenv("PCB_AI_WORKDIR", os.path.abspath("build"))
+    catalog_db: Optional[str] = os.getenv("PCB_AI_CATALOG")  # SQLite parts catalog
+    footprint_index: Optional[str] = os.getenv("PCB_AI_FOOTPRINT_INDEX")  # SQLite index of .pretty libraries
+
+    # Synthesis
+    netlist_backend: str = os.getenv("PCB_AI_NETLIST_BACKEND", "native")  # "native" or "skidl"
 
     # EDA tool backends
     kicad_cli: str = os.getenv("KICAD_CLI", "kicad-cli")
+    kicad_timeout: float = float(os.getenv("PCB_AI_KICAD_TIMEOUT", "300"))  # seconds per kicad-cli run
     altium_api_key: Optional[str] = os.getenv("ALTIUM_API_KEY")
     cadence_api_key: Optional[str] = os.getenv("CADENCE_API_KEY")
 
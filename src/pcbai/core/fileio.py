@@ -0,0 +1,21 @@
+"""Small file helpers shared by the caches, the pipeline manifest and step outputs."""
+from __future__ import annotations
+
+import os
+import tempfile
+
+
+def atomic_write(path: str, content: str) -> None:
+    """Write `content` to `path` via a temp file + rename, so readers never see a partial file."""
+    d = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=".tmp-", suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
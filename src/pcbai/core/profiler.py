@@ -0,0 +1,197 @@
+"""Lightweight span tracing for pipeline steps and hot functions.
+
+Disabled by default: `span()` then hands back a shared no-op object and
+`@traced` functions pay one flag check. `enable()` (the CLI's `--profile`)
+starts recording wall time, thread CPU time, peak-RSS growth and item counts
+per span; `format_summary()` aggregates them into a table and
+`write_chrome_trace()` exports trace-event JSON for chrome://tracing or Perfetto.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_enabled = False
+_lock = threading.Lock()
+_records: List["SpanRecord"] = []
+_origin_ns = time.perf_counter_ns()
+
+
+def _peak_rss_kb() -> int:
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KiB on Linux
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    cat: str
+    start_us: float
+    wall_us: float
+    cpu_us: float
+    rss_delta_kb: int
+    items: int
+    tid: int
+    args: Dict[str, Any] = field(default_factory=dict)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def add(self, n: int = 1) -> None:
+        pass
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL = _NullSpan()
+
+
+class Span:
+    __slots__ = ("name", "cat", "items", "args", "_t0", "_cpu0", "_rss0")
+
+    def __init__(self, name: str, cat: str, items: int, args: Dict[str, Any]):
+        self.name, self.cat, self.items, self.args = name, cat, items, args
+
+    def add(self, n: int = 1) -> None:
+        """Count `n` more items processed inside this span."""
+        self.items += n
+
+    def set(self, **args: Any) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> "Span":
+        self._rss0 = _peak_rss_kb()
+        self._cpu0 = time.thread_time_ns()
+        self._t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        t1 = time.perf_counter_ns()
+        cpu = time.thread_time_ns() - self._cpu0
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        rec = SpanRecord(self.name, self.cat, (self._t0 - _origin_ns) / 1e3, (t1 - self._t0) / 1e3, cpu / 1e3,
+                         _peak_rss_kb() - self._rss0, self.items, threading.get_native_id(), self.args)
+        with _lock:
+            _records.append(rec)
+
+
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    with _lock:
+        _records.clear()
+
+
+def records() -> List[SpanRecord]:
+    with _lock:
+        return list(_records)
+
+
+def span(name: str, cat: str = "pcbai", items: int = 0, **args: Any):
+    """Context manager timing a block: `with span("fetch", items=len(mpns)) as s: ...; s.add()`."""
+    if not _enabled:
+        return _NULL
+    return Span(name, cat, items, args)
+
+
+def traced(name: Optional[str] = None, items: Optional[Callable[[Any], int]] = None) -> Callable[[F], F]:
+    """Decorator recording a span per call; `items(result)` gives the span's item count."""
+    def wrap(fn: F) -> F:
+        label = name or fn.__qualname__
+        cat = fn.__module__.rsplit(".", 1)[-1]
+
+        @functools.wraps(fn)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            if not _enabled:
+                return fn(*a, **kw)
+            with Span(label, cat, 0, {}) as s:
+                result = fn(*a, **kw)
+                if items is not None:
+                    s.items = items(result)
+                return result
+
+        return wrapper  # type: ignore[return-value]
+    return wrap
+
+
+def summary(recs: Optional[List[SpanRecord]] = None) -> List[Dict[str, Any]]:
+    """Per-name totals, slowest first."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for r in recs if recs is not None else records():
+        row = rows.setdefault(r.name, {"name": r.name, "calls": 0, "wall_ms": 0.0, "max_ms": 0.0,
+                                       "cpu_ms": 0.0, "rss_kb": 0, "items": 0})
+        row["calls"] += 1
+        row["wall_ms"] += r.wall_us / 1e3
+        row["max_ms"] = max(row["max_ms"], r.wall_us / 1e3)
+        row["cpu_ms"] += r.cpu_us / 1e3
+        row["rss_kb"] = max(row["rss_kb"], r.rss_delta_kb)
+        row["items"] += r.items
+    for row in rows.values():
+        row["items_per_s"] = row["items"] / (row["wall_ms"] / 1e3) if row["items"] and row["wall_ms"] else 0.0
+    return sorted(rows.values(), key=lambda r: r["wall_ms"], reverse=True)
+
+
+def format_summary(recs: Optional[List[SpanRecord]] = None) -> str:
+    rows = summary(recs)
+    if not rows:
+        return "No spans recorded."
+    width = max(4, *(len(r["name"]) for r in rows))
+    lines = [f"{'span':<{width}}  {'calls':>6}  {'wall ms':>10}  {'max ms':>9}  {'cpu ms':>10}  "
+             f"{'+rss KiB':>9}  {'items':>8}  {'items/s':>10}"]
+    for r in rows:
+        lines.append(f"{r['name']:<{width}}  {r['calls']:>6}  {r['wall_ms']:>10.2f}  {r['max_ms']:>9.2f}  "
+                     f"{r['cpu_ms']:>10.2f}  {r['rss_kb']:>9}  {r['items']:>8}  {r['items_per_s']:>10.1f}")
+    return "\n".join(lines)
+
+
+def chrome_trace(recs: Optional[List[SpanRecord]] = None) -> Dict[str, Any]:
+    pid = os.getpid()
+    events = [{
+        "name": r.name, "cat": r.cat, "ph": "X", "ts": round(r.start_us, 3), "dur": round(r.wall_us, 3),
+        "pid": pid, "tid": r.tid,
+        "args": {"cpu_ms": round(r.cpu_us / 1e3, 3), "rss_delta_kb": r.rss_delta_kb, "items": r.items, **r.args},
+    } for r in (recs if recs is not None else records())]
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(path: str, recs: Optional[List[SpanRecord]] = None) -> str:
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(chrome_trace(recs), f, default=str)
+    return path
@@ -0,0 +1,37 @@
+"""Uniform-grid spatial hash for bounding-box neighbour queries (placement, DRC)."""
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterator, Set, Tuple
+
+
+class SpatialHash:
+    """Uniform grid of buckets holding item ids by bounding box."""
+
+    def __init__(self, cell: float):
+        self.cell = cell
+        self.buckets: Dict[Tuple[int, int], Set[int]] = {}
+
+    def _cells(self, x0: float, y0: float, x1: float, y1: float) -> Iterator[Tuple[int, int]]:
+        c = self.cell
+        for cx in range(int(math.floor(x0 / c)), int(math.floor(x1 / c)) + 1):
+            for cy in range(int(math.floor(y0 / c)), int(math.floor(y1 / c)) + 1):
+                yield cx, cy
+
+    def add(self, i: int, x0: float, y0: float, x1: float, y1: float) -> None:
+        for key in self._cells(x0, y0, x1, y1):
+            self.buckets.setdefault(key, set()).add(i)
+
+    def remove(self, i: int, x0: float, y0: float, x1: float, y1: float) -> None:
+        for key in self._cells(x0, y0, x1, y1):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(i)
+
+    def query(self, x0: float, y0: float, x1: float, y1: float) -> Set[int]:
+        found: Set[int] = set()
+        for key in self._cells(x0, y0, x1, y1):
+            bucket = self.buckets.get(key)
+            if bucket:
+                found |= bucket
+        return found
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pcbai.core.fileio import atomic_write
+from pcbai.llm.provider import Completion, LLMProvider
+
+
+@dataclass
+class LLMMetrics:
+    requests: int = 0
+    cache_hits: int = 0
+    deduped: int = 0        # answered by an identical request already in flight
+    backend_calls: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0  # backend calls only; cache hits cost nothing
+    completion_tokens: int = 0
+    latencies: List[float] = field(default_factory=list)  # seconds per backend call
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.cache_hits + self.deduped) / self.requests if self.requests else 0.0
+
+    def latency(self, pct: float) -> float:
+        """Backend latency percentile (0-100), 0.0 before any call."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        d = asdict(self)
+        del d["latencies"]
+        d.update(hit_rate=round(self.hit_rate, 4), latency_p50=self.latency(50), latency_p95=self.latency(95),
+                 latency_total=sum(self.latencies))
+        return d
+
+
+class CachingProvider(LLMProvider):
+    """Wrap a provider with a persistent response cache, in-flight dedupe and a concurrency cap.
+
+    Responses are keyed by sha256 of (provider name, prompt, parameters) and
+    kept in memory plus, with `cache_dir`, one JSON file per response, so
+    repeated prompts never reach the backend again. Identical prompts that
+    arrive while the first is still running wait for its answer instead of
+    issuing their own call. At most `max_concurrency` backend calls run at
+    once, from threads (`complete`, `complete_many`) or coroutines
+    (`acomplete`, `acomplete_many`).
+    """
+
+    def __init__(self, provider: LLMProvider, cache_dir: Optional[str] = None, max_concurrency: int = 4):
+        self.provider = provider
+        self.name = provider.name
+        self.cache_dir = cache_dir
+        self.max_concurrency = max(1, max_concurrency)
+        self._memory: Dict[str, Completion] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._inflight: Dict[str, Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._asem: Optional[asyncio.Semaphore] = None
+        self._ainflight: Dict[str, asyncio.Future] = {}
+        self._metrics = LLMMetrics()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def metrics(self) -> LLMMetrics:
+        with self._lock:
+            return LLMMetrics(**{**asdict(self._metrics), "latencies": list(self._metrics.latencies)})
+
+    def key(self, prompt: str, params: Dict[str, Any]) -> str:
+        blob = json.dumps({"provider": self.name, "prompt": prompt, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, n in deltas.items():
+                setattr(self._metrics, name, getattr(self._metrics, name) + n)
+
+    def _lookup(self, key: str) -> Optional[Completion]:
+        hit = self._memory.get(key)
+        if hit is None and self.cache_dir:
+            try:
+                with open(self._path(key), "r", encoding="utf-8") as f:
+                    hit = Completion(**json.load(f))
+            except (OSError, ValueError, TypeError):
+                return None
+            self._memory[key] = hit
+        return hit
+
+    def _store(self, key: str, comp: Completion) -> None:
+        self._memory[key] = comp
+        if self.cache_dir:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            atomic_write(path, json.dumps(asdict(comp)))
+
+    def _record(self, comp: Optional[Completion], seconds: float) -> None:
+        with self._lock:
+            m = self._metrics
+            m.backend_calls += 1
+            m.latencies.append(seconds)
+            if comp is None:
+                m.errors += 1
+            else:
+                m.prompt_tokens += comp.prompt_tokens
+                m.completion_tokens += comp.completion_tokens
+
+    def _claim(self, key: str) -> Tuple[Future, bool]:
+        with self._lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut, False
+            fut = self._inflight[key] = Future()
+            return fut, True
+
+    def completion(self, prompt: str, **kwargs: Any) -> Completion:
+        key = self.key(prompt, kwargs)
+        self._count(requests=1)
+        hit = self._lookup(key)
+        if hit is not None:
+            self._count(cache_hits=1)
+            return hit
+        fut, owner = self._claim(key)
+        if not owner:
+            self._count(deduped=1)
+            return fut.result()
+        try:
+            # The previous owner may have finished between our lookup and claim
+            comp = self._lookup(key)
+            if comp is None:
+                with self._slots:
+                    t0 = time.perf_counter()
+                    try:
+                        comp = self.provider.completion(prompt, **kwargs)
+                    except BaseException:
+                        self._record(None, time.perf_counter() - t0)
+                        raise
+                    self._record(comp, time.perf_counter() - t0)
+                self._store(key, comp)
+            fut.set_result(comp)
+            return comp
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def complete(self, prompt: str, **kwargs: Any) -> str:
+        return self.completion(prompt, **kwargs).text
+
+    def complete_many(self, prompts: Sequence[str], **kwargs: Any) -> List[str]:
+        """Complete `prompts` with at most `max_concurrency` backend calls at once; results in input order."""
+        if not prompts:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(prompts))) as pool:
+            return list(pool.map(lambda p: self.complete(p, **kwargs), prompts))
+
+    def _async_state(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._asem, self._ainflight = loop, asyncio.Semaphore(self.max_concurrency), {}
+        return self._asem
+
+    async def acompletion(self, prompt: str, **kwargs: Any) -> Completion:
+        sem = self._async_state()
+        key = self.key(prompt, kwargs)
+        self._count(requests=1)
+        hit = self._lookup(key)
+        if hit is not None:
+            self._count(cache_hits=1)
+            return hit
+        fut = self._ainflight.get(key)
+        if fut is not None:
+            self._count(deduped=1)
+            return await asyncio.shield(fut)
+        fut = self._ainflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            async with sem:
+                t0 = time.perf_counter()
+                try:
+                    comp = await self.provider.acompletion(prompt, **kwargs)
+                except BaseException:
+                    self._record(None, time.perf_counter() - t0)
+                    raise
+                self._record(comp, time.perf_counter() - t0)
+            self._store(key, comp)
+            fut.set_result(comp)
+            return comp
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved: waiters re-raise it, nobody else has to
+            raise
+        finally:
+            del self._ainflight[key]
+
+    async def acomplete_many(self, prompts: Sequence[str], **kwargs: Any) -> List[str]:
+        return list(await asyncio.gather(*(self.acomplete(p, **kwargs) for p in prompts)))
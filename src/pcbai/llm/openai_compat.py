@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from pcbai.llm.provider import Completion, LLMProvider, estimate_tokens
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Chat completions over any OpenAI-compatible HTTP API (OpenAI, Ollama, the local stub).
+
+    One pooled `requests.Session` is reused for every call, so concurrent
+    requests share keep-alive connections instead of reconnecting.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, model: str = "gpt-4o-mini",
+                 timeout: float = 60.0, pool_size: int = 16, session: Optional[requests.Session] = None):
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.name = f"openai-compat:{self.base_url}:{model}"
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        if api_key:
+            session.headers["Authorization"] = f"Bearer {api_key}"
+        self.session = session
+
+    def close(self) -> None:
+        self.session.close()
+
+    def completion(self, prompt: str, **kwargs: Any) -> Completion:
+        body: Dict[str, Any] = {"model": kwargs.pop("model", self.model),
+                                "messages": [{"role": "user", "content": prompt}], **kwargs}
+        r = self.session.post(f"{self.base_url}/chat/completions", json=body, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json()
+        text = data["choices"][0]["message"]["content"] or ""
+        usage = data.get("usage") or {}
+        return Completion(text, usage.get("prompt_tokens", estimate_tokens(prompt)),
+                          usage.get("completion_tokens", estimate_tokens(text)))
+
+    def complete(self, prompt: str, **kwargs: Any) -> str:
+        return self.completion(prompt, **kwargs).text
@@ -1,15 +1,78 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) for backends that report no usage."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class Completion:
+    text: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
 
 
 class LLMProvider(ABC):
+    # Part of the response cache key: different backends/models never share entries
+    name: str = "llm"
+
     @abstractmethod
     def complete(self, prompt: str, **kwargs) -> str:
         ...
 
+    def completion(self, prompt: str, **kwargs) -> Completion:
+        """Like `complete`, with token usage; backends that know their usage override this."""
+        text = self.complete(prompt, **kwargs)
+        return Completion(text, estimate_tokens(prompt), estimate_tokens(text))
+
+    async def acompletion(self, prompt: str, **kwargs) -> Completion:
+        # Blocking backends run on a worker thread so the event loop stays free
+        return await asyncio.to_thread(self.completion, prompt, **kwargs)
+
+    async def acomplete(self, prompt: str, **kwargs) -> str:
+        return (await self.acompletion(prompt, **kwargs)).text
+
 
 class DummyProvider(LLMProvider):
+    name = "dummy"
+
     def complete(self, prompt: str, **kwargs) -> str:
         return "TODO: implement real provider or configure via env"
+
+
+def make_provider(name: Optional[str] = None, cache_dir: Optional[str] = None, **options: Any) -> LLMProvider:
+    """Build the configured provider ("openai", "ollama", "stub" or "dummy").
+
+    With a `cache_dir` (default: settings.llm_cache_dir) the provider is
+    wrapped in a persistent, deduplicating `CachingProvider`.
+    """
+    from pcbai.core.config import settings
+
+    name = (name or settings.llm_provider).lower()
+    provider: LLMProvider
+    if name in ("openai", "ollama"):
+        from pcbai.llm.openai_compat import OpenAICompatibleProvider
+        if name == "openai":
+            provider = OpenAICompatibleProvider("https://api.openai.com/v1", api_key=settings.openai_api_key,
+                                                model=options.pop("model", settings.llm_model), **options)
+        else:
+            provider = OpenAICompatibleProvider(settings.ollama_host.rstrip("/") + "/v1",
+                                                model=options.pop("model", settings.llm_model), **options)
+    elif name == "stub":
+        from pcbai.llm.stub import StubProvider
+        provider = StubProvider(**options)
+    elif name == "dummy":
+        provider = DummyProvider()
+    else:
+        raise ValueError(f"Unknown LLM provider: {name}")
+    cache_dir = cache_dir or settings.llm_cache_dir
+    if cache_dir:
+        from pcbai.llm.caching import CachingProvider
+        provider = CachingProvider(provider, cache_dir=cache_dir, max_concurrency=settings.llm_max_concurrency)
+    return provider
@@ -0,0 +1,158 @@
+"""Offline stand-ins for an LLM backend.
+
+`StubProvider` answers in-process; `StubServer` speaks the OpenAI chat
+completions API on localhost so `OpenAICompatibleProvider` can be exercised
+end to end. Run `python -m pcbai.llm.stub --port 8800` for a standalone server.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional, Union
+
+from pcbai.llm.provider import Completion, LLMProvider, estimate_tokens
+
+Reply = Union[str, Callable[[str], str], None]
+
+
+def _answer(reply: Reply, prompt: str) -> str:
+    if reply is None:
+        return f"stub: {prompt}"
+    return reply(prompt) if callable(reply) else reply
+
+
+class StubProvider(LLMProvider):
+    """Deterministic provider: echoes the prompt (or returns `reply`) after `delay` seconds.
+
+    Counts calls and the peak number of calls running at once, which is what
+    tests of caching and concurrency limits need to observe.
+    """
+
+    name = "stub"
+
+    def __init__(self, reply: Reply = None, delay: float = 0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self) -> None:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    def _completion(self, prompt: str) -> Completion:
+        text = _answer(self.reply, prompt)
+        return Completion(text, estimate_tokens(prompt), estimate_tokens(text))
+
+    def completion(self, prompt: str, **kwargs: Any) -> Completion:
+        self._enter()
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            return self._completion(prompt)
+        finally:
+            self._exit()
+
+    def complete(self, prompt: str, **kwargs: Any) -> str:
+        return self.completion(prompt, **kwargs).text
+
+    async def acompletion(self, prompt: str, **kwargs: Any) -> Completion:
+        self._enter()
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            return self._completion(prompt)
+        finally:
+            self._exit()
+
+
+class StubServer:
+    """Local OpenAI-compatible `/v1/chat/completions` server on a background thread."""
+
+    def __init__(self, reply: Reply = None, delay: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.reply = reply
+        self.delay = delay
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                if self.path.rstrip("/") != "/v1/chat/completions":
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+                server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                text = _answer(server.reply, prompt)
+                payload = json.dumps({
+                    "object": "chat.completion",
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": estimate_tokens(text)},
+                }).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a stub OpenAI-compatible LLM endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each answer")
+    args = parser.parse_args()
+    server = StubServer(delay=args.delay, host=args.host, port=args.port)
+    print(f"Stub LLM listening on {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
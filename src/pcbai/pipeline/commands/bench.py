@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import click
+
+
+@click.command()
+@click.option("--only", "patterns", multiple=True, help="Run benchmarks whose name starts with this (repeatable).")
+@click.option("--scale", type=float, default=1.0, show_default=True, help="Workload size multiplier.")
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--save", "save_path", type=click.Path(dir_okay=False), help="Write results as a JSON baseline.")
+@click.option("--baseline", "baseline_path", type=click.Path(exists=True, dir_okay=False),
+              help="Compare against a saved baseline; exit 1 on regressions.")
+@click.option("--threshold", type=float, default=0.25, show_default=True,
+              help="Allowed slowdown per item before a benchmark counts as regressed (0.25 = 25%).")
+@click.option("--list", "list_only", is_flag=True, help="List benchmarks and exit.")
+def bench(patterns, scale: float, repeat: int, save_path: str, baseline_path: str, threshold: float, list_only: bool):
+    """Time every step module on synthetic large-design workloads."""
+    from pcbai.bench.runner import compare, load_baseline, run_benchmarks, save_baseline, select
+
+    if list_only:
+        for b in select(patterns):
+            click.echo(f"{b.name:<26} {b.module}")
+        return
+    click.echo(f"{'benchmark':<26}{'items':>8}{'best s':>10}{'mean s':>10}{'us/item':>11}")
+
+    def report(r):
+        click.echo(f"{r.name:<26}{r.items:>8}{r.best:>10.3f}{r.mean:>10.3f}{r.per_item_us:>11.2f}")
+
+    results = run_benchmarks(patterns, scale=scale, repeat=repeat, on_result=report,
+                             on_skip=lambda b: click.echo(f"{b.name:<26} skipped (needs {', '.join(b.requires)})"))
+    if save_path:
+        click.echo(f"Baseline written to {save_baseline(results, save_path, scale=scale)}")
+    if baseline_path:
+        regressions = 0
+        for c in compare(results, load_baseline(baseline_path), threshold=threshold):
+            flag = "REGRESSION" if c.regression else "ok"
+            regressions += c.regression
+            click.echo(f"{c.name:<26}{c.baseline_us:>11.2f} -> {c.current_us:>9.2f} us/item  x{c.ratio:.2f}  {flag}")
+        if regressions:
+            raise click.ClickException(f"{regressions} benchmark(s) regressed by more than {threshold:.0%}")
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+import click
+
+from pcbai.core.config import settings
+from pcbai.steps.bom_generator import generate_bom
+from pcbai.steps.requirements_parser import parse_requirements
+
+
+@click.command()
+@click.argument("description", nargs=-1)
+@click.option("--out", "outdir", type=click.Path(), default="build")
+@click.option("--catalog", "catalog_db", type=click.Path(dir_okay=False), default=settings.catalog_db,
+              help="SQLite parts catalog (default: $PCB_AI_CATALOG, else the built-in demo parts).")
+def bom(description: str, outdir: str, catalog_db: str):
+    """Generate a toy BOM from a natural language description."""
+    text = " ".join(description)
+    req = parse_requirements(text)
+    if catalog_db:
+        from pcbai.steps.catalog import Catalog
+        with Catalog(catalog_db, readonly=True) as catalog:
+            parts = generate_bom(req, catalog=catalog)
+    else:
+        parts = generate_bom(req)
+    os.makedirs(outdir, exist_ok=True)
+    path = os.path.join(outdir, "bom.txt")
+    with open(path, "w") as f:
+        for p in parts:
+            f.write(f"{p['mpn']},{p['package']}\n")
+    click.echo(f"BOM written to {path}")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+import time
+
+import click
+
+from pcbai.core.config import settings
+from pcbai.steps.catalog import Catalog, PartQuery
+
+
+@click.group()
+def catalog():
+    """Manage and query the SQLite parts catalog."""
+
+
+@catalog.command("import")
+@click.argument("csv_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--db", "catalog_db", type=click.Path(dir_okay=False), default=settings.catalog_db or "build/catalog.db", show_default=True)
+def catalog_import(csv_path: str, catalog_db: str):
+    """Bulk-import parts from a CSV (mpn, category, package, voltage, current, price, stock, ...)."""
+    if os.path.dirname(catalog_db):
+        os.makedirs(os.path.dirname(catalog_db), exist_ok=True)
+    t0 = time.perf_counter()
+    with Catalog(catalog_db) as cat:
+        n = cat.import_csv(csv_path)
+        total = len(cat)
+    click.echo(f"Imported {n} parts in {time.perf_counter() - t0:.1f}s ({total} in {catalog_db})")
+
+
+@catalog.command("query")
+@click.argument("category")
+@click.option("--db", "catalog_db", type=click.Path(exists=True, dir_okay=False), default=settings.catalog_db or "build/catalog.db", show_default=True)
+@click.option("--package")
+@click.option("--voltage", type=float, help="Operating voltage that must be within the part's range.")
+@click.option("--vin-min", "min_voltage", type=float, help="Part's maximum voltage must be at least this.")
+@click.option("--current", type=float, help="Part's maximum current must be at least this (A).")
+@click.option("--limit", type=int, default=10, show_default=True)
+def catalog_query(category: str, catalog_db: str, package: str, voltage: float, min_voltage: float, current: float, limit: int):
+    """Ranked parametric search, e.g. `pcbai catalog query buck --vin-min 12 --package SOIC-8`."""
+    with Catalog(catalog_db, readonly=True) as cat:
+        parts = cat.query(PartQuery(category=category, package=package, voltage=voltage,
+                                    min_voltage=min_voltage, current=current, limit=limit))
+    for p in parts:
+        click.echo(f"{p['mpn']},{p['package'] or ''},{p['voltage'] or ''},{p['current'] or ''}")
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+
+import click
+
+
+@click.command("fetch-datasheets")
+@click.argument("mpns", nargs=-1, required=True)
+@click.option("--out", "outdir", type=click.Path(), default="build/datasheets")
+@click.option("--workers", type=int, default=8, show_default=True)
+@click.option("--per-host", type=int, default=4, show_default=True, help="Concurrent requests per host.")
+@click.option("--timeout", type=float, default=5.0, show_default=True)
+def fetch_datasheets(mpns, outdir: str, workers: int, per_host: int, timeout: float):
+    """Download datasheet PDFs for MPNs concurrently (cached copies are revalidated)."""
+    from pcbai.steps.datasheet_fetcher import fetch_datasheet
+
+    paths = fetch_datasheet(list(mpns), outdir, max_workers=workers, per_host=per_host, timeout=timeout)
+    for path in paths:
+        click.echo(path)
+    click.echo(f"Fetched {len(paths)}/{len(set(mpns))} datasheets into {outdir}")
+
+
+@click.command()
+@click.argument("pdf", type=click.Path(exists=True))
+@click.option("--out", "out_json", type=click.Path(), default="build/package_guess.json")
+@click.option("--cache-dir", type=click.Path(file_okay=False), envvar="PCB_AI_TEXT_CACHE", default=None,
+              help="Persistent per-page text cache, keyed by PDF content hash.")
+@click.option("--from-end", is_flag=True, help="Scan from the last page (package drawings are usually at the end).")
+@click.option("--full-scan", is_flag=True, help="Read every page instead of stopping once all fields are found.")
+@click.option("--vision/--no-vision", default=None,
+              help="OCR the most likely pages when fields are missing (default: only for scanned PDFs; needs the vision extra).")
+def extract_package(pdf: str, out_json: str, cache_dir: str, from_end: bool, full_scan: bool, vision: bool):
+    """Extract package parameters from a datasheet PDF (heuristic)."""
+    os.makedirs(os.path.dirname(out_json), exist_ok=True)
+    from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf, save_guess_json
+    guess = extract_package_params_from_pdf(pdf, cache_dir=cache_dir, early_exit=not full_scan, from_end=from_end,
+                                            vision=vision)
+    save_guess_json(guess, out_json)
+    click.echo(f"Saved package guess to {out_json}")
+
+
+@click.command("extract-corpus")
+@click.argument("root", type=click.Path(exists=True, file_okay=False))
+@click.option("--out", "out_jsonl", type=click.Path(dir_okay=False), default="build/package_guesses.jsonl")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+@click.option("--timeout", type=float, default=60.0, show_default=True, help="Seconds per PDF before its worker is killed.")
+@click.option("--cache-dir", type=click.Path(file_okay=False), envvar="PCB_AI_TEXT_CACHE", default=None)
+@click.option("--from-end", is_flag=True, help="Scan each PDF from the last page.")
+def extract_corpus(root: str, out_jsonl: str, workers: int, timeout: float, cache_dir: str, from_end: bool):
+    """Extract package guesses for every PDF under ROOT into a JSONL file (resumable)."""
+    from pcbai.steps.datasheet_corpus import run_corpus
+
+    def report(rec):
+        if rec["status"] != "ok":
+            click.echo(f"{rec['path']}: {rec['status']}: {rec['error']}", err=True)
+
+    summary = run_corpus(root, out_jsonl, workers=workers, timeout=timeout, cache_dir=cache_dir,
+                         from_end=from_end, on_record=report)
+    click.echo(f"{summary.ok} ok, {summary.errors} errors, {summary.timeouts} timeouts, {summary.skipped} already done "
+               f"of {summary.found} PDFs in {summary.elapsed:.1f}s ({summary.rate:.1f} PDFs/s) -> {out_jsonl}")
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import os
+
+import click
+
+from pcbai.steps.footprint_generator import (
+    SmdRcParams, SoicParams, write_kicad_mod_smd_rc, write_kicad_mod_soic,
+)
+from pcbai.steps.footprint_qfn_qfp import QfnParams, QfpParams, generate_qfn, generate_qfp, KiCadModuleWriter
+
+
+@click.command()
+@click.option("--type", "ftype", type=click.Choice(["smd_rc", "soic", "qfn", "qfp", "bga"]), required=True)
+@click.option("--name", required=True)
+@click.option("--out", "outdir", type=click.Path(), default="build")
+# Common
+@click.option("--pins", type=int)
+@click.option("--pitch", type=float)
+@click.option("--body-l", type=float)
+@click.option("--body-w", type=float)
+@click.option("--pad-l", type=float)
+@click.option("--pad-w", type=float)
+# SMD RC
+@click.option("--gap", type=float)
+# SOIC
+@click.option("--row-offset", type=float)
+# QFN specific
+@click.option("--ep-l", type=float)
+@click.option("--ep-w", type=float)
+# QFP specific
+@click.option("--gullwing-ext", type=float)
+# BGA specific
+@click.option("--rows", type=int)
+@click.option("--cols", type=int)
+@click.option("--pad-d", type=float)
+@click.option("--center-depop", type=int, default=0)
+def footprint(ftype: str, name: str, outdir: str, pins: int, pitch: float, body_l: float, body_w: float, pad_l: float, pad_w: float, gap: float, row_offset: float, ep_l: float, ep_w: float, gullwing_ext: float, rows: int, cols: int, pad_d: float, center_depop: int):
+    """Generate a KiCad footprint (.kicad_mod)."""
+    os.makedirs(outdir, exist_ok=True)
+    if ftype == "smd_rc":
+        assert all(v is not None for v in [body_l, body_w, pad_l, pad_w, gap]), "Missing SMD RC params"
+        params = SmdRcParams(name=name, body_l=body_l, body_w=body_w, pad_l=pad_l, pad_w=pad_w, gap=gap)
+        path = write_kicad_mod_smd_rc(outdir, params)
+    elif ftype == "soic":
+        assert all(v is not None for v in [pins, pitch, body_l, body_w, pad_l, pad_w, row_offset]), "Missing SOIC params"
+        params = SoicParams(name=name, pins=pins, pitch=pitch, body_l=body_l, body_w=body_w, pad_l=pad_l, pad_w=pad_w, row_offset=row_offset)
+        path = write_kicad_mod_soic(outdir, params)
+    elif ftype == "qfn":
+        assert all(v is not None for v in [pins, pitch, body_l, body_w, pad_l, pad_w]), "Missing QFN params"
+        params = QfnParams(name=name, pins=pins, pitch=pitch, body_l=body_l, body_w=body_w, pad_l=pad_l, pad_w=pad_w, ep_l=ep_l, ep_w=ep_w)
+        content = generate_qfn(params)
+        path = KiCadModuleWriter(outdir).write(name, content)
+    elif ftype == "qfp":
+        assert all(v is not None for v in [pins, pitch, body_l, body_w, pad_l, pad_w]), "Missing QFP params"
+        params = QfpParams(name=name, pins=pins, pitch=pitch, body_l=body_l, body_w=body_w, pad_l=pad_l, pad_w=pad_w, gullwing_ext=gullwing_ext or 0.0)
+        content = generate_qfp(params)
+        path = KiCadModuleWriter(outdir).write(name, content)
+    elif ftype == "bga":
+        assert all(v is not None for v in [rows, cols, pitch, body_l, body_w, pad_d]), "Missing BGA params"
+        from pcbai.steps.footprint_bga import BgaParams, generate_bga
+        params = BgaParams(name=name, rows=rows, cols=cols, pitch=pitch, body_l=body_l, body_w=body_w, pad_d=pad_d, center_depop=center_depop)
+        content = generate_bga(params)
+        path = KiCadModuleWriter(outdir).write(name, content)
+    else:
+        raise click.ClickException("Unsupported type")
+    click.echo(f"Wrote {path}")
+
+
+@click.command("footprint-batch")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+@click.option("--out", "outdir", type=click.Path(), default="build/pcbai.pretty")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: all cores, 1 = in-process).")
+@click.option("--chunksize", type=int, default=32, show_default=True, help="Manifest rows handed to a worker at a time.")
+@click.option("--cache-dir", type=click.Path(file_okay=False), envvar="PCB_AI_FOOTPRINT_CACHE", default=None,
+              help="Reuse footprints whose params and generator version are unchanged.")
+@click.option("--cache-max-mb", type=int, default=256, show_default=True)
+def footprint_batch(manifest: str, outdir: str, workers: int, chunksize: int, cache_dir: str, cache_max_mb: int):
+    """Generate many footprints from a CSV/JSONL manifest into a .pretty library."""
+    from pcbai.steps.footprint_batch import run_batch
+    from pcbai.steps.footprint_cache import FootprintCache
+
+    cache = FootprintCache(cache_dir, max_bytes=cache_max_mb * 1024 * 1024) if cache_dir else None
+
+    def report(res):
+        if not res.ok:
+            click.echo(f"row {res.row} ({res.name or '?'}): {res.error}", err=True)
+
+    summary = run_batch(manifest, outdir, workers=workers, chunksize=chunksize, on_result=report, cache=cache)
+    click.echo(f"Wrote {summary.ok}/{summary.total} footprints to {outdir} in {summary.elapsed:.2f}s ({summary.rate:.0f} footprints/s)")
+    if cache is not None:
+        st = cache.stats
+        click.echo(f"Cache: {st.hits} up to date, {st.restored} restored, {st.misses} generated, {st.evictions} evicted ({st.hit_rate:.0%} hit rate)")
+    if summary.failed:
+        raise click.ClickException(f"{summary.failed} row(s) failed")
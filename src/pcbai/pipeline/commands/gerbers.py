@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import json
+import os
+
+import click
+
+
+@click.command("export-gerbers")
+@click.argument("boards", nargs=-1, required=True, type=click.Path(dir_okay=False))
+@click.option("--out", "outroot", type=click.Path(file_okay=False), default="build/gerbers",
+              help="One subdirectory per board is created here.")
+@click.option("--workers", type=int, default=None, help="Concurrent kicad-cli processes (default: one per core).")
+@click.option("--timeout", type=float, default=None, help="Seconds per kicad-cli run (default: PCB_AI_KICAD_TIMEOUT or 300).")
+@click.option("--retries", type=int, default=1, show_default=True, help="Extra attempts after a failure or timeout.")
+@click.option("--drill", is_flag=True, help="Also export Excellon drill files.")
+@click.option("--report", type=click.Path(dir_okay=False), default=None, help="Write one JSON result per board (JSONL).")
+def export_gerbers(boards, outroot: str, workers: int, timeout: float, retries: int, drill: bool, report: str):
+    """Export Gerbers for many KiCad boards with kicad-cli, in parallel."""
+    from pcbai.steps.kicad_jobs import export_boards
+
+    out = None
+    if report:
+        os.makedirs(os.path.dirname(report) or ".", exist_ok=True)
+        out = open(report, "w", encoding="utf-8")
+
+    def on_result(res):
+        if out is not None:
+            out.write(json.dumps(res.to_dict()) + "\n")
+            out.flush()
+        if res.ok:
+            click.echo(f"{res.board}: {len(res.files)} files in {res.outdir} ({res.seconds:.1f}s)")
+        else:
+            click.echo(f"{res.board}: FAILED after {res.attempts} attempt(s): {res.error}", err=True)
+
+    try:
+        summary = export_boards(boards, outroot, workers=workers, on_result=on_result, timeout=timeout,
+                                retries=retries, exports=("gerbers", "drill") if drill else ("gerbers",))
+    finally:
+        if out is not None:
+            out.close()
+    click.echo(f"Exported {summary.ok}/{summary.total} boards to {outroot} in {summary.elapsed:.1f}s")
+    if summary.failed:
+        raise click.ClickException(f"{summary.failed} board(s) failed")
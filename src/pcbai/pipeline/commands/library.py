@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+
+import click
+
+from pcbai.core.config import settings
+from pcbai.steps.footprint_library import FootprintIndex, FootprintInfo
+
+_DB = settings.footprint_index or "build/footprints.db"
+
+
+def _line(info: FootprintInfo) -> str:
+    pitch = f"{info.pitch:g}" if info.pitch is not None else ""
+    return f"{info.library}:{info.name},{info.pads},{pitch},{info.fingerprint or ''},{info.path}"
+
+
+@click.group("footprint-index")
+def footprint_index():
+    """Index existing .pretty footprint libraries and look up or dedupe against them."""
+
+
+@footprint_index.command("update")
+@click.argument("libraries", nargs=-1, required=True, type=click.Path(exists=True, file_okay=False))
+@click.option("--db", "index_db", type=click.Path(dir_okay=False), default=_DB, show_default=True)
+@click.option("--workers", type=int, default=None, help="Parser processes for large rebuilds (default: one per core).")
+def index_update(libraries, index_db: str, workers: int):
+    """Re-index LIBRARIES (.pretty dirs or folders containing them); unchanged files are skipped."""
+    if os.path.dirname(index_db):
+        os.makedirs(os.path.dirname(index_db), exist_ok=True)
+    with FootprintIndex(index_db) as index:
+        stats = index.update(libraries, workers=workers)
+        total = len(index)
+    click.echo(f"Scanned {stats.scanned} footprints in {stats.elapsed:.2f}s: {stats.parsed} parsed, "
+               f"{stats.unchanged} unchanged, {stats.removed} removed, {stats.failed} failed ({total} in {index_db})")
+
+
+@footprint_index.command("lookup")
+@click.argument("name")
+@click.option("--db", "index_db", type=click.Path(exists=True, dir_okay=False), default=_DB, show_default=True)
+@click.option("--library", help="Only this library (the .pretty name without the suffix).")
+def index_lookup(name: str, index_db: str, library: str):
+    """Footprints called NAME."""
+    with FootprintIndex(index_db, readonly=True) as index:
+        for info in index.lookup(name, library=library):
+            click.echo(_line(info))
+
+
+@footprint_index.command("match")
+@click.argument("footprint", type=click.Path(exists=True, dir_okay=False))
+@click.option("--db", "index_db", type=click.Path(exists=True, dir_okay=False), default=_DB, show_default=True)
+def index_match(footprint: str, index_db: str):
+    """Indexed footprints with the same pad geometry as the .kicad_mod FOOTPRINT."""
+    with open(footprint, "r", encoding="utf-8") as f:
+        text = f.read()
+    with FootprintIndex(index_db, readonly=True) as index:
+        found = index.match(text)
+    for info in found:
+        click.echo(_line(info))
+    if not found:
+        raise SystemExit(1)
+
+
+@footprint_index.command("search")
+@click.option("--db", "index_db", type=click.Path(exists=True, dir_okay=False), default=_DB, show_default=True)
+@click.option("--pads", type=int)
+@click.option("--pitch", type=float, help="Pad pitch in mm (matched within --tolerance).")
+@click.option("--tolerance", type=float, default=0.005, show_default=True)
+@click.option("--limit", type=int, default=50, show_default=True)
+def index_search(index_db: str, pads: int, pitch: float, tolerance: float, limit: int):
+    """Footprints by pad count and pitch, e.g. `pcbai footprint-index search --pads 8 --pitch 1.27`."""
+    with FootprintIndex(index_db, readonly=True) as index:
+        for info in index.search(pads=pads, pitch=pitch, tolerance=tolerance, limit=limit):
+            click.echo(_line(info))
+
+
+@footprint_index.command("dupes")
+@click.option("--db", "index_db", type=click.Path(exists=True, dir_okay=False), default=_DB, show_default=True)
+def index_dupes(index_db: str):
+    """Groups of footprints with identical pad geometry."""
+    with FootprintIndex(index_db, readonly=True) as index:
+        groups = index.duplicates()
+    for group in groups:
+        click.echo(" = ".join(f"{info.library}:{info.name}" for info in group))
+    click.echo(f"{len(groups)} duplicate groups ({sum(len(g) for g in groups)} footprints)", err=True)
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+
+import click
+
+from pcbai.core.config import settings
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8765, show_default=True)
+@click.option("--workers", type=int, default=4, show_default=True, help="Jobs run at once.")
+@click.option("--queue", "queue_size", type=int, default=256, show_default=True,
+              help="Jobs waiting beyond this are refused with 429.")
+@click.option("--workdir", type=click.Path(file_okay=False), default=settings.workdir, show_default=True,
+              help="Page-text and synthesis step caches.")
+@click.option("--catalog", "catalog_db", type=click.Path(exists=True, dir_okay=False), default=settings.catalog_db)
+@click.option("--footprint-index", type=click.Path(exists=True, dir_okay=False), default=settings.footprint_index,
+              help="Report existing footprints with the same pads for every generated one.")
+def serve(host: str, port: int, workers: int, queue_size: int, workdir: str, catalog_db: str, footprint_index: str):
+    """Run a warm local HTTP/JSON job server for pipeline steps.
+
+    Submit with `POST /jobs {"kind": "bom", "params": {"description": "..."}}`,
+    poll `GET /jobs/<id>`, and watch `GET /metrics`. Kinds: bom, footprint,
+    extract_package, synthesize.
+    """
+    from pcbai.pipeline.server import JobServer, WarmState
+
+    state = WarmState(workdir=workdir, catalog_db=catalog_db, footprint_index=footprint_index)
+    server = JobServer(state, workers=workers, queue_size=queue_size)
+    try:
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import click
+
+from pcbai.pipeline.registry import BUILTIN_STEPS, step_names, step_target
+
+
+@click.command()
+def steps():
+    """List registered pipeline steps (built-in and plugins)."""
+    for name in step_names():
+        origin = "builtin" if name in BUILTIN_STEPS else "plugin"
+        click.echo(f"{name:<34} {origin:<8} {step_target(name)}")
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+
+import click
+
+from pcbai.core.config import settings
+
+
+@click.command()
+@click.option("--out", "outdir", type=click.Path(), default="build")
+@click.option("--workdir", type=click.Path(file_okay=False), default=settings.workdir, show_default=True,
+              help="Where step results are cached between runs.")
+@click.option("--catalog", "catalog_db", type=click.Path(dir_okay=False), default=settings.catalog_db)
+@click.option("--datasheets/--no-datasheets", default=False, help="Also fetch datasheets for the BOM.")
+@click.option("--footprints", "footprint_manifest", type=click.Path(exists=True, dir_okay=False),
+              help="Footprint manifest (CSV/JSONL) to generate alongside.")
+@click.option("--netlist-backend", type=click.Choice(["native", "skidl"]), default=settings.netlist_backend,
+              show_default=True, help="Emit the netlist directly or through SKiDL.")
+@click.option("--jobs", type=int, default=4, show_default=True, help="Steps run concurrently.")
+@click.option("--force", is_flag=True, help="Re-run every step even if its inputs are unchanged.")
+@click.argument("description", nargs=-1)
+def synthesize(description: str, outdir: str, workdir: str, catalog_db: str, datasheets: bool,
+               footprint_manifest: str, netlist_backend: str, jobs: int, force: bool):
+    """Run a minimal end-to-end synthesis: parse → BOM → KiCad netlist → (placeholder GERBER export).
+
+    Steps whose inputs have not changed since the last run are skipped, and a
+    failed run picks up after the last step that succeeded.
+    """
+    from pcbai.pipeline.executor import PipelineError
+    from pcbai.pipeline.synthesize import build_synthesis_pipeline
+
+    os.makedirs(outdir, exist_ok=True)
+    pipe = build_synthesis_pipeline(" ".join(description), outdir, workdir, catalog_db=catalog_db,
+                                    datasheets=datasheets, footprint_manifest=footprint_manifest, max_workers=jobs,
+                                    netlist_backend=netlist_backend)
+    try:
+        values = pipe.run(force=force)
+    except PipelineError as e:
+        for name, res in e.results.items():
+            click.echo(f"{name}: {res.status}" + (f" ({res.error})" if res.error else ""), err=True)
+        raise click.ClickException(str(e))
+    for name, res in pipe.results.items():
+        click.echo(f"{name}: {res.status} ({res.seconds:.2f}s)")
+    click.echo(f"Netlist written to {values['netlist']}")
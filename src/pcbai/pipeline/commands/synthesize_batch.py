@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import click
+
+from pcbai.core.config import settings
+
+
+@click.command("synthesize-batch")
+@click.argument("designs", type=click.Path(exists=True, dir_okay=False))
+@click.option("--out", "outroot", type=click.Path(file_okay=False), default="build/designs", show_default=True,
+              help="One subdirectory per design, plus bom_lines.csv and bom_rollup.csv.")
+@click.option("--catalog", "catalog_db", type=click.Path(exists=True, dir_okay=False), default=settings.catalog_db,
+              help="SQLite parts catalog (default: $PCB_AI_CATALOG, else the built-in demo parts).")
+@click.option("--workers", type=int, default=None, help="Worker processes (default: one per core).")
+@click.option("--netlist-backend", type=click.Choice(["native", "skidl"]), default=settings.netlist_backend,
+              show_default=True)
+def synthesize_batch(designs: str, outroot: str, catalog_db: str, workers: int, netlist_backend: str):
+    """Synthesize every design in a JSONL file in parallel and roll up their BOMs."""
+    from pcbai.pipeline.synthesize_batch import run_synthesis_batch
+
+    def on_result(res):
+        if not res.ok:
+            click.echo(f"line {res.row} ({res.name}): {res.error}", err=True)
+
+    summary = run_synthesis_batch(designs, outroot, catalog_db=catalog_db, workers=workers,
+                                  netlist_backend=netlist_backend, on_result=on_result)
+    click.echo(f"Synthesized {summary.ok}/{summary.total} designs in {summary.elapsed:.1f}s; "
+               f"{summary.parts} distinct parts in {outroot}/bom_rollup.csv")
+    if summary.failed:
+        raise click.ClickException(f"{summary.failed} design(s) failed")
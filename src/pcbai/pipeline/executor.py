@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Sequence, Union
+
+from pcbai.core.fileio import atomic_write
+from pcbai.core.logger import get_logger
+from pcbai.core.profiler import span
+
+log = get_logger(__name__)
+
+_CODE_DIGESTS: Dict[str, str] = {}
+_MODULE_IMPORTS: Dict[str, FrozenSet[str]] = {}
+_PACKAGE = __name__.split(".")[0]
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _module_path(name: str) -> Optional[str]:
+    """Source file of a module, found on disk without importing it."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return getattr(module, "__file__", None)
+    if name.split(".")[0] != _PACKAGE:
+        return None
+    base = os.path.join(_PACKAGE_DIR, *name.split(".")[1:])
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _package_imports(name: str, path: str) -> FrozenSet[str]:
+    """Modules of this package that `path` imports anywhere (function-local imports included)."""
+    found = _MODULE_IMPORTS.get(path)
+    if found is not None:
+        return found
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name for a in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                base = importlib.util.resolve_name("." * node.level + base, name.rpartition(".")[0])
+            names.add(base)
+            names.update(f"{base}.{a.name}" for a in node.names)  # `from pkg import module`
+    found = _MODULE_IMPORTS[path] = frozenset(n for n in names if n.split(".")[0] == _PACKAGE)
+    return found
+
+
+def _code_digest(fn: Callable[..., Any]) -> str:
+    """Hash of the module defining `fn` and every package module it imports, directly or not.
+
+    Editing a step module, or a helper it calls into, invalidates its results.
+    """
+    root = getattr(fn, "__module__", "") or ""
+    path = _module_path(root)
+    if not path:
+        return getattr(fn, "__qualname__", repr(fn))
+    files: Dict[str, str] = {}
+    queue = [(root, path)]
+    while queue:
+        name, path = queue.pop()
+        if name in files:
+            continue
+        digest = _CODE_DIGESTS.get(path)
+        if digest is None:
+            digest = _CODE_DIGESTS[path] = _sha256_file(path)
+        files[name] = digest
+        for dep in _package_imports(name, path):
+            dep_path = _module_path(dep) if dep not in files else None
+            if dep_path and dep_path.endswith(".py"):
+                queue.append((dep, dep_path))
+    if len(files) == 1:
+        return files[root]
+    return hashlib.sha256(json.dumps(sorted(files.items())).encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Step:
+    name: str
+    fn: Callable[..., Any]
+    inputs: Dict[str, str] = field(default_factory=dict)  # kwarg -> upstream step name
+    params: Dict[str, Any] = field(default_factory=dict)  # JSON-able keyword arguments
+    files: Sequence[str] = ()    # input files whose content is part of the fingerprint
+    outputs: Sequence[str] = ()  # files or directories the step writes; missing or changed ones force a re-run
+    version: str = ""            # bump to invalidate results by hand
+
+
+@dataclass
+class StepResult:
+    status: str = "pending"  # ran, skipped, failed, blocked (an upstream step failed)
+    seconds: float = 0.0
+    fingerprint: Optional[str] = None
+    error: Optional[str] = None
+
+
+class PipelineError(RuntimeError):
+    def __init__(self, failed: List[str], results: Dict[str, StepResult]):
+        super().__init__("Pipeline step(s) failed: " + ", ".join(f"{n} ({results[n].error})" for n in failed))
+        self.failed = failed
+        self.results = results
+
+
+class Pipeline:
+    """Incremental DAG executor for pipeline steps.
+
+    Each step's fingerprint covers its code, parameters, input files and the
+    fingerprints of the steps it consumes. Results are pickled into
+    `<workdir>/pipeline/<name>/` and recorded in a manifest as soon as each
+    step finishes, so a step is skipped when its fingerprint is unchanged, and
+    a run that failed halfway resumes after the last step that succeeded.
+    Steps whose inputs are ready run concurrently on a thread pool.
+    """
+
+    def __init__(self, workdir: str, name: str = "default", max_workers: int = 4):
+        self.dir = os.path.join(workdir, "pipeline", name)
+        self.max_workers = max(1, max_workers)
+        self.steps: Dict[str, Step] = {}
+        self._manifest_path = os.path.join(self.dir, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest: Dict[str, Any] = {"steps": {}, "files": {}}
+
+    def add(self, name: str, fn: Union[str, Callable[..., Any]], inputs: Optional[Mapping[str, str]] = None,
+            params: Optional[Mapping[str, Any]] = None, files: Sequence[str] = (),
+            outputs: Sequence[str] = (), version: str = "") -> Step:
+        """Add a step; `fn` is a callable or the name of a registered (built-in or plugin) step."""
+        if name in self.steps:
+            raise ValueError(f"Duplicate step: {name}")
+        if isinstance(fn, str):
+            from pcbai.pipeline.registry import load_step
+            fn = load_step(fn)
+        for upstream in (inputs or {}).values():
+            if upstream not in self.steps:
+                raise ValueError(f"Step {name!r} depends on unknown step {upstream!r}")
+        step = self.steps[name] = Step(name, fn, dict(inputs or {}), dict(params or {}), tuple(files),
+                                       tuple(outputs), version)
+        return step
+
+    # -- persistence -------------------------------------------------------
+
+    def _load_manifest(self) -> None:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._manifest = {"steps": data.get("steps", {}), "files": data.get("files", {})}
+        except (OSError, ValueError):
+            self._manifest = {"steps": {}, "files": {}}
+
+    def _save_manifest(self) -> None:
+        # Caller holds self._lock
+        atomic_write(self._manifest_path, json.dumps(self._manifest, indent=1, sort_keys=True))
+
+    def _file_digest(self, path: str) -> str:
+        """Content hash of `path`, reusing the recorded hash while size and mtime are unchanged.
+
+        A directory hashes the names, sizes and mtimes of the files under it.
+        """
+        path = os.path.abspath(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return "missing"
+        if os.path.isdir(path):
+            h = hashlib.sha256()
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for fname in sorted(filenames):
+                    full = os.path.join(dirpath, fname)
+                    try:
+                        fst = os.stat(full)
+                    except OSError:
+                        continue
+                    h.update(f"{os.path.relpath(full, path)}\0{fst.st_size}\0{fst.st_mtime_ns}\n".encode("utf-8"))
+            return "dir:" + h.hexdigest()
+        stamp = [st.st_size, st.st_mtime_ns]
+        with self._lock:
+            known = self._manifest["files"].get(path)
+        if known and known[:2] == stamp:
+            return known[2]
+        digest = _sha256_file(path)
+        with self._lock:
+            self._manifest["files"][path] = stamp + [digest]
+        return digest
+
+    def _artifact(self, name: str) -> str:
+        return os.path.join(self.dir, f"{name}.pkl")
+
+    # -- execution ---------------------------------------------------------
+
+    def _fingerprint(self, step: Step, upstream: Mapping[str, str]) -> str:
+        blob = json.dumps({
+            "name": step.name,
+            "version": step.version,
+            "code": _code_digest(step.fn),
+            "params": step.params,
+            "files": {f: self._file_digest(f) for f in step.files},
+            "inputs": {k: upstream[s] for k, s in sorted(step.inputs.items())},
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _up_to_date(self, step: Step, fp: str) -> bool:
+        rec = self._manifest["steps"].get(step.name)
+        if not rec or rec.get("fingerprint") != fp or not os.path.exists(self._artifact(step.name)):
+            return False
+        return all(self._file_digest(p) == rec.get("outputs", {}).get(p) for p in step.outputs)
+
+    def _run_step(self, step: Step, fp: str, values: Dict[str, Any]) -> Any:
+        kwargs = dict(step.params)
+        kwargs.update({k: values[s] for k, s in step.inputs.items()})
+        with span(f"step:{step.name}", cat="pipeline"):
+            value = step.fn(**kwargs)
+        path = self._artifact(step.name)
+        tmp = f"{path}.{threading.get_ident()}.part"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        outputs = {p: self._file_digest(p) for p in step.outputs}
+        with self._lock:
+            self._manifest["steps"][step.name] = {"fingerprint": fp, "outputs": outputs, "finished": time.time()}
+            self._save_manifest()
+        return value
+
+    def _load_value(self, name: str) -> Any:
+        with open(self._artifact(name), "rb") as f:
+            return pickle.load(f)
+
+    def run(self, targets: Optional[Sequence[str]] = None, force: bool = False) -> Dict[str, Any]:
+        """Run `targets` (default: every step) and whatever they depend on; returns step -> value.
+
+        `self.results` holds a StepResult per step afterwards. Raises
+        PipelineError if any step failed; steps that succeeded stay cached.
+        """
+        os.makedirs(self.dir, exist_ok=True)
+        self._load_manifest()
+        needed = self._closure(targets or list(self.steps))
+        self.results: Dict[str, StepResult] = {n: StepResult() for n in needed}
+        values: Dict[str, Any] = {}
+        fps: Dict[str, str] = {}
+        remaining = {n: set(self.steps[n].inputs.values()) for n in needed}
+        failed: List[str] = []
+        running: Dict[Any, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline") as pool:
+            while remaining or running:
+                for name in [n for n, deps in remaining.items() if not deps]:
+                    del remaining[name]
+                    step = self.steps[name]
+                    fp = fps[name] = self._fingerprint(step, fps)
+                    self.results[name].fingerprint = fp
+                    if not force and self._up_to_date(step, fp):
+                        try:
+                            values[name] = self._load_value(name)
+                        except (OSError, pickle.PickleError, EOFError, AttributeError):
+                            pass
+                        else:
+                            self.results[name].status = "skipped"
+                            log.info("step %s: up to date", name)
+                            self._release(name, remaining)
+                            continue
+                    log.info("step %s: running", name)
+                    running[pool.submit(self._timed, step, fp, values)] = name
+                if not running:
+                    if any(not deps for deps in remaining.values()):
+                        continue  # skipped steps released more work
+                    break
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for fut in done:
+                    name = running.pop(fut)
+                    res = self.results[name]
+                    try:
+                        values[name], res.seconds = fut.result()
+                        res.status = "ran"
+                        self._release(name, remaining)
+                    except Exception as e:
+                        res.status, res.error = "failed", f"{type(e).__name__}: {e}"
+                        log.error("step %s failed: %s", name, res.error)
+                        failed.append(name)
+                        self._block(name, remaining)
+
+        with self._lock:
+            self._save_manifest()
+        if failed:
+            raise PipelineError(failed, self.results)
+        return {n: values[n] for n in needed}
+
+    def _timed(self, step: Step, fp: str, values: Dict[str, Any]):
+        t0 = time.perf_counter()
+        value = self._run_step(step, fp, values)
+        return value, time.perf_counter() - t0
+
+    def _closure(self, targets: Sequence[str]) -> List[str]:
+        order: List[str] = []
+        seen = set()
+
+        def visit(name: str) -> None:
+            if name in seen:
+                return
+            if name not in self.steps:
+                raise ValueError(f"Unknown step: {name}")
+            seen.add(name)
+            for upstream in self.steps[name].inputs.values():
+                visit(upstream)
+            order.append(name)
+
+        for t in targets:
+            visit(t)
+        return order
+
+    def _release(self, name: str, remaining: Dict[str, set]) -> None:
+        for deps in remaining.values():
+            deps.discard(name)
+
+    def _block(self, name: str, remaining: Dict[str, set]) -> None:
+        for other in [n for n, deps in remaining.items() if name in deps]:
+            if other in remaining:
+                del remaining[other]
+                self.results[other].status = "blocked"
+                self._block(other, remaining)
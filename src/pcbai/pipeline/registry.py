@@ -0,0 +1,160 @@
+"""Lazy registry of CLI commands and pipeline steps.
+
+Built-in commands and steps are listed here as "module:attr" targets and
+imported only when used. Third-party packages add their own through entry
+points, without touching this package:
+
+    [project.entry-points."pcbai.commands"]
+    my-cmd = "my_pkg.cli:my_cmd"          # a click.Command
+
+    [project.entry-points."pcbai.steps"]
+    my_step = "my_pkg.steps:my_step"      # a callable usable as a Pipeline step
+
+Entry points are only scanned when a name is not built in (or for
+listings), so running a built-in command never pays for metadata discovery.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import click
+
+COMMAND_GROUP = "pcbai.commands"
+STEP_GROUP = "pcbai.steps"
+
+# name -> (target, short help shown by `pcbai --help` without importing the command)
+BUILTIN_COMMANDS: Dict[str, Tuple[str, str]] = {
+    "bench": ("pcbai.pipeline.commands.bench:bench",
+              "Time every step module on synthetic large-design workloads."),
+    "bom": ("pcbai.pipeline.commands.bom:bom",
+            "Generate a toy BOM from a natural language description."),
+    "catalog": ("pcbai.pipeline.commands.catalog:catalog",
+                "Manage and query the SQLite parts catalog."),
+    "export-gerbers": ("pcbai.pipeline.commands.gerbers:export_gerbers",
+                       "Export Gerbers for many KiCad boards with kicad-cli, in parallel."),
+    "extract-corpus": ("pcbai.pipeline.commands.datasheet:extract_corpus",
+                       "Extract package guesses for every PDF under ROOT into a JSONL file (resumable)."),
+    "extract-package": ("pcbai.pipeline.commands.datasheet:extract_package",
+                        "Extract package parameters from a datasheet PDF (heuristic)."),
+    "fetch-datasheets": ("pcbai.pipeline.commands.datasheet:fetch_datasheets",
+                         "Download datasheet PDFs for MPNs concurrently (cached copies are revalidated)."),
+    "footprint": ("pcbai.pipeline.commands.footprint:footprint",
+                  "Generate a KiCad footprint (.kicad_mod)."),
+    "footprint-batch": ("pcbai.pipeline.commands.footprint:footprint_batch",
+                        "Generate many footprints from a CSV/JSONL manifest into a .pretty library."),
+    "footprint-index": ("pcbai.pipeline.commands.library:footprint_index",
+                        "Index existing .pretty footprint libraries and look up or dedupe against them."),
+    "serve": ("pcbai.pipeline.commands.serve:serve",
+              "Run a warm local HTTP/JSON job server for pipeline steps."),
+    "steps": ("pcbai.pipeline.commands.steps:steps",
+              "List registered pipeline steps (built-in and plugins)."),
+    "synthesize": ("pcbai.pipeline.commands.synthesize:synthesize",
+                   "Run a minimal end-to-end synthesis: parse → BOM → KiCad netlist → (placeholder GERBER export)."),
+    "synthesize-batch": ("pcbai.pipeline.commands.synthesize_batch:synthesize_batch",
+                         "Synthesize every design in a JSONL file in parallel and roll up their BOMs."),
+}
+
+BUILTIN_STEPS: Dict[str, str] = {
+    "parse_requirements": "pcbai.steps.requirements_parser:parse_requirements",
+    "generate_bom": "pcbai.steps.bom_generator:generate_bom",
+    "synthesize_schematic": "pcbai.steps.schematic_synthesizer:synthesize_schematic",
+    "bom_to_schematic": "pcbai.steps.skidl_schematic:bom_to_schematic",
+    "route_pcb": "pcbai.steps.pcb_router:route_pcb",
+    "export_gerbers": "pcbai.steps.gerber_exporter:export_gerbers",
+    "export_boards": "pcbai.steps.kicad_jobs:export_boards",
+    "fetch_datasheet": "pcbai.steps.datasheet_fetcher:fetch_datasheet",
+    "extract_package_params_from_pdf": "pcbai.steps.datasheet_package_extractor:extract_package_params_from_pdf",
+    "run_footprint_batch": "pcbai.steps.footprint_batch:run_batch",
+    "run_synthesis_batch": "pcbai.pipeline.synthesize_batch:run_synthesis_batch",
+}
+
+_plugin_cache: Dict[str, Dict[str, Any]] = {}
+
+
+def load_target(target: str) -> Any:
+    """Import "package.module:attr" and return the attribute."""
+    module, _, attr = target.partition(":")
+    obj: Any = importlib.import_module(module)
+    for part in attr.split(".") if attr else ():
+        obj = getattr(obj, part)
+    return obj
+
+
+def plugins(group: str) -> Dict[str, Any]:
+    """Entry points registered under `group` (name -> EntryPoint), scanned once per process."""
+    found = _plugin_cache.get(group)
+    if found is None:
+        from importlib.metadata import entry_points
+        found = _plugin_cache[group] = {ep.name: ep for ep in entry_points(group=group)}
+    return found
+
+
+def step_names() -> List[str]:
+    return sorted(set(BUILTIN_STEPS) | set(plugins(STEP_GROUP)))
+
+
+def step_target(name: str) -> Optional[str]:
+    if name in BUILTIN_STEPS:
+        return BUILTIN_STEPS[name]
+    ep = plugins(STEP_GROUP).get(name)
+    return ep.value if ep is not None else None
+
+
+def load_step(name: str) -> Callable[..., Any]:
+    """Resolve a step by registry name, importing its module on first use."""
+    if name in BUILTIN_STEPS:
+        return load_target(BUILTIN_STEPS[name])
+    ep = plugins(STEP_GROUP).get(name)
+    if ep is None:
+        raise KeyError(f"Unknown pipeline step: {name}")
+    return ep.load()
+
+
+class LazyGroup(click.Group):
+    """click.Group whose subcommands are imported only when invoked.
+
+    `--help` lists built-in commands from their registered short help and
+    plugin commands from their entry point, so listing imports nothing.
+    """
+
+    def __init__(self, *args: Any, lazy_commands: Optional[Dict[str, Tuple[str, str]]] = None,
+                 plugin_group: Optional[str] = COMMAND_GROUP, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = dict(lazy_commands or {})
+        self.plugin_group = plugin_group
+
+    def _plugins(self) -> Dict[str, Any]:
+        return plugins(self.plugin_group) if self.plugin_group else {}
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(self.commands) | set(self.lazy_commands) | set(self._plugins()))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if cmd_name in self.commands:
+            return self.commands[cmd_name]
+        if cmd_name in self.lazy_commands:
+            cmd = load_target(self.lazy_commands[cmd_name][0])
+        else:
+            ep = self._plugins().get(cmd_name)
+            if ep is None:
+                return None
+            cmd = ep.load()
+        if not isinstance(cmd, click.Command):
+            raise click.ClickException(f"{cmd_name!r} does not resolve to a click command")
+        self.commands[cmd_name] = cmd
+        return cmd
+
+    def format_commands(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        rows = []
+        for name in self.list_commands(ctx):
+            if name in self.commands:
+                help_text = self.commands[name].get_short_help_str(formatter.width)
+            elif name in self.lazy_commands:
+                help_text = self.lazy_commands[name][1]
+            else:
+                help_text = f"[plugin] {self._plugins()[name].value}"
+            rows.append((name, help_text))
+        if rows:
+            with formatter.section("Commands"):
+                formatter.write_dl(rows)
@@ -0,0 +1,475 @@
+"""`pcbai serve`: a long-running local HTTP/JSON job service.
+
+A CLI call pays for interpreter startup, imports and cold caches every
+time. The server keeps one process warm: read-only catalog connections
+(one per worker thread), the keyword matcher, generated footprints and
+extracted package guesses (in-memory LRUs), the per-page PDF text cache
+and the synthesis step cache all survive between jobs.
+
+Jobs go onto a bounded asyncio queue that `workers` consumers drain.
+Each job runs its step on a thread pool, so SQLite, file and subprocess
+work overlap. A full queue is answered with 429 instead of growing
+without limit. The HTTP layer is a small HTTP/1.1 reader on
+`asyncio.start_server`, so no web framework is needed.
+
+    POST /jobs            {"kind": "bom", "params": {...}}  -> 202 {"id": ..., "status": "queued"}
+                          (?wait=SECONDS answers 200 with the finished job if it completes in time)
+    GET  /jobs            recent jobs, newest first
+    GET  /jobs/<id>       status, timings, and result or error (?wait=SECONDS long-polls)
+    GET  /metrics         queue depth, running jobs, counts and latency percentiles per kind
+    GET  /health          liveness and the job kinds on offer
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from pcbai.core.config import settings
+from pcbai.core.logger import get_logger
+
+log = get_logger("pcbai.serve")
+
+MAX_BODY = 16 << 20
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+
+class _LRU:
+    """Small thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = self.misses = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+class WarmState:
+    """Everything the server keeps loaded between jobs."""
+
+    def __init__(self, workdir: Optional[str] = None, catalog_db: Optional[str] = None,
+                 footprint_index: Optional[str] = None, cache_size: int = 4096):
+        self.workdir = workdir or settings.workdir
+        self.catalog_db = catalog_db
+        self.footprint_index = footprint_index
+        self.page_cache = os.path.join(self.workdir, "pages")
+        self.footprints = _LRU(cache_size)
+        self.guesses = _LRU(cache_size)
+        self._local = threading.local()
+        self._opened: List[Any] = []
+        self._lock = threading.Lock()
+        self._run_locks: Dict[str, threading.Lock] = {}
+
+    def _thread_db(self, attr: str, path: Optional[str], factory: Callable[[str], Any]) -> Any:
+        # SQLite connections are per thread; each worker opens its own once and keeps it
+        if not path:
+            return None
+        db = getattr(self._local, attr, None)
+        if db is None:
+            db = factory(path)
+            setattr(self._local, attr, db)
+            with self._lock:
+                self._opened.append(db)
+        return db
+
+    def catalog(self):
+        from pcbai.steps.catalog import Catalog
+        return self._thread_db("catalog", self.catalog_db, lambda p: Catalog(p, readonly=True))
+
+    def index(self):
+        from pcbai.steps.footprint_library import FootprintIndex
+        return self._thread_db("index", self.footprint_index, lambda p: FootprintIndex(p, readonly=True))
+
+    def run_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._run_locks.setdefault(key, threading.Lock())
+
+    def stats(self) -> Dict[str, Any]:
+        return {"footprints": self.footprints.stats(), "package_guesses": self.guesses.stats(),
+                "connections": len(self._opened)}
+
+    def close(self) -> None:
+        with self._lock:
+            opened, self._opened = self._opened, []
+        for db in opened:
+            db.close()
+
+
+# -- job kinds: (state, params) -> JSON-able result ---------------------------
+
+def _bom(state: WarmState, params: Dict[str, Any]) -> Dict[str, Any]:
+    from pcbai.steps.bom_generator import generate_bom
+    from pcbai.steps.requirements_parser import parse_requirements
+
+    requirements = params.get("requirements")
+    if requirements is None:
+        if "description" not in params:
+            raise ValueError("bom needs 'description' or 'requirements'")
+        requirements = parse_requirements(params["description"])
+    return {"requirements": requirements, "bom": generate_bom(requirements, catalog=state.catalog())}
+
+
+def _footprint(state: WarmState, params: Dict[str, Any]) -> Dict[str, Any]:
+    from pcbai.steps.footprint_batch import FOOTPRINT_KINDS, params_from_row
+    from pcbai.steps.footprint_cache import params_key
+    from pcbai.steps.footprint_generator import KiCadModuleWriter
+
+    row = dict(params)
+    outdir = row.pop("outdir", None)
+    fp = params_from_row(row)
+    key = params_key(fp)
+    content = state.footprints.get(key)
+    if content is None:
+        content = FOOTPRINT_KINDS[row["type"]][1](fp)
+        state.footprints.put(key, content)
+    result: Dict[str, Any] = {"name": fp.name, "key": key}
+    if outdir:
+        result["path"] = KiCadModuleWriter(outdir).write(fp.name, content)
+    else:
+        result["content"] = content
+    index = state.index()
+    if index is not None:
+        result["existing"] = [asdict(info) for info in index.match(content)]
+    return result
+
+
+def _extract_package(state: WarmState, params: Dict[str, Any]) -> Dict[str, Any]:
+    from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf
+
+    pdf = params.get("pdf")
+    if not pdf:
+        raise ValueError("extract_package needs 'pdf'")
+    early_exit, from_end = bool(params.get("early_exit", True)), bool(params.get("from_end", False))
+    vision = params.get("vision")
+    st = os.stat(pdf)
+    key = (os.path.abspath(pdf), st.st_mtime_ns, st.st_size, early_exit, from_end, vision)
+    guess = state.guesses.get(key)
+    if guess is None:
+        guess = asdict(extract_package_params_from_pdf(pdf, cache_dir=state.page_cache, early_exit=early_exit,
+                                                       from_end=from_end, vision=vision))
+        state.guesses.put(key, guess)
+    return guess
+
+
+def _synthesize(state: WarmState, params: Dict[str, Any]) -> Dict[str, Any]:
+    from pcbai.pipeline.executor import PipelineError
+    from pcbai.pipeline.synthesize import build_synthesis_pipeline
+
+    description = params.get("description")
+    if not description:
+        raise ValueError("synthesize needs 'description'")
+    # Identical requests share a step cache (and re-runs are skipped); different ones never share a manifest
+    key = hashlib.sha256(json.dumps(params, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    workdir = os.path.join(state.workdir, "serve", key)
+    outdir = params.get("outdir") or os.path.join(workdir, "out")
+    os.makedirs(outdir, exist_ok=True)
+    pipe = build_synthesis_pipeline(description, outdir, workdir,
+                                    catalog_db=params.get("catalog_db", state.catalog_db),
+                                    datasheets=bool(params.get("datasheets", False)),
+                                    footprint_manifest=params.get("footprints"),
+                                    netlist_backend=params.get("netlist_backend", settings.netlist_backend))
+    with state.run_lock(key):
+        try:
+            values = pipe.run(force=bool(params.get("force", False)))
+        except PipelineError as e:
+            raise RuntimeError(str(e)) from None
+    return {"steps": {name: {"status": res.status, "seconds": round(res.seconds, 4)}
+                      for name, res in pipe.results.items()},
+            "bom": values.get("bom"), "netlist": values.get("netlist")}
+
+
+JOB_KINDS: Dict[str, Callable[[WarmState, Dict[str, Any]], Any]] = {
+    "bom": _bom,
+    "footprint": _footprint,
+    "extract_package": _extract_package,
+    "synthesize": _synthesize,
+}
+
+
+# -- jobs and metrics ---------------------------------------------------------
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"  # queued, running, done, failed
+    submitted: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self, full: bool = True) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"id": self.id, "kind": self.kind, "status": self.status, "submitted": self.submitted,
+                               "started": self.started, "finished": self.finished}
+        if self.started is not None:
+            out["wait_ms"] = round((self.started - self.submitted) * 1000, 3)
+        if self.finished is not None and self.started is not None:
+            out["run_ms"] = round((self.finished - self.started) * 1000, 3)
+        if full:
+            out["error"] = self.error
+            out["result"] = self.result
+        return out
+
+
+class _KindStats:
+    __slots__ = ("count", "failed", "run", "wait")
+
+    def __init__(self, window: int):
+        self.count = self.failed = 0
+        self.run: Deque[float] = deque(maxlen=window)
+        self.wait: Deque[float] = deque(maxlen=window)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def pct(values: List[float], q: float) -> float:
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 3) if values else 0.0
+
+        run = sorted(self.run)
+        return {"count": self.count, "failed": self.failed,
+                "mean_ms": round(sum(run) / len(run) * 1000, 3) if run else 0.0,
+                "p50_ms": pct(run, 0.5), "p95_ms": pct(run, 0.95), "max_ms": pct(run, 1.0),
+                "mean_wait_ms": round(sum(self.wait) / len(self.wait) * 1000, 3) if self.wait else 0.0}
+
+
+class QueueFull(RuntimeError):
+    pass
+
+
+class JobServer:
+    """Bounded job queue, worker pool and HTTP front end (see module docstring)."""
+
+    def __init__(self, state: Optional[WarmState] = None, workers: int = 4, queue_size: int = 256,
+                 max_jobs: int = 10000, latency_window: int = 1000):
+        self.state = state or WarmState()
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._latency_window = latency_window
+        self._kinds: Dict[str, _KindStats] = {}
+        self._counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self._running = 0
+        self._done_events: Dict[str, asyncio.Event] = {}
+        self._started = time.time()
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # -- lifecycle ---------------------------------------------------------
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> Tuple[str, int]:
+        """Start workers and listen; returns the bound (host, port), so `port=0` picks a free one."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pcbai-job")
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+        self.state.close()
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        host, port = await self.start(host, port)
+        log.info("Serving on http://%s:%d (%d workers, queue of %d)", host, port, self.workers, self.queue_size)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    # -- jobs --------------------------------------------------------------
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        if kind not in JOB_KINDS:
+            raise ValueError(f"unknown job kind {kind!r} (expected one of {', '.join(sorted(JOB_KINDS))})")
+        if not isinstance(params or {}, dict):
+            raise ValueError("'params' must be an object")
+        job = Job(id=uuid.uuid4().hex[:12], kind=kind, params=dict(params or {}))
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._counts["rejected"] += 1
+            raise QueueFull(f"job queue is full ({self.queue_size} waiting)") from None
+        self._counts["submitted"] += 1
+        self.jobs[job.id] = job
+        self._done_events[job.id] = asyncio.Event()
+        self._evict()
+        return job
+
+    def _evict(self) -> None:
+        # Drop the oldest finished jobs beyond max_jobs; queued and running ones are always kept
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self.jobs.values() if j.finished is not None][:excess]:
+            del self.jobs[job_id]
+            self._done_events.pop(job_id, None)
+
+    async def wait(self, job: Job, timeout: float) -> Job:
+        event = self._done_events.get(job.id)
+        if event is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return job
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status, job.started = "running", time.time()
+            self._running += 1
+            try:
+                job.result = await loop.run_in_executor(self._pool, JOB_KINDS[job.kind], self.state, job.params)
+                job.status = "done"
+            except Exception as e:
+                job.status, job.error = "failed", f"{type(e).__name__}: {e}"
+            finally:
+                job.finished = time.time()
+                self._running -= 1
+                self._record(job)
+                event = self._done_events.get(job.id)
+                if event is not None:
+                    event.set()
+                self._queue.task_done()
+
+    def _record(self, job: Job) -> None:
+        stats = self._kinds.get(job.kind)
+        if stats is None:
+            stats = self._kinds[job.kind] = _KindStats(self._latency_window)
+        stats.count += 1
+        stats.run.append(job.finished - job.started)
+        stats.wait.append(job.started - job.submitted)
+        if job.status == "done":
+            self._counts["completed"] += 1
+        else:
+            stats.failed += 1
+            self._counts["failed"] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"uptime": round(time.time() - self._started, 3), "workers": self.workers,
+                "running": self._running, "queued": self._queue.qsize() if self._queue else 0,
+                "queue_size": self.queue_size, **self._counts,
+                "kinds": {kind: s.to_dict() for kind, s in sorted(self._kinds.items())},
+                "warm": self.state.stats()}
+
+    # -- HTTP --------------------------------------------------------------
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, Any]:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        wait = min(float(query.get("wait", ["0"])[0] or 0), 300.0)
+        parts = [p for p in url.path.split("/") if p]
+        if parts == ["health"] and method == "GET":
+            return 200, {"ok": True, "kinds": sorted(JOB_KINDS)}
+        if parts == ["metrics"] and method == "GET":
+            return 200, self.metrics()
+        if parts == ["jobs"]:
+            if method == "GET":
+                return 200, [job.to_dict(full=False) for job in reversed(self.jobs.values())][:100]
+            if method != "POST":
+                return 405, {"error": f"{method} not allowed"}
+            request = json.loads(body or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            try:
+                job = self.submit(str(request.get("kind", "")), request.get("params"))
+            except QueueFull as e:
+                return 429, {"error": str(e)}
+            await self.wait(job, wait)
+            return (200 if job.finished is not None else 202), job.to_dict(full=job.finished is not None)
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return 404, {"error": f"no job {parts[1]!r}"}
+            if method != "GET":
+                return 405, {"error": f"{method} not allowed"}
+            await self.wait(job, wait)
+            return 200, job.to_dict()
+        return 404, {"error": f"no route for {method} {url.path}"}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                try:
+                    method, target, version = line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+                headers: Dict[str, str] = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, {"error": f"body over {MAX_BODY} bytes"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                try:
+                    status, payload = await self._route(method.upper(), target, body)
+                except ValueError as e:  # includes malformed JSON
+                    status, payload = 400, {"error": str(e)}
+                except Exception as e:
+                    log.exception("Error handling %s %s", method, target)
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: Any, keep_alive: bool) -> None:
+        data = json.dumps(payload, default=str).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import os
+from typing import Dict, List, Optional
+
+from pcbai.pipeline.executor import Pipeline
+from pcbai.steps.bom_generator import generate_bom
+from pcbai.steps.requirements_parser import parse_requirements
+from pcbai.steps.skidl_schematic import bom_to_schematic
+
+
+# Step functions take JSON-able parameters and upstream results as keyword
+# arguments and return picklable values, so the executor can fingerprint and
+# cache them.
+
+def bom_step(requirements: Dict, catalog_db: Optional[str] = None) -> List[Dict]:
+    if not catalog_db:
+        return generate_bom(requirements)
+    from pcbai.steps.catalog import Catalog
+    with Catalog(catalog_db, readonly=True) as catalog:
+        return generate_bom(requirements, catalog=catalog)
+
+
+def netlist_step(bom: List[Dict], path: str, backend: str = "native") -> str:
+    netlist = bom_to_schematic(bom, backend=backend)
+    with open(path, "w") as f:
+        f.write(netlist)
+    return path
+
+
+def datasheets_step(bom: List[Dict], outdir: str) -> List[str]:
+    from pcbai.steps.datasheet_fetcher import fetch_datasheet
+    return fetch_datasheet([p["mpn"] for p in bom if p.get("mpn")], outdir)
+
+
+def footprints_step(manifest: str, outdir: str, cache_dir: Optional[str] = None) -> Dict[str, int]:
+    from pcbai.steps.footprint_batch import run_batch
+    from pcbai.steps.footprint_cache import FootprintCache
+    cache = FootprintCache(cache_dir) if cache_dir else None
+    summary = run_batch(manifest, outdir, cache=cache)
+    return {"total": summary.total, "ok": summary.ok, "failed": summary.failed}
+
+
+def build_synthesis_pipeline(description: str, outdir: str, workdir: str, catalog_db: Optional[str] = None,
+                             datasheets: bool = False, footprint_manifest: Optional[str] = None,
+                             footprint_cache: Optional[str] = None, max_workers: int = 4,
+                             netlist_backend: str = "native") -> Pipeline:
+    """requirements -> bom -> netlist, plus optional datasheet fetch and footprint batch.
+
+    Datasheets, footprints and the netlist do not depend on each other and
+    run concurrently once their inputs are ready.
+    """
+    pipe = Pipeline(workdir, name="synthesize", max_workers=max_workers)
+    pipe.add("requirements", parse_requirements, params={"natural_text": description})
+    pipe.add("bom", bom_step, inputs={"requirements": "requirements"}, params={"catalog_db": catalog_db},
+             files=[catalog_db] if catalog_db else ())
+    netlist_path = os.path.join(outdir, "netlist.txt")
+    pipe.add("netlist", netlist_step, inputs={"bom": "bom"}, params={"path": netlist_path, "backend": netlist_backend}, outputs=[netlist_path])
+    if datasheets:
+        datasheet_dir = os.path.join(outdir, "datasheets")
+        pipe.add("datasheets", datasheets_step, inputs={"bom": "bom"}, params={"outdir": datasheet_dir},
+                 outputs=[datasheet_dir])
+    if footprint_manifest:
+        footprint_dir = os.path.join(outdir, "footprints")
+        pipe.add("footprints", footprints_step, files=[footprint_manifest],
+                 params={"manifest": footprint_manifest, "outdir": footprint_dir, "cache_dir": footprint_cache},
+                 outputs=[footprint_dir])
+    return pipe
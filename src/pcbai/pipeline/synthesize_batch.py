@@ -0,0 +1,207 @@
+"""Batch synthesis over many product variants.
+
+`pcbai synthesize` pays for the catalog connection, the requirements
+vocabulary and the pipeline bookkeeping once per design. Here one JSONL
+file lists the designs:
+
+    {"name": "sensor-v2", "description": "buck converter, mcu and lipo charger", "quantity": 500}
+
+They are fanned out over a process pool. Each worker opens the catalog
+read-only and builds the keyword matcher once, in its initializer, then
+runs requirements -> BOM -> netlist for every design it is handed. Each
+design gets `<out>/<name>/bom.csv` and `netlist.txt`. The parent streams
+one line per BOM entry to `<out>/bom_lines.csv` as results arrive, and
+keeps only a running total per MPN for `<out>/bom_rollup.csv`, so memory
+grows with the number of distinct parts, not with the number of designs.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import multiprocessing
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pcbai.core.profiler import traced
+
+LINE_COLUMNS = ("design", "mpn", "manufacturer", "package", "per_unit", "units", "quantity")
+ROLLUP_COLUMNS = ("mpn", "manufacturer", "package", "quantity", "designs", "unit_price", "extended_price")
+
+
+@dataclass
+class DesignResult:
+    row: int  # 1-based line in the designs file
+    name: str
+    outdir: Optional[str] = None
+    units: int = 1
+    parts: List[Tuple[str, str, str, int, Optional[float]]] = field(default_factory=list)  # mpn, mfr, package, count, price
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class SynthesisSummary:
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    parts: int = 0  # distinct MPNs in the rollup
+    elapsed: float = 0.0
+    errors: List[DesignResult] = field(default_factory=list)
+
+
+def load_designs(path: str) -> Iterator[Any]:
+    """Design rows from a JSONL file; each needs a `description`, `name` and `quantity` are optional.
+
+    A line that is not valid JSON comes back as its `ValueError`, so that
+    one design fails instead of the whole batch.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield ValueError(f"invalid JSON: {e}")
+
+
+def _work_items(rows: Iterable[Any]) -> Iterator[Tuple[int, str, str, Any]]:
+    # (line number, name, output dirname, row); dirnames are filesystem-safe and repeats get a -2, -3, ... suffix
+    seen: Dict[str, int] = {}
+    for idx, row in enumerate(rows, start=1):
+        name = str((row.get("name") if isinstance(row, dict) else None) or f"design-{idx:04d}")
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "design"
+        n = seen[stem] = seen.get(stem, 0) + 1
+        yield idx, name, stem if n == 1 else f"{stem}-{n}", row
+
+
+# Per-process state, set up once by the pool initializer
+_catalog = None
+_outroot: Optional[str] = None
+_backend = "native"
+
+
+def _init_worker(catalog_db: Optional[str], outroot: str, backend: str) -> None:
+    global _catalog, _outroot, _backend
+    from pcbai.steps.keyword_matcher import default_matcher
+
+    default_matcher()  # build the vocabulary before the first design arrives
+    _catalog = None
+    if catalog_db:
+        from pcbai.steps.catalog import Catalog
+        _catalog = Catalog(catalog_db, readonly=True)
+    _outroot, _backend = outroot, backend
+
+
+def _synthesize_design(item: Tuple[int, str, str, Any]) -> DesignResult:
+    from pcbai.steps.bom_generator import generate_bom
+    from pcbai.steps.requirements_parser import parse_requirements
+    from pcbai.steps.skidl_schematic import bom_to_schematic
+
+    idx, name, dirname, row = item
+    start = time.perf_counter()
+    res = DesignResult(row=idx, name=name)
+    try:
+        if isinstance(row, Exception):
+            raise row
+        if not isinstance(row, dict):
+            raise ValueError(f"expected a JSON object, got {type(row).__name__}")
+        description = row.get("description")
+        if not description:
+            raise ValueError("missing 'description'")
+        res.units = int(row.get("quantity", 1))
+        bom = generate_bom(parse_requirements(description), catalog=_catalog)
+        outdir = os.path.join(_outroot, dirname)
+        os.makedirs(outdir, exist_ok=True)
+        with open(os.path.join(outdir, "netlist.txt"), "w", encoding="utf-8") as f:
+            f.write(bom_to_schematic(bom, backend=row.get("netlist_backend", _backend)))
+        counts: Dict[str, List[Any]] = {}
+        for part in bom:
+            entry = counts.setdefault(part["mpn"], [part.get("manufacturer") or "", part.get("package") or "", 0,
+                                                    part.get("price")])
+            entry[2] += 1
+        with open(os.path.join(outdir, "bom.csv"), "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["mpn", "manufacturer", "package", "quantity"])
+            for mpn, (mfr, package, count, _) in counts.items():
+                w.writerow([mpn, mfr, package, count])
+        res.outdir = outdir
+        res.parts = [(mpn, mfr, package, count, price) for mpn, (mfr, package, count, price) in counts.items()]
+    except Exception as e:
+        res.error = f"{type(e).__name__}: {e}"
+    res.seconds = time.perf_counter() - start
+    return res
+
+
+def synthesize_designs(rows: Iterable[Any], outroot: str, catalog_db: Optional[str] = None,
+                       workers: Optional[int] = None, chunksize: int = 8,
+                       netlist_backend: str = "native") -> Iterator[DesignResult]:
+    """Synthesize every design row, yielding results in completion order.
+
+    `workers=None` uses every core; `workers=1` runs in-process.
+    """
+    global _catalog
+    os.makedirs(outroot, exist_ok=True)
+    items = _work_items(rows)
+    if workers == 1:
+        _init_worker(catalog_db, outroot, netlist_backend)
+        try:
+            for item in items:
+                yield _synthesize_design(item)
+        finally:
+            if _catalog is not None:
+                _catalog.close()
+                _catalog = None
+        return
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                              initargs=(catalog_db, outroot, netlist_backend)) as pool:
+        yield from pool.imap_unordered(_synthesize_design, items, chunksize=chunksize)
+
+
+@traced(items=lambda s: s.total)
+def run_synthesis_batch(designs: str, outroot: str, catalog_db: Optional[str] = None, workers: Optional[int] = None,
+                        chunksize: int = 8, netlist_backend: str = "native",
+                        on_result: Optional[Callable[[DesignResult], None]] = None) -> SynthesisSummary:
+    """Synthesize every design in the `designs` JSONL and write the BOM line list and rollup under `outroot`."""
+    summary = SynthesisSummary()
+    start = time.perf_counter()
+    os.makedirs(outroot, exist_ok=True)
+    rollup: Dict[str, List[Any]] = {}  # mpn -> [manufacturer, package, quantity, designs, unit price]
+    with open(os.path.join(outroot, "bom_lines.csv"), "w", encoding="utf-8", newline="") as f:
+        lines = csv.writer(f)
+        lines.writerow(LINE_COLUMNS)
+        for res in synthesize_designs(load_designs(designs), outroot, catalog_db=catalog_db, workers=workers,
+                                      chunksize=chunksize, netlist_backend=netlist_backend):
+            summary.total += 1
+            if res.ok:
+                summary.ok += 1
+                for mpn, mfr, package, count, price in res.parts:
+                    lines.writerow([res.name, mpn, mfr, package, count, res.units, count * res.units])
+                    entry = rollup.get(mpn)
+                    if entry is None:
+                        entry = rollup[mpn] = [mfr, package, 0, 0, price]
+                    entry[2] += count * res.units
+                    entry[3] += 1
+            else:
+                summary.failed += 1
+                summary.errors.append(res)
+            if on_result is not None:
+                on_result(res)
+    tmp = os.path.join(outroot, "bom_rollup.csv.tmp")
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(ROLLUP_COLUMNS)
+        for mpn, (mfr, package, qty, ndesigns, price) in sorted(rollup.items(), key=lambda kv: (-kv[1][2], kv[0])):
+            extended = round(price * qty, 4) if price is not None else ""
+            w.writerow([mpn, mfr, package, qty, ndesigns, "" if price is None else price, extended])
+    os.replace(tmp, os.path.join(outroot, "bom_rollup.csv"))
+    summary.parts = len(rollup)
+    summary.elapsed = time.perf_counter() - start
+    return summary
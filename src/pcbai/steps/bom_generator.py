@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from pcbai.core.profiler import traced
+from pcbai.steps.catalog import Catalog, PartQuery
 
 
 # Placeholder catalog for demo purposes
@@ -18,10 +21,54 @@ CATALOG = {
 }
 
 
-def generate_bom(requirements: Dict) -> List[Dict]:
+def _add_limit(limits: Dict[str, float], c: Dict) -> None:
+    if c["quantity"] == "voltage":
+        limits["min_voltage"] = max(limits.get("min_voltage", 0.0), c["hi"])
+    elif c["quantity"] == "current":
+        limits["current"] = max(limits.get("current", 0.0), c["hi"])
+
+
+def _constraint_limits(requirements: Dict) -> Dict[str, Dict[str, float]]:
+    """Catalog query limits per keyword (highest voltage and current asked for).
+
+    Each constraint belongs to the matched term nearest to it in the text,
+    the earlier one on a tie ("buck 24V 3A and mcu 3.3V" gives the buck
+    24 V / 3 A and the MCU 3.3 V). Without term positions every keyword
+    gets every constraint.
+    """
+    keywords = requirements.get("keywords", [])
+    terms = requirements.get("terms") or []
+    limits: Dict[str, Dict[str, float]] = {}
+    for c in requirements.get("constraints", []):
+        if not terms or "start" not in c:
+            for kw in keywords:
+                _add_limit(limits.setdefault(kw, {}), c)
+            continue
+        nearest = min(terms, key=lambda t: (max(c["start"] - t["end"], t["start"] - c["end"], 0),
+                                            t["start"] > c["start"]))
+        _add_limit(limits.setdefault(nearest["category"], {}), c)
+    return limits
+
+
+@traced(items=len)
+def generate_bom(requirements: Dict, catalog: Optional[Catalog] = None) -> List[Dict]:
+    """Pick one part per requirement keyword.
+
+    With a `catalog`, each keyword is a ranked parametric query and the best
+    match is taken; voltage/current constraints next to a keyword narrow
+    its query when some part satisfies them. Otherwise the built-in demo
+    CATALOG is used.
+    """
     keywords = requirements.get("keywords", [])
+    limits_by_kw = _constraint_limits(requirements)
     bom: List[Dict] = []
     for kw in keywords:
-        parts = CATALOG.get(kw, [])
+        if catalog is not None:
+            limits = limits_by_kw.get(kw)
+            parts = catalog.query(PartQuery(category=kw, limit=1, **limits)) if limits else []
+            if not parts:
+                parts = catalog.query(PartQuery(category=kw, limit=1))
+        else:
+            parts = CATALOG.get(kw, [])
         bom.extend(parts[:1])  # pick first as placeholder
     return bom
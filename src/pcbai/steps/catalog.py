@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import csv
+import re
+import sqlite3
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pcbai.core.profiler import traced
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parts (
+    id INTEGER PRIMARY KEY,
+    mpn TEXT NOT NULL UNIQUE,
+    manufacturer TEXT,
+    category TEXT NOT NULL,
+    package TEXT,
+    package_key TEXT,          -- normalized package name, e.g. SOIC8
+    voltage TEXT,              -- spec string as imported, e.g. "4.5-28V"
+    v_min REAL,
+    v_max REAL,
+    current TEXT,
+    i_max REAL,                -- amps
+    price REAL,
+    stock INTEGER,
+    description TEXT
+)
+"""
+
+INDEXES = {
+    "idx_parts_cat_pkg": "category, package_key, v_max",
+    "idx_parts_cat_vmax": "category, v_max",
+    "idx_parts_cat_imax": "category, i_max",
+    "idx_parts_pkg": "package_key",
+}
+
+_COLUMNS = ("mpn", "manufacturer", "category", "package", "package_key", "voltage", "v_min", "v_max",
+            "current", "i_max", "price", "stock", "description")
+
+_NUM = r"[-+]?\d+(?:\.\d+)?"
+_RANGE_RE = re.compile(rf"({_NUM})\s*(m|k)?(?:V|A)?\s*(?:-|–|to|\.\.)\s*({_NUM})\s*(m|k)?\s*(?:V|A)\b", re.IGNORECASE)
+_SINGLE_RE = re.compile(rf"({_NUM})\s*(m|k)?\s*(?:V|A)\b", re.IGNORECASE)
+_SCALE = {None: 1.0, "": 1.0, "m": 1e-3, "k": 1e3}
+
+
+def normalize_package(package: Optional[str]) -> Optional[str]:
+    """Match-friendly package key: "SOIC-8", "soic 8" and "SOIC8" all become "SOIC8"."""
+    if not package:
+        return None
+    return re.sub(r"[^0-9A-Z]", "", package.upper()) or None
+
+
+def parse_range(spec: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """Parse a voltage/current spec into (min, max) base units.
+
+    "4.5-28V" -> (4.5, 28.0); "3.3V" -> (3.3, 3.3); "500mA" -> (0.5, 0.5);
+    anything unparseable -> (None, None).
+    """
+    if not spec:
+        return None, None
+    m = _RANGE_RE.search(spec)
+    if m:
+        hi_scale = _SCALE[(m.group(4) or "").lower()]
+        lo = float(m.group(1)) * (_SCALE[m.group(2).lower()] if m.group(2) else hi_scale)
+        hi = float(m.group(3)) * hi_scale
+        return min(lo, hi), max(lo, hi)
+    m = _SINGLE_RE.search(spec)
+    if m:
+        v = float(m.group(1)) * _SCALE[(m.group(2) or "").lower()]
+        return v, v
+    return None, None
+
+
+@dataclass
+class PartQuery:
+    """Parametric catalog query. Unset constraints are not applied."""
+    category: str
+    package: Optional[str] = None
+    voltage: Optional[float] = None      # operating point that must lie within the part's range
+    min_voltage: Optional[float] = None  # part's max rating must reach this ("Vin >= 12 V")
+    current: Optional[float] = None      # part's max current must reach this (A)
+    limit: int = 10
+
+
+def _float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _row_values(row: Dict[str, Any]) -> Tuple[Any, ...]:
+    v_min, v_max = _float(row.get("v_min")), _float(row.get("v_max"))
+    if v_min is None and v_max is None:
+        v_min, v_max = parse_range(row.get("voltage"))
+    i_max = _float(row.get("i_max"))
+    if i_max is None:
+        i_max = parse_range(row.get("current"))[1]
+    stock = row.get("stock")
+    return (
+        row["mpn"], row.get("manufacturer") or None, str(row["category"]).strip().lower(),
+        row.get("package") or None, normalize_package(row.get("package")),
+        row.get("voltage") or None, v_min, v_max, row.get("current") or None, i_max,
+        _float(row.get("price")), int(stock) if stock not in (None, "") else None,
+        row.get("description") or None,
+    )
+
+
+class Catalog:
+    """Parametric component catalog in a local SQLite database.
+
+    Parts are indexed by category, normalized package and parsed numeric
+    voltage/current limits, so queries touch only matching index ranges and
+    never load the catalog into memory.
+    """
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(SCHEMA)
+            self._create_indexes()
+            self.conn.commit()
+        self.conn.row_factory = sqlite3.Row
+
+    def _create_indexes(self) -> None:
+        for name, cols in INDEXES.items():
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON parts({cols})")
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM parts").fetchone()[0]
+
+    @traced(items=lambda n: n)
+    def import_rows(self, rows: Iterable[Dict[str, Any]], batch: int = 10000) -> int:
+        """Insert or replace parts (by MPN). Returns the number of rows imported.
+
+        Loading into an empty catalog builds the indexes once at the end,
+        which is much faster than maintaining them row by row.
+        """
+        conn = self.conn
+        empty = conn.execute("SELECT 1 FROM parts LIMIT 1").fetchone() is None
+        sql = f"INSERT OR REPLACE INTO parts ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+        count = 0
+        conn.execute("PRAGMA synchronous=OFF")
+        try:
+            with conn:
+                # DDL does not open a transaction on its own; without this the drops would
+                # commit at once and a failed import would leave the catalog unindexed
+                conn.execute("BEGIN")
+                if empty:
+                    for name in INDEXES:
+                        conn.execute(f"DROP INDEX IF EXISTS {name}")
+                it = iter(rows)
+                while True:
+                    chunk = [_row_values(r) for r in islice(it, batch)]
+                    if not chunk:
+                        break
+                    conn.executemany(sql, chunk)
+                    count += len(chunk)
+                if empty:
+                    self._create_indexes()
+            conn.execute("ANALYZE")
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return count
+
+    def import_csv(self, path: str, batch: int = 10000) -> int:
+        """Bulk-import a CSV with a header row (mpn, category, package, voltage, current, ...)."""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return self.import_rows(csv.DictReader(f), batch=batch)
+
+    @traced(items=len)
+    def query(self, q: PartQuery) -> List[Dict[str, Any]]:
+        """Matching parts, best first.
+
+        Ranking prefers the least over-specified part (smallest relative
+        voltage/current headroom over the requested values), then stock, then price.
+        """
+        where = ["category = ?"]
+        args: List[Any] = [q.category.strip().lower()]
+        rank: List[str] = []
+        rank_args: List[Any] = []
+        if q.package:
+            where.append("package_key = ?")
+            args.append(normalize_package(q.package))
+        if q.voltage is not None:
+            where.append("v_min <= ? AND v_max >= ?")
+            args += [q.voltage, q.voltage]
+        if q.min_voltage is not None:
+            where.append("v_max >= ?")
+            args.append(q.min_voltage)
+        need_v = max((v for v in (q.voltage, q.min_voltage) if v is not None), default=0.0)
+        if need_v > 0:
+            rank.append("(v_max - ?) / ?")
+            rank_args += [need_v, need_v]
+        if q.current is not None:
+            where.append("i_max >= ?")
+            args.append(q.current)
+            if q.current > 0:
+                rank.append("(i_max - ?) / ?")
+                rank_args += [q.current, q.current]
+        order = (" + ".join(rank) + ", " if rank else "") + "stock IS NULL, stock DESC, price IS NULL, price, mpn"
+        sql = f"SELECT * FROM parts WHERE {' AND '.join(where)} ORDER BY {order} LIMIT ?"
+        cur = self.conn.execute(sql, args + rank_args + [q.limit])
+        return [dict(r) for r in cur]
+
+    def search(self, category: str, **constraints: Any) -> List[Dict[str, Any]]:
+        return self.query(PartQuery(category=category, **constraints))
+
+    def iter_parts(self) -> Iterator[Dict[str, Any]]:
+        for r in self.conn.execute("SELECT * FROM parts ORDER BY id"):
+            yield dict(r)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from pcbai.core.profiler import traced
+from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf
+
+
+@dataclass
+class CorpusSummary:
+    found: int = 0
+    skipped: int = 0   # already present in the output file
+    ok: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        done = self.ok + self.errors + self.timeouts
+        return done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def find_pdfs(root: str) -> Iterator[str]:
+    """Yield PDF paths under `root`, relative to it, in a stable order."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".pdf"):
+                yield os.path.relpath(os.path.join(dirpath, name), root)
+
+
+def _open_for_append(path: str):
+    """Open a JSONL file for appending, first dropping a torn last line left by a crash."""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    f = open(path, "a+b")
+    size = pos = f.seek(0, os.SEEK_END)
+    while pos > 0:
+        step = min(65536, pos)
+        f.seek(pos - step)
+        chunk = f.read(step)
+        if pos == size and chunk.endswith(b"\n"):
+            break
+        cut = chunk.rfind(b"\n")
+        if cut >= 0:
+            f.truncate(pos - step + cut + 1)
+            break
+        pos -= step
+    else:
+        f.truncate(0)
+    return f
+
+
+def load_done(path: str) -> Set[str]:
+    """Paths already recorded in a corpus JSONL (unparseable lines are ignored)."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+def _worker_main(conn, extract: Callable[..., Any], kwargs: Dict[str, Any]) -> None:
+    while True:
+        try:
+            path = conn.recv()
+        except EOFError:
+            return
+        if path is None:
+            return
+        try:
+            conn.send(("ok", asdict(extract(path, **kwargs)), None))
+        except Exception as e:
+            conn.send(("error", None, f"{type(e).__name__}: {e}"))
+
+
+class _Slot:
+    """One worker process plus the file it is currently working on."""
+
+    def __init__(self, ctx, extract: Callable[..., Any], kwargs: Dict[str, Any]):
+        self.conn, child = ctx.Pipe()
+        self.proc = ctx.Process(target=_worker_main, args=(child, extract, kwargs), daemon=True)
+        self.proc.start()
+        child.close()
+        self.task: Optional[str] = None
+        self.started = 0.0
+
+    def kill(self) -> None:
+        self.proc.kill()
+        self.proc.join()
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.proc.join(timeout=5)
+        if self.proc.is_alive():
+            self.proc.kill()
+            self.proc.join()
+        self.conn.close()
+
+
+@traced(items=lambda s: s.ok + s.errors + s.timeouts)
+def run_corpus(root: str, out_jsonl: str, workers: Optional[int] = None, timeout: float = 60.0,
+               cache_dir: Optional[str] = None, early_exit: bool = True, from_end: bool = False,
+               on_record: Optional[Callable[[Dict[str, Any]], None]] = None,
+               extract: Callable[..., Any] = extract_package_params_from_pdf) -> CorpusSummary:
+    """Extract package guesses for every PDF under `root` into `out_jsonl`.
+
+    Files run in a pool of worker processes; a file that takes longer than
+    `timeout` seconds has its worker killed and replaced, and is recorded with
+    status "timeout". Each record is appended and flushed as soon as it
+    finishes, and files already present in `out_jsonl` are skipped, so an
+    interrupted run resumes where it stopped.
+    """
+    summary = CorpusSummary()
+    start = time.perf_counter()
+    done = load_done(out_jsonl)
+    todo: List[str] = []
+    for rel in find_pdfs(root):
+        summary.found += 1
+        if rel in done:
+            summary.skipped += 1
+        else:
+            todo.append(rel)
+    tasks = iter(todo)
+    kwargs = {"cache_dir": cache_dir, "early_exit": early_exit, "from_end": from_end}
+    ctx = multiprocessing.get_context()
+    n = max(1, min(workers or os.cpu_count() or 1, len(todo)))
+    slots = [_Slot(ctx, extract, kwargs) for _ in range(n)] if todo else []
+
+    with _open_for_append(out_jsonl) as out:
+        def emit(rel: str, status: str, guess: Optional[Dict[str, Any]], error: Optional[str], seconds: float) -> None:
+            rec = {"path": rel, "status": status, "guess": guess, "error": error, "seconds": round(seconds, 3)}
+            out.write((json.dumps(rec) + "\n").encode("utf-8"))
+            out.flush()
+            if status == "ok":
+                summary.ok += 1
+            elif status == "timeout":
+                summary.timeouts += 1
+            else:
+                summary.errors += 1
+            if on_record is not None:
+                on_record(rec)
+
+        def assign(slot: _Slot) -> None:
+            slot.task = next(tasks, None)
+            if slot.task is not None:
+                slot.started = time.monotonic()
+                slot.conn.send(os.path.join(root, slot.task))
+
+        for slot in slots:
+            assign(slot)
+        while any(s.task is not None for s in slots):
+            busy = [s for s in slots if s.task is not None]
+            now = time.monotonic()
+            deadline = min(s.started + timeout for s in busy)
+            ready = wait([s.conn for s in busy], timeout=max(0.0, deadline - now))
+            now = time.monotonic()
+            for i, slot in enumerate(slots):
+                if slot.task is None:
+                    continue
+                if slot.conn in ready:
+                    try:
+                        status, guess, error = slot.conn.recv()
+                    except (EOFError, OSError):
+                        # Worker died (segfault, OOM kill): record it and start a fresh one
+                        emit(slot.task, "error", None, "worker exited unexpectedly", now - slot.started)
+                        slot.kill()
+                        slot = slots[i] = _Slot(ctx, extract, kwargs)
+                    else:
+                        emit(slot.task, status, guess, error, now - slot.started)
+                    assign(slot)
+                elif now - slot.started >= timeout:
+                    emit(slot.task, "timeout", None, f"exceeded {timeout:g}s", now - slot.started)
+                    slot.kill()
+                    slot = slots[i] = _Slot(ctx, extract, kwargs)
+                    assign(slot)
+        for slot in slots:
+            slot.stop()
+
+    summary.elapsed = time.perf_counter() - start
+    return summary
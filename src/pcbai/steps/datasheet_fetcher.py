@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import json
 import os
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Sequence
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from pcbai.core.profiler import span, traced
 
 
 DATASHEET_SOURCES = [
@@ -11,22 +19,194 @@ DATASHEET_SOURCES = [
     "https://www.analog.com/media/en/technical-documentation/data-sheets/{}",
 ]
 
+CHUNK_SIZE = 64 * 1024
+
+
+class _Race:
+    """Shared state for the hedged source requests of one MPN."""
+
+    def __init__(self, mpn: str):
+        self.mpn = mpn
+        self.done = threading.Event()     # a source won (or a cached copy was confirmed)
+        self.settled = threading.Event()  # done, or every attempt has finished
+        self.lock = threading.Lock()
+        self.path: Optional[str] = None
+        self.pending = 0
+
+    def expect(self, attempts: int) -> None:
+        # Count all attempts up front so an early finisher can't settle the race
+        with self.lock:
+            self.pending += attempts
+            if self.pending == 0:
+                self.settled.set()
+            else:
+                self.settled.clear()
+
+    def finished(self, _future: Future) -> None:
+        with self.lock:
+            self.pending -= 1
+            if self.pending == 0:
+                self.settled.set()
+
+    def win(self, path: str) -> None:
+        # Caller holds self.lock
+        self.path = path
+        self.done.set()
+        self.settled.set()
+
+
+class DatasheetFetcher:
+    """Concurrent datasheet downloader over a shared, pooled `requests.Session`.
+
+    For each MPN every source pattern is tried at once and the first PDF to
+    finish streaming wins; the other attempts stop at their next chunk. At most
+    `per_host` requests run against any one host. A sidecar `<mpn>.pdf.json`
+    keeps the winning URL with its ETag/Last-Modified, so a later run sends a
+    conditional request and skips the download on `304 Not Modified`.
+    """
+
+    def __init__(self, outdir: str, sources: Sequence[str] = DATASHEET_SOURCES, max_workers: int = 8,
+                 per_host: int = 4, timeout: float = 5.0, chunk_size: int = CHUNK_SIZE,
+                 session: Optional[requests.Session] = None):
+        self.outdir = outdir
+        self.sources = list(sources)
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        os.makedirs(outdir, exist_ok=True)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=max(len(self.sources), 1), pool_maxsize=max_workers)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._hosts_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="datasheet")
 
-def fetch_datasheet(mpns: List[str], outdir: str) -> List[str]:
-    os.makedirs(outdir, exist_ok=True)
-    paths: List[str] = []
-    for mpn in mpns:
-        # This is a stub: try a few URL patterns naively.
-        for pattern in DATASHEET_SOURCES:
-            url = pattern.format(mpn)
+    def __enter__(self) -> "DatasheetFetcher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Losing attempts abort at their next chunk; wait for them before closing the session
+        self._pool.shutdown(wait=True)
+        self.session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc
+        with self._hosts_lock:
+            sem = self._hosts.get(host)
+            if sem is None:
+                sem = self._hosts[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def _paths(self, mpn: str):
+        path = os.path.join(self.outdir, f"{mpn}.pdf")
+        return path, path + ".json"
+
+    def _load_meta(self, mpn: str) -> Optional[Dict[str, str]]:
+        path, meta = self._paths(mpn)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(meta, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _attempt(self, race: _Race, url: str, validators: Optional[Dict[str, str]] = None) -> None:
+        if race.done.is_set():
+            return
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        path, meta = self._paths(race.mpn)
+        tmp = f"{path}.{threading.get_ident()}.part"
+        with self._host_slot(url):
+            if race.done.is_set():
+                return
             try:
-                r = requests.get(url, timeout=5)
-                if r.ok and r.headers.get("content-type", "").startswith("application/pdf"):
-                    path = os.path.join(outdir, f"{mpn}.pdf")
-                    with open(path, "wb") as f:
-                        f.write(r.content)
-                    paths.append(path)
-                    break
-            except Exception:
-                continue
-    return paths
+                with span("datasheet.request", cat="datasheet_fetcher", url=url), \
+                        self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as r:
+                    if r.status_code == 304 and validators:
+                        with race.lock:
+                            if not race.done.is_set():
+                                race.win(path)
+                        return
+                    if not r.ok:
+                        return
+                    # Content-Type is not trusted: error pages and empty bodies get served as
+                    # application/pdf too, so the body itself must start with the PDF magic
+                    is_pdf = False
+                    with open(tmp, "wb") as f:
+                        for i, chunk in enumerate(r.iter_content(self.chunk_size)):
+                            if race.done.is_set():
+                                break
+                            if i == 0:
+                                if not chunk.startswith(b"%PDF"):
+                                    break
+                                is_pdf = True
+                            f.write(chunk)
+                        else:
+                            if is_pdf:
+                                with race.lock:
+                                    if not race.done.is_set():
+                                        os.replace(tmp, path)
+                                        with open(meta, "w", encoding="utf-8") as m:
+                                            json.dump({"url": url, "etag": r.headers.get("ETag"),
+                                                       "last_modified": r.headers.get("Last-Modified")}, m)
+                                        race.win(path)
+            except (requests.RequestException, OSError):
+                pass
+            finally:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+
+    def _submit(self, race: _Race, url: str, validators: Optional[Dict[str, str]] = None) -> None:
+        self._pool.submit(self._attempt, race, url, validators).add_done_callback(race.finished)
+
+    def _race_sources(self, race: _Race) -> None:
+        race.expect(len(self.sources))
+        for pattern in self.sources:
+            self._submit(race, pattern.format(race.mpn))
+
+    def _revalidated(self, race: _Race, future: Future) -> None:
+        # A changed or unreachable cached URL falls back to the sources. They are counted
+        # before the revalidation is, so the race can't settle in between
+        if not race.done.is_set():
+            self._race_sources(race)
+        race.finished(future)
+
+    @traced(items=len)
+    def fetch_many(self, mpns: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Fetch datasheets for `mpns`; returns mpn -> local PDF path (None if not found).
+
+        Known datasheets are revalidated while the sources are raced for new
+        MPNs. Returns as soon as every MPN has a winner or has run out of
+        sources; slower losing attempts are left to wind down in the background.
+        """
+        races = {mpn: _Race(mpn) for mpn in dict.fromkeys(mpns)}
+        for mpn, race in races.items():
+            meta = self._load_meta(mpn)
+            if meta and meta.get("url"):
+                race.expect(1)
+                self._pool.submit(self._attempt, race, meta["url"], meta).add_done_callback(
+                    lambda future, race=race: self._revalidated(race, future))
+            else:
+                self._race_sources(race)
+        for race in races.values():
+            race.settled.wait()
+        return {mpn: race.path for mpn, race in races.items()}
+
+def fetch_datasheet(mpns: List[str], outdir: str, max_workers: int = 8, per_host: int = 4, timeout: float = 5.0) -> List[str]:
+    """Download datasheet PDFs for `mpns` into `outdir`, returning paths in MPN order."""
+    with DatasheetFetcher(outdir, max_workers=max_workers, per_host=per_host, timeout=timeout) as fetcher:
+        found = fetcher.fetch_many(mpns)
+    return [found[mpn] for mpn in dict.fromkeys(mpns) if found[mpn]]
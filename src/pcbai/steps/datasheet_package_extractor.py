@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+import io
 import json
+import os
 import re
+import string
 from dataclasses import dataclass, asdict
-from typing import Dict, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
+
+from pcbai.core.logger import get_logger
+from pcbai.core.profiler import span, traced
 
 try:
     from pdfminer.high_level import extract_text
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
 except Exception:  # pragma: no cover
     extract_text = None  # type: ignore
 
@@ -38,75 +49,279 @@ def _to_mm(val: float, unit: str) -> float:
     return val
 
 
-def _find_first_float(pattern: str, text: str) -> Optional[float]:
-    m = re.search(pattern, text, flags=re.IGNORECASE)
-    if not m:
-        return None
-    gd = m.groupdict()
-    if "val" in gd and "unit" in gd:
-        return _to_mm(float(gd["val"]), gd["unit"])  # type: ignore
-    if m.group(1):
-        try:
-            return float(m.group(1))
-        except Exception:
-            return None
-    return None
+@dataclass
+class Candidate:
+    """One pattern hit: the field it fills, its value and where it was found."""
+    field: str    # pkg_type | pins | pitch | body_l | body_w | pad_l | pad_w | ep_l | ep_w
+    value: Any    # "qfn"/"qfp", int pin count or float mm
+    start: int
+    end: int
+    rank: int     # pattern preference within the field, 0 = best
 
 
-def _find_first_int(pattern: str, text: str) -> Optional[int]:
-    m = re.search(pattern, text, flags=re.IGNORECASE)
-    if not m:
-        return None
-    try:
-        return int(m.group(1))
-    except Exception:
-        return None
+# (field, rank, kind, trigger keywords, pattern). Patterns run against
+# lower-cased text, anchored at a trigger keyword; a space matches any
+# whitespace run, so the text needs no normalization pass. kind is the family
+# name for package-type patterns, "count" for pin counts (the number precedes
+# the keyword) or "dim" for a UNIT_RE measurement converted to mm.
+_PATTERNS = [
+    ("pkg_type", 0, "qfn", ("qfn", "vfqfn", "mlf"), r"\b(?:qfn|vfqfn|mlf)\b"),
+    ("pkg_type", 1, "qfp", ("qfp", "tqfp", "lqfp"), r"\b(?:qfp|tqfp|lqfp)\b"),
+    ("pins", 0, "count", ("pin",), r"pins?\b"),
+    # "lead pitch" needs no pattern of its own: every lead-pitch hit is a pitch hit
+    ("pitch", 0, "dim", ("pitch",), r"pitch\s*[:=]?\s*{unit}"),
+    ("body_l", 0, "dim", ("body",), r"body (?:length|l)\s*[:=]?\s*{unit}"),
+    ("body_l", 1, "dim", ("package",), r"package length\s*[:=]?\s*{unit}"),
+    ("body_w", 0, "dim", ("body",), r"body (?:width|w)\s*[:=]?\s*{unit}"),
+    ("body_w", 1, "dim", ("package",), r"package width\s*[:=]?\s*{unit}"),
+    ("pad_l", 0, "dim", ("terminal",), r"terminal length\s*[:=]?\s*{unit}"),
+    ("pad_l", 1, "dim", ("lead",), r"lead length\s*[:=]?\s*{unit}"),
+    ("pad_w", 0, "dim", ("terminal",), r"terminal width\s*[:=]?\s*{unit}"),
+    ("pad_w", 1, "dim", ("lead",), r"lead width\s*[:=]?\s*{unit}"),
+    ("ep_l", 0, "dim", ("exposed",), r"exposed pad (?:length|l)\s*[:=]?\s*{unit}"),
+    ("ep_w", 0, "dim", ("exposed",), r"exposed pad (?:width|w)\s*[:=]?\s*{unit}"),
+]
 
+_BANK = [
+    (field, rank, kind, re.compile(pattern.replace(" ", r"\s+").replace("{unit}", UNIT_RE)))
+    for field, rank, kind, _, pattern in _PATTERNS
+]
+_TRIGGERS: Dict[str, List[int]] = {}
+for _i, _p in enumerate(_PATTERNS):
+    for _kw in _p[3]:
+        _TRIGGERS.setdefault(_kw, []).append(_i)
+# One scan over the text finds every keyword; the field patterns only run at those offsets
+_TRIGGER_RE = re.compile("|".join(sorted(_TRIGGERS, key=len, reverse=True)))
+_COUNT_RE = re.compile(r"\b(\d{1,3})\s*$")
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
-def extract_package_params_from_pdf(pdf_path: str) -> PackageGuess:
-    """Heuristic extractor: searches textual datasheets for package tables/notes.
 
-    Returns a best-effort guess for QFN/QFP packages. Use human-in-the-loop to confirm.
+def scan_text(text: str) -> List[Candidate]:
+    """Find every candidate for every field in a single pass over `text`.
+
+    Candidates come back in text order with offsets into `text`.
     """
-    if extract_text is None:
-        return PackageGuess(pkg_type="unknown")
+    low = text.lower()
+    if len(low) != len(text):
+        # Some non-ASCII characters change length when lower-cased; keep offsets valid
+        low = text.translate(_ASCII_LOWER)
+    out: List[Candidate] = []
+    for t in _TRIGGER_RE.finditer(low):
+        pos = t.start()
+        for i in _TRIGGERS[t.group()]:
+            field, rank, kind, rx = _BANK[i]
+            m = rx.match(low, pos)
+            if m is None:
+                continue
+            if kind == "count":
+                n = _COUNT_RE.search(low, max(0, pos - 64), pos)
+                if n is not None:
+                    out.append(Candidate(field, int(n.group(1)), n.start(), m.end(), rank))
+            elif kind == "dim":
+                out.append(Candidate(field, _to_mm(float(m.group("val")), m.group("unit")), pos, m.end(), rank))
+            else:
+                out.append(Candidate(field, kind, pos, m.end(), rank))
+    return out
+
 
-    text = extract_text(pdf_path)
+def guess_from_candidates(candidates: List[Candidate]) -> PackageGuess:
+    """Pick, per field, the earliest hit of the best-ranked pattern."""
+    best: Dict[str, Candidate] = {}
+    for c in candidates:
+        cur = best.get(c.field)
+        if cur is None or (c.rank, c.start) < (cur.rank, cur.start):
+            best[c.field] = c
+    guess = PackageGuess(pkg_type=best["pkg_type"].value if "pkg_type" in best else "unknown")
+    for field, c in best.items():
+        if field != "pkg_type":
+            setattr(guess, field, c.value)
+    return guess
+
+
+def guess_from_text(text: str) -> PackageGuess:
+    """Run the package heuristics over already-extracted datasheet text."""
     if not text:
         return PackageGuess(pkg_type="unknown")
+    return guess_from_candidates(scan_text(text))
 
-    # Normalize
-    t = re.sub(r"\s+", " ", text)
 
-    # Determine package family
-    if re.search(r"\bQFN\b|\bVFQFN\b|\bMLF\b", t, re.IGNORECASE):
-        pkg = "qfn"
-    elif re.search(r"\bQFP\b|\bTQFP\b|\bLQFP\b", t, re.IGNORECASE):
-        pkg = "qfp"
-    else:
-        pkg = "unknown"
+# Below this many text characters per page on average, a PDF is treated as scanned
+_SCANNED_CHARS_PER_PAGE = 32
 
-    # Pins
-    pins = _find_first_int(r"\b(\d{10,3}|\d{2})\s*(?:pins|pin)\b", t)
+_DIMENSION_FIELDS = ("pins", "pitch", "body_l", "body_w", "pad_l", "pad_w")
 
-    # Pitch
-    pitch = _find_first_float(r"pitch\s*[:=]?\s*" + UNIT_RE, t)
-    if pitch is None:
-        pitch = _find_first_float(r"lead pitch\s*[:=]?\s*" + UNIT_RE, t)
 
-    # Body size
-    body_l = _find_first_float(r"body (?:length|L)\s*[:=]?\s*" + UNIT_RE, t) or _find_first_float(r"package length\s*[:=]?\s*" + UNIT_RE, t)
-    body_w = _find_first_float(r"body (?:width|W)\s*[:=]?\s*" + UNIT_RE, t) or _find_first_float(r"package width\s*[:=]?\s*" + UNIT_RE, t)
+def is_complete(guess: PackageGuess) -> bool:
+    """True once the family and every field that applies to it are known.
 
-    # Pad (terminal) length/width
-    pad_l = _find_first_float(r"terminal length\s*[:=]?\s*" + UNIT_RE, t) or _find_first_float(r"lead length\s*[:=]?\s*" + UNIT_RE, t)
-    pad_w = _find_first_float(r"terminal width\s*[:=]?\s*" + UNIT_RE, t) or _find_first_float(r"lead width\s*[:=]?\s*" + UNIT_RE, t)
+    Exposed-pad size only applies to QFN, so QFP/SOIC guesses never wait for it.
+    """
+    if guess.pkg_type == "unknown":
+        return False
+    names = _DIMENSION_FIELDS + (("ep_l", "ep_w") if guess.pkg_type == "qfn" else ())
+    return all(getattr(guess, n) is not None for n in names)
+
+
+def merge_guess(into: PackageGuess, other: PackageGuess) -> PackageGuess:
+    """Fill the unknown fields of `into` from `other` (first value found wins)."""
+    if into.pkg_type == "unknown":
+        into.pkg_type = other.pkg_type
+    for name in _DIMENSION_FIELDS + ("ep_l", "ep_w"):
+        if getattr(into, name) is None:
+            setattr(into, name, getattr(other, name))
+    return into
+
+
+class PageTextCache:
+    """Persistent per-page text cache keyed by the SHA-256 of the PDF bytes.
+
+    Layout: `<cachedir>/<hh>/<hash>/pages.json` (page count) and `<n>.txt` per
+    extracted page, so a PDF that was only partly read can be completed later.
+    """
+
+    def __init__(self, cachedir: str):
+        self.cachedir = cachedir
+
+    @staticmethod
+    def pdf_hash(pdf_path: str) -> str:
+        h = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        return h.hexdigest()
+
+    def _dir(self, key: str) -> str:
+        return os.path.join(self.cachedir, key[:2], key)
+
+    def page_count(self, key: str) -> Optional[int]:
+        try:
+            with open(os.path.join(self._dir(key), "pages.json"), "r", encoding="utf-8") as f:
+                return int(json.load(f)["pages"])
+        except (OSError, ValueError, KeyError):
+            return None
 
-    # Exposed pad for QFN
-    ep_l = _find_first_float(r"exposed pad (?:length|L)\s*[:=]?\s*" + UNIT_RE, t)
-    ep_w = _find_first_float(r"exposed pad (?:width|W)\s*[:=]?\s*" + UNIT_RE, t)
+    def set_page_count(self, key: str, pages: int) -> None:
+        self._write(key, "pages.json", json.dumps({"pages": pages}))
 
-    return PackageGuess(pkg_type=pkg, pins=pins, pitch=pitch, body_l=body_l, body_w=body_w, pad_l=pad_l, pad_w=pad_w, ep_l=ep_l, ep_w=ep_w)
+    def get(self, key: str, page: int) -> Optional[str]:
+        try:
+            with open(os.path.join(self._dir(key), f"{page}.txt"), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def put(self, key: str, page: int, text: str) -> None:
+        self._write(key, f"{page}.txt", text)
+
+    def _write(self, key: str, name: str, data: str) -> None:
+        d = self._dir(key)
+        os.makedirs(d, exist_ok=True)
+        tmp = os.path.join(d, f".{name}.{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(d, name))
+
+
+class _PdfPages:
+    """Lazily opened pdfminer document that renders single pages to text."""
+
+    def __init__(self, pdf_path: str):
+        self._fp = open(pdf_path, "rb")
+        self.pages = list(PDFPage.get_pages(self._fp))  # page objects only; content is parsed on demand
+        rsrc = PDFResourceManager(caching=True)
+        self._out = io.StringIO()
+        self._interp = PDFPageInterpreter(rsrc, TextConverter(rsrc, self._out, laparams=LAParams()))
+
+    def text(self, page: int) -> str:
+        with span("pdf.page_text", cat="datasheet_package_extractor", items=1, page=page):
+            self._interp.process_page(self.pages[page])
+        text = self._out.getvalue()
+        self._out.seek(0)
+        self._out.truncate(0)
+        return text
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+def iter_page_texts(pdf_path: str, cache_dir: Optional[str] = None, from_end: bool = False) -> Iterator[Tuple[int, str]]:
+    """Yield `(page_index, text)` one page at a time, optionally last page first.
+
+    Pages found in the text cache are served without opening the PDF; the PDF is
+    only parsed on the first cache miss, and only the pages actually consumed
+    are converted.
+    """
+    cache = PageTextCache(cache_dir) if cache_dir else None
+    key = PageTextCache.pdf_hash(pdf_path) if cache else None
+    count = cache.page_count(key) if cache else None  # type: ignore[arg-type]
+    doc: Optional[_PdfPages] = None
+    try:
+        if count is None:
+            doc = _PdfPages(pdf_path)
+            count = len(doc.pages)
+            if cache:
+                cache.set_page_count(key, count)  # type: ignore[arg-type]
+        order = range(count - 1, -1, -1) if from_end else range(count)
+        for i in order:
+            text = cache.get(key, i) if cache else None  # type: ignore[arg-type]
+            if text is None:
+                if doc is None:
+                    doc = _PdfPages(pdf_path)
+                text = doc.text(i)
+                if cache:
+                    cache.put(key, i, text)  # type: ignore[arg-type]
+            yield i, text
+    finally:
+        if doc is not None:
+            doc.close()
+
+
+@traced()
+def extract_package_params_from_pdf(pdf_path: str, cache_dir: Optional[str] = None, early_exit: bool = True,
+                                    from_end: bool = False, vision: Optional[bool] = None) -> PackageGuess:
+    """Heuristic extractor: searches textual datasheets for package tables/notes.
+
+    Returns a best-effort guess for QFN/QFP packages. Use human-in-the-loop to confirm.
+
+    Pages are streamed one at a time and, with `early_exit`, reading stops as soon
+    as every applicable field is filled (each field takes the first page that has
+    it; `from_end` scans from the last page, where package drawings usually sit).
+    With `early_exit=False` the whole document is scanned as one text, as before.
+    `cache_dir` enables the persistent per-page text cache.
+
+    When nothing is found and the PDF has (almost) no text layer, the OCR path in
+    `pcbai.steps.datasheet_vision` fills in the rest if the `vision` extra is
+    installed. `vision=True` forces it whenever fields are missing, `False` never runs it.
+    """
+    if extract_text is None:
+        return PackageGuess(pkg_type="unknown")
+
+    pages = iter_page_texts(pdf_path, cache_dir=cache_dir, from_end=from_end)
+    chars = count = 0
+    if not early_exit:
+        texts = [text for _, text in sorted(pages)]
+        chars, count = sum(len(t.strip()) for t in texts), len(texts)
+        guess = guess_from_text("".join(texts))
+    else:
+        guess = PackageGuess(pkg_type="unknown")
+        for _, text in pages:
+            chars += len(text.strip())
+            count += 1
+            merge_guess(guess, guess_from_text(text))
+            if is_complete(guess):
+                pages.close()
+                break
+    if vision is False or is_complete(guess):
+        return guess
+    if vision or (guess.pkg_type == "unknown" and chars < _SCANNED_CHARS_PER_PAGE * max(count, 1)):
+        from pcbai.steps.datasheet_vision import available, extract_package_params_vision
+        if available():
+            try:
+                merge_guess(guess, extract_package_params_vision(pdf_path, cache_dir=cache_dir))
+            except Exception as e:
+                # OCR is a best-effort extra: keep what the text layer gave
+                get_logger("pcbai.vision").warning("OCR fallback failed for %s: %s: %s", pdf_path, type(e).__name__, e)
+    return guess
 
 
 def save_guess_json(guess: PackageGuess, out_json: str) -> str:
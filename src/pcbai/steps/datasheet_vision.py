@@ -0,0 +1,359 @@
+"""OCR and table extraction for scanned datasheets (the `vision` extra).
+
+Scanned datasheets have no text layer, so the text heuristics in
+`datasheet_package_extractor` find nothing. OCR is slow (seconds per
+page), so this module only reads the pages likely to hold the package
+drawing:
+
+1. Rank every page cheaply. Pages with a text layer are scored on
+   keywords ("package outline", "dimensions", ...) and on package-field
+   hits from `scan_text`. Pages without one are scored on a low-resolution
+   thumbnail of their scan: dimension drawings and dimension tables are
+   ruled, so long straight lines count. Later pages get a small bonus,
+   because the drawing is usually near the end.
+2. OCR the `top` pages on a process pool. Each worker opens the PDF once.
+   Scanned pages are read from their embedded page image, which is how
+   scanners write PDFs, so no PDF renderer is needed. Pages that do have
+   a text layer go through camelot for tables instead.
+3. Turn JEDEC dimension tables (symbol / min / nom / max rows such as
+   `D 4.90 5.00 5.10` or `e 0.50 BSC`) into phrases the text heuristics
+   understand. Then merge the guesses in rank order.
+
+Results are cached per page hash (content stream plus image data), so a
+page seen in any earlier revision of a datasheet is not OCR'd again.
+Every dependency is optional; `available()` says whether the OCR path
+can run.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pcbai.core.profiler import span, traced
+from pcbai.steps.datasheet_package_extractor import (
+    PackageGuess, extract_text, guess_from_text, iter_page_texts, merge_guess, scan_text,
+)
+
+try:
+    from pypdf import PdfReader
+except Exception:  # pragma: no cover
+    PdfReader = None  # type: ignore
+
+try:
+    from PIL import Image, ImageOps
+except Exception:  # pragma: no cover
+    Image = ImageOps = None  # type: ignore
+
+try:
+    import pytesseract
+except Exception:  # pragma: no cover
+    pytesseract = None  # type: ignore
+
+try:
+    import camelot
+except Exception:  # pragma: no cover
+    camelot = None  # type: ignore
+
+try:
+    import cv2
+except Exception:  # pragma: no cover
+    cv2 = None  # type: ignore
+
+# Bump when OCR preprocessing or row grouping changes, so cached pages are redone
+OCR_VERSION = 1
+
+KEYWORDS = {
+    "package outline": 6.0, "package dimensions": 6.0, "mechanical data": 5.0, "package drawing": 5.0,
+    "land pattern": 4.0, "recommended footprint": 4.0, "dimensions": 3.0, "mechanical": 2.0, "footprint": 2.0,
+    "top view": 1.0, "bottom view": 1.0, "side view": 1.0, "millimeters": 1.0, "bsc": 1.0,
+}
+_KEYWORD_RE = re.compile("|".join(re.escape(k) for k in sorted(KEYWORDS, key=len, reverse=True)))
+_TEXT_LAYER_CHARS = 32  # fewer stripped characters than this: treat the page as a scan
+_THUMBNAIL = 256
+
+# JEDEC dimension-table symbols -> phrases scan_text recognises (symbols are case-sensitive: E is width, e pitch)
+_SYMBOLS = {
+    "D": "body length", "E": "body width", "e": "pitch", "b": "terminal width", "L": "terminal length",
+    "D2": "exposed pad length", "E2": "exposed pad width",
+}
+_NUMBER = re.compile(r"^\d+(?:\.\d+)?$")
+
+
+@dataclass
+class PageScore:
+    page: int
+    score: float
+    source: str  # "text", "image" or "none" (no text layer and no way to look at the scan)
+
+
+def available() -> bool:
+    """True when scanned pages can be OCR'd (pypdf, Pillow, pytesseract and the tesseract binary)."""
+    if PdfReader is None or Image is None or pytesseract is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+# -- ranking ------------------------------------------------------------------
+
+def score_text(text: str) -> float:
+    """Keyword and package-field evidence in a page's text layer."""
+    low = text.lower()
+    counts: Dict[str, int] = {}
+    for m in _KEYWORD_RE.finditer(low):
+        counts[m.group()] = counts.get(m.group(), 0) + 1
+    score = sum(KEYWORDS[k] * min(n, 3) for k, n in counts.items())
+    return score + 2.0 * min(len(scan_text(text)), 10)
+
+
+def score_image(gray: np.ndarray) -> float:
+    """Ruled-structure score of a grayscale page thumbnail (0 = white).
+
+    Dimension drawings and tables are full of long straight lines; body
+    text is not. The score counts rows and columns whose dark pixels
+    cover more than half their length, with vertical lines counting
+    double because text never produces them. Blank pages score 0.
+    """
+    dark = 255.0 - np.asarray(gray, dtype=np.float32)
+    if dark.size == 0 or dark.mean() < 0.5:
+        return 0.0
+    ink = dark > max(24.0, float(dark.mean() + dark.std()))
+    rows = np.count_nonzero(ink.mean(axis=1) > 0.5)
+    cols = np.count_nonzero(ink.mean(axis=0) > 0.5)
+    return float(rows + 2 * cols)
+
+
+def _page_image(page: Any) -> Any:
+    """The largest image embedded in a pypdf page (a scanned page is one big image), or None."""
+    try:
+        images = list(page.images)
+    except Exception:
+        return None
+    if not images:
+        return None
+    return max(images, key=lambda im: len(im.data)).image
+
+
+def _thumbnail(img: Any) -> np.ndarray:
+    thumb = img.copy()
+    thumb.draft("L", (_THUMBNAIL, _THUMBNAIL))  # JPEG scans decode at reduced size
+    thumb = thumb.convert("L")
+    thumb.thumbnail((_THUMBNAIL, _THUMBNAIL))
+    return np.asarray(thumb)
+
+
+def _page_texts(pdf_path: str, cache_dir: Optional[str]) -> Dict[int, str]:
+    if extract_text is None:
+        return {}
+    try:
+        return dict(iter_page_texts(pdf_path, cache_dir=cache_dir))
+    except Exception:
+        return {}
+
+
+@traced(items=len)
+def rank_pages(pdf_path: str, cache_dir: Optional[str] = None, texts: Optional[Dict[int, str]] = None) -> List[PageScore]:
+    """Every page of `pdf_path`, most likely to hold the package drawing first."""
+    texts = _page_texts(pdf_path, cache_dir) if texts is None else texts
+    reader = PdfReader(pdf_path) if PdfReader is not None else None
+    count = len(reader.pages) if reader is not None else len(texts)
+    scores: List[PageScore] = []
+    for i in range(count):
+        text = texts.get(i, "")
+        if len(text.strip()) >= _TEXT_LAYER_CHARS:
+            score, source = score_text(text), "text"
+        elif reader is not None and Image is not None:
+            with span("vision.thumbnail", cat="datasheet_vision", items=1, page=i):
+                img = _page_image(reader.pages[i])
+                score, source = (score_image(_thumbnail(img)), "image") if img is not None else (0.0, "none")
+        else:
+            score, source = 0.0, "none"
+        scores.append(PageScore(i, score + 0.5 * i / max(1, count - 1), source))
+    scores.sort(key=lambda s: (-s.score, -s.page))
+    return scores
+
+
+# -- OCR and tables -----------------------------------------------------------
+
+def page_hash(page: Any) -> str:
+    """SHA-256 of a pypdf page's content stream and image data: the same page in another file hashes the same."""
+    h = hashlib.sha256()
+    contents = page.get_contents()
+    if contents is not None:
+        h.update(contents.get_data())
+    resources = page["/Resources"] if "/Resources" in page else None
+    if resources is not None and "/XObject" in resources:
+        xobjects = resources["/XObject"]
+        for name in sorted(xobjects):
+            obj = xobjects[name].get_object()
+            if hasattr(obj, "get_data"):
+                h.update(obj.get_data())
+    return h.hexdigest()
+
+
+class VisionCache:
+    """OCR results per page hash: `<cachedir>/vision/<hh>/<hash>-<lang>-v<OCR_VERSION>.json`."""
+
+    def __init__(self, cachedir: str):
+        self.cachedir = os.path.join(cachedir, "vision")
+
+    def _path(self, key: str, lang: str) -> str:
+        return os.path.join(self.cachedir, key[:2], f"{key}-{lang}-v{OCR_VERSION}.json")
+
+    def get(self, key: str, lang: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key, lang), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, lang: str, result: Dict[str, Any]) -> None:
+        path = self._path(key, lang)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+
+def _prepare(img: Any) -> Any:
+    img = img.convert("L")
+    if img.width < 1600:  # low-resolution scans OCR better upscaled
+        img = img.resize((1600, round(img.height * 1600 / img.width)), Image.LANCZOS)
+    if cv2 is not None:
+        _, binary = cv2.threshold(np.asarray(img), 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return Image.fromarray(binary)
+    return ImageOps.autocontrast(img)
+
+
+def ocr_rows(data: Dict[str, List[Any]]) -> List[List[str]]:
+    """Table-like rows from `pytesseract.image_to_data(..., output_type=DICT)`.
+
+    Words are grouped by OCR line; within a line a gap wider than the line
+    height starts a new cell.
+    """
+    lines: Dict[Tuple[int, int, int], List[Tuple[int, int, int, str]]] = {}
+    for i, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        if not word:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append((data["left"][i], data["width"][i], data["height"][i], word))
+    rows: List[List[str]] = []
+    for key in sorted(lines):
+        words = sorted(lines[key])
+        cells, cur, end = [], [words[0][3]], words[0][0] + words[0][1]
+        for left, width, height, word in words[1:]:
+            if left - end > max(height, 1):
+                cells.append(" ".join(cur))
+                cur = []
+            cur.append(word)
+            end = left + width
+        cells.append(" ".join(cur))
+        rows.append(cells)
+    return rows
+
+
+def table_text(rows: Sequence[Sequence[str]]) -> str:
+    """Phrases for `scan_text` from JEDEC dimension-table rows, e.g. ["D", "4.90", "5.00", "5.10"] -> "body length: 5.00 mm"."""
+    out: List[str] = []
+    for row in rows:
+        cells = [str(c).strip() for c in row if str(c).strip()]
+        if not cells or cells[0] not in _SYMBOLS:
+            continue
+        values = [float(tok) for c in cells[1:] for tok in c.split() if _NUMBER.match(tok)]
+        if not values:
+            continue
+        nominal = values[1] if len(values) == 3 else sum(values) / len(values)
+        out.append(f"{_SYMBOLS[cells[0]]}: {nominal:g} mm")
+    return "\n".join(out)
+
+
+# Per-process state, set up once by the pool initializer
+_reader = None
+_pdf_path: Optional[str] = None
+_lang = "eng"
+
+
+def _init_worker(pdf_path: str, lang: str) -> None:
+    global _reader, _pdf_path, _lang
+    _reader, _pdf_path, _lang = PdfReader(pdf_path), pdf_path, lang
+
+
+def _extract_page(item: Tuple[int, bool]) -> Tuple[int, Dict[str, Any]]:
+    page, has_text = item
+    text: str = ""
+    rows: List[List[str]] = []
+    try:
+        if has_text:
+            if camelot is not None:
+                for table in camelot.read_pdf(_pdf_path, pages=str(page + 1), flavor="stream"):
+                    rows += [[str(c) for c in r] for r in table.df.values.tolist()]
+        else:
+            img = _page_image(_reader.pages[page])
+            if img is not None:
+                data = pytesseract.image_to_data(_prepare(img), lang=_lang, output_type=pytesseract.Output.DICT)
+                rows = ocr_rows(data)
+                text = "\n".join(" ".join(r) for r in rows)
+        return page, {"text": text, "rows": rows}
+    except Exception as e:
+        return page, {"text": text, "rows": rows, "error": f"{type(e).__name__}: {e}"}
+
+
+def _run_pool(items: List[Tuple[int, bool]], pdf_path: str, lang: str,
+              workers: Optional[int]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    if not items:
+        return
+    # Daemonic processes (e.g. extract-corpus workers) may not start a pool of their own
+    if workers == 1 or len(items) == 1 or multiprocessing.current_process().daemon:
+        _init_worker(pdf_path, lang)
+        for item in items:
+            yield _extract_page(item)
+        return
+    processes = min(workers or os.cpu_count() or 1, len(items))
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker, initargs=(pdf_path, lang)) as pool:
+        yield from pool.imap_unordered(_extract_page, items)
+
+
+@traced()
+def extract_package_params_vision(pdf_path: str, cache_dir: Optional[str] = None, top: int = 4,
+                                  workers: Optional[int] = None, lang: str = "eng") -> PackageGuess:
+    """Package guess from the `top` ranked pages, OCR'd (or table-parsed) in parallel.
+
+    Returns `pkg_type="unknown"` when the vision dependencies are missing.
+    """
+    if not available():
+        return PackageGuess(pkg_type="unknown")
+    texts = _page_texts(pdf_path, cache_dir)
+    ranked = rank_pages(pdf_path, cache_dir=cache_dir, texts=texts)[:max(1, top)]
+    reader = PdfReader(pdf_path)
+    cache = VisionCache(cache_dir) if cache_dir else None
+    keys = {p.page: page_hash(reader.pages[p.page]) for p in ranked}
+    results: Dict[int, Dict[str, Any]] = {}
+    misses: List[Tuple[int, bool]] = []
+    for p in ranked:
+        hit = cache.get(keys[p.page], lang) if cache else None
+        if hit is not None:
+            results[p.page] = hit
+        else:
+            misses.append((p.page, p.source == "text"))
+    for page, result in _run_pool(misses, pdf_path, lang, workers):
+        results[page] = result
+        if cache and "error" not in result:
+            cache.put(keys[page], lang, result)
+    guess = PackageGuess(pkg_type="unknown")
+    for p in ranked:
+        result = results[p.page]
+        text = "\n".join(s for s in (texts.get(p.page, ""), result["text"], table_text(result["rows"])) if s)
+        merge_guess(guess, guess_from_text(text))
+    return guess
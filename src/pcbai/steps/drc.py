@@ -0,0 +1,413 @@
+"""Design-rule checks (copper clearance, courtyard overlap) over a spatial index.
+
+Pads, tracks and courtyards are bucketed by bounding box in a uniform grid,
+so each item is only measured against the items in neighbouring buckets
+rather than against every other item. The same checker runs on one
+footprint (the text of a generated `.kicad_mod`, every pad number its own
+net) or on a whole board (placed footprints, nets from the netlist, routed
+tracks). `Drc.move()` re-checks only the items of the part that moved.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
+
+from pcbai.core.profiler import traced
+from pcbai.core.spatial import SpatialHash
+from pcbai.steps.maze_router import Pad
+from pcbai.steps.netlist import Netlist
+from pcbai.steps.sexpr import find, find_all, floats, parse
+
+PAD, TRACK, COURTYARD = 0, 1, 2
+_EPS = 1e-9
+
+Box = Tuple[float, float, float, float]
+
+
+@dataclass
+class DrcRules:
+    clearance: float = 0.2              # mm between copper of different nets
+    courtyard_margin: float = 0.25      # mm around pads and body when a footprint has no F.CrtYd outline
+    layers: int = 2                     # copper layers; B.Cu is the last one
+    cell: float = 2.0                   # spatial-index bucket size, mm
+
+
+@dataclass(frozen=True)
+class Violation:
+    kind: str                           # "clearance" or "courtyard"
+    a: str
+    b: str
+    distance: float                     # copper gap (negative when overlapping) or -overlap depth for courtyards
+    required: float
+    x: float
+    y: float
+
+
+@dataclass(frozen=True)
+class PadDetail:
+    """What `Pad` leaves out: pad type, shape, drill and non-copper layers (for artwork)."""
+    kind: str = "smd"                   # smd | thru_hole | np_thru_hole | connect
+    shape: str = "rect"
+    drill: float = 0.0
+    layers: Tuple[str, ...] = ("F.Cu", "F.Paste", "F.Mask")
+    mask_margin: float = 0.0
+    paste_ratio: float = 0.0            # solder_paste_margin_ratio: paste = pad * (1 + ratio)
+
+
+@dataclass
+class Footprint:
+    name: str
+    pads: List[Tuple[str, Pad]] = field(default_factory=list)  # layers=() for apertures without copper
+    details: List[PadDetail] = field(default_factory=list)  # parallel to `pads`
+    body: Optional[Box] = None          # extent of the F.Fab outline
+    courtyard: Optional[Box] = None     # extent of the F.CrtYd outline, if the footprint has one
+
+    def bounds(self, margin: float) -> Optional[Box]:
+        """Courtyard box: the F.CrtYd outline, else pads and body grown by `margin`."""
+        if self.courtyard is not None:
+            return self.courtyard
+        boxes = [(p.x - p.w / 2, p.y - p.h / 2, p.x + p.w / 2, p.y + p.h / 2) for _, p in self.pads]
+        if self.body is not None:
+            boxes.append(self.body)
+        if not boxes:
+            return None
+        return (min(b[0] for b in boxes) - margin, min(b[1] for b in boxes) - margin,
+                max(b[2] for b in boxes) + margin, max(b[3] for b in boxes) + margin)
+
+
+def _copper_layers(names: Iterable[str], layers: int) -> Optional[Tuple[int, ...]]:
+    out = set()
+    for name in names:
+        name = name.strip('"')
+        if name.startswith("*") and name.endswith(".Cu"):
+            return None  # through-hole: copper on every layer, B.Cu included
+        if name == "F&B.Cu":
+            out.update((0, layers - 1))
+        if name == "F.Cu":
+            out.add(0)
+        elif name == "B.Cu":
+            out.add(layers - 1)
+        elif name.startswith("In") and name.endswith(".Cu"):
+            out.add(int(name[2:-3]))
+    return tuple(sorted(out))
+
+
+def parse_footprint(text: str, layers: int = 2) -> Footprint:
+    """Pads and outline extents of a KiCad footprint (`module` or `footprint` S-expression)."""
+    root = parse(text)
+    fp = Footprint(root[1] if len(root) > 1 and isinstance(root[1], str) else "")
+    for pad in find_all(root, "pad"):
+        number = pad[1] if len(pad) > 1 and isinstance(pad[1], str) else ""
+        kind = pad[2] if len(pad) > 2 and isinstance(pad[2], str) else "smd"
+        shape = pad[3] if len(pad) > 3 and isinstance(pad[3], str) else "rect"
+        x, y, angle = floats(find(pad, "at"), 3)
+        w, h = floats(find(pad, "size"), 2)
+        if angle:
+            # Axis-aligned bounding box of the rotated pad (exact for multiples of 90 degrees)
+            a = math.radians(angle)
+            c, s = abs(math.cos(a)), abs(math.sin(a))
+            w, h = w * c + h * s, w * s + h * c
+        node = find(pad, "layers")
+        names = tuple(n for n in node[1:] if isinstance(n, str)) if node else ("F.Cu",)
+        pad_layers = _copper_layers(names, layers)  # () for no copper, e.g. a paste-only aperture
+        fp.pads.append((number, Pad(x, y, w, h, pad_layers)))
+        drill = find(pad, "drill")
+        fp.details.append(PadDetail(kind, shape, floats(drill, 1)[0], names,
+                                    floats(find(pad, "solder_mask_margin"), 1)[0],
+                                    floats(find(pad, "solder_paste_margin_ratio"), 1)[0]))
+    extents: Dict[str, Box] = {}
+    for item in root:
+        if not (isinstance(item, list) and item and item[0] in ("fp_line", "fp_rect")):
+            continue
+        layer = find(item, "layer")
+        if layer is None or len(layer) < 2:
+            continue
+        x1, y1 = floats(find(item, "start"), 2)
+        x2, y2 = floats(find(item, "end"), 2)
+        box = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        old = extents.get(layer[1])
+        extents[layer[1]] = box if old is None else (min(old[0], box[0]), min(old[1], box[1]),
+                                                     max(old[2], box[2]), max(old[3], box[3]))
+    fp.body = extents.get("F.Fab")
+    fp.courtyard = extents.get("F.CrtYd")
+    return fp
+
+
+# -- geometry -------------------------------------------------------------
+
+def _rect_gap(a: Box, b: Box) -> float:
+    """Distance between two boxes; negative (minus the smaller penetration) when they overlap."""
+    dx = max(b[0] - a[2], a[0] - b[2])
+    dy = max(b[1] - a[3], a[1] - b[3])
+    if dx < 0 and dy < 0:
+        return max(dx, dy)
+    return math.hypot(max(dx, 0.0), max(dy, 0.0))
+
+
+def _point_seg(px: float, py: float, x1: float, y1: float, x2: float, y2: float) -> float:
+    dx, dy = x2 - x1, y2 - y1
+    n = dx * dx + dy * dy
+    t = 0.0 if n == 0 else min(1.0, max(0.0, ((px - x1) * dx + (py - y1) * dy) / n))
+    return math.hypot(px - x1 - t * dx, py - y1 - t * dy)
+
+
+def _point_rect(px: float, py: float, r: Box) -> float:
+    return math.hypot(max(r[0] - px, 0.0, px - r[2]), max(r[1] - py, 0.0, py - r[3]))
+
+
+def _seg_cross(a: Tuple[float, ...], b: Tuple[float, ...]) -> bool:
+    def orient(px, py, qx, qy, rx, ry):
+        return (qx - px) * (ry - py) - (qy - py) * (rx - px)
+    d1 = orient(b[0], b[1], b[2], b[3], a[0], a[1])
+    d2 = orient(b[0], b[1], b[2], b[3], a[2], a[3])
+    d3 = orient(a[0], a[1], a[2], a[3], b[0], b[1])
+    d4 = orient(a[0], a[1], a[2], a[3], b[2], b[3])
+    return d1 * d2 < 0 and d3 * d4 < 0
+
+
+def _seg_seg(a: Tuple[float, ...], b: Tuple[float, ...]) -> float:
+    if _seg_cross(a, b):
+        return 0.0
+    return min(_point_seg(a[0], a[1], *b[:4]), _point_seg(a[2], a[3], *b[:4]),
+               _point_seg(b[0], b[1], *a[:4]), _point_seg(b[2], b[3], *a[:4]))
+
+
+def _seg_rect(s: Tuple[float, ...], r: Box) -> float:
+    # Liang-Barsky clip: does any part of the segment lie inside the box?
+    x1, y1, x2, y2 = s[:4]
+    t0, t1 = 0.0, 1.0
+    for p, q in ((x1 - x2, x1 - r[0]), (x2 - x1, r[2] - x1), (y1 - y2, y1 - r[1]), (y2 - y1, r[3] - y1)):
+        if p == 0:
+            if q < 0:
+                break
+        else:
+            t = q / p
+            if p < 0:
+                t0 = max(t0, t)
+            else:
+                t1 = min(t1, t)
+    else:
+        if t0 <= t1:
+            return 0.0
+    corners = ((r[0], r[1]), (r[2], r[1]), (r[2], r[3]), (r[0], r[3]))
+    return min(min(_point_rect(x1, y1, r), _point_rect(x2, y2, r)),
+               min(_point_seg(cx, cy, x1, y1, x2, y2) for cx, cy in corners))
+
+
+class Drc:
+    """Incremental clearance and courtyard checker.
+
+    Add footprints, pads and tracks, call `check()` once, then `move()`
+    parts and get back the violations that involve them. Copper items on
+    the same net (pads of one footprint with the same number count as one
+    net) are never checked against each other.
+    """
+
+    def __init__(self, rules: Optional[DrcRules] = None):
+        self.rules = rules or DrcRules()
+        self.kind: List[int] = []
+        self.ref: List[Optional[str]] = []
+        self.label: List[str] = []
+        self.net: List[str] = []
+        self.layers: List[Optional[FrozenSet[int]]] = []
+        self.local: List[Tuple[float, ...]] = []
+        self.geom: List[Tuple[float, ...]] = []
+        self.box: List[Box] = []
+        self.by_ref: Dict[str, List[int]] = {}
+        self.origin: Dict[str, Tuple[float, float]] = {}
+        self.grids = (SpatialHash(self.rules.cell), SpatialHash(self.rules.cell))  # copper, courtyards
+        self._found: Dict[Tuple[int, int], Violation] = {}
+        self._checked = False
+
+    # -- building ---------------------------------------------------------
+
+    def _add(self, kind: int, ref: Optional[str], label: str, net: str, layers: Optional[Iterable[int]],
+             local: Tuple[float, ...]) -> int:
+        i = len(self.kind)
+        self.kind.append(kind)
+        self.ref.append(ref)
+        self.label.append(label)
+        self.net.append(net)
+        self.layers.append(None if layers is None else frozenset(layers))
+        self.local.append(local)
+        self.geom.append(local)
+        self.box.append((0.0, 0.0, 0.0, 0.0))
+        if ref is not None:
+            self.by_ref.setdefault(ref, []).append(i)
+        self._place(i)
+        self._checked = False
+        return i
+
+    def _place(self, i: int) -> None:
+        ox, oy = self.origin.get(self.ref[i], (0.0, 0.0)) if self.ref[i] is not None else (0.0, 0.0)
+        g = self.local[i]
+        if self.kind[i] == TRACK:
+            x1, y1, x2, y2, hw = g
+            self.geom[i] = g
+            self.box[i] = (min(x1, x2) - hw, min(y1, y2) - hw, max(x1, x2) + hw, max(y1, y2) + hw)
+        else:
+            self.geom[i] = self.box[i] = (g[0] + ox, g[1] + oy, g[2] + ox, g[3] + oy)
+        self.grids[self.kind[i] == COURTYARD].add(i, *self.box[i])
+
+    def add_footprint(self, ref: str, footprint: Union[Footprint, str], x: float = 0.0, y: float = 0.0,
+                      nets: Optional[Mapping[str, Optional[str]]] = None) -> List[int]:
+        """Add a footprint's pads and courtyard with its origin at (x, y).
+
+        `nets` maps pad numbers to net names; unmapped pads are their own net.
+        """
+        if isinstance(footprint, str):
+            footprint = parse_footprint(footprint, self.rules.layers)
+        self.origin[ref] = (x, y)
+        prefix = f"{ref}:" if ref else ""
+        for number, p in footprint.pads:
+            if p.layers == ():
+                continue  # mask/paste-only aperture: nothing to clear
+            net = (nets or {}).get(number) or f"{ref}:{number}"
+            self._add(PAD, ref, prefix + number, net, p.layers,
+                      (p.x - p.w / 2, p.y - p.h / 2, p.x + p.w / 2, p.y + p.h / 2))
+        court = footprint.bounds(self.rules.courtyard_margin)
+        if court is not None:
+            self._add(COURTYARD, ref, ref or footprint.name, "", (), court)
+        return self.by_ref.get(ref, [])
+
+    def add_pad(self, pad: Pad, net: Optional[str] = None, label: str = "") -> int:
+        """A free-standing board pad (mounting hole, test point); no net means a net of its own."""
+        i = len(self.kind)
+        return self._add(PAD, None, label or f"pad#{i}", net or f"#{i}", pad.layers,
+                         (pad.x - pad.w / 2, pad.y - pad.h / 2, pad.x + pad.w / 2, pad.y + pad.h / 2))
+
+    def add_track(self, layer: int, start: Tuple[float, float], end: Tuple[float, float], width: float,
+                  net: str) -> int:
+        return self._add(TRACK, None, f"track:{net}", net, (layer,), (start[0], start[1], end[0], end[1], width / 2))
+
+    def add_tracks(self, tracks: Iterable[Mapping]) -> None:
+        """Tracks in the `RouteResult.tracks()` / `route_pcb()` shape."""
+        for t in tracks:
+            self.add_track(t["layer"], t["start"], t["end"], t["width"], t["net"])
+
+    @classmethod
+    def from_board(cls, positions: Mapping[str, Tuple[float, float]], footprints: Mapping[str, Union[Footprint, str]],
+                   netlist: Optional[Netlist] = None, tracks: Iterable[Mapping] = (),
+                   rules: Optional[DrcRules] = None) -> "Drc":
+        """Checker for placed footprints (ref -> center, e.g. `Placement.positions()`) and routed tracks."""
+        drc = cls(rules)
+        parsed: Dict[str, Footprint] = {}
+        for ref, (x, y) in positions.items():
+            fp = footprints[ref]
+            if isinstance(fp, str):
+                # Boards reuse a handful of footprints; parse each text once
+                if fp not in parsed:
+                    parsed[fp] = parse_footprint(fp, drc.rules.layers)
+                fp = parsed[fp]
+            nets = None
+            if netlist is not None and ref in netlist.refs:
+                nets = {}
+                for number, _ in fp.pads:
+                    try:
+                        nets[number] = netlist.net_of(ref, number)
+                    except KeyError:
+                        pass
+            drc.add_footprint(ref, fp, x, y, nets)
+        drc.add_tracks(tracks)
+        return drc
+
+    # -- checking ---------------------------------------------------------
+
+    def _pair(self, i: int, j: int) -> Optional[Violation]:
+        ki, kj = self.kind[i], self.kind[j]
+        if (ki == COURTYARD) != (kj == COURTYARD):
+            return None
+        if ki == COURTYARD:
+            if self.ref[i] == self.ref[j]:
+                return None
+            d = _rect_gap(self.geom[i], self.geom[j])
+            if d >= -_EPS:
+                return None
+            kind, required = "courtyard", 0.0
+        else:
+            if self.net[i] == self.net[j]:
+                return None
+            li, lj = self.layers[i], self.layers[j]
+            if li is not None and lj is not None and not li & lj:
+                return None
+            gi, gj = self.geom[i], self.geom[j]
+            if ki == PAD and kj == PAD:
+                d = _rect_gap(gi, gj)
+            elif ki == TRACK and kj == TRACK:
+                d = _seg_seg(gi, gj) - gi[4] - gj[4]
+            elif ki == TRACK:
+                d = _seg_rect(gi, gj) - gi[4]
+            else:
+                d = _seg_rect(gj, gi) - gj[4]
+            required = self.rules.clearance
+            if d >= required - _EPS:
+                return None
+            kind = "clearance"
+        a, b = self.box[i], self.box[j]
+        x = (max(a[0], b[0]) + min(a[2], b[2])) / 2
+        y = (max(a[1], b[1]) + min(a[3], b[3])) / 2
+        return Violation(kind, self.label[i], self.label[j], round(d, 6), required, round(x, 6), round(y, 6))
+
+    def _neighbours(self, i: int) -> Iterable[int]:
+        x0, y0, x1, y1 = self.box[i]
+        if self.kind[i] == COURTYARD:
+            return self.grids[1].query(x0, y0, x1, y1)
+        c = self.rules.clearance
+        return self.grids[0].query(x0 - c, y0 - c, x1 + c, y1 + c)
+
+    @traced(items=lambda v: len(v))
+    def check(self) -> List[Violation]:
+        """Check every item against its neighbours; returns all violations."""
+        self._found = {}
+        for i in range(len(self.kind)):
+            for j in self._neighbours(i):
+                if j > i:
+                    v = self._pair(i, j)
+                    if v is not None:
+                        self._found[(i, j)] = v
+        self._checked = True
+        return self.violations
+
+    def move(self, ref: str, x: float, y: float) -> List[Violation]:
+        """Move `ref`'s origin to (x, y) and return the violations that now involve it.
+
+        Only pairs with exactly one item in the moved part are re-measured;
+        pairs inside the part keep their relative geometry.
+        """
+        ids = self.by_ref.get(ref, [])
+        moved = set(ids)
+        for i in ids:
+            self.grids[self.kind[i] == COURTYARD].remove(i, *self.box[i])
+        self.origin[ref] = (x, y)
+        for i in ids:
+            self._place(i)
+        if not self._checked:
+            self.check()
+        else:
+            self._found = {k: v for k, v in self._found.items() if (k[0] in moved) == (k[1] in moved)}
+            for i in ids:
+                for j in self._neighbours(i):
+                    if j not in moved:
+                        v = self._pair(i, j)
+                        if v is not None:
+                            self._found[(min(i, j), max(i, j))] = v
+        return [v for k, v in self._found.items() if k[0] in moved or k[1] in moved]
+
+    @property
+    def violations(self) -> List[Violation]:
+        return [self._found[k] for k in sorted(self._found)]
+
+
+def check_footprint(footprint: Union[Footprint, str], rules: Optional[DrcRules] = None) -> List[Violation]:
+    """Pad-to-pad clearance inside one footprint, e.g. the output of `generate_qfn`/`generate_soic`."""
+    drc = Drc(rules)
+    drc.add_footprint("", footprint)
+    return drc.check()
+
+
+def check_board(positions: Mapping[str, Tuple[float, float]], footprints: Mapping[str, Union[Footprint, str]],
+                netlist: Optional[Netlist] = None, tracks: Iterable[Mapping] = (),
+                rules: Optional[DrcRules] = None) -> List[Violation]:
+    """Clearance and courtyard violations for a placed (and optionally routed) board."""
+    return Drc.from_board(positions, footprints, netlist, tracks, rules).check()
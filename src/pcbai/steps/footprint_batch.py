@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import csv
+import json
+import multiprocessing
+import os
+import time
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pcbai.core.profiler import traced
+from pcbai.steps.footprint_bga import BgaParams, generate_bga
+from pcbai.steps.footprint_cache import FootprintCache
+from pcbai.steps.footprint_generator import SmdRcParams, SoicParams, KiCadModuleWriter, generate_smd_rc, generate_soic
+from pcbai.steps.footprint_qfn_qfp import QfnParams, QfpParams, generate_qfn, generate_qfp
+
+
+# Manifest `type` column -> (params dataclass, generator)
+FOOTPRINT_KINDS: Dict[str, Tuple[type, Callable[[Any], str]]] = {
+    "smd_rc": (SmdRcParams, generate_smd_rc),
+    "soic": (SoicParams, generate_soic),
+    "qfn": (QfnParams, generate_qfn),
+    "qfp": (QfpParams, generate_qfp),
+    "bga": (BgaParams, generate_bga),
+}
+_GENERATORS: Dict[type, Callable[[Any], str]] = {cls: gen for cls, gen in FOOTPRINT_KINDS.values()}
+
+_TRUE = {"1", "true", "yes", "y", "on"}
+_FALSE = {"0", "false", "no", "n", "off"}
+
+
+@dataclass
+class BatchResult:
+    row: int  # 1-based manifest row
+    name: str
+    path: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    content: Optional[str] = None  # only returned to the parent when caching
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    errors: List[BatchResult] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        """Footprints written per second."""
+        return self.ok / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def load_manifest(path: str) -> Iterator[Any]:
+    """Yield manifest rows from a CSV (header row) or JSONL file.
+
+    Every row needs a `type` (smd_rc | soic | qfn | qfp | bga) plus the fields of the
+    matching params dataclass. Empty CSV cells fall back to the dataclass defaults.
+    A JSONL line that does not parse is yielded as its `ValueError`, so it fails
+    as one row instead of ending the run.
+    """
+    if path.lower().endswith((".jsonl", ".ndjson")):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield ValueError(f"invalid JSON: {e}")
+    else:
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+
+
+def _coerce(value: Any, annotation: str) -> Any:
+    # Annotations are strings because of `from __future__ import annotations`
+    base = annotation.replace(" | None", "").replace("Optional[", "").rstrip("]").strip()
+    if base == "int":
+        return int(float(value)) if isinstance(value, str) else int(value)
+    if base == "float":
+        return float(value)
+    if base == "bool":
+        if isinstance(value, str):
+            v = value.strip().lower()
+            if v in _TRUE:
+                return True
+            if v in _FALSE:
+                return False
+            raise ValueError(f"not a boolean: {value!r}")
+        return bool(value)
+    return str(value) if base == "str" else value
+
+
+def _row_name(row: Any) -> str:
+    return str(row.get("name") or "") if isinstance(row, dict) else ""
+
+
+def params_from_row(row: Dict[str, Any]) -> Any:
+    """Build the params dataclass described by one manifest row."""
+    if isinstance(row, Exception):
+        raise row
+    if not isinstance(row, dict):
+        raise ValueError(f"expected an object row, got {type(row).__name__}")
+    ftype = str(row.get("type") or "").strip()
+    if ftype not in FOOTPRINT_KINDS:
+        raise ValueError(f"unknown footprint type {ftype!r}")
+    cls, _ = FOOTPRINT_KINDS[ftype]
+    known = {f.name: f.type for f in fields(cls)}
+    kwargs: Dict[str, Any] = {}
+    for key, value in row.items():
+        if key == "type" or value is None or value == "":
+            continue
+        if key not in known:
+            raise ValueError(f"unknown field {key!r} for {ftype}")
+        kwargs[key] = _coerce(value, known[key])
+    return cls(**kwargs)
+
+
+# Per-process writer, set up once by the pool initializer
+_writer: Optional[KiCadModuleWriter] = None
+
+
+def _init_worker(outdir: Optional[str]) -> None:
+    global _writer
+    _writer = KiCadModuleWriter(outdir) if outdir is not None else None
+
+
+def _generate_row(item: Tuple[int, Any]) -> BatchResult:
+    idx, row = item
+    name = ""
+    try:
+        name = row.name if is_dataclass(row) else _row_name(row)
+        params = row if is_dataclass(row) else params_from_row(row)
+        content = _GENERATORS[type(params)](params)
+        if _writer is None:
+            return BatchResult(row=idx, name=params.name, content=content)
+        return BatchResult(row=idx, name=params.name, path=_writer.write(params.name, content))
+    except Exception as e:
+        return BatchResult(row=idx, name=name, error=f"{type(e).__name__}: {e}")
+
+
+def _run_pool(items: Iterable[Tuple[int, Any]], outdir: Optional[str], workers: Optional[int], chunksize: int) -> Iterator[BatchResult]:
+    if workers == 1:
+        _init_worker(outdir)
+        for item in items:
+            yield _generate_row(item)
+        return
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(outdir,)) as pool:
+        yield from pool.imap_unordered(_generate_row, items, chunksize=chunksize)
+
+
+def generate_batch(rows: Iterable[Dict[str, Any]], outdir: str, workers: Optional[int] = None, chunksize: int = 32,
+                   cache: Optional[FootprintCache] = None) -> Iterator[BatchResult]:
+    """Generate footprints for manifest rows, yielding results as they complete.
+
+    Rows are fanned out over a process pool (`workers=None` uses every core);
+    `workers=1` runs in-process. Each worker writes its own `.kicad_mod` files
+    into `outdir`, and a bad row yields an error result instead of aborting.
+    Results arrive in completion order, not manifest order.
+
+    With a `cache`, rows are looked up in the parent first: up-to-date outputs
+    are reported without touching the pool, and only misses are generated
+    (the parent then writes them through the cache).
+    """
+    os.makedirs(outdir, exist_ok=True)
+    if cache is None:
+        yield from _run_pool(enumerate(rows, start=1), outdir, workers, chunksize)
+        return
+    pending: List[Tuple[int, Any]] = []
+    for idx, row in enumerate(rows, start=1):
+        try:
+            params = params_from_row(row)
+            path = cache.fetch(params, outdir)
+        except Exception as e:
+            yield BatchResult(row=idx, name=_row_name(row), error=f"{type(e).__name__}: {e}")
+            continue
+        if path is not None:
+            yield BatchResult(row=idx, name=params.name, path=path, cached=True)
+        else:
+            pending.append((idx, params))
+    if not pending:
+        return
+    by_row = dict(pending)
+    for res in _run_pool(pending, None, workers, chunksize):
+        if res.ok:
+            res.path = cache.store(by_row[res.row], outdir, res.content)  # type: ignore[arg-type]
+            res.content = None
+        yield res
+
+
+@traced(items=lambda s: s.total)
+def run_batch(manifest: str, outdir: str, workers: Optional[int] = None, chunksize: int = 32,
+              on_result: Optional[Callable[[BatchResult], None]] = None,
+              cache: Optional[FootprintCache] = None) -> BatchSummary:
+    """Generate every footprint in `manifest` and return counts and throughput."""
+    summary = BatchSummary()
+    start = time.perf_counter()
+    for res in generate_batch(load_manifest(manifest), outdir, workers=workers, chunksize=chunksize, cache=cache):
+        summary.total += 1
+        if res.ok:
+            summary.ok += 1
+        else:
+            summary.failed += 1
+            summary.errors.append(res)
+        if on_result is not None:
+            on_result(res)
+    if cache is not None:
+        cache.flush()
+    summary.elapsed = time.perf_counter() - start
+    return summary
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+from pcbai.core.profiler import traced
+from pcbai.steps.pad_array import depopulation_mask, format_smd_pads, grid
+
+
+# Bump whenever generated output changes; invalidates footprint cache entries
+GENERATOR_VERSION = 1
+
+
+@dataclass
+class BgaParams:
+    name: str
+    rows: int
+    cols: int
+    pitch: float
+    body_l: float
+    body_w: float
+    pad_d: float              # copper land diameter
+    center_depop: int = 0     # balls per side of an unpopulated centre block
+    missing: str = ""         # extra unpopulated balls, e.g. "A1 B2"
+    mask_expansion: float = 0.05
+    paste_ratio: float = 1.0
+
+
+@traced()
+def generate_bga(params: BgaParams) -> str:
+    if params.rows <= 0 or params.cols <= 0:
+        raise ValueError("BGA needs at least one row and one column")
+    lines: List[str] = []
+    lines.append(f"(module {params.name} (layer F.Cu) (tedit 5B3079AF)")
+    lines.append("  (attr smd)")
+    hw = params.body_w / 2.0
+    hl = params.body_l / 2.0
+    fab = [(-hl, -hw), (hl, -hw), (hl, hw), (-hl, hw), (-hl, -hw)]
+    for i in range(4):
+        x1, y1 = fab[i]
+        x2, y2 = fab[i+1]
+        lines.append(f"  (fp_line (start {x1:.3f} {y1:.3f}) (end {x2:.3f} {y2:.3f}) (layer F.Fab) (width 0.1))")
+    # Pin A1 marker
+    lines.append(f"  (fp_circle (center {-hl+0.6:.3f} {-hw+0.6:.3f}) (end {-hl+0.3:.3f} {-hw+0.6:.3f}) (layer F.SilkS) (width 0.2))")
+
+    populated = depopulation_mask(params.rows, params.cols, params.center_depop, params.missing.replace(",", " ").split())
+    pads = grid(params.rows, params.cols, params.pitch, params.pad_d, populated)
+    if len(pads):
+        lines.append(format_smd_pads(pads, params.mask_expansion, params.paste_ratio, shape="circle"))
+
+    lines.append(")")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from pcbai.core.fileio import atomic_write
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0       # output already up to date: nothing generated or written
+    restored: int = 0   # output rewritten from the object store, generator skipped
+    misses: int = 0     # generated from scratch
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.restored + self.misses
+        return (self.hits + self.restored) / total if total else 0.0
+
+
+def params_key(params: Any) -> str:
+    """Content hash of a params dataclass plus its generator's GENERATOR_VERSION."""
+    cls = type(params)
+    version = getattr(sys.modules.get(cls.__module__), "GENERATOR_VERSION", 0)
+    doc = {"type": f"{cls.__module__}.{cls.__qualname__}", "version": version, "params": asdict(params)}
+    blob = json.dumps(doc, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class FootprintCache:
+    """Disk-backed, content-addressed cache of generated `.kicad_mod` files.
+
+    Generated footprints live in `<cachedir>/objects/` keyed by `params_key`.
+    For every output library the cache also remembers which key produced each
+    file together with its size/mtime, so an unchanged footprint costs one hash
+    and one `stat` and is neither regenerated nor rewritten. The object store is
+    trimmed to `max_bytes` on `flush()`, least recently used first.
+    """
+
+    def __init__(self, cachedir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cachedir = cachedir
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._indexes: Dict[str, Dict[str, List[Any]]] = {}
+        self._dirty: Set[str] = set()
+        self._touched: Set[str] = set()
+        os.makedirs(os.path.join(cachedir, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(cachedir, "outputs"), exist_ok=True)
+
+    def __enter__(self) -> "FootprintCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def _object_path(self, key: str) -> str:
+        return os.path.join(self.cachedir, "objects", key[:2], f"{key}.kicad_mod")
+
+    def _index_path(self, outdir: str) -> str:
+        digest = hashlib.sha256(os.path.abspath(outdir).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cachedir, "outputs", f"{digest}.json")
+
+    def _index(self, outdir: str) -> Dict[str, List[Any]]:
+        outdir = os.path.abspath(outdir)
+        index = self._indexes.get(outdir)
+        if index is None:
+            try:
+                with open(self._index_path(outdir), "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+            self._indexes[outdir] = index
+        return index
+
+    def _record(self, outdir: str, filename: str, key: str, path: str) -> None:
+        st = os.stat(path)
+        self._index(outdir)[filename] = [key, st.st_size, st.st_mtime_ns]
+        self._dirty.add(os.path.abspath(outdir))
+
+    def fetch(self, params: Any, outdir: str, key: Optional[str] = None) -> Optional[str]:
+        """Return the output path if it is up to date or could be restored, else None."""
+        key = key or params_key(params)
+        filename = f"{params.name}.kicad_mod"
+        path = os.path.join(outdir, filename)
+        entry = self._index(outdir).get(filename)
+        if entry is not None and entry[0] == key:
+            try:
+                st = os.stat(path)
+            except OSError:
+                st = None
+            if st is not None and st.st_size == entry[1] and st.st_mtime_ns == entry[2]:
+                self.stats.hits += 1
+                self._touched.add(key)
+                return path
+        obj = self._object_path(key)
+        try:
+            with open(obj, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return None
+        os.makedirs(outdir, exist_ok=True)
+        atomic_write(path, content)
+        self._record(outdir, filename, key, path)
+        self._touched.add(key)
+        self.stats.restored += 1
+        return path
+
+    def store(self, params: Any, outdir: str, content: str, key: Optional[str] = None) -> str:
+        """Save freshly generated `content` to the object store and the output library."""
+        key = key or params_key(params)
+        obj = self._object_path(key)
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        atomic_write(obj, content)
+        os.makedirs(outdir, exist_ok=True)
+        filename = f"{params.name}.kicad_mod"
+        path = os.path.join(outdir, filename)
+        atomic_write(path, content)
+        self._record(outdir, filename, key, path)
+        self.stats.misses += 1
+        return path
+
+    def write(self, params: Any, outdir: str, generate: Callable[[Any], str]) -> str:
+        """Cached equivalent of `KiCadModuleWriter(outdir).write(params.name, generate(params))`."""
+        key = params_key(params)
+        path = self.fetch(params, outdir, key)
+        if path is None:
+            path = self.store(params, outdir, generate(params), key)
+        return path
+
+    def flush(self) -> None:
+        """Persist output indexes, refresh LRU timestamps and evict down to `max_bytes`."""
+        for outdir in self._dirty:
+            os.makedirs(os.path.join(self.cachedir, "outputs"), exist_ok=True)
+            atomic_write(self._index_path(outdir), json.dumps(self._indexes[outdir], separators=(",", ":")))
+        self._dirty.clear()
+        for key in self._touched:
+            try:
+                os.utime(self._object_path(key))
+            except OSError:
+                pass
+        self._touched.clear()
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        root = os.path.join(self.cachedir, "objects")
+        for sub in os.scandir(root):
+            if not sub.is_dir():
+                continue
+            for e in os.scandir(sub.path):
+                st = e.stat()
+                entries.append((st.st_mtime_ns, st.st_size, e.path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.stats.evictions += 1
@@ -4,6 +4,13 @@ import os
 from dataclasses import dataclass
 from typing import List, Optional
 
+from pcbai.core.profiler import traced
+from pcbai.steps.pad_array import dual_row, format_smd_pads
+
+
+# Bump whenever generated output changes; invalidates footprint cache entries
+GENERATOR_VERSION = 1
+
 
 @dataclass
 class SmdRcParams:
@@ -44,6 +51,7 @@ class KiCadModuleWriter:
         return path
 
 
+@traced()
 def generate_smd_rc(params: SmdRcParams) -> str:
     # KiCad footprint template (v6+)
     # Two pads centered on x-axis, symmetric about origin; courtyard and fab outline
@@ -80,10 +88,10 @@ def generate_smd_rc(params: SmdRcParams) -> str:
     return "\n".join(lines) + "\n"
 
 
+@traced()
 def generate_soic(params: SoicParams) -> str:
     if params.pins % 2 != 0:
         raise ValueError("SOIC pins must be even")
-    pins_per_side = params.pins // 2
 
     lines: List[str] = []
     lines.append(f"(module {params.name} (layer F.Cu) (tedit 5B3079AF)")
@@ -107,19 +115,9 @@ def generate_soic(params: SoicParams) -> str:
     # Pads
     # Top row (pins 1..N/2): y = +row_offset
     # Bottom row (pins N..N/2+1): y = -row_offset
-    top_y = params.row_offset
-    bot_y = -params.row_offset
-    x0 = - (params.pitch * (pins_per_side - 1)) / 2.0
-    for i in range(pins_per_side):
-        x = x0 + i * params.pitch
-        pad_num_top = 1 + i
-        pad_num_bot = params.pins - i
-        lines.append(
-            f"  (pad {pad_num_top} smd rect (at {x:.3f} {top_y:.3f}) (size {params.pad_w:.3f} {params.pad_l:.3f}) (layers F.Cu F.Paste F.Mask) (solder_mask_margin {params.mask_expansion:.3f}) (solder_paste_margin_ratio {params.paste_ratio - 1.0:.3f}))"
-        )
-        lines.append(
-            f"  (pad {pad_num_bot} smd rect (at {x:.3f} {bot_y:.3f}) (size {params.pad_w:.3f} {params.pad_l:.3f}) (layers F.Cu F.Paste F.Mask) (solder_mask_margin {params.mask_expansion:.3f}) (solder_paste_margin_ratio {params.paste_ratio - 1.0:.3f}))"
-        )
+    pads = dual_row(params.pins, params.pitch, params.row_offset, params.pad_w, params.pad_l)
+    if len(pads):
+        lines.append(format_smd_pads(pads, params.mask_expansion, params.paste_ratio))
 
     lines.append(")")
     return "\n".join(lines) + "\n"
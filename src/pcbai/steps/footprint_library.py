@@ -0,0 +1,309 @@
+"""Persistent index over existing KiCad footprint libraries (`.pretty` directories).
+
+Every `.kicad_mod` is parsed once with `pcbai.steps.sexpr`, and summarized
+as pad count, pitch, bounding box and a geometry fingerprint in a SQLite
+database. `update()` re-parses only files whose mtime or size changed and
+drops rows for deleted files, so a warm re-index of 30k footprints costs
+one `stat` per file. Lookups by name, fingerprint or pad count/pitch are
+index hits, which makes "does this footprint already exist?" cheap enough
+to ask before generating a new one.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import multiprocessing
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from pcbai.core.profiler import traced
+from pcbai.steps.sexpr import Node, find, find_all, floats, parse
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS footprints (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,         -- the .pretty directory
+    library TEXT NOT NULL,     -- its name without .pretty
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    pads INTEGER,
+    pitch REAL,                -- smallest pad spacing along a row or column, mm
+    x0 REAL, y0 REAL, x1 REAL, y1 REAL,
+    fingerprint TEXT,          -- hash of pad numbers and copper geometry; NULL without pads
+    error TEXT                 -- parse error; retried when the file changes
+)
+"""
+
+INDEXES = {
+    "idx_fp_dir": "dir",
+    "idx_fp_name": "name",
+    "idx_fp_fingerprint": "fingerprint",
+    "idx_fp_pads_pitch": "pads, pitch",
+}
+
+_COLUMNS = ("path", "dir", "library", "name", "mtime_ns", "size", "pads", "pitch", "x0", "y0", "x1", "y1",
+            "fingerprint", "error")
+
+# Files changed since the last update before parsing moves to a process pool
+_POOL_THRESHOLD = 256
+
+
+@dataclass
+class FootprintInfo:
+    path: str
+    library: str
+    name: str
+    pads: int
+    pitch: Optional[float]
+    bbox: Tuple[float, float, float, float]
+    fingerprint: Optional[str]  # None for padless footprints (logos, fiducial marks)
+
+
+@dataclass
+class IndexStats:
+    scanned: int = 0
+    unchanged: int = 0
+    parsed: int = 0
+    removed: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+
+def _pad_fields(pad: Node) -> Tuple[str, str, str, float, float, float, float, float, float]:
+    head = [a if isinstance(a, str) else "" for a in pad[1:4]] + ["", "", ""]
+    at = size = drill = None
+    for child in pad:
+        if type(child) is list and child:
+            key = child[0]
+            if key == "at":
+                at = child
+            elif key == "size":
+                size = child
+            elif key == "drill":
+                drill = child
+    x, y, rot = floats(at, 3)
+    w, h = floats(size, 2)
+    return (head[0], head[1], head[2], x, y, rot % 360, w, h, floats(drill, 1)[0])
+
+
+def summarize(expr: Node) -> Dict[str, Any]:
+    """Name, pad count, pitch, bounding box and geometry fingerprint of a parsed footprint."""
+    name = expr[1] if len(expr) > 1 and isinstance(expr[1], str) else ""
+    pads = [_pad_fields(pad) for pad in find_all(expr, "pad")]
+    xs: List[float] = []
+    ys: List[float] = []
+    keys: List[str] = []
+    centers = None
+    if pads:
+        geo = np.array([p[3:] for p in pads], dtype=float)   # x, y, rot, w, h, drill
+        # Rounded to the micron, + 0.0 folds -0.000 into 0.000, so equal geometry hashes equal
+        rounded = (np.round(geo, 3) + 0.0).tolist()
+        keys = ["%s|%s|%s|%.3f|%.3f|%.3f|%.3f|%.3f|%.3f" % (*p[:3], *r) for p, r in zip(pads, rounded)]
+        a = np.radians(geo[:, 2])
+        c, s = np.abs(np.cos(a)), np.abs(np.sin(a))
+        hw = (geo[:, 3] * c + geo[:, 4] * s) / 2
+        hh = (geo[:, 3] * s + geo[:, 4] * c) / 2
+        xs += [float((geo[:, 0] - hw).min()), float((geo[:, 0] + hw).max())]
+        ys += [float((geo[:, 1] - hh).min()), float((geo[:, 1] + hh).max())]
+        centers = geo[:, :2]
+    for item in expr:
+        if not (type(item) is list and item and isinstance(item[0], str) and item[0].startswith("fp_")):
+            continue
+        if item[0] == "fp_text":
+            continue
+        for key in ("start", "end", "mid", "center"):
+            pt = find(item, key)
+            if pt is not None:
+                px, py = floats(pt, 2)
+                xs.append(px)
+                ys.append(py)
+        if item[0] == "fp_circle":
+            (cx, cy), (ex, ey) = floats(find(item, "center"), 2), floats(find(item, "end"), 2)
+            r = math.hypot(ex - cx, ey - cy)
+            xs += [cx - r, cx + r]
+            ys += [cy - r, cy + r]
+        pts = find(item, "pts")
+        for xy in find_all(pts or [], "xy"):
+            px, py = floats(xy, 2)
+            xs.append(px)
+            ys.append(py)
+    bbox = (min(xs), min(ys), max(xs), max(ys)) if xs else (0.0, 0.0, 0.0, 0.0)
+    # Padless footprints (logos, graphics) have no pad geometry to compare, so no fingerprint at all
+    fingerprint = hashlib.sha1("\n".join(sorted(keys)).encode("utf-8")).hexdigest()[:16] if keys else None
+    return {"name": name, "pads": len(keys), "pitch": _pitch(centers),
+            "bbox": tuple(round(v, 4) for v in bbox), "fingerprint": fingerprint}
+
+
+def _pitch(centers: Optional[np.ndarray]) -> Optional[float]:
+    """Smallest spacing between neighbouring pads that share a row (same y) or a column (same x)."""
+    if centers is None or len(centers) < 2:
+        return None
+    xy = np.round(centers, 3)
+    best = math.inf
+    for row, along in ((1, 0), (0, 1)):
+        order = np.lexsort((xy[:, along], xy[:, row]))
+        a, b = xy[order, row], xy[order, along]
+        gaps = np.diff(b)[(np.diff(a) == 0)]
+        gaps = gaps[gaps > 0]
+        if len(gaps):
+            best = min(best, float(gaps.min()))
+    return round(best, 4) if best < math.inf else None
+
+
+def fingerprint(text: str) -> Optional[str]:
+    """Geometry fingerprint of footprint text (e.g. a freshly generated footprint); None without pads."""
+    return summarize(parse(text))["fingerprint"]
+
+
+def _index_file(item: Tuple[str, str, int, int]) -> Tuple[Any, ...]:
+    path, pretty, mtime_ns, size = item
+    library = os.path.basename(pretty)[: -len(".pretty")] if pretty.endswith(".pretty") else os.path.basename(pretty)
+    name = os.path.basename(path)[: -len(".kicad_mod")]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            info = summarize(parse(f.read()))
+    except Exception as e:
+        return (path, pretty, library, name, mtime_ns, size, None, None, None, None, None, None, None,
+                f"{type(e).__name__}: {e}")
+    return (path, pretty, library, info["name"] or name, mtime_ns, size, info["pads"], info["pitch"], *info["bbox"],
+            info["fingerprint"], None)
+
+
+def find_libraries(paths: Iterable[str]) -> List[str]:
+    """`.pretty` directories among `paths` or anywhere below them."""
+    found: List[str] = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if path.endswith(".pretty"):
+            found.append(path)
+            continue
+        for root, dirs, _ in os.walk(path):
+            pretty = sorted(d for d in dirs if d.endswith(".pretty"))
+            found += [os.path.join(root, d) for d in pretty]
+            dirs[:] = sorted(d for d in dirs if not d.endswith(".pretty"))
+    return found
+
+
+class FootprintIndex:
+    """SQLite index of footprints in `.pretty` libraries (see module docstring)."""
+
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(SCHEMA)
+            for name, cols in INDEXES.items():
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON footprints({cols})")
+            # Older indexes gave every padless footprint the hash of nothing
+            self.conn.execute("UPDATE footprints SET fingerprint = NULL WHERE pads = 0 AND fingerprint IS NOT NULL")
+            self.conn.commit()
+        self.conn.row_factory = sqlite3.Row
+
+    def __enter__(self) -> "FootprintIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM footprints WHERE error IS NULL").fetchone()[0]
+
+    @traced(items=lambda s: s.scanned)
+    def update(self, libraries: Iterable[str], workers: Optional[int] = None) -> IndexStats:
+        """Bring the index up to date for `libraries` (`.pretty` dirs or folders containing them).
+
+        Unchanged files (same mtime and size) are skipped. Large rebuilds are
+        parsed on a process pool (`workers=None` uses every core, 1 stays
+        in-process).
+        """
+        stats = IndexStats()
+        start = time.perf_counter()
+        changed: List[Tuple[str, str, int, int]] = []
+        gone: List[str] = []
+        for pretty in find_libraries(libraries):
+            known = {row[0]: (row[1], row[2]) for row in
+                     self.conn.execute("SELECT path, mtime_ns, size FROM footprints WHERE dir = ?", (pretty,))}
+            with os.scandir(pretty) as it:
+                for entry in it:
+                    if not entry.name.endswith(".kicad_mod") or not entry.is_file():
+                        continue
+                    st = entry.stat()
+                    stats.scanned += 1
+                    if known.pop(entry.path, None) == (st.st_mtime_ns, st.st_size):
+                        stats.unchanged += 1
+                    else:
+                        changed.append((entry.path, pretty, st.st_mtime_ns, st.st_size))
+            gone += list(known)
+        if workers != 1 and len(changed) >= _POOL_THRESHOLD:
+            with multiprocessing.Pool(processes=workers) as pool:
+                rows = list(pool.imap_unordered(_index_file, changed, chunksize=64))
+        else:
+            rows = [_index_file(item) for item in changed]
+        sql = f"INSERT OR REPLACE INTO footprints ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})"
+        with self.conn:
+            self.conn.executemany(sql, rows)
+            self.conn.executemany("DELETE FROM footprints WHERE path = ?", [(p,) for p in gone])
+        stats.parsed = len(rows)
+        stats.failed = sum(1 for r in rows if r[-1] is not None)
+        stats.removed = len(gone)
+        stats.elapsed = time.perf_counter() - start
+        return stats
+
+    def _infos(self, sql: str, args: Tuple[Any, ...] = ()) -> List[FootprintInfo]:
+        return [FootprintInfo(r["path"], r["library"], r["name"], r["pads"], r["pitch"],
+                              (r["x0"], r["y0"], r["x1"], r["y1"]), r["fingerprint"])
+                for r in self.conn.execute(sql, args)]
+
+    def lookup(self, name: str, library: Optional[str] = None) -> List[FootprintInfo]:
+        """Footprints called `name` (optionally only in `library`)."""
+        if library is None:
+            return self._infos("SELECT * FROM footprints WHERE name = ? AND error IS NULL ORDER BY path", (name,))
+        return self._infos("SELECT * FROM footprints WHERE name = ? AND library = ? AND error IS NULL ORDER BY path",
+                           (name, library))
+
+    def with_fingerprint(self, fp: Optional[str]) -> List[FootprintInfo]:
+        if fp is None:
+            return []
+        return self._infos("SELECT * FROM footprints WHERE fingerprint = ? ORDER BY path", (fp,))
+
+    def match(self, text: str) -> List[FootprintInfo]:
+        """Existing footprints with the same pads as footprint `text`, e.g. before writing a generated one."""
+        return self.with_fingerprint(fingerprint(text))
+
+    def search(self, pads: Optional[int] = None, pitch: Optional[float] = None, tolerance: float = 0.005,
+               limit: int = 50) -> List[FootprintInfo]:
+        where, args = ["error IS NULL"], []
+        if pads is not None:
+            where.append("pads = ?")
+            args.append(pads)
+        if pitch is not None:
+            where.append("pitch BETWEEN ? AND ?")
+            args += [pitch - tolerance, pitch + tolerance]
+        return self._infos(f"SELECT * FROM footprints WHERE {' AND '.join(where)} ORDER BY library, name LIMIT ?",
+                           (*args, limit))
+
+    def duplicates(self) -> List[List[FootprintInfo]]:
+        """Groups of footprints with identical pad geometry (two or more files each)."""
+        rows = self._infos("SELECT * FROM footprints WHERE fingerprint IN (SELECT fingerprint FROM footprints "
+                           "WHERE error IS NULL AND fingerprint IS NOT NULL GROUP BY fingerprint HAVING COUNT(*) > 1) ORDER BY fingerprint, path")
+        groups: Dict[str, List[FootprintInfo]] = {}
+        for info in rows:
+            groups.setdefault(info.fingerprint, []).append(info)
+        return list(groups.values())
+
+    def errors(self) -> List[Tuple[str, str]]:
+        return [(r["path"], r["error"]) for r in
+                self.conn.execute("SELECT path, error FROM footprints WHERE error IS NOT NULL ORDER BY path")]
@@ -4,6 +4,13 @@ from dataclasses import dataclass
 from typing import List
 import os
 
+from pcbai.core.profiler import traced
+from pcbai.steps.pad_array import quad, format_smd_pads
+
+
+# Bump whenever generated output changes; invalidates footprint cache entries
+GENERATOR_VERSION = 1
+
 
 @dataclass
 class QfnParams:
@@ -46,29 +53,10 @@ class KiCadModuleWriter:
         return path
 
 
-def _generate_quad_pads(pins: int, pitch: float, pad_l: float, pad_w: float, row_y: float, row_x: float, start_num: int, vertical: bool, mask_expansion: float, paste_ratio: float) -> List[str]:
-    lines: List[str] = []
-    per_side = pins // 4
-    x0 = - (pitch * (per_side - 1)) / 2.0
-    for i in range(per_side):
-        x = x0 + i * pitch
-        n = start_num + i
-        if vertical:
-            atx, aty = row_x, x
-            size_x, size_y = pad_l, pad_w
-        else:
-            atx, aty = x, row_y
-            size_x, size_y = pad_w, pad_l
-        lines.append(
-            f"  (pad {n} smd rect (at {atx:.3f} {aty:.3f}) (size {size_x:.3f} {size_y:.3f}) (layers F.Cu F.Paste F.Mask) (solder_mask_margin {mask_expansion:.3f}) (solder_paste_margin_ratio {paste_ratio - 1.0:.3f}))"
-        )
-    return lines
-
-
+@traced()
 def generate_qfn(params: QfnParams) -> str:
     if params.pins % 4 != 0:
         raise ValueError("QFN pins must be multiple of 4")
-    per_side = params.pins // 4
     lines: List[str] = []
     lines.append(f"(module {params.name} (layer F.Cu) (tedit 5B3079AF)")
     lines.append("  (attr smd)")
@@ -85,10 +73,9 @@ def generate_qfn(params: QfnParams) -> str:
 
     # Pads by side
     offset = hw + params.pad_l/2.0
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=+offset, row_x=+offset, start_num=1,  vertical=False, mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=+offset, row_x=-offset, start_num=1+per_side, vertical=True,  mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=-offset, row_x=-offset, start_num=1+2*per_side, vertical=False, mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=-offset, row_x=+offset, start_num=1+3*per_side, vertical=True,  mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
+    pads = quad(params.pins, params.pitch, offset, params.pad_l, params.pad_w)
+    if len(pads):
+        lines.append(format_smd_pads(pads, params.mask_expansion, params.paste_ratio))
 
     # Exposed pad
     if params.ep_l and params.ep_w:
@@ -100,10 +87,10 @@ def generate_qfn(params: QfnParams) -> str:
     return "\n".join(lines) + "\n"
 
 
+@traced()
 def generate_qfp(params: QfpParams) -> str:
     if params.pins % 4 != 0:
         raise ValueError("QFP pins must be multiple of 4")
-    per_side = params.pins // 4
     lines: List[str] = []
     lines.append(f"(module {params.name} (layer F.Cu) (tedit 5B3079AF)")
     lines.append("  (attr smd)")
@@ -118,10 +105,9 @@ def generate_qfp(params: QfpParams) -> str:
 
     # Pads (gullwing leads): extend outside body by gullwing_ext
     offset = hw + params.pad_l/2.0 + params.gullwing_ext
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=+offset, row_x=+offset, start_num=1,  vertical=False, mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=+offset, row_x=-offset, start_num=1+per_side, vertical=True,  mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=-offset, row_x=-offset, start_num=1+2*per_side, vertical=False, mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
-    lines += _generate_quad_pads(params.pins, params.pitch, params.pad_l, params.pad_w, row_y=-offset, row_x=+offset, start_num=1+3*per_side, vertical=True,  mask_expansion=params.mask_expansion, paste_ratio=params.paste_ratio)
+    pads = quad(params.pins, params.pitch, offset, params.pad_l, params.pad_w)
+    if len(pads):
+        lines.append(format_smd_pads(pads, params.mask_expansion, params.paste_ratio))
 
     lines.append(")")
     return "\n".join(lines) + "\n"
@@ -1,21 +1,34 @@
 from __future__ import annotations
 
 import os
-from typing import Dict
+from typing import Optional, Union
 
-from pcbai.core.config import settings
+from pcbai.steps.gerber_writer import BoardArtwork, write_gerbers
+from pcbai.steps.kicad_jobs import KicadError, run_job
 
+BACKENDS = ("kicad", "native")
 
-def export_gerbers(board_file: str, outdir: str) -> str:
+
+def export_gerbers(board: Union[str, BoardArtwork], outdir: str, backend: Optional[str] = None,
+                   workers: Optional[int] = None) -> str:
+    """Export Gerbers and drill files for `board` into `outdir`.
+
+    `backend="native"` (the default for a `BoardArtwork`) writes them in
+    process, layers in parallel, with no KiCad install. `backend="kicad"`
+    (the default for a `.kicad_pcb` path) runs `kicad-cli` with the
+    configured timeout and raises `KicadError` (exit code, stderr) if it
+    fails or is missing.
+    """
+    backend = backend or ("native" if isinstance(board, BoardArtwork) else "kicad")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown Gerber backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
     os.makedirs(outdir, exist_ok=True)
-    # Try kicad-cli if available
-    try:
-        import subprocess
-        subprocess.run([settings.kicad_cli, 'pcb', 'export', 'gerbers', '--output', outdir, board_file], check=True)
+    if backend == "native":
+        if not isinstance(board, BoardArtwork):
+            raise ValueError("The native Gerber backend needs board geometry (BoardArtwork), not a board file")
+        write_gerbers(board, outdir, workers=workers)
         return outdir
-    except Exception:
-        # Fallback marker if kicad-cli not present
-        marker = os.path.join(outdir, "GERBERS_READY.txt")
-        with open(marker, "w") as f:
-            f.write(f"Gerbers would be exported for: {board_file}\n")
-        return marker
+    result = run_job(board, outdir, ("gerbers",))
+    if not result.ok:
+        raise KicadError(result)
+    return outdir
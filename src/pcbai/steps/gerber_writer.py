@@ -0,0 +1,369 @@
+"""Native Gerber X2 (RS-274X) and Excellon writer.
+
+Writes copper, solder mask, paste, silkscreen, board outline and drill
+files straight from placed pad, track and via geometry, without going
+through a `.kicad_pcb` and `kicad-cli`. Geometry is held in NumPy arrays
+and every layer is formatted in a few batched `%` operations. Layers are
+independent, so `write_gerbers` fans them out over a process pool with
+one output file per task.
+
+Coordinates follow KiCad's export: millimetres, format 4.6, Y negated
+(board Y grows downward, Gerber Y upward).
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from pcbai.core.profiler import traced
+from pcbai.steps.drc import Footprint, PadDetail, parse_footprint
+from pcbai.steps.netlist import Netlist
+
+GENERATOR = "pcbai,gerber_writer,1"
+_SHAPES = {"circle": "C", "oval": "O"}  # everything else (rect, roundrect, trapezoid, custom) is drawn as R
+_MASK_F, _MASK_B, _PASTE_F, _PASTE_B = 1, 2, 4, 8
+
+
+def _attr(value: str) -> str:
+    # Gerber attribute fields cannot contain the field separator or the command delimiters
+    return value.replace(",", "_").replace("*", "_").replace("%", "_")
+
+
+@dataclass
+class BoardArtwork:
+    """Placed copper and legend geometry of one board, as flat arrays (mm, board coordinates)."""
+
+    width: float
+    height: float
+    layers: int = 2
+    pad_xy: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    pad_size: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    pad_shape: List[str] = field(default_factory=list)          # Gerber aperture letter: R, C or O
+    pad_copper: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))  # bit k: copper layer k
+    pad_sides: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))   # mask/paste bits
+    pad_mask_margin: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    pad_paste_ratio: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    pad_drill: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    pad_plated: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=bool))
+    pad_net: List[str] = field(default_factory=list)
+    pad_ref: List[str] = field(default_factory=list)
+    pad_pin: List[str] = field(default_factory=list)
+    track_xy: np.ndarray = field(default_factory=lambda: np.zeros((0, 4)))
+    track_width: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    track_layer: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+    track_net: List[str] = field(default_factory=list)
+    via_xy: np.ndarray = field(default_factory=lambda: np.zeros((0, 2)))
+    via_diameter: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    via_drill: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    via_net: List[str] = field(default_factory=list)
+    silk: np.ndarray = field(default_factory=lambda: np.zeros((0, 4)))  # legend line segments
+    silk_width: float = 0.12
+
+    @classmethod
+    def from_layout(cls, positions: Mapping[str, Tuple[float, float]], footprints: Mapping[str, Union[Footprint, str]],
+                    board: Tuple[float, float], netlist: Optional[Netlist] = None, routing: Optional[Mapping] = None,
+                    layers: int = 2, via_drill: float = 0.3) -> "BoardArtwork":
+        """Artwork for footprints placed at `positions` (ref -> origin) plus `route_pcb` tracks and vias.
+
+        The legend gets each footprint's F.Fab body outline.
+        """
+        parsed: Dict[str, Footprint] = {}
+        xy, size, shape, copper, sides, margin, paste, drill, plated = [], [], [], [], [], [], [], [], []
+        nets, refs, pins, silk = [], [], [], []
+        all_copper = (1 << layers) - 1
+        for ref, (ox, oy) in positions.items():
+            fp = footprints[ref]
+            if isinstance(fp, str):
+                if fp not in parsed:
+                    parsed[fp] = parse_footprint(fp, layers)
+                fp = parsed[fp]
+            details = fp.details or [PadDetail()] * len(fp.pads)
+            for (number, p), d in zip(fp.pads, details):
+                xy.append((ox + p.x, oy + p.y))
+                size.append((p.w, p.h))
+                shape.append(_SHAPES.get(d.shape, "R"))
+                if d.kind == "np_thru_hole":
+                    copper.append(0)  # a bare hole: drilled, never plated
+                else:
+                    copper.append(all_copper if p.layers is None else sum(1 << k for k in p.layers if k < layers))
+                bits = 0
+                for name in d.layers:
+                    bits |= {"F.Mask": _MASK_F, "B.Mask": _MASK_B, "*.Mask": _MASK_F | _MASK_B,
+                             "F.Paste": _PASTE_F, "B.Paste": _PASTE_B, "*.Paste": _PASTE_F | _PASTE_B}.get(name, 0)
+                sides.append(bits)
+                margin.append(d.mask_margin)
+                paste.append(d.paste_ratio)
+                drill.append(d.drill)
+                plated.append(d.kind != "np_thru_hole")
+                net = None
+                if netlist is not None:
+                    try:
+                        net = netlist.net_of(ref, number)
+                    except KeyError:
+                        pass
+                nets.append(_attr(net or ""))
+                refs.append(_attr(ref))
+                pins.append(_attr(number))
+            if fp.body is not None:
+                x0, y0, x1, y1 = fp.body
+                silk += [(ox + x0, oy + y0, ox + x1, oy + y0), (ox + x1, oy + y0, ox + x1, oy + y1),
+                         (ox + x1, oy + y1, ox + x0, oy + y1), (ox + x0, oy + y1, ox + x0, oy + y0)]
+        tracks = list((routing or {}).get("tracks", ()))
+        vias = list((routing or {}).get("vias", ()))
+        return cls(
+            width=board[0], height=board[1], layers=layers,
+            pad_xy=np.array(xy, dtype=float).reshape(-1, 2), pad_size=np.array(size, dtype=float).reshape(-1, 2),
+            pad_shape=shape, pad_copper=np.array(copper, dtype=np.int64), pad_sides=np.array(sides, dtype=np.int64),
+            pad_mask_margin=np.array(margin, dtype=float), pad_paste_ratio=np.array(paste, dtype=float),
+            pad_drill=np.array(drill, dtype=float), pad_plated=np.array(plated, dtype=bool),
+            pad_net=nets, pad_ref=refs, pad_pin=pins,
+            track_xy=np.array([(*t["start"], *t["end"]) for t in tracks], dtype=float).reshape(-1, 4),
+            track_width=np.array([t["width"] for t in tracks], dtype=float),
+            track_layer=np.array([t["layer"] for t in tracks], dtype=np.int64),
+            track_net=[_attr(t["net"]) for t in tracks],
+            via_xy=np.array([v["at"] for v in vias], dtype=float).reshape(-1, 2),
+            via_diameter=np.array([v["diameter"] for v in vias], dtype=float),
+            via_drill=np.array([v.get("drill", via_drill) for v in vias], dtype=float),
+            via_net=[_attr(v["net"]) for v in vias],
+            silk=np.array(silk, dtype=float).reshape(-1, 4),
+        )
+
+    def layer_names(self) -> List[str]:
+        """Every file this board produces: copper layers top to bottom, then mask, paste, legend, outline, drills."""
+        copper = ["F_Cu"] + [f"In{k}_Cu" for k in range(1, self.layers - 1)] + (["B_Cu"] if self.layers > 1 else [])
+        names = copper + ["F_Mask", "B_Mask", "F_Paste", "B_Paste", "F_SilkS", "Edge_Cuts", "PTH"]
+        if (~self.pad_plated & (self.pad_drill > 0)).any():
+            names.append("NPTH")
+        return names
+
+
+# -- Gerber -----------------------------------------------------------------
+
+def _coords(xy: np.ndarray) -> Tuple[List[int], List[int]]:
+    xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+    return np.rint(xy[:, 0] * 1e6).astype(np.int64).tolist(), np.rint(-xy[:, 1] * 1e6).astype(np.int64).tolist()
+
+
+class _Apertures:
+    """D-code table for one file; definitions are emitted ahead of the objects that use them."""
+
+    def __init__(self) -> None:
+        self.codes: Dict[Tuple[str, float, float, str], int] = {}
+        self.defs: List[str] = []
+
+    def get(self, shape: str, w: float, h: float = 0.0, function: str = "") -> int:
+        key = (shape, round(w, 6), round(h, 6), function)
+        code = self.codes.get(key)
+        if code is None:
+            code = self.codes[key] = 10 + len(self.codes)
+            params = f"{w:.6f}" if shape == "C" else f"{w:.6f}X{h:.6f}"
+            if function:
+                self.defs.append(f"%TA.AperFunction,{function}*%\n%ADD{code}{shape},{params}*%\n%TD*%")
+            else:
+                self.defs.append(f"%ADD{code}{shape},{params}*%")
+        return code
+
+
+def _header(function: str, polarity: str = "Positive") -> List[str]:
+    return [f"%TF.GenerationSoftware,{GENERATOR}*%", f"%TF.FileFunction,{function}*%",
+            f"%TF.FilePolarity,{polarity}*%", "%FSLAX46Y46*%", "%MOMM*%", "%LPD*%", "G01*"]
+
+
+def _flashes(ap: _Apertures, xy: np.ndarray, size: np.ndarray, shape: Sequence[str], function: str,
+             attrs: Optional[Tuple[List[str], List[str], List[str]]] = None) -> List[str]:
+    """Pad flashes grouped by aperture; `attrs` (net, ref, pin) adds X2 object attributes."""
+    out: List[str] = []
+    if not len(xy):
+        return out
+    xs, ys = _coords(xy)
+    groups: Dict[int, List[int]] = {}
+    for i, (s, (w, h)) in enumerate(zip(shape, np.asarray(size).tolist())):
+        groups.setdefault(ap.get(s, w, h, function), []).append(i)
+    for code, idx in groups.items():
+        out.append(f"D{code}*")
+        if attrs is None:
+            line = "X%dY%dD03*"
+            values = chain.from_iterable((xs[i], ys[i]) for i in idx)
+        else:
+            nets, refs, pins = attrs
+            line = "%%TO.N,%s*%%\n%%TO.P,%s,%s*%%\nX%dY%dD03*\n%%TD*%%"
+            values = chain.from_iterable((nets[i], refs[i], pins[i], xs[i], ys[i]) for i in idx)
+        out.append("\n".join([line] * len(idx)) % tuple(values))
+    return out
+
+
+def _strokes(ap: _Apertures, segs: np.ndarray, width: Sequence[float], function: str,
+             nets: Optional[Sequence[str]] = None) -> List[str]:
+    out: List[str] = []
+    if not len(segs):
+        return out
+    x1, y1 = _coords(segs[:, :2])
+    x2, y2 = _coords(segs[:, 2:])
+    groups: Dict[int, List[int]] = {}
+    for i, w in enumerate(np.asarray(width).tolist()):
+        groups.setdefault(ap.get("C", w, function=function), []).append(i)
+    for code, idx in groups.items():
+        out.append(f"D{code}*")
+        if nets is None:
+            line = "X%dY%dD02*\nX%dY%dD01*"
+            values = chain.from_iterable((x1[i], y1[i], x2[i], y2[i]) for i in idx)
+        else:
+            line = "%%TO.N,%s*%%\nX%dY%dD02*\nX%dY%dD01*\n%%TD*%%"
+            values = chain.from_iterable((nets[i], x1[i], y1[i], x2[i], y2[i]) for i in idx)
+        out.append("\n".join([line] * len(idx)) % tuple(values))
+    return out
+
+
+def _copper(art: BoardArtwork, k: int) -> Tuple[str, List[str], List[str]]:
+    side = "Top" if k == 0 else "Bot" if k == art.layers - 1 else "Inr"
+    ap = _Apertures()
+    sel = (art.pad_copper >> k) & 1 == 1
+    smd = np.flatnonzero(sel & (art.pad_drill == 0))
+    tht = np.flatnonzero(sel & (art.pad_drill > 0))
+    body: List[str] = []
+    for group, function in ((smd, "SMDPad,CuDef"), (tht, "ComponentPad")):
+        if len(group):
+            pick = group.tolist()
+            body += _flashes(ap, art.pad_xy[group], art.pad_size[group], [art.pad_shape[i] for i in pick], function,
+                             ([art.pad_net[i] for i in pick], [art.pad_ref[i] for i in pick],
+                              [art.pad_pin[i] for i in pick]))
+    on = np.flatnonzero(art.track_layer == k).tolist()
+    if on:
+        body += _strokes(ap, art.track_xy[on], art.track_width[on], "Conductor", [art.track_net[i] for i in on])
+    if len(art.via_xy):
+        xs, ys = _coords(art.via_xy)
+        groups: Dict[int, List[int]] = {}
+        for i, d in enumerate(art.via_diameter.tolist()):
+            groups.setdefault(ap.get("C", d, function="ViaPad"), []).append(i)
+        for code, vias in groups.items():
+            body.append(f"D{code}*")
+            body.append("\n".join(["%%TO.N,%s*%%\nX%dY%dD03*\n%%TD*%%"] * len(vias))
+                        % tuple(chain.from_iterable((art.via_net[i], xs[i], ys[i]) for i in vias)))
+    return f"Copper,L{k + 1},{side}", ap.defs, body
+
+
+def _openings(art: BoardArtwork, bit: int, paste: bool) -> Tuple[List[str], List[str]]:
+    ap = _Apertures()
+    sel = np.flatnonzero((art.pad_sides & bit) != 0)
+    if paste:
+        sel = sel[art.pad_drill[sel] == 0]  # no paste on plated holes
+        size = art.pad_size[sel] * (1 + art.pad_paste_ratio[sel])[:, None]
+    else:
+        size = art.pad_size[sel] + 2 * art.pad_mask_margin[sel][:, None]
+    body = _flashes(ap, art.pad_xy[sel], np.maximum(size, 0.0), [art.pad_shape[i] for i in sel.tolist()], "")
+    return ap.defs, body
+
+
+def iter_layer(art: BoardArtwork, name: str) -> Iterator[str]:
+    """Stream one output file (a name from `art.layer_names()`) as text chunks."""
+    if name in ("PTH", "NPTH"):
+        yield from _iter_drill(art, plated=name == "PTH")
+        return
+    polarity = "Positive"
+    if name.endswith("_Cu"):
+        k = 0 if name == "F_Cu" else art.layers - 1 if name == "B_Cu" else int(name[2:-3])
+        function, defs, body = _copper(art, k)
+    elif name in ("F_Mask", "B_Mask"):
+        function, polarity = f"Soldermask,{'Top' if name == 'F_Mask' else 'Bot'}", "Negative"
+        defs, body = _openings(art, _MASK_F if name == "F_Mask" else _MASK_B, paste=False)
+    elif name in ("F_Paste", "B_Paste"):
+        function = f"Paste,{'Top' if name == 'F_Paste' else 'Bot'}"
+        defs, body = _openings(art, _PASTE_F if name == "F_Paste" else _PASTE_B, paste=True)
+    elif name == "F_SilkS":
+        function, ap = "Legend,Top", _Apertures()
+        body = _strokes(ap, art.silk, [art.silk_width] * len(art.silk), "")
+        defs = ap.defs
+    elif name == "Edge_Cuts":
+        function, ap = "Profile,NP", _Apertures()
+        W, H = art.width, art.height
+        outline = np.array([(0, 0, W, 0), (W, 0, W, H), (W, H, 0, H), (0, H, 0, 0)], dtype=float)
+        body = _strokes(ap, outline, [0.1] * 4, "Profile")
+        defs = ap.defs
+    else:
+        raise ValueError(f"Unknown layer: {name!r} (expected one of {', '.join(art.layer_names())})")
+    yield "\n".join(_header(function, polarity)) + "\n"
+    if defs:
+        yield "\n".join(defs) + "\n"
+    for chunk in body:
+        yield chunk + "\n"
+    yield "M02*\n"
+
+
+# -- Excellon ---------------------------------------------------------------
+
+def _iter_drill(art: BoardArtwork, plated: bool) -> Iterator[str]:
+    holes = art.pad_drill > 0
+    sel = np.flatnonzero(holes & (art.pad_plated if plated else ~art.pad_plated))
+    xy = [art.pad_xy[sel]]
+    dia = [art.pad_drill[sel]]
+    if plated and len(art.via_xy):
+        xy.append(art.via_xy)
+        dia.append(art.via_drill)
+    xy_all = np.concatenate(xy)
+    dia_all = np.round(np.concatenate(dia), 3)
+    kind = "Plated,1,{},PTH".format(art.layers) if plated else "NonPlated,1,{},NPTH".format(art.layers)
+    yield (f"M48\n; #@! TF.GenerationSoftware,{GENERATOR}\n; #@! TF.FileFunction,{kind}\n"
+           "FMAT,2\nMETRIC\n")
+    tools = sorted(set(dia_all.tolist()))
+    for t, d in enumerate(tools, start=1):
+        yield f"T{t}C{d:.3f}\n"
+    yield "%\nG90\nG05\n"
+    for t, d in enumerate(tools, start=1):
+        pick = xy_all[dia_all == d]
+        yield f"T{t}\n"
+        yield "\n".join(["X%.3fY%.3f"] * len(pick)) % tuple(chain.from_iterable(zip(pick[:, 0].tolist(),
+                                                                                      (-pick[:, 1]).tolist()))) + "\n"
+    yield "T0\nM30\n"
+
+
+# -- files ------------------------------------------------------------------
+
+def _filename(prefix: str, name: str) -> str:
+    return f"{prefix}-{name}.drl" if name in ("PTH", "NPTH") else f"{prefix}-{name}.gbr"
+
+
+def write_layer(art: BoardArtwork, name: str, outdir: str, prefix: str = "board") -> str:
+    path = os.path.join(outdir, _filename(prefix, name))
+    tmp = f"{path}.part"
+    with open(tmp, "w", encoding="ascii", newline="\n") as f:
+        for chunk in iter_layer(art, name):
+            f.write(chunk)
+    os.replace(tmp, path)
+    return path
+
+
+# Per-process artwork, set up once by the pool initializer
+_artwork: Optional[Tuple[BoardArtwork, str, str]] = None
+
+
+def _init_worker(art: BoardArtwork, outdir: str, prefix: str) -> None:
+    global _artwork
+    _artwork = (art, outdir, prefix)
+
+
+def _write_one(name: str) -> Tuple[str, str]:
+    art, outdir, prefix = _artwork  # type: ignore[misc]
+    return name, write_layer(art, name, outdir, prefix)
+
+
+@traced(items=lambda paths: len(paths))
+def write_gerbers(art: BoardArtwork, outdir: str, prefix: str = "board", workers: Optional[int] = None,
+                  layers: Optional[Sequence[str]] = None) -> Dict[str, str]:
+    """Write every layer (or just `layers`) to `outdir`; returns {layer: path}.
+
+    Layers are spread over a process pool, one file per task (`workers=None`
+    uses up to one process per layer, `workers=1` runs in-process).
+    """
+    os.makedirs(outdir, exist_ok=True)
+    names = list(layers or art.layer_names())
+    workers = min(workers or os.cpu_count() or 1, len(names))
+    if workers <= 1:
+        return {name: write_layer(art, name, outdir, prefix) for name in names}
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(art, outdir, prefix)) as pool:
+        done = dict(pool.imap_unordered(_write_one, names))
+    return {name: done[name] for name in names}
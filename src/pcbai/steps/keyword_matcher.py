@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+import string
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pcbai.core.profiler import traced
+
+
+# category -> synonyms; the category name itself always matches too
+DEFAULT_VOCABULARY: Dict[str, List[str]] = {
+    "bluetooth": ["ble", "bluetooth le", "bluetooth low energy"],
+    "wifi": ["wi-fi", "wlan", "802.11"],
+    "usb": ["usb-c", "usb c", "type-c", "usb 2.0"],
+    "buck": ["step-down", "step down", "buck converter", "dc-dc", "dc/dc"],
+    "lipo": ["li-po", "li-ion", "lithium", "lipo charger", "battery charger"],
+    "mcu": ["microcontroller", "micro-controller", "mcus"],
+    "adc": ["analog-to-digital", "analog to digital"],
+    "opamp": ["op-amp", "op amp", "operational amplifier"],
+}
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+_NUM = r"(\d+(?:\.\d+)?)"
+_PREFIX = r"(k|m|u|µ|μ|n|p|g)?"
+_UNIT = r"(v|a|w|hz|f|\s?ohms?|Ω)"
+# "3.3v", "500 ma", "2.4ghz", "10k ohm", "4.5-28v", "4.5v to 28v"; matched on lower-cased text, but the
+# prefix is read back from the original so "M" (mega) and "m" (milli) stay apart
+_QTY_RE = re.compile(
+    rf"{_NUM}(?:\s*(?:{_PREFIX}{_UNIT})?\s*(?:-|–|~|to)\s*{_NUM})?\s*{_PREFIX}{_UNIT}(?![a-z0-9])"
+)
+# lower-cased unit -> (quantity, display unit)
+_UNITS = {"v": ("voltage", "V"), "a": ("current", "A"), "w": ("power", "W"), "hz": ("frequency", "Hz"),
+          "f": ("capacitance", "F"), "ohm": ("resistance", "ohm"), "ohms": ("resistance", "ohm"),
+          "Ω": ("resistance", "ohm")}
+_SCALE = {None: 1.0, "k": 1e3, "m": 1e-3, "M": 1e6, "u": 1e-6, "µ": 1e-6, "μ": 1e-6, "n": 1e-9, "p": 1e-12, "g": 1e9}
+_MIN_WORDS = ("at least", "min", ">=", "≥", "minimum", "above")
+_MAX_WORDS = ("up to", "max", "<=", "≤", "maximum", "below", "under")
+
+
+@dataclass(frozen=True)
+class Match:
+    term: str
+    category: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Constraint:
+    """A numeric spec found in text, in base units (V, A, W, Hz, F, ohm)."""
+    quantity: str   # voltage, current, power, frequency, capacitance, resistance
+    unit: str
+    lo: float
+    hi: float
+    bound: str      # "min", "max" or "nominal", from the words just before it
+    start: int
+    end: int
+
+
+def _scale(text: str, m: "re.Match[str]", group: int, unit: str) -> float:
+    """Multiplier for the prefix in `group`, taken from the original-case `text`."""
+    prefix = text[m.start(group):m.end(group)] if m.group(group) else None
+    if prefix in ("m", "M") and unit == "hz":
+        return 1e6  # "MHz" however it is cased; nobody asks for millihertz
+    return _SCALE[prefix if prefix in (None, "M") else prefix.lower()]
+
+
+def _constraint(text: str, low: str, m: "re.Match[str]") -> Constraint:
+    unit = m.group(6).lstrip()
+    hi_scale = _scale(text, m, 5, unit)
+    hi = float(m.group(1)) * hi_scale
+    lo = hi
+    if m.group(4) is not None:
+        lo_scale = _scale(text, m, 2, unit) if m.group(3) else hi_scale
+        lo, hi = sorted((float(m.group(1)) * lo_scale, float(m.group(4)) * hi_scale))
+    before = low[max(0, m.start() - 12):m.start()]
+    bound = "nominal"
+    if any(w in before for w in _MIN_WORDS):
+        bound = "min"
+    elif any(w in before for w in _MAX_WORDS):
+        bound = "max"
+    quantity, display = _UNITS[unit]
+    return Constraint(quantity, display, lo, hi, bound, m.start(), m.end())
+
+
+class KeywordMatcher:
+    """Aho-Corasick matcher over a category/synonym vocabulary.
+
+    The automaton is built once; `scan` then finds every vocabulary term
+    (whole words, case-insensitive) and every numeric spec ("3.3 V",
+    "500mA", "4.5-28V") in one pass over the text, however large the
+    vocabulary.
+    """
+
+    def __init__(self, vocabulary: Mapping[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        self._terms: List[Tuple[str, str]] = []  # term id -> (term, category)
+        self.order: Dict[str, int] = {}          # category -> vocabulary position
+        seen = set()
+        for category, synonyms in vocabulary.items():
+            category = category.strip().lower()
+            self.order.setdefault(category, len(self.order))
+            for term in (category, *synonyms):
+                term = term.translate(_ASCII_LOWER).strip()
+                if term and (term, category) not in seen:
+                    seen.add((term, category))
+                    self._add(term, len(self._terms))
+                    self._terms.append((term, category))
+        self._link()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _add(self, term: str, tid: int) -> None:
+        goto, node = self._goto, 0
+        for ch in term:
+            nxt = goto[node].get(ch)
+            if nxt is None:
+                nxt = goto[node][ch] = len(goto)
+                goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        self._out[node] += (tid,)
+
+    def _link(self) -> None:
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = list(goto[0].values())
+        for node in queue:  # breadth-first; the list grows as we go
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                out[nxt] += out[fail[nxt]]
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordMatcher":
+        """Load a vocabulary: JSON {category: [synonyms]} or CSV rows of term,category."""
+        if path.lower().endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        vocab: Dict[str, List[str]] = {}
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                if len(row) >= 2 and row[0].strip() and not row[0].startswith("#"):
+                    vocab.setdefault(row[1].strip(), []).append(row[0])
+        return cls(vocab)
+
+    @traced()
+    def scan(self, text: str) -> Tuple[List[Match], List[Constraint]]:
+        """All term matches and numeric constraints in `text`, in text order."""
+        low = text.translate(_ASCII_LOWER)
+        goto, fail, out, terms = self._goto, self._fail, self._out, self._terms
+        n = len(low)
+        matches: List[Match] = []
+        constraints: List[Constraint] = []
+        qty_end = 0
+        node = 0
+        prev = ""
+        for i, ch in enumerate(low):
+            if ch.isdigit() and i >= qty_end and not (prev.isalnum() or prev == "."):
+                m = _QTY_RE.match(low, i)
+                if m:
+                    constraints.append(_constraint(text, low, m))
+                    qty_end = m.end()
+            prev = ch
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                after_ok = i + 1 >= n or not low[i + 1].isalnum()
+                for tid in out[node]:
+                    term, category = terms[tid]
+                    start = i + 1 - len(term)
+                    if after_ok and (start == 0 or not low[start - 1].isalnum()):
+                        matches.append(Match(term, category, start, i + 1))
+        matches.sort(key=lambda m: (m.start, -m.end))
+        return matches, constraints
+
+    def categories(self, matches: Iterable[Match]) -> List[str]:
+        """Distinct matched categories in vocabulary order."""
+        return sorted({m.category for m in matches}, key=self.order.__getitem__)
+
+
+@lru_cache(maxsize=None)
+def default_matcher() -> KeywordMatcher:
+    return KeywordMatcher(DEFAULT_VOCABULARY)
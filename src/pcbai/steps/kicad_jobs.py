@@ -0,0 +1,165 @@
+"""Bounded, retrying `kicad-cli` job runner for bulk fab output.
+
+One board is one job: `kicad-cli pcb export gerbers` (and optionally
+`drill`) into the board's own output directory. The work happens in the
+kicad-cli child processes, so jobs run on a thread pool and `workers`
+boards export at once. Every attempt has a timeout. Failed or timed-out
+attempts are retried with exponential backoff, and each board gets a
+`JobResult` with the exit code, captured stderr and the files written.
+A missing binary or a broken board is a failed result, never a silent
+success.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from pcbai.core.config import settings
+from pcbai.core.profiler import traced
+
+# export name -> kicad-cli subcommand
+EXPORTS: Dict[str, List[str]] = {
+    "gerbers": ["pcb", "export", "gerbers"],
+    "drill": ["pcb", "export", "drill"],
+}
+
+
+@dataclass
+class JobResult:
+    board: str
+    outdir: str
+    returncode: Optional[int] = None
+    attempts: int = 0
+    seconds: float = 0.0
+    stderr: str = ""
+    error: Optional[str] = None
+    files: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def to_dict(self) -> Dict:
+        return dict(asdict(self), ok=self.ok)
+
+
+@dataclass
+class JobSummary:
+    total: int = 0
+    ok: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    results: List[JobResult] = field(default_factory=list)
+
+
+class KicadError(RuntimeError):
+    """A kicad-cli job failed; `result` has the exit code and stderr."""
+
+    def __init__(self, result: JobResult):
+        super().__init__(f"{result.board}: {result.error}")
+        self.result = result
+
+
+def _text(data) -> str:
+    if data is None:
+        return ""
+    return data.decode("utf-8", "replace") if isinstance(data, bytes) else data
+
+
+def _last_line(text: str) -> str:
+    lines = [line for line in text.strip().splitlines() if line.strip()]
+    return lines[-1].strip() if lines else ""
+
+
+def run_job(board: str, outdir: str, exports: Sequence[str] = ("gerbers",), kicad_cli: Optional[str] = None,
+            timeout: Optional[float] = None, retries: int = 1, backoff: float = 1.0) -> JobResult:
+    """Run every export in `exports` for one board, stopping at the first one that keeps failing."""
+    kicad_cli = kicad_cli or settings.kicad_cli
+    timeout = settings.kicad_timeout if timeout is None else timeout
+    start = time.perf_counter()
+    result = JobResult(board=board, outdir=outdir)
+    if not os.path.isfile(board):
+        result.error = "board file not found"
+        return result
+    os.makedirs(outdir, exist_ok=True)
+    for export in exports:
+        cmd = [kicad_cli, *EXPORTS[export], "--output", outdir + os.sep, board]
+        for attempt in range(retries + 1):
+            result.attempts += 1
+            try:
+                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout or None)
+            except OSError as e:
+                # Missing or non-executable binary: retrying will not help
+                result.error = f"cannot run {kicad_cli}: {e}"
+                result.seconds = time.perf_counter() - start
+                return result
+            except subprocess.TimeoutExpired as e:
+                result.returncode = None
+                result.stderr = _text(e.stderr)
+                result.error = f"{export}: timed out after {timeout:g}s"
+            else:
+                result.returncode = proc.returncode
+                result.stderr = proc.stderr
+                if proc.returncode == 0:
+                    result.error = None
+                    break
+                detail = _last_line(proc.stderr)
+                result.error = f"{export}: exit code {proc.returncode}" + (f": {detail}" if detail else "")
+            if attempt < retries:
+                time.sleep(backoff * 2 ** attempt)
+        if result.error is not None:
+            break
+    result.files = sorted(os.path.join(outdir, name) for name in os.listdir(outdir))
+    result.seconds = time.perf_counter() - start
+    return result
+
+
+def _outdirs(boards: Sequence[str], outroot: str) -> List[str]:
+    # One directory per board, named after the file; same-named boards from different folders get a suffix
+    seen: Dict[str, int] = {}
+    out = []
+    for board in boards:
+        stem = os.path.splitext(os.path.basename(board))[0]
+        n = seen[stem] = seen.get(stem, 0) + 1
+        out.append(os.path.join(outroot, stem if n == 1 else f"{stem}-{n}"))
+    return out
+
+
+def run_jobs(boards: Iterable[str], outroot: str, workers: Optional[int] = None, **options) -> Iterator[JobResult]:
+    """Export every board into `outroot/<board name>/`, yielding results in completion order.
+
+    At most `workers` kicad-cli processes run at once (default: one per
+    core). `options` are passed to `run_job` (exports, kicad_cli, timeout,
+    retries, backoff).
+    """
+    boards = list(boards)
+    if not boards:
+        return
+    workers = max(1, min(workers or os.cpu_count() or 1, len(boards)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kicad-cli") as pool:
+        futures = [pool.submit(run_job, board, outdir, **options) for board, outdir in zip(boards, _outdirs(boards, outroot))]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+@traced(items=lambda s: s.total)
+def export_boards(boards: Iterable[str], outroot: str, workers: Optional[int] = None,
+                  on_result: Optional[Callable[[JobResult], None]] = None, **options) -> JobSummary:
+    """Run `run_jobs` to completion and return counts plus every result."""
+    summary = JobSummary()
+    start = time.perf_counter()
+    for res in run_jobs(boards, outroot, workers=workers, **options):
+        summary.total += 1
+        if res.ok:
+            summary.ok += 1
+        else:
+            summary.failed += 1
+        summary.results.append(res)
+        if on_result is not None:
+            on_result(res)
+    summary.elapsed = time.perf_counter() - start
+    return summary
@@ -0,0 +1,470 @@
+"""Grid-based A*/Lee maze router for simple multi-layer boards.
+
+The board is rasterized at `resolution` mm into two (layers, ny, nx) int32
+grids: `hard` holds fixed copper (pads, net id) and keep-outs (-2), `track`
+holds routed copper (net id). Free cells are -1.
+
+Each two-terminal connection is searched with A* inside a window around
+its terminals. Clearance is turned into a blocked-cell mask for the window
+by dilating foreign copper with a square kernel (NumPy, separable), so the
+Python search loop only reads one byte per cell. Layer changes cost
+`via_cost` and need room for a via on every layer.
+
+Foreign tracks are passable at `rip_penalty` per cell rather than blocked:
+when the cheapest path crosses one, that net is ripped up and queued again
+(each at most `max_ripups` times, after which its tracks are fixed).
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+
+from pcbai.core.profiler import traced
+
+FREE = -1
+KEEPOUT = -2
+
+_HARD, _SOFT = 2, 1
+_FIX = 64  # A* costs in 1/64 of a cell step, so weighted heuristics stay integers
+
+
+@dataclass(frozen=True)
+class Pad:
+    """Rectangular pad centered at (x, y) mm; `layers=None` means every layer (through-hole)."""
+
+    x: float
+    y: float
+    w: float = 0.6
+    h: float = 0.6
+    layers: Optional[Tuple[int, ...]] = (0,)
+
+
+@dataclass
+class RouterConfig:
+    resolution: float = 0.1     # mm per grid cell
+    layers: int = 2
+    track_width: float = 0.25
+    clearance: float = 0.2
+    via_diameter: float = 0.6
+    via_cost: int = 20          # in cells of track length
+    margin: float = 5.0         # mm of search window around the terminals
+    rip_penalty: int = 15       # per cell of a foreign track crossed while looking for rip-up victims
+    max_ripups: int = 3         # times one net may be ripped up and rerouted
+    heuristic_weight: float = 1.5  # 1.0 = optimal A*, larger = faster, slightly longer paths
+    # "short" / "long" first by terminal bounding box, "given" keeps the mapping order,
+    # or a callable (name, pads) -> sort key
+    order: Union[str, Callable[[str, Sequence[Pad]], float]] = "short"
+
+
+@dataclass
+class NetRoute:
+    name: str
+    routed: bool = False
+    segments: List[Tuple[int, float, float, float, float]] = field(default_factory=list)  # layer, x1, y1, x2, y2
+    vias: List[Tuple[float, float]] = field(default_factory=list)
+    seconds: float = 0.0
+    ripups: int = 0
+
+    @property
+    def length(self) -> float:
+        return sum(math.hypot(x2 - x1, y2 - y1) for _, x1, y1, x2, y2 in self.segments)
+
+
+@dataclass
+class RouteResult:
+    routes: Dict[str, NetRoute]
+    seconds: float
+
+    @property
+    def routed(self) -> int:
+        return sum(r.routed for r in self.routes.values())
+
+    @property
+    def unrouted(self) -> int:
+        return len(self.routes) - self.routed
+
+    def tracks(self, width: float) -> List[Dict]:
+        return [{"net": r.name, "layer": layer, "start": (x1, y1), "end": (x2, y2), "width": width}
+                for r in self.routes.values() for layer, x1, y1, x2, y2 in r.segments]
+
+
+def _dilate(mask: np.ndarray, r: int) -> np.ndarray:
+    """Square (2r+1)^2 binary dilation over the last two axes, as two 1-D passes."""
+    if r <= 0:
+        return mask
+    rows = mask.copy()
+    for s in range(1, r + 1):
+        rows[..., s:, :] |= mask[..., :-s, :]
+        rows[..., :-s, :] |= mask[..., s:, :]
+    out = rows.copy()
+    for s in range(1, r + 1):
+        out[..., :, s:] |= rows[..., :, :-s]
+        out[..., :, :-s] |= rows[..., :, s:]
+    return out
+
+
+def _astar(code: bytes, via: bytes, L: int, H: int, W: int, sources: Iterable[int], targets: Set[int],
+           goal: Tuple[int, int], via_cost: int, soft_cost: Optional[int], weight: float = 1.0) -> Optional[List[int]]:
+    """A* over window cells `l*H*W + y*W + x`; `code` is 0 free, 1 soft, 2 hard per cell.
+
+    The window must have a one-cell hard border, so neighbours need no
+    bounds checks. `weight` > 1 inflates the Manhattan heuristic: paths may
+    come out a few percent longer, but the search no longer floods the
+    plateau of equal-cost cells that a 4-connected grid has around every
+    obstacle. Expanded cells are closed for good, which keeps weighted A*
+    within its bound.
+
+    Costs are kept in fixed point (1/64 cell) so a heap entry is one int,
+    `f`, then `-g`, then the cell, packed most significant first; ints
+    compare far faster than tuples. Only reached cells have a `g` entry.
+    """
+    HW = H * W
+    gx, gy = goal
+    # Manhattan distance to the goal split per axis, weighted and scaled, so a heuristic is two lookups
+    hx = [round(weight * _FIX * abs(x - gx)) for x in range(W)]
+    hy = [round(weight * _FIX * abs(y - gy)) for y in range(H)]
+    size = L * HW
+    ib = max(1, size.bit_length())
+    imask = (1 << ib) - 1
+    gb = ib + 16 + _FIX.bit_length() + 8  # room for g in fixed point: every cell at the soft cost, plus vias
+    gtop = 1 << gb
+    step = _FIX
+    soft = (soft_cost or 0) * _FIX
+    via_step = via_cost * _FIX
+    g: Dict[int, int] = {}
+    came: Dict[int, int] = {}
+    closed = bytearray(size)
+    heap: List[int] = []
+    for s in sources:
+        if code[s] != _HARD:
+            g[s] = 0
+            y, x = divmod(s % HW, W)
+            heap.append((((hx[x] + hy[y]) << gb | gtop - 1) << ib) | s)
+    heapq.heapify(heap)
+    push, pop = heapq.heappush, heapq.heappop
+    moves = ((-1, -1, 0), (1, 1, 0), (-W, 0, -1), (W, 0, 1))
+    layers = range(L) if L > 1 else ()
+    blocked_soft = soft_cost is None
+    unreached = gtop
+    while heap:
+        i = pop(heap) & imask
+        if closed[i]:
+            continue
+        closed[i] = 1
+        if i in targets:
+            path = [i]
+            while i in came:
+                i = came[i]
+                path.append(i)
+            return path[::-1]
+        gi = g[i]
+        layer, r = divmod(i, HW)
+        y, x = divmod(r, W)
+        for d, dx, dy in moves:
+            j = i + d
+            c = code[j]
+            if c == _HARD or closed[j] or (c == _SOFT and blocked_soft):
+                continue
+            ng = gi + (step + soft if c == _SOFT else step)
+            if ng < g.get(j, unreached):
+                g[j] = ng
+                came[j] = i
+                push(heap, (((ng + hx[x + dx] + hy[y + dy]) << gb | gtop - 1 - ng) << ib) | j)
+        vc = via[r] if layers else _HARD
+        if vc == _HARD or (vc == _SOFT and blocked_soft):
+            continue
+        h = hx[x] + hy[y]
+        for other in layers:
+            j = other * HW + r
+            c = code[j]
+            if j == i or c == _HARD or closed[j] or (c == _SOFT and blocked_soft):
+                continue
+            ng = gi + via_step + (soft if vc == _SOFT else 0) + (soft if c == _SOFT else 0)
+            if ng < g.get(j, unreached):
+                g[j] = ng
+                came[j] = i
+                push(heap, (((ng + h) << gb | gtop - 1 - ng) << ib) | j)
+    return None
+
+
+class MazeRouter:
+    """Occupancy-grid router; add pads and keep-outs, then `route()` a {net: [Pad, ...]} mapping."""
+
+    def __init__(self, width: float, height: float, config: Optional[RouterConfig] = None):
+        self.config = cfg = config or RouterConfig()
+        self.res = cfg.resolution
+        self.nx = max(1, int(math.ceil(width / self.res)))
+        self.ny = max(1, int(math.ceil(height / self.res)))
+        self.L = cfg.layers
+        self.hard = np.full((self.L, self.ny, self.nx), FREE, dtype=np.int32)
+        self.track = np.full((self.L, self.ny, self.nx), FREE, dtype=np.int32)
+        # Clearance as cell radii: track centerline to foreign copper, via center to foreign copper
+        self.r_clear = int(math.ceil((cfg.track_width / 2 + cfg.clearance) / self.res))
+        self.r_via = int(math.ceil((cfg.via_diameter / 2 + cfg.clearance) / self.res))
+        self.r_track = max(0, int(round(cfg.track_width / 2 / self.res)))
+        self.r_via_copper = max(0, int(round(cfg.via_diameter / 2 / self.res)))
+        self.net_ids: Dict[str, int] = {}
+        self._paths: Dict[int, List[Tuple[int, int, int]]] = {}
+
+    # -- geometry ---------------------------------------------------------
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (min(self.nx - 1, max(0, int(x / self.res))), min(self.ny - 1, max(0, int(y / self.res))))
+
+    def _rect(self, x0: float, y0: float, x1: float, y1: float) -> Tuple[slice, slice]:
+        cx0, cy0 = self._cell(min(x0, x1), min(y0, y1))
+        cx1, cy1 = self._cell(max(x0, x1), max(y0, y1))
+        return slice(cy0, cy1 + 1), slice(cx0, cx1 + 1)
+
+    def _layers(self, layers: Optional[Sequence[int]]) -> List[int]:
+        return list(range(self.L)) if layers is None else [la for la in layers if la < self.L]
+
+    def _net_id(self, name: str) -> int:
+        return self.net_ids.setdefault(name, len(self.net_ids))
+
+    def add_keepout(self, x0: float, y0: float, x1: float, y1: float, layers: Optional[Sequence[int]] = None) -> None:
+        ys, xs = self._rect(x0, y0, x1, y1)
+        for layer in self._layers(layers):
+            self.hard[layer, ys, xs] = KEEPOUT
+
+    def add_pad(self, pad: Pad, net: Optional[str] = None) -> None:
+        """Stamp a pad; pads without a net are treated as keep-outs."""
+        owner = KEEPOUT if net is None else self._net_id(net)
+        ys, xs = self._rect(pad.x - pad.w / 2, pad.y - pad.h / 2, pad.x + pad.w / 2, pad.y + pad.h / 2)
+        for layer in self._layers(pad.layers):
+            self.hard[layer, ys, xs] = owner
+
+    def _pad_cells(self, pad: Pad) -> List[Tuple[int, int, int]]:
+        x, y = self._cell(pad.x, pad.y)
+        return [(layer, y, x) for layer in self._layers(pad.layers)]
+
+    # -- search -----------------------------------------------------------
+
+    def _window(self, cells: Sequence[Tuple[int, int, int]], margin: int) -> Tuple[int, int, int, int]:
+        ys = [c[1] for c in cells]
+        xs = [c[2] for c in cells]
+        return (max(0, min(ys) - margin), min(self.ny, max(ys) + margin + 1),
+                max(0, min(xs) - margin), min(self.nx, max(xs) + margin + 1))
+
+    def _masks(self, net: int, win: Tuple[int, int, int, int], locked: Set[int]) -> Tuple[bytes, bytes]:
+        """Cell codes for tracks (per layer) and vias over `win` plus a one-cell hard border.
+
+        0 is free, 1 is within clearance of a foreign track that may be ripped
+        up, 2 is within clearance of fixed copper, a keep-out or a `locked` net.
+        """
+        y0, y1, x0, x1 = win
+        pad = max(self.r_clear, self.r_via)
+        py0, py1, px0, px1 = max(0, y0 - pad), min(self.ny, y1 + pad), max(0, x0 - pad), min(self.nx, x1 + pad)
+        crop = (slice(None), slice(y0 - py0, y0 - py0 + (y1 - y0)), slice(x0 - px0, x0 - px0 + (x1 - x0)))
+        hard = self.hard[:, py0:py1, px0:px1]
+        track = self.track[:, py0:py1, px0:px1]
+        foreign_hard = (hard != FREE) & (hard != net)
+        foreign_track = (track != FREE) & (track != net)
+        if locked:
+            fixed = np.isin(track, list(locked))
+            foreign_hard |= fixed
+            foreign_track &= ~fixed
+        own_pad = (hard == net)[crop]
+
+        hard_blk = _dilate(foreign_hard, self.r_clear)[crop] & ~own_pad
+        soft_blk = _dilate(foreign_track, self.r_clear)[crop] & ~own_pad
+        code = np.where(hard_blk, _HARD, np.where(soft_blk, _SOFT, 0)).astype(np.uint8)
+
+        via_hard = _dilate(foreign_hard, self.r_via)[crop].any(axis=0)
+        via_soft = _dilate(foreign_track, self.r_via)[crop].any(axis=0)
+        via = np.where(via_hard, _HARD, np.where(via_soft, _SOFT, 0)).astype(np.uint8)
+        border = ((0, 0), (1, 1), (1, 1))
+        return (np.pad(code, border, constant_values=_HARD).tobytes(),
+                np.pad(via, border[1:], constant_values=_HARD).tobytes())
+
+    def _connect(self, net: int, source: Sequence[Tuple[int, int, int]], tree: Sequence[Tuple[int, int, int]],
+                 soft_cost: Optional[int], locked: Set[int]) -> Optional[List[Tuple[int, int, int]]]:
+        """Path (global cells) from any `source` cell to any `tree` cell.
+
+        Searches the window around the terminals first. When that is walled
+        off the margin grows fourfold at a time, so a detour is usually found
+        long before the masks and search cover the whole board.
+        """
+        sy, sx = source[0][1], source[0][2]
+        nearest = min(tree, key=lambda c: abs(c[1] - sy) + abs(c[2] - sx))
+        margin = max(1, int(self.config.margin / self.res))
+        full = (0, self.ny, 0, self.nx)
+        windows = [self._window(list(source) + [nearest], margin)]
+        while windows[-1] != full:
+            margin *= 4
+            windows.append(self._window(list(source) + [nearest], margin))
+        for y0, y1, x0, x1 in windows:
+            # window coordinates are shifted by the one-cell border
+            H, W = y1 - y0 + 2, x1 - x0 + 2
+            code, via = self._masks(net, (y0, y1, x0, x1), locked)
+            enc = lambda c: (c[0] * H + c[1] - y0 + 1) * W + c[2] - x0 + 1  # noqa: E731
+            targets = {enc(c) for c in tree if y0 <= c[1] < y1 and x0 <= c[2] < x1}
+            path = _astar(code, via, self.L, H, W, [enc(c) for c in source], targets,
+                          (nearest[2] - x0 + 1, nearest[1] - y0 + 1), self.config.via_cost, soft_cost,
+                          self.config.heuristic_weight)
+            if path is not None:
+                out = []
+                for i in path:
+                    layer, r = divmod(i, H * W)
+                    y, x = divmod(r, W)
+                    out.append((layer, y + y0 - 1, x + x0 - 1))
+                return out
+        return None
+
+    def _route_net(self, net: int, pads: Sequence[Pad], soft_cost: Optional[int],
+                   locked: Set[int]) -> Optional[List[List[Tuple[int, int, int]]]]:
+        """Connect every pad to a growing tree (nearest pad first); returns the per-connection paths."""
+        remaining = [self._pad_cells(p) for p in pads]
+        tree = list(remaining.pop(0))
+        paths = []
+        while remaining:
+            ty = np.array([c[1] for c in tree])
+            tx = np.array([c[2] for c in tree])
+            dist = [int(np.min(np.abs(ty - cells[0][1]) + np.abs(tx - cells[0][2]))) for cells in remaining]
+            source = remaining.pop(int(np.argmin(dist)))
+            path = self._connect(net, source, tree, soft_cost, locked)
+            if path is None:
+                return None
+            paths.append(path)
+            tree.extend(path)
+            tree.extend(source)
+        return paths
+
+    # -- occupancy --------------------------------------------------------
+
+    def _stamp_mask(self, cells: Sequence[Tuple[int, int, int]], r: int, vias: Sequence[Tuple[int, int]], rv: int):
+        win = self._window(cells, max(r, rv))
+        y0, y1, x0, x1 = win
+        mask = np.zeros((self.L, y1 - y0, x1 - x0), dtype=bool)
+        cells_arr = np.array(cells)
+        mask[cells_arr[:, 0], cells_arr[:, 1] - y0, cells_arr[:, 2] - x0] = True
+        mask = _dilate(mask, r)
+        if vias:
+            vmask = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+            va = np.array(vias)
+            vmask[va[:, 0] - y0, va[:, 1] - x0] = True
+            mask |= _dilate(vmask, rv)[None]
+        return (slice(None), slice(y0, y1), slice(x0, x1)), mask
+
+    @staticmethod
+    def _vias(path: Sequence[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+        return [(b[1], b[2]) for a, b in zip(path, path[1:]) if a[0] != b[0]]
+
+    def _commit(self, net: int, paths: Sequence[Sequence[Tuple[int, int, int]]]) -> None:
+        for path in paths:
+            region, mask = self._stamp_mask(path, self.r_track, self._vias(path), self.r_via_copper)
+            view = self.track[region]
+            view[mask & (view == FREE)] = net
+        self._paths[net] = [c for p in paths for c in p]
+
+    def _rip(self, net: int) -> None:
+        cells = self._paths.pop(net, None)
+        if cells:
+            region, _ = self._stamp_mask(cells, self.r_track, [], self.r_via_copper)
+            view = self.track[region]
+            view[view == net] = FREE
+
+    def _victims(self, net: int, paths: Sequence[Sequence[Tuple[int, int, int]]]) -> Set[int]:
+        """Nets whose tracks are within clearance of `paths`."""
+        found: Set[int] = set()
+        for path in paths:
+            region, mask = self._stamp_mask(path, self.r_clear, self._vias(path), self.r_via)
+            owners = self.track[region][mask]
+            found.update(int(n) for n in np.unique(owners) if n != FREE and n != net)
+        return found
+
+    # -- output -----------------------------------------------------------
+
+    def _segments(self, paths: Sequence[Sequence[Tuple[int, int, int]]]) -> Tuple[List, List]:
+        """Merge cell paths into straight (layer, x1, y1, x2, y2) segments (mm) plus via positions."""
+        res = self.res
+        xy = lambda c: (round((c[2] + 0.5) * res, 4), round((c[1] + 0.5) * res, 4))  # noqa: E731
+        segments: List[Tuple[int, float, float, float, float]] = []
+        vias: List[Tuple[float, float]] = []
+
+        def flush(start, end):
+            if start != end:
+                segments.append((start[0], *xy(start), *xy(end)))
+
+        for path in paths:
+            start, prev, step = path[0], path[0], None
+            for cur in path[1:]:
+                if cur[0] != prev[0]:
+                    flush(start, prev)
+                    vias.append(xy(cur))
+                    start, step = cur, None
+                else:
+                    d = (cur[1] - prev[1], cur[2] - prev[2])
+                    if step is not None and d != step:
+                        flush(start, prev)
+                        start = prev
+                    step = d
+                prev = cur
+            flush(start, prev)
+        return segments, vias
+
+    # -- driver -----------------------------------------------------------
+
+    def _order(self, nets: Dict[str, Sequence[Pad]]) -> List[str]:
+        order = self.config.order
+        if order == "given":
+            return list(nets)
+        if callable(order):
+            return sorted(nets, key=lambda n: order(n, nets[n]))
+
+        def span(name: str) -> float:
+            pads = nets[name]
+            return (max(p.x for p in pads) - min(p.x for p in pads)) + (max(p.y for p in pads) - min(p.y for p in pads))
+        return sorted(nets, key=span, reverse=(order == "long"))
+
+    @traced(items=lambda r: len(r.routes))
+    def route(self, nets: Dict[str, Sequence[Pad]]) -> RouteResult:
+        """Route every net with two or more pads; pads are stamped first so all nets see them."""
+        t0 = time.perf_counter()
+        for name, pads in nets.items():
+            for pad in pads:
+                self.add_pad(pad, name)
+        routes = {name: NetRoute(name) for name in nets}
+        todo = [name for name in self._order(nets) if len(nets[name]) >= 2]
+        for name in nets:
+            if len(nets[name]) < 2:
+                routes[name].routed = True
+        queue = deque(todo)
+        names = {self._net_id(n): n for n in nets}
+        net_paths: Dict[str, List[List[Tuple[int, int, int]]]] = {}
+        rip = self.config.max_ripups > 0
+        locked: Set[int] = set()
+        while queue:
+            name = queue.popleft()
+            net = self._net_id(name)
+            route = routes[name]
+            t = time.perf_counter()
+            # One search: foreign tracks cost `rip_penalty` per cell instead of
+            # blocking, nets already ripped up `max_ripups` times are fixed.
+            paths = self._route_net(net, nets[name], self.config.rip_penalty if rip else None, locked)
+            if paths is not None and rip:
+                for v in self._victims(net, paths):
+                    if v not in names:
+                        continue
+                    self._rip(v)
+                    victim = routes[names[v]]
+                    victim.routed = False
+                    victim.ripups += 1
+                    if victim.ripups >= self.config.max_ripups:
+                        locked.add(v)
+                    net_paths.pop(victim.name, None)
+                    queue.append(victim.name)
+            if paths is not None:
+                self._commit(net, paths)
+                net_paths[name] = paths
+                route.routed = True
+            route.seconds += time.perf_counter() - t
+        for name, paths in net_paths.items():
+            routes[name].segments, routes[name].vias = self._segments(paths)
+        return RouteResult(routes, time.perf_counter() - t0)
@@ -0,0 +1,338 @@
+"""Compact array-backed netlist with streaming KiCad and JSON writers.
+
+Part refs, net names, pin names and part values/footprints are interned to
+dense integer ids. Pins are numbered 0..n_pins-1 and stored grouped by part:
+
+    pin_part[p]   part id of pin p
+    pin_name[p]   pin-name id of pin p
+    pin_net[p]    net id of pin p, -1 when unconnected
+
+Connectivity is kept as CSR in both directions:
+
+    pins of part k:  part_ptr[k] .. part_ptr[k + 1]
+    pins of net n:   net_pin[net_ptr[n]:net_ptr[n + 1]]
+
+so net -> pins and pin -> net are O(1) slices, and a 10k-part, 100k-pin
+board costs a few MB instead of a dict of lists per net.
+"""
+from __future__ import annotations
+
+import json
+import os
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from pcbai.core.profiler import traced
+
+NetKey = Union[str, int]
+
+
+class Interner:
+    """Dense str <-> int id map (ids in insertion order)."""
+
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str) -> int:
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return i
+
+    def id(self, name: str) -> int:
+        return self.ids[name]
+
+    def __getitem__(self, i: int) -> str:
+        return self.names[i]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+
+class NetlistBuilder:
+    """Accumulates parts and (net, ref, pin) connections, then freezes them into a `Netlist`."""
+
+    def __init__(self) -> None:
+        self.refs = Interner()
+        self.nets = Interner()
+        self.pin_names = Interner()
+        self.strings = Interner([""])
+        self._value = array("i")
+        self._footprint = array("i")
+        self._pin_part = array("i")
+        self._pin_name = array("i")
+        self._pin_net = array("i")
+        self._pins: Dict[Tuple[int, int], int] = {}
+
+    def add_part(self, ref: str, value: str = "", footprint: str = "") -> int:
+        k = self.refs.add(ref)
+        if k == len(self._value):
+            self._value.append(self.strings.add(value))
+            self._footprint.append(self.strings.add(footprint))
+        else:
+            if value:
+                self._value[k] = self.strings.add(value)
+            if footprint:
+                self._footprint[k] = self.strings.add(footprint)
+        return k
+
+    def add_net(self, name: str) -> int:
+        return self.nets.add(name)
+
+    def add_pin(self, ref: str, pin: str) -> int:
+        """Declare a (possibly unconnected) pin; returns its id."""
+        k = self.add_part(ref) if ref not in self.refs else self.refs.id(ref)
+        key = (k, self.pin_names.add(str(pin)))
+        p = self._pins.get(key)
+        if p is None:
+            p = self._pins[key] = len(self._pin_part)
+            self._pin_part.append(k)
+            self._pin_name.append(key[1])
+            self._pin_net.append(-1)
+        return p
+
+    def connect(self, net: str, ref: str, pin: str) -> int:
+        """Attach pin `pin` of part `ref` to `net`; unknown parts are created on the fly."""
+        p = self.add_pin(ref, pin)
+        n = self.nets.add(net)
+        current = self._pin_net[p]
+        if current not in (-1, n):
+            raise ValueError(f"Pin {ref}.{pin} is already on net {self.nets[current]!r}, not {net!r}")
+        self._pin_net[p] = n
+        return p
+
+    def build(self) -> "Netlist":
+        pin_part = np.frombuffer(self._pin_part, dtype=np.intc).astype(np.int32)
+        order = np.argsort(pin_part, kind="stable")
+        pin_part = pin_part[order]
+        pin_name = np.frombuffer(self._pin_name, dtype=np.intc).astype(np.int32)[order]
+        pin_net = np.frombuffer(self._pin_net, dtype=np.intc).astype(np.int32)[order]
+        return Netlist(
+            refs=self.refs, nets=self.nets, pin_names=self.pin_names, strings=self.strings,
+            part_value=np.frombuffer(self._value, dtype=np.intc).astype(np.int32),
+            part_footprint=np.frombuffer(self._footprint, dtype=np.intc).astype(np.int32),
+            pin_part=pin_part, pin_name=pin_name, pin_net=pin_net,
+        )
+
+
+def _csr(keys: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(ptr, order) such that order[ptr[i]:ptr[i+1]] are the positions where keys == i."""
+    ptr = np.zeros(n + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=n), out=ptr[1:])
+    return ptr, np.argsort(keys, kind="stable").astype(np.int32)
+
+
+class Netlist:
+    """Immutable, picklable netlist; build one with `NetlistBuilder` or `Netlist.from_connections`."""
+
+    def __init__(self, refs: Interner, nets: Interner, pin_names: Interner, strings: Interner,
+                 part_value: np.ndarray, part_footprint: np.ndarray,
+                 pin_part: np.ndarray, pin_name: np.ndarray, pin_net: np.ndarray):
+        self.refs = refs
+        self.nets = nets
+        self.pin_names = pin_names
+        self.strings = strings
+        self.part_value = part_value
+        self.part_footprint = part_footprint
+        self.pin_part = pin_part
+        self.pin_name = pin_name
+        self.pin_net = pin_net
+        self.part_ptr, _ = _csr(pin_part, len(refs))  # pins are already grouped by part
+        connected = np.flatnonzero(pin_net >= 0).astype(np.int32)
+        self.net_ptr, order = _csr(pin_net[connected], len(nets))
+        self.net_pin = connected[order]
+
+    @classmethod
+    def from_connections(cls, connections: Iterable[Tuple[str, str, str]],
+                         parts: Iterable[Tuple[str, str, str]] = ()) -> "Netlist":
+        """Build from (net, ref, pin) triples plus optional (ref, value, footprint) rows."""
+        b = NetlistBuilder()
+        for ref, value, footprint in parts:
+            b.add_part(ref, value, footprint)
+        for net, ref, pin in connections:
+            b.connect(net, ref, pin)
+        return b.build()
+
+    @property
+    def n_parts(self) -> int:
+        return len(self.refs)
+
+    @property
+    def n_nets(self) -> int:
+        return len(self.nets)
+
+    @property
+    def n_pins(self) -> int:
+        return len(self.pin_part)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the connectivity arrays (names not included)."""
+        return sum(a.nbytes for a in (self.part_value, self.part_footprint, self.pin_part, self.pin_name,
+                                      self.pin_net, self.part_ptr, self.net_ptr, self.net_pin))
+
+    def net_id(self, net: NetKey) -> int:
+        return net if isinstance(net, int) else self.nets.id(net)
+
+    def net_pins(self, net: NetKey) -> np.ndarray:
+        """Pin ids on `net` (a view, in part order)."""
+        n = self.net_id(net)
+        return self.net_pin[self.net_ptr[n]:self.net_ptr[n + 1]]
+
+    def part_pins(self, ref: str) -> np.ndarray:
+        k = self.refs.id(ref)
+        return np.arange(self.part_ptr[k], self.part_ptr[k + 1], dtype=np.int32)
+
+    def pin_id(self, ref: str, pin: str) -> int:
+        k = self.refs.id(ref)
+        lo, hi = int(self.part_ptr[k]), int(self.part_ptr[k + 1])
+        name = self.pin_names.ids.get(str(pin), -1)
+        hits = np.flatnonzero(self.pin_name[lo:hi] == name)
+        if not len(hits):
+            raise KeyError(f"{ref}.{pin}")
+        return lo + int(hits[0])
+
+    def net_of(self, ref: str, pin: str) -> Optional[str]:
+        """Name of the net `ref.pin` is on, or None if it is unconnected."""
+        n = int(self.pin_net[self.pin_id(ref, pin)])
+        return self.nets[n] if n >= 0 else None
+
+    def part_nets(self, ref: str) -> List[str]:
+        ids = self.pin_net[self.part_pins(ref)]
+        return [self.nets[n] for n in dict.fromkeys(ids[ids >= 0].tolist())]
+
+    def nodes(self, net: NetKey) -> List[Tuple[str, str]]:
+        """(ref, pin) pairs on `net`."""
+        pins = self.net_pins(net)
+        refs, names = self.refs.names, self.pin_names.names
+        return [(refs[k], names[m]) for k, m in zip(self.pin_part[pins].tolist(), self.pin_name[pins].tolist())]
+
+    def iter_nets(self) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        for n, name in enumerate(self.nets):
+            yield name, self.nodes(n)
+
+    def components(self) -> Iterator[Tuple[str, str, str]]:
+        """(ref, value, footprint) per part."""
+        s = self.strings.names
+        for ref, v, f in zip(self.refs, self.part_value.tolist(), self.part_footprint.tolist()):
+            yield ref, s[v], s[f]
+
+    def to_dict(self) -> Dict:
+        """The legacy `{"nets": {name: [refs]}}` shape (materializes every net)."""
+        refs = self.refs.names
+        return {"nets": {name: [refs[k] for k in self.pin_part[self.net_pins(n)].tolist()]
+                         for n, name in enumerate(self.nets)}}
+
+    def __repr__(self) -> str:
+        return f"Netlist(parts={self.n_parts}, nets={self.n_nets}, pins={self.n_pins})"
+
+
+# ---------------------------------------------------------------------------
+# Streaming writers: output is produced net by net and flushed in chunks, so
+# memory stays bounded by the largest single net rather than the document.
+
+def _kicad_str(s: str) -> str:
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _net_slices(netlist: Netlist) -> Iterator[Tuple[int, List[int], List[int]]]:
+    ptr = netlist.net_ptr.tolist()
+    for n in range(netlist.n_nets):
+        pins = netlist.net_pin[ptr[n]:ptr[n + 1]]
+        yield n, netlist.pin_part[pins].tolist(), netlist.pin_name[pins].tolist()
+
+
+def _write_chunked(out: TextIO, lines: Iterable[str], chunk: int = 4096) -> int:
+    buf: List[str] = []
+    written = 0
+    for line in lines:
+        buf.append(line)
+        if len(buf) >= chunk:
+            written += out.write("".join(buf))
+            buf.clear()
+    if buf:
+        written += out.write("".join(buf))
+    return written
+
+
+def iter_kicad(netlist: Netlist, source: str = "", tool: str = "pcbai") -> Iterator[str]:
+    """Lines of a KiCad (version "E") netlist."""
+    yield '(export (version "E")\n'
+    yield f"  (design (source {_kicad_str(source)}) (tool {_kicad_str(tool)}))\n"
+    yield "  (components\n"
+    for ref, value, footprint in netlist.components():
+        yield (f"    (comp (ref {_kicad_str(ref)})\n      (value {_kicad_str(value)})\n"
+               f"      (footprint {_kicad_str(footprint)}))\n")
+    yield "  )\n  (nets\n"
+    qrefs = [_kicad_str(r) for r in netlist.refs]
+    qpins = [_kicad_str(p) for p in netlist.pin_names]
+    for n, parts, pins in _net_slices(netlist):
+        yield f'    (net (code "{n + 1}") (name {_kicad_str(netlist.nets[n])})'
+        for k, m in zip(parts, pins):
+            yield f"\n      (node (ref {qrefs[k]}) (pin {qpins[m]}))"
+        yield ")\n"
+    yield "  )\n)\n"
+
+
+def iter_json(netlist: Netlist) -> Iterator[str]:
+    """Chunks of `{"components": [{ref, value, footprint}], "nets": [{name, nodes: [[ref, pin]]}]}`."""
+    dumps = json.dumps
+    yield '{"components": ['
+    sep = "\n  "
+    for ref, value, footprint in netlist.components():
+        yield f'{sep}{{"ref": {dumps(ref)}, "value": {dumps(value)}, "footprint": {dumps(footprint)}}}'
+        sep = ",\n  "
+    yield '],\n "nets": ['
+    qrefs = [dumps(r) for r in netlist.refs]
+    qpins = [dumps(p) for p in netlist.pin_names]
+    sep = "\n  "
+    for n, parts, pins in _net_slices(netlist):
+        yield f'{sep}{{"name": {dumps(netlist.nets[n])}, "nodes": ['
+        node_sep = ""
+        for k, m in zip(parts, pins):
+            yield f"{node_sep}[{qrefs[k]}, {qpins[m]}]"
+            node_sep = ", "
+        yield "]}"
+        sep = ",\n  "
+    yield "]}\n"
+
+
+@traced()
+def write_kicad(netlist: Netlist, out: TextIO, source: str = "") -> int:
+    """Stream a KiCad netlist to `out`; returns characters written."""
+    return _write_chunked(out, iter_kicad(netlist, source=source))
+
+
+@traced()
+def write_json(netlist: Netlist, out: TextIO) -> int:
+    """Stream the netlist as JSON to `out`; returns characters written."""
+    return _write_chunked(out, iter_json(netlist))
+
+
+def write_netlist(netlist: Netlist, path: str, fmt: Optional[str] = None) -> str:
+    """Write to `path` as "kicad" or "json" (default: from the extension, `.json` or KiCad)."""
+    fmt = fmt or ("json" if path.endswith(".json") else "kicad")
+    if fmt not in ("kicad", "json"):
+        raise ValueError(f"Unknown netlist format: {fmt}")
+    tmp = f"{path}.part"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            write_json(netlist, f)
+        else:
+            write_kicad(netlist, f, source=os.path.basename(path))
+    os.replace(tmp, path)
+    return path
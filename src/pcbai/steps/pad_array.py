@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+# JEDEC ball-row letters: I, O, Q, S, X and Z are never used
+BGA_ROW_LETTERS = "ABCDEFGHJKLMNPRTUVWY"
+
+
+@dataclass
+class PadArray:
+    """A batch of pads: numbers in emission order, centers and sizes (mm)."""
+
+    numbers: List[str]
+    xy: np.ndarray    # (n, 2) pad centers
+    size: np.ndarray  # (n, 2) pad size along x, y
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @classmethod
+    def concat(cls, arrays: Sequence["PadArray"]) -> "PadArray":
+        return cls(
+            numbers=list(chain.from_iterable(a.numbers for a in arrays)),
+            xy=np.concatenate([a.xy for a in arrays]) if arrays else np.empty((0, 2)),
+            size=np.concatenate([a.size for a in arrays]) if arrays else np.empty((0, 2)),
+        )
+
+
+def _row_positions(count: int, pitch: float) -> np.ndarray:
+    # Same arithmetic as the scalar loops (x0 + i * pitch) so output is bit-identical
+    x0 = - (pitch * (count - 1)) / 2.0
+    return x0 + np.arange(count) * pitch
+
+
+def dual_row(pins: int, pitch: float, row_offset: float, pad_w: float, pad_l: float) -> PadArray:
+    """SOIC-style pads: pins 1..N/2 along y=+row_offset, N..N/2+1 along y=-row_offset.
+
+    Pads are emitted interleaved (1, N, 2, N-1, ...), matching the historical output.
+    """
+    per_side = pins // 2
+    x = _row_positions(per_side, pitch)
+    xy = np.empty((2 * per_side, 2))
+    xy[0::2, 0] = x
+    xy[1::2, 0] = x
+    xy[0::2, 1] = row_offset
+    xy[1::2, 1] = -row_offset
+    nums = np.empty(2 * per_side, dtype=np.int64)
+    nums[0::2] = np.arange(1, per_side + 1)
+    nums[1::2] = pins - np.arange(per_side)
+    size = np.broadcast_to(np.array([pad_w, pad_l]), xy.shape)
+    return PadArray(numbers=[str(n) for n in nums.tolist()], xy=xy, size=size)
+
+
+def quad(pins: int, pitch: float, offset: float, pad_l: float, pad_w: float) -> PadArray:
+    """QFN/QFP-style pads, numbered 1..N counter-clockwise in four equal sides.
+
+    Side order: y=+offset, x=-offset, y=-offset, x=+offset. `pad_l` is the size
+    perpendicular to the package edge.
+    """
+    per_side = pins // 4
+    t = np.tile(_row_positions(per_side, pitch), 4)
+    side = np.repeat(np.arange(4), per_side)
+    vertical = (side % 2) == 1
+    fixed = np.array([1.0, -1.0, -1.0, 1.0])[side] * offset
+    xy = np.empty((4 * per_side, 2))
+    xy[:, 0] = np.where(vertical, fixed, t)
+    xy[:, 1] = np.where(vertical, t, fixed)
+    size = np.empty_like(xy)
+    size[:, 0] = np.where(vertical, pad_l, pad_w)
+    size[:, 1] = np.where(vertical, pad_w, pad_l)
+    return PadArray(numbers=[str(n) for n in range(1, 4 * per_side + 1)], xy=xy, size=size)
+
+
+def bga_row_labels(rows: int) -> List[str]:
+    """Row names A, B, ... Y, AA, AB, ... skipping the letters JEDEC reserves."""
+    letters = BGA_ROW_LETTERS
+    labels: List[str] = []
+    for r in range(rows):
+        label = ""
+        n = r
+        while True:
+            label = letters[n % len(letters)] + label
+            n = n // len(letters) - 1
+            if n < 0:
+                break
+        labels.append(label)
+    return labels
+
+
+def depopulation_mask(rows: int, cols: int, center: int = 0, missing: Iterable[str] = ()) -> np.ndarray:
+    """Boolean (rows, cols) mask of populated balls.
+
+    `center` removes a centred square block of that many balls per side;
+    `missing` removes individual balls by name (e.g. "A1").
+    """
+    mask = np.ones((rows, cols), dtype=bool)
+    if center > 0:
+        r0 = (rows - center) // 2
+        c0 = (cols - center) // 2
+        mask[max(r0, 0):r0 + center, max(c0, 0):c0 + center] = False
+    if missing:
+        index = {label: i for i, label in enumerate(bga_row_labels(rows))}
+        for ball in missing:
+            ball = ball.strip().upper()
+            letters = ball.rstrip("0123456789")
+            if letters not in index or not ball[len(letters):]:
+                raise ValueError(f"invalid ball name {ball!r}")
+            col = int(ball[len(letters):]) - 1
+            if not 0 <= col < cols:
+                raise ValueError(f"invalid ball name {ball!r}")
+            mask[index[letters], col] = False
+    return mask
+
+
+def grid(rows: int, cols: int, pitch: float, pad_d: float, populated: Optional[np.ndarray] = None) -> PadArray:
+    """Full or depopulated ball grid, ball A1 at the top-left (-x, -y) corner.
+
+    Balls are emitted row-major and named row letter + column number.
+    """
+    if populated is None:
+        populated = np.ones((rows, cols), dtype=bool)
+    r, c = np.nonzero(populated)
+    xy = np.empty((len(r), 2))
+    xy[:, 0] = (c - (cols - 1) / 2.0) * pitch
+    xy[:, 1] = (r - (rows - 1) / 2.0) * pitch
+    labels = bga_row_labels(rows)
+    numbers = [f"{labels[ri]}{ci + 1}" for ri, ci in zip(r.tolist(), c.tolist())]
+    size = np.broadcast_to(np.array([pad_d, pad_d]), xy.shape)
+    return PadArray(numbers=numbers, xy=xy, size=size)
+
+
+def format_smd_pads(pads: PadArray, mask_expansion: float, paste_ratio: float, shape: str = "rect") -> str:
+    """Render all pads as KiCad `(pad ...)` lines with a single format operation."""
+    if not len(pads):
+        return ""
+    line = (
+        "  (pad %s smd " + shape + " (at %.3f %.3f) (size %.3f %.3f) (layers F.Cu F.Paste F.Mask)"
+        f" (solder_mask_margin {mask_expansion:.3f}) (solder_paste_margin_ratio {paste_ratio - 1.0:.3f}))"
+    )
+    x, y = pads.xy.T.tolist()
+    sx, sy = np.asarray(pads.size).T.tolist()
+    values = tuple(chain.from_iterable(zip(pads.numbers, x, y, sx, sy)))
+    return "\n".join([line] * len(pads)) % values
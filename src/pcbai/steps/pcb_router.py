@@ -1,11 +1,49 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Mapping, Optional, Tuple
 
+from pcbai.core.profiler import traced
+from pcbai.steps.maze_router import MazeRouter, Pad, RouterConfig
 
-def route_pcb(netlist: Dict) -> Dict:
-    """Placeholder router result.
+
+@traced()
+def route_pcb(netlist, pins: Optional[Mapping[Tuple[str, str], Pad]] = None,
+              board: Tuple[float, float] = (100.0, 100.0), **options) -> Dict:
+    """Route `netlist` (a `Netlist`) with the in-process maze router.
+
+    `pins` maps (ref, pin) to its placed `Pad`; pins that are not on any net
+    become obstacles. `options` are `RouterConfig` fields (resolution,
+    layers, clearance, via_cost, order, ...). Without pin geometry there is
+    nothing to route and the result has no tracks.
 
     Future: integrate with KiCad pcbnew or external routers.
     """
-    return {"status": "routed", "tracks": [], "netlist": netlist}
+    if pins is None:
+        return {"status": "routed", "tracks": [], "netlist": netlist}
+
+    config = RouterConfig(**options)
+    router = MazeRouter(board[0], board[1], config)
+    nets: Dict[str, list] = {}
+    on_net = set()
+    for name, nodes in netlist.iter_nets():
+        on_net.update(nodes)
+        pads = [pins[node] for node in nodes if node in pins]
+        if pads:
+            nets[name] = pads
+    for key, pad in pins.items():
+        if key not in on_net:
+            router.add_pad(pad)
+    result = router.route(nets)
+    return {
+        "status": "routed" if result.unrouted == 0 else "partial",
+        "tracks": result.tracks(config.track_width),
+        "vias": [{"net": r.name, "at": at, "diameter": config.via_diameter}
+                 for r in result.routes.values() for at in r.vias],
+        "routed": result.routed,
+        "unrouted": result.unrouted,
+        "seconds": result.seconds,
+        "nets": {name: {"routed": r.routed, "length": round(r.length, 4), "vias": len(r.vias),
+                        "ripups": r.ripups, "seconds": r.seconds}
+                 for name, r in result.routes.items()},
+        "netlist": netlist,
+    }
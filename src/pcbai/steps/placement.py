@@ -0,0 +1,366 @@
+"""Component placement: force-directed global placement, then annealing.
+
+1. Global placement (vectorized NumPy). Every net pulls its parts toward its
+   centroid (star model, weight 1/(degree-1)). Rank spreading then moves
+   parts toward evenly distributed positions in the same x/y order, and the
+   spreading weight grows each iteration.
+2. Simulated annealing on half-perimeter wirelength (HPWL) plus
+   `overlap_weight` times courtyard overlap area (ramped up over the
+   schedule). Moves go to a part's optimal region, or are displacements or
+   swaps within a window sized for ~44% acceptance. Cost deltas are
+   incremental: only the nets touching the moved parts are re-measured, and
+   overlap is looked up in a uniform spatial hash.
+3. Legalization. Parts that still overlap are moved to the nearest free
+   spot on a spiral around them.
+
+Nets with more than `max_fanout` parts (power, ground) are ignored for
+wirelength, as usual, because they are routed as planes or pours.
+"""
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from pcbai.core.profiler import span, traced
+from pcbai.core.spatial import SpatialHash
+from pcbai.steps.maze_router import Pad
+from pcbai.steps.netlist import Netlist
+
+
+@dataclass
+class PlacementConfig:
+    spacing: float = 0.25               # mm added around every courtyard
+    default_size: Tuple[float, float] = (1.0, 1.0)
+    max_fanout: int = 64
+    global_iterations: int = 60
+    moves_per_part: int = 40            # annealing moves per movable part, over all temperatures
+    temperatures: int = 40
+    cooling: float = 0.85
+    overlap_weight: float = 20.0        # cost per mm^2 of overlap, in mm of wirelength
+    seed: int = 0
+
+
+@dataclass
+class Placement:
+    refs: List[str]
+    xy: np.ndarray                      # (n, 2) part centers, mm
+    size: np.ndarray                    # (n, 2) courtyard width/height, mm (spacing not included)
+    hpwl: float
+    overlap: float                      # remaining courtyard overlap area, mm^2
+    seconds: float
+    stats: Dict[str, float] = field(default_factory=dict)
+
+    def positions(self) -> Dict[str, Tuple[float, float]]:
+        return {ref: (float(x), float(y)) for ref, (x, y) in zip(self.refs, self.xy)}
+
+    def pads(self, footprints: Mapping[str, Mapping[str, Pad]]) -> Dict[Tuple[str, str], Pad]:
+        """Board-coordinate pads for `route_pcb`, from footprint-local pads per ref."""
+        index = {ref: i for i, ref in enumerate(self.refs)}
+        out: Dict[Tuple[str, str], Pad] = {}
+        for ref, pads in footprints.items():
+            cx, cy = self.xy[index[ref]]
+            for pin, p in pads.items():
+                out[(ref, pin)] = Pad(float(cx + p.x), float(cy + p.y), p.w, p.h, p.layers)
+        return out
+
+
+def _net_entries(netlist: Netlist, max_fanout: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(net, part) pairs, one per part per net, for nets with 2..max_fanout parts."""
+    net_of_pin = np.repeat(np.arange(netlist.n_nets), np.diff(netlist.net_ptr))
+    keys = np.unique(net_of_pin.astype(np.int64) * netlist.n_parts + netlist.pin_part[netlist.net_pin])
+    nets, parts = keys // netlist.n_parts, keys % netlist.n_parts
+    degree = np.bincount(nets, minlength=netlist.n_nets)
+    keep = (degree[nets] >= 2) & (degree[nets] <= max_fanout)
+    _, nets = np.unique(nets[keep], return_inverse=True)  # renumber the kept nets densely
+    return nets.astype(np.int64), parts[keep].astype(np.int64)
+
+
+def hpwl(xy: np.ndarray, nets: np.ndarray, parts: np.ndarray) -> float:
+    """Total half-perimeter wirelength of (net, part) pairs at part centers `xy`."""
+    if not len(nets):
+        return 0.0
+    n = int(nets.max()) + 1
+    total = 0.0
+    for axis in (0, 1):
+        v = xy[parts, axis]
+        hi = np.full(n, -np.inf)
+        lo = np.full(n, np.inf)
+        np.maximum.at(hi, nets, v)
+        np.minimum.at(lo, nets, v)
+        total += float((hi - lo).sum())
+    return total
+
+
+def overlap_area(xy: np.ndarray, half: np.ndarray) -> float:
+    """Total pairwise overlap area of axis-aligned boxes (centers `xy`, half sizes `half`)."""
+    grid = SpatialHash(_cell_size(half))
+    total = 0.0
+    for i in range(len(xy)):
+        x, y = xy[i]
+        hw, hh = half[i]
+        for j in grid.query(x - hw, y - hh, x + hw, y + hh):
+            total += _overlap(x, y, hw, hh, xy[j, 0], xy[j, 1], half[j, 0], half[j, 1])
+        grid.add(i, x - hw, y - hh, x + hw, y + hh)
+    return total
+
+
+def _overlap(x1, y1, hw1, hh1, x2, y2, hw2, hh2) -> float:
+    dx = min(x1 + hw1, x2 + hw2) - max(x1 - hw1, x2 - hw2)
+    if dx <= 0:
+        return 0.0
+    dy = min(y1 + hh1, y2 + hh2) - max(y1 - hh1, y2 - hh2)
+    return dx * dy if dy > 0 else 0.0
+
+
+def _cell_size(half: np.ndarray) -> float:
+    # A few typical parts per bucket; large parts simply span several buckets
+    return max(0.5, 4 * float(np.median(half))) if len(half) else 1.0
+
+
+def _rank_spread(v: np.ndarray, weight: np.ndarray, length: float) -> np.ndarray:
+    """Positions that keep the order of `v` but spread the parts' `weight` evenly over [0, length]."""
+    order = np.argsort(v, kind="stable")
+    cum = np.cumsum(weight[order]) - weight[order] / 2
+    out = np.empty_like(v)
+    out[order] = cum / weight.sum() * length
+    return out
+
+
+def _global_place(xy: np.ndarray, half: np.ndarray, movable: np.ndarray, nets: np.ndarray, parts: np.ndarray,
+                  board: Tuple[float, float], iterations: int) -> np.ndarray:
+    """Star-model attraction alternating with order-preserving spreading, all parts at once.
+
+    Spreading moves every part toward the position its x (and y) rank
+    would have if part areas were laid out evenly across the board. The
+    pull toward that position grows each iteration, so the connectivity-
+    driven relative order is kept while overlap drains away.
+    """
+    W, H = board
+    n = len(xy)
+    if not n:
+        return xy
+    area = 4 * half[:, 0] * half[:, 1]
+    degree = np.bincount(nets) if len(nets) else np.zeros(0)
+    weight = 1.0 / np.maximum(degree - 1, 1)
+    w_entry = weight[nets] if len(nets) else np.zeros(0)
+    w_part = np.bincount(parts, weights=w_entry, minlength=n)
+    connected = w_part > 0
+    lo, hi = half, np.array([W, H]) - half
+    for it in range(iterations):
+        step = xy.copy()
+        if len(nets):
+            for axis in (0, 1):
+                centroid = np.bincount(nets, weights=xy[parts, axis]) / degree
+                pull = np.bincount(parts, weights=w_entry * centroid[nets], minlength=n)
+                target = np.where(connected, pull / np.where(connected, w_part, 1), xy[:, axis])
+                step[:, axis] += 0.5 * (target - xy[:, axis])
+        beta = 0.3 + 0.7 * (it + 1) / iterations
+        for axis, length in ((0, W), (1, H)):
+            step[:, axis] += beta * (_rank_spread(step[:, axis], area, length) - step[:, axis])
+        xy = np.where(movable[:, None], np.clip(step, lo, hi), xy)
+    return xy
+
+
+class _Annealer:
+    """Incremental HPWL + overlap cost over plain Python lists (fast scalar access)."""
+
+    def __init__(self, xy: np.ndarray, half: np.ndarray, nets: np.ndarray, parts: np.ndarray,
+                 board: Tuple[float, float], overlap_weight: float):
+        n = len(xy)
+        self.x, self.y = xy[:, 0].tolist(), xy[:, 1].tolist()
+        self.hw, self.hh = half[:, 0].tolist(), half[:, 1].tolist()
+        self.board = board
+        self.k = overlap_weight
+        n_nets = int(nets.max()) + 1 if len(nets) else 0
+        self.net_parts: List[List[int]] = [[] for _ in range(n_nets)]
+        self.part_nets: List[List[int]] = [[] for _ in range(n)]
+        for net, part in zip(nets.tolist(), parts.tolist()):
+            self.net_parts[net].append(part)
+            self.part_nets[part].append(net)
+        self.net_cost = [self._net(net) for net in range(n_nets)]
+        self.grid = SpatialHash(_cell_size(half))
+        for i in range(n):
+            self.grid.add(i, *self._box(i))
+
+    def _box(self, i: int) -> Tuple[float, float, float, float]:
+        return self.x[i] - self.hw[i], self.y[i] - self.hh[i], self.x[i] + self.hw[i], self.y[i] + self.hh[i]
+
+    def _net(self, net: int) -> float:
+        ps = self.net_parts[net]
+        xs = [self.x[p] for p in ps]
+        ys = [self.y[p] for p in ps]
+        return max(xs) - min(xs) + max(ys) - min(ys)
+
+    def optimal(self, i: int) -> Tuple[float, float]:
+        """Center of the region minimizing HPWL of part `i`: median of its nets' bounding-box edges."""
+        xs: List[float] = []
+        ys: List[float] = []
+        for net in self.part_nets[i]:
+            others = [p for p in self.net_parts[net] if p != i]
+            px = [self.x[p] for p in others]
+            py = [self.y[p] for p in others]
+            xs += (min(px), max(px))
+            ys += (min(py), max(py))
+        xs.sort()
+        ys.sort()
+        m = len(xs) // 2
+        return (xs[m - 1] + xs[m]) / 2, (ys[m - 1] + ys[m]) / 2
+
+    def _overlap_of(self, i: int, skip: Sequence[int]) -> float:
+        x, y, hw, hh = self.x[i], self.y[i], self.hw[i], self.hh[i]
+        total = 0.0
+        for j in self.grid.query(x - hw, y - hh, x + hw, y + hh):
+            if j != i and j not in skip:
+                total += _overlap(x, y, hw, hh, self.x[j], self.y[j], self.hw[j], self.hh[j])
+        return total
+
+    def _local(self, moved: Sequence[int]) -> float:
+        """Overlap cost of `moved` against everything (pairs inside `moved` counted once)."""
+        total = sum(self._overlap_of(i, moved) for i in moved)
+        if len(moved) == 2:
+            a, b = moved
+            total += _overlap(self.x[a], self.y[a], self.hw[a], self.hh[a], self.x[b], self.y[b], self.hw[b], self.hh[b])
+        return self.k * total
+
+    def try_move(self, moved: Sequence[int], new_xy: Sequence[Tuple[float, float]], temperature: float,
+                 rng: random.Random) -> Tuple[float, bool]:
+        """Apply the move if the Metropolis test accepts it; returns (cost delta, accepted).
+
+        A negative `temperature` only measures the delta and never applies the move.
+        """
+        nets = {net for i in moved for net in self.part_nets[i]}
+        old_xy = [(self.x[i], self.y[i]) for i in moved]
+        before = sum(self.net_cost[n] for n in nets) + self._local(moved)
+        for i in moved:
+            self.grid.remove(i, *self._box(i))
+        for i, (x, y) in zip(moved, new_xy):
+            self.x[i], self.y[i] = x, y
+        new_costs = {n: self._net(n) for n in nets}
+        after = sum(new_costs.values()) + self._local(moved)
+        delta = after - before
+        if temperature >= 0 and (delta <= 0 or (temperature > 0 and rng.random() < math.exp(-delta / temperature))):
+            for n, c in new_costs.items():
+                self.net_cost[n] = c
+            for i in moved:
+                self.grid.add(i, *self._box(i))
+            return delta, True
+        for i, (x, y) in zip(moved, old_xy):
+            self.x[i], self.y[i] = x, y
+        for i in moved:
+            self.grid.add(i, *self._box(i))
+        return delta, False
+
+    def clamp(self, i: int, x: float, y: float) -> Tuple[float, float]:
+        W, H = self.board
+        return (min(max(x, self.hw[i]), W - self.hw[i]), min(max(y, self.hh[i]), H - self.hh[i]))
+
+    max_rings = 60
+
+    def legalize(self, movable: Sequence[bool]) -> None:
+        """Move every overlapping movable part to the nearest free spot on a spiral around it.
+
+        Parts with no free spot within `max_rings` steps stay put; the
+        overlap left over is reported in `Placement.overlap`.
+        """
+        order = sorted(range(len(self.x)), key=lambda i: -(self.hw[i] * self.hh[i]))
+        W, H = self.board
+        for i in order:
+            if not movable[i] or self._overlap_of(i, ()) <= 0:
+                continue
+            self.grid.remove(i, *self._box(i))
+            x0, y0 = self.x[i], self.y[i]
+            step = max(min(self.hw[i], self.hh[i]), 0.1)
+            best = None
+            for ring in range(1, min(int(max(W, H) / step) + 2, self.max_rings)):
+                for k in range(8 * ring):
+                    a = 2 * math.pi * k / (8 * ring)
+                    x, y = self.clamp(i, x0 + ring * step * math.cos(a), y0 + ring * step * math.sin(a))
+                    self.x[i], self.y[i] = x, y
+                    if self._overlap_of(i, ()) <= 0:
+                        best = (x, y)
+                        break
+                if best is not None:
+                    break
+            self.x[i], self.y[i] = best if best is not None else (x0, y0)
+            self.grid.add(i, *self._box(i))
+            for net in self.part_nets[i]:
+                self.net_cost[net] = self._net(net)
+
+
+@traced(items=lambda p: len(p.refs))
+def place(netlist: Netlist, sizes: Mapping[str, Tuple[float, float]], board: Tuple[float, float] = (100.0, 100.0),
+          config: Optional[PlacementConfig] = None, fixed: Optional[Mapping[str, Tuple[float, float]]] = None) -> Placement:
+    """Place every part of `netlist` on a `board` (width, height mm).
+
+    `sizes` maps ref to courtyard (width, height); `fixed` pins parts such as
+    connectors to given centers.
+    """
+    cfg = config or PlacementConfig()
+    t0 = time.perf_counter()
+    rng = random.Random(cfg.seed)
+    refs = list(netlist.refs)
+    n = len(refs)
+    size = np.array([sizes.get(ref, cfg.default_size) for ref in refs], dtype=float).reshape(n, 2)
+    half = (size + cfg.spacing) / 2
+    movable = np.ones(n, dtype=bool)
+    gen = np.random.default_rng(cfg.seed)
+    W, H = board
+    xy = np.column_stack([gen.uniform(0, W, n), gen.uniform(0, H, n)]) if n else np.zeros((0, 2))
+    xy = np.clip(xy, half, np.array([W, H]) - half)
+    for ref, pos in (fixed or {}).items():
+        i = netlist.refs.id(ref)
+        xy[i] = pos
+        movable[i] = False
+    nets, parts = _net_entries(netlist, cfg.max_fanout)
+    stats: Dict[str, float] = {"hpwl_random": hpwl(xy, nets, parts)}
+
+    with span("placement.global", items=n):
+        xy = _global_place(xy, half, movable, nets, parts, board, cfg.global_iterations)
+    stats["hpwl_global"] = hpwl(xy, nets, parts)
+
+    with span("placement.anneal", items=n):
+        ann = _Annealer(xy, half, nets, parts, board, cfg.overlap_weight)
+        ann.legalize(movable.tolist())
+        candidates = [i for i in range(n) if movable[i]]
+        moves = cfg.moves_per_part * len(candidates)
+        if candidates and moves:
+            per_t = max(1, moves // cfg.temperatures)
+            # Refinement of the global placement: start with a window of a few
+            # part sizes and a temperature at which a typical uphill move is
+            # accepted about a third of the time.
+            radius = min(max(W, H), 8 * float(np.median(size.max(axis=1))) + 2 * cfg.spacing)
+
+            def propose(i: int) -> Tuple[List[int], List[Tuple[float, float]]]:
+                if ann.part_nets[i] and rng.random() < 0.5:
+                    ox, oy = ann.optimal(i)
+                    r = min(radius, 2 * (ann.hw[i] + ann.hh[i]))
+                    tx, ty = ann.clamp(i, ox + rng.uniform(-r, r), oy + rng.uniform(-r, r))
+                else:
+                    tx, ty = ann.clamp(i, ann.x[i] + rng.uniform(-radius, radius), ann.y[i] + rng.uniform(-radius, radius))
+                hits = [j for j in ann.grid.query(tx, ty, tx, ty) if j != i and movable[j]]
+                if hits:
+                    j = hits[0]
+                    return [i, j], [ann.clamp(i, ann.x[j], ann.y[j]), ann.clamp(j, ann.x[i], ann.y[i])]
+                return [i], [(tx, ty)]
+
+            uphill = [d for d, _ in (ann.try_move(*propose(rng.choice(candidates)), -1.0, rng)
+                                     for _ in range(min(200, moves))) if d > 0]
+            temperature = float(np.median(uphill)) / math.log(3) if uphill else 1.0
+            for step in range(cfg.temperatures):
+                # overlap is cheap early so parts can pass each other, and at full weight by the end
+                ann.k = cfg.overlap_weight * 0.01 ** (1 - step / max(1, cfg.temperatures - 1))
+                accepted = sum(ann.try_move(*propose(rng.choice(candidates)), temperature, rng)[1]
+                               for _ in range(per_t))
+                # keep the acceptance rate near the 0.44 sweet spot by resizing the move window
+                radius = min(max(W, H), max(0.5, radius * (1 - 0.44 + accepted / per_t)))
+                temperature *= cfg.cooling
+            stats["moves"] = moves
+        ann.legalize(movable.tolist())
+
+    xy = np.column_stack([ann.x, ann.y]) if n else xy
+    return Placement(refs, xy, size, hpwl(xy, nets, parts), overlap_area(xy, half), time.perf_counter() - t0, stats)
@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-from typing import List, Dict
+from dataclasses import asdict
+from typing import List, Dict, Iterable, Optional
 
+from pcbai.core.profiler import traced
+from pcbai.steps.keyword_matcher import KeywordMatcher, default_matcher
 
-def parse_requirements(natural_text: str) -> Dict:
+
+@traced()
+def parse_requirements(natural_text: str, matcher: Optional[KeywordMatcher] = None) -> Dict:
     """Very basic placeholder that extracts target keywords.
 
-    In the future, use an LLM to extract structured requirements.
+    Matches `natural_text` against the matcher's vocabulary (the built-in one
+    by default) and collects numeric specs such as "3.3V" or "500 mA" in the
+    same pass. In the future, use an LLM to extract structured requirements.
     """
-    lower = natural_text.lower()
+    matcher = matcher or default_matcher()
+    terms, constraints = matcher.scan(natural_text)
     result = {
-        "keywords": [w for w in ["bluetooth", "wifi", "usb", "buck", "lipo", "mcu", "adc", "opamp"] if w in lower],
+        "keywords": matcher.categories(terms),
+        "terms": [asdict(t) for t in terms],
+        "constraints": [asdict(c) for c in constraints],
         "notes": natural_text.strip(),
     }
     return result
+
+
+@traced(items=len)
+def parse_requirements_batch(texts: Iterable[str], matcher: Optional[KeywordMatcher] = None) -> List[Dict]:
+    """Parse many descriptions against one shared matcher."""
+    matcher = matcher or default_matcher()
+    return [parse_requirements(t, matcher) for t in texts]
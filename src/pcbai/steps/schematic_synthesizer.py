@@ -2,20 +2,25 @@ from __future__ import annotations
 
 from typing import List, Dict
 
+from pcbai.core.profiler import traced
+from pcbai.steps.netlist import Netlist, NetlistBuilder
+
 
 # Placeholder for future SKiDL-based generation
 
-def synthesize_schematic(bom: List[Dict]) -> Dict:
-    """Return a toy netlist structure.
+@traced(items=lambda n: n.n_parts)
+def synthesize_schematic(bom: List[Dict]) -> Netlist:
+    """Return a toy netlist: every part's pin 1 on VCC and pin 2 on GND.
 
     In the future, use SKiDL to create real netlists from parameterized templates.
+    Use `Netlist.to_dict()` for the old `{"nets": {name: [refs]}}` shape.
     """
-    nets = {
-        "GND": [],
-        "VCC": [],
-    }
+    b = NetlistBuilder()
+    b.add_net("GND")
+    b.add_net("VCC")
     for idx, part in enumerate(bom, start=1):
         ref = f"U{idx}"
-        nets["VCC"].append(ref)
-        nets["GND"].append(ref)
-    return {"nets": nets, "components": bom}
+        b.add_part(ref, part.get("mpn", ""), part.get("package", ""))
+        b.connect("VCC", ref, "1")
+        b.connect("GND", ref, "2")
+    return b.build()
@@ -0,0 +1,164 @@
+"""S-expression reader for KiCad files (.kicad_mod, .kicad_pcb, ...).
+
+One compiled regex splits the text into tokens and a single loop builds
+nested lists. Atoms stay `str` (quoted strings are unquoted), so nothing
+is converted to numbers unless the caller asks. `iter_tokens` and
+`iter_items` read a file chunk by chunk, so a large board can be walked
+item by item without holding the whole tree.
+"""
+from __future__ import annotations
+
+import re
+from typing import IO, Iterable, Iterator, List, Optional, Union
+
+Node = List[Union[str, "Node"]]
+
+# An unterminated string only matches at the end of a chunk; the reader holds it back for the next one
+_TOKEN = re.compile(r'[()]|"(?:[^"\\]|\\.)*"?|[^\s()"]+')
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"')
+_ESCAPE = re.compile(r"\\(.)")
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+class SexprError(ValueError):
+    pass
+
+
+def _unquote(tok: str) -> str:
+    if not _STRING.fullmatch(tok):
+        raise SexprError(f"unterminated string: {tok[:40]!r}")
+    s = tok[1:-1]
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(1)), s) if "\\" in s else s
+
+
+def iter_tokens(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[str]:
+    """Raw tokens ("(", ")", atoms, quoted strings with their quotes) from a text stream."""
+    buf = ""
+    while True:
+        chunk = stream.read(chunk_size)
+        buf += chunk
+        pos = 0
+        for m in _TOKEN.finditer(buf):
+            tok = m.group()
+            # A token touching the end, or a string cut at a backslash, may continue in the next chunk
+            if chunk and (m.end() == len(buf) or (tok[0] == '"' and (len(tok) == 1 or tok[-1] != '"'))):
+                pos = m.start()
+                break
+            yield tok
+            pos = m.end()
+        else:
+            pos = len(buf)
+        buf = buf[pos:]
+        if not chunk:
+            return
+
+
+def _build(tokens: Iterable[str]) -> Iterator[Node]:
+    """Top-level expressions from a token stream."""
+    stack: List[Node] = []
+    cur: Optional[Node] = None
+    for tok in tokens:
+        if tok == "(":
+            node: Node = []
+            if cur is not None:
+                cur.append(node)
+                stack.append(cur)
+            cur = node
+        elif tok == ")":
+            if cur is None:
+                raise SexprError("unbalanced ')'")
+            if stack:
+                cur = stack.pop()
+            else:
+                yield cur
+                cur = None
+        elif cur is None:
+            raise SexprError(f"atom outside of a list: {tok[:40]!r}")
+        else:
+            cur.append(_unquote(tok) if tok[0] == '"' else tok)
+    if cur is not None:
+        raise SexprError("unexpected end of input: missing ')'")
+
+
+def parse(text: str) -> Node:
+    """The first top-level expression of `text` as nested lists (the rest must still be well-formed)."""
+    nodes = list(_build(_TOKEN.findall(text)))
+    if not nodes:
+        raise SexprError("no expression found")
+    return nodes[0]
+
+
+def parse_file(path: str) -> Node:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse(f.read())
+
+
+def iter_items(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Union[str, Node]]:
+    """Children of the top-level expression, one at a time, read in chunks.
+
+    Only the item being built is held in memory, which suits walking a
+    large `.kicad_pcb` for its footprints or tracks.
+    """
+    depth = 0
+    stack: List[Node] = []
+    for tok in iter_tokens(stream, chunk_size):
+        if tok == "(":
+            depth += 1
+            if depth >= 2:
+                node: Node = []
+                if stack:
+                    stack[-1].append(node)
+                stack.append(node)
+        elif tok == ")":
+            if depth == 0:
+                raise SexprError("unbalanced ')'")
+            depth -= 1
+            if depth >= 1:
+                node = stack.pop()
+                if depth == 1:
+                    yield node
+        elif depth == 1:
+            yield _unquote(tok) if tok[0] == '"' else tok
+        elif depth > 1:
+            stack[-1].append(_unquote(tok) if tok[0] == '"' else tok)
+        else:
+            raise SexprError(f"atom outside of a list: {tok[:40]!r}")
+    if depth:
+        raise SexprError("unexpected end of input: missing ')'")
+
+
+def find(node: Node, key: str) -> Optional[Node]:
+    """First child list whose head is `key`."""
+    for child in node:
+        if isinstance(child, list) and child and child[0] == key:
+            return child
+    return None
+
+
+def find_all(node: Node, key: str) -> Iterator[Node]:
+    for child in node:
+        if isinstance(child, list) and child and child[0] == key:
+            yield child
+
+
+def floats(node: Optional[Node], count: int, default: float = 0.0) -> List[float]:
+    """The first `count` numeric atoms after the head, padded with `default`."""
+    if node is None:
+        return [default] * count
+    try:
+        # Common case: the numbers come first, e.g. (at 1 2) or (size 1.5 0.6)
+        out = [float(a) for a in node[1:count + 1]]
+        if len(out) == count:
+            return out
+    except (TypeError, ValueError):
+        pass
+    out = []
+    for atom in node[1:]:
+        if isinstance(atom, str):
+            try:
+                out.append(float(atom))
+            except ValueError:
+                continue
+            if len(out) == count:
+                break
+    return out + [default] * (count - len(out))
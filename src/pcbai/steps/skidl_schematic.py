@@ -2,31 +2,62 @@ from __future__ import annotations
 
 from typing import List, Dict
 
-try:
-    from skidl import Part, Net, ERC, generate_netlist, subcircuit
-except Exception:  # pragma: no cover
-    Part = Net = ERC = generate_netlist = subcircuit = None  # type: ignore
+from pcbai.core.profiler import traced
+from pcbai.steps.netlist import iter_kicad
+from pcbai.steps.schematic_synthesizer import synthesize_schematic
 
+BACKENDS = ("native", "skidl")
+SKIDL_MISSING = "SKiDL not installed. Install with `pip install skidl` to enable schematic generation."
 
-def bom_to_schematic(bom: List[Dict]) -> str:
-    """Create a simple SKiDL netlist if SKiDL is available.
 
-    Returns a textual netlist (XML) or a message if SKiDL isn't installed.
+def _skidl():
+    # Imported on first use: SKiDL is slow to import and only the "skidl" backend needs it
+    try:
+        import skidl
+    except Exception:  # pragma: no cover
+        return None
+    return skidl
+
+
+def native_netlist(bom: List[Dict], source: str = "") -> str:
+    """KiCad netlist built straight from the connectivity model.
+
+    Same parts and connections as the SKiDL path (U<n>, pin 1 on VCC, pin 2
+    on GND) without touching any SKiDL state, so repeated calls cost the
+    same no matter how many designs a process has already synthesized.
     """
-    if Part is None:
-        return "SKiDL not installed. Install with `pip install skidl` to enable schematic generation."
+    return "".join(iter_kicad(synthesize_schematic(bom), source=source))
+
 
-    # Example: connect all parts to VCC and GND nets.
-    vcc = Net('VCC')
-    gnd = Net('GND')
+def skidl_netlist(bom: List[Dict]) -> str:
+    """SKiDL netlist built in a fresh Circuit, so nothing leaks into SKiDL's default circuit."""
+    skidl = _skidl()
+    if skidl is None:
+        return SKIDL_MISSING
 
-    refs = []
+    circuit = skidl.Circuit()
+    vcc = skidl.Net('VCC', circuit=circuit)
+    gnd = skidl.Net('GND', circuit=circuit)
     for i, p in enumerate(bom, start=1):
         # Generic part symbol; in reality, we'd map MPN/package to SKiDL libs
-        part = Part('Device', 'U', value=p.get('mpn', 'U'), ref=f'U{i}', footprint=p.get('package', ''))
+        part = skidl.Part('Device', 'U', value=p.get('mpn', 'U'), ref=f'U{i}', footprint=p.get('package', ''),
+                          circuit=circuit)
         vcc += part['1']
         gnd += part['2']
-        refs.append(part.ref)
 
-    ERC();
-    return generate_netlist()
+    circuit.ERC()
+    return circuit.generate_netlist()
+
+
+@traced()
+def bom_to_schematic(bom: List[Dict], backend: str = "native") -> str:
+    """Return a KiCad netlist for `bom`.
+
+    `backend="native"` (default) emits it directly; `backend="skidl"` goes
+    through SKiDL and returns a message if SKiDL isn't installed.
+    """
+    if backend == "native":
+        return native_netlist(bom)
+    if backend == "skidl":
+        return skidl_netlist(bom)
+    raise ValueError(f"Unknown netlist backend: {backend!r} (expected one of {', '.join(BACKENDS)})")
@@ -0,0 +1,13 @@
+import pytest
+
+from pcbai.bench.workloads import text_pdf_bytes
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """Write a text PDF into tmp_path: make_pdf(["page 1 text", ...], name="x.pdf") -> path."""
+    def _make(pages, name="datasheet.pdf"):
+        path = tmp_path / name
+        path.write_bytes(text_pdf_bytes(pages))
+        return str(path)
+    return _make
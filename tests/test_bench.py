@@ -0,0 +1,38 @@
+import json
+
+from click.testing import CliRunner
+
+from pcbai.bench.runner import compare, load_baseline, run_benchmarks, save_baseline, select
+from pcbai.pipeline.cli import main
+
+
+def test_every_workload_runs_at_small_scale(tmp_path):
+    names = [b.name for b in select()]
+    assert {"footprints.generate", "bga.grid_1024", "extractor.scan_500p", "bom.generate_10k"} <= set(names)
+    results = run_benchmarks(scale=0.005, repeat=1)
+    assert all(r.items > 0 and r.best >= 0 for r in results.values())
+    path = save_baseline(results, str(tmp_path / "base.json"), scale=0.005)
+    base = load_baseline(path)
+    assert set(base) == set(results)
+    assert not any(c.regression for c in compare(results, base, threshold=10.0))
+
+
+def test_compare_flags_regressions(tmp_path):
+    results = run_benchmarks(["bga."], scale=0.1, repeat=1)
+    base = {"bga.grid_1024": {"per_item_us": results["bga.grid_1024"].per_item_us / 10}}
+    (c,) = compare(results, base, threshold=0.5)
+    assert c.regression and c.ratio > 5
+
+
+def test_bench_cli_baseline_roundtrip(tmp_path):
+    runner = CliRunner()
+    base = tmp_path / "base.json"
+    args = ["bench", "--only", "requirements.", "--scale", "0.01", "--repeat", "1"]
+    first = runner.invoke(main, args + ["--save", str(base)])
+    assert first.exit_code == 0, first.output
+    assert "requirements.parse_10k" in first.output
+    data = json.loads(base.read_text())
+    data["results"]["requirements.parse_10k"]["per_item_us"] /= 100
+    base.write_text(json.dumps(data))
+    second = runner.invoke(main, args + ["--baseline", str(base)])
+    assert second.exit_code == 1 and "REGRESSION" in second.output
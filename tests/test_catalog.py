@@ -0,0 +1,64 @@
+import csv
+
+import pytest
+
+from pcbai.steps.bom_generator import CATALOG, generate_bom
+from pcbai.steps.catalog import Catalog, PartQuery, normalize_package, parse_range
+
+
+def test_parse_range():
+    assert parse_range("4.5-28V") == (4.5, 28.0)
+    assert parse_range("2.0 to 3.6 V") == (2.0, 3.6)
+    assert parse_range("4.2V charger") == (4.2, 4.2)
+    assert parse_range("500mA") == (0.5, 0.5)
+    assert parse_range("Module") == (None, None)
+    assert normalize_package("soic 8") == normalize_package("SOIC-8") == "SOIC8"
+
+
+def _write_csv(path):
+    rows = [
+        {"mpn": "BUCK-60V", "category": "buck", "package": "SOIC-8", "voltage": "4.5-60V", "current": "2A", "stock": "100"},
+        {"mpn": "BUCK-28V", "category": "buck", "package": "SOIC-8", "voltage": "4.5-28V", "current": "3A", "stock": "5"},
+        {"mpn": "BUCK-10V", "category": "buck", "package": "SOIC-8", "voltage": "2.7-10V", "current": "3A", "stock": "500"},
+        {"mpn": "BUCK-QFN", "category": "buck", "package": "QFN-16", "voltage": "4-36V", "current": "5A", "stock": "1000"},
+        {"mpn": "LDO-1", "category": "ldo", "package": "SOT-23-5", "voltage": "2.5-6V", "current": "300mA", "stock": ""},
+    ]
+    with open(path, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=list(rows[0]))
+        w.writeheader()
+        w.writerows(rows)
+
+
+def test_catalog_ranked_query(tmp_path):
+    csv_path = tmp_path / "parts.csv"
+    _write_csv(csv_path)
+    db = str(tmp_path / "cat.db")
+    with Catalog(db) as cat:
+        assert cat.import_csv(str(csv_path)) == 5
+        # Re-import is idempotent (replace by MPN)
+        cat.import_csv(str(csv_path))
+        assert len(cat) == 5
+    with Catalog(db, readonly=True) as cat:
+        hits = cat.query(PartQuery(category="buck", min_voltage=12, package="soic8"))
+        assert [p["mpn"] for p in hits] == ["BUCK-28V", "BUCK-60V"]
+        # Least headroom over 24 V / 2.5 A wins over the bigger, better-stocked part
+        assert [p["mpn"] for p in cat.search("buck", current=2.5, voltage=24)] == ["BUCK-28V", "BUCK-QFN"]
+        assert cat.search("ldo", current=0.2)[0]["i_max"] == 0.3
+
+
+def test_generate_bom_from_catalog(tmp_path):
+    with Catalog(str(tmp_path / "cat.db")) as cat:
+        cat.import_rows({"category": kw, **p} for kw, parts in CATALOG.items() for p in parts)
+        bom = generate_bom({"keywords": ["mcu", "buck", "wifi"]}, catalog=cat)
+    assert [p["mpn"] for p in bom] == ["ESP32-WROOM-32", "MP1584EN"]
+
+
+def test_failed_import_keeps_indexes(tmp_path):
+    with Catalog(str(tmp_path / "cat.db")) as cat:
+        def indexes():
+            return {r[0] for r in cat.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+        before = indexes()
+        with pytest.raises(KeyError):
+            cat.import_rows([{"mpn": "OK-1", "category": "mcu"}, {"category": "mcu"}])
+        assert indexes() == before and len(cat) == 0
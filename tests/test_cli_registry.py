@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+
+import click
+from click.testing import CliRunner
+
+from pcbai.pipeline import registry
+from pcbai.pipeline.cli import main
+from pcbai.pipeline.executor import Pipeline
+
+
+@click.command()
+@click.argument("who")
+def hello(who):
+    """Say hello (plugin)."""
+    click.echo(f"hello {who}")
+
+
+def shout(text):
+    return text.upper()
+
+
+def test_help_imports_no_step_modules():
+    code = ("import sys\nfrom pcbai.pipeline.cli import main\n"
+            "try:\n    main(['--help'])\nexcept SystemExit:\n    pass\n"
+            "heavy = [m for m in ('requests', 'pdfminer', 'skidl', 'numpy') if m in sys.modules]\n"
+            "steps = [m for m in sys.modules if m.startswith('pcbai.steps')]\n"
+            "print('LOADED', heavy, steps)")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+    assert "LOADED [] []" in out
+    assert "footprint-batch" in out
+
+
+def test_builtin_help_matches_commands():
+    for name, (target, short) in registry.BUILTIN_COMMANDS.items():
+        cmd = registry.load_target(target)
+        assert cmd.get_short_help_str(limit=200) == short, name
+
+
+def test_plugin_command_and_step(monkeypatch):
+    monkeypatch.setitem(registry._plugin_cache, registry.COMMAND_GROUP,
+                        {"hello": EntryPoint("hello", f"{__name__}:hello", registry.COMMAND_GROUP)})
+    monkeypatch.setitem(registry._plugin_cache, registry.STEP_GROUP,
+                        {"shout": EntryPoint("shout", f"{__name__}:shout", registry.STEP_GROUP)})
+    runner = CliRunner()
+    listing = runner.invoke(main, ["--help"])
+    assert "hello" in listing.output and "[plugin]" in listing.output
+    assert runner.invoke(main, ["hello", "board"]).output == "hello board\n"
+    assert "shout" in runner.invoke(main, ["steps"]).output
+    assert registry.load_step("shout") is shout
+
+
+def test_pipeline_resolves_registered_steps(tmp_path, monkeypatch):
+    monkeypatch.setitem(registry._plugin_cache, registry.STEP_GROUP,
+                        {"shout": EntryPoint("shout", f"{__name__}:shout", registry.STEP_GROUP)})
+    pipe = Pipeline(str(tmp_path))
+    pipe.add("req", "parse_requirements", params={"natural_text": "buck"})
+    pipe.add("loud", "shout", params={"text": "ok"})
+    out = pipe.run()
+    assert out["req"]["keywords"] == ["buck"] and out["loud"] == "OK"
@@ -0,0 +1,39 @@
+import json
+import time
+
+import pytest
+
+pytest.importorskip("pdfminer")
+
+from pcbai.steps.datasheet_corpus import run_corpus
+from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf
+
+
+def _slow_on_hang(path, **kwargs):
+    if "hang" in path:
+        time.sleep(60)
+    return extract_package_params_from_pdf(path, **kwargs)
+
+
+def test_corpus_timeout_and_resume(make_pdf, tmp_path):
+    make_pdf(["QFN 32 pins pitch 0.5 mm"], name="a.pdf")
+    make_pdf(["LQFP 64 pins pitch 0.4 mm"], name="b.pdf")
+    make_pdf(["QFN"], name="hang.pdf")
+    (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+    out = tmp_path / "out" / "corpus.jsonl"
+
+    t0 = time.perf_counter()
+    summary = run_corpus(str(tmp_path), str(out), workers=2, timeout=1.0, extract=_slow_on_hang)
+    assert time.perf_counter() - t0 < 10
+    assert (summary.found, summary.ok, summary.errors, summary.timeouts) == (4, 2, 1, 1)
+    records = {r["path"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert records["a.pdf"]["guess"]["pins"] == 32 and records["b.pdf"]["guess"]["pkg_type"] == "qfp"
+    assert records["hang.pdf"]["status"] == "timeout"
+
+    # Simulate a crash mid-write, then resume: only the torn record is redone
+    lines = out.read_text().splitlines(keepends=True)
+    torn = [l for l in lines if '"a.pdf"' not in l]
+    out.write_text("".join(torn) + '{"path": "a.pdf", "sta')
+    summary = run_corpus(str(tmp_path), str(out), workers=2, timeout=1.0, extract=_slow_on_hang)
+    assert (summary.skipped, summary.ok) == (3, 1)
+    assert len(out.read_text().splitlines()) == 4
@@ -0,0 +1,102 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from pcbai.steps.datasheet_fetcher import DatasheetFetcher
+
+PDF = b"%PDF-1.4\n" + b"x" * 200_000 + b"\n%%EOF\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = []
+    arrived = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        _Handler.hits.append((self.path, self.headers.get("If-None-Match")))
+        _Handler.arrived.setdefault(self.path, time.perf_counter())
+        source, mpn = self.path.strip("/").split("/")
+        if source == "slow":
+            time.sleep(1.0)
+        if mpn == "MISSING" or source in ("html", "liar", "empty"):
+            # "liar" and "empty" claim a PDF but send an error page or nothing
+            liar = source in ("liar", "empty")
+            self.send_response(200 if liar or source == "html" else 404)
+            self.send_header("Content-Type", "application/pdf" if liar else "text/html")
+            body = b"" if source == "empty" else b"<html>nope</html>"
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(PDF)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(PDF)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    t = threading.Thread(target=httpd.serve_forever, daemon=True)
+    t.start()
+    _Handler.hits = []
+    _Handler.arrived = {}
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_hedged_concurrent_fetch(server, tmp_path):
+    sources = [server + "/slow/{}", server + "/html/{}", server + "/fast/{}"]
+    mpns = [f"PART{i}" for i in range(6)] + ["MISSING"]
+    t0 = time.perf_counter()
+    with DatasheetFetcher(str(tmp_path), sources=sources, max_workers=24, per_host=24) as f:
+        found = f.fetch_many(mpns)
+    assert time.perf_counter() - t0 < 3.0
+    assert found["MISSING"] is None
+    for i in range(6):
+        with open(found[f"PART{i}"], "rb") as fh:
+            assert fh.read() == PDF
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".part"]
+
+
+def test_conditional_refetch_skips_download(server, tmp_path):
+    sources = [server + "/fast/{}"]
+    with DatasheetFetcher(str(tmp_path), sources=sources) as f:
+        first = f.fetch_many(["LM358"])
+        _Handler.hits = []
+        second = f.fetch_many(["LM358"])
+    assert first == second
+    assert _Handler.hits == [("/fast/LM358", '"v1"')]
+
+
+def test_new_mpns_do_not_wait_for_revalidation(server, tmp_path):
+    with DatasheetFetcher(str(tmp_path), sources=[server + "/slow/{}"]) as f:
+        f.fetch_many(["LM358"])
+    with DatasheetFetcher(str(tmp_path), sources=[server + "/fast/{}"]) as f:
+        t0 = time.perf_counter()
+        found = f.fetch_many(["LM358", "NE555"])
+    # LM358 revalidates against the slow URL it was fetched from; NE555 starts right away
+    assert _Handler.arrived["/fast/NE555"] - t0 < 0.5
+    assert found["LM358"].endswith("LM358.pdf") and found["NE555"].endswith("NE555.pdf")
+    assert ("/fast/LM358", None) not in _Handler.hits
+
+
+def test_pdf_content_type_without_pdf_body_is_rejected(server, tmp_path):
+    sources = [server + "/liar/{}", server + "/empty/{}"]
+    with DatasheetFetcher(str(tmp_path), sources=sources) as f:
+        assert f.fetch_many(["LM358"]) == {"LM358": None}
+    with DatasheetFetcher(str(tmp_path), sources=sources + [server + "/fast/{}"]) as f:
+        found = f.fetch_many(["LM358"])
+    with open(found["LM358"], "rb") as fh:
+        assert fh.read() == PDF
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+pytest.importorskip("pdfminer")
+
+from pcbai.steps import datasheet_package_extractor as dpe
+from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf, guess_from_text, scan_text
+
+FILLER = ["General description page %d. Supply 3.3 V." % i for i in range(8)]
+PACKAGE_PAGE = (
+    "Package outline QFN 32 pins\n"
+    "Pitch: 0.5 mm  Body length: 5.0 mm  Body width: 5.0 mm\n"
+    "Terminal length: 0.4 mm  Terminal width: 0.25 mm\n"
+    "Exposed pad length: 3.1 mm  Exposed pad width: 3.1 mm"
+)
+
+
+def test_guess_from_text():
+    g = guess_from_text(PACKAGE_PAGE)
+    assert g.pkg_type == "qfn" and g.pins == 32 and g.pitch == 0.5
+    assert (g.body_l, g.body_w, g.pad_l, g.pad_w, g.ep_l, g.ep_w) == (5.0, 5.0, 0.4, 0.25, 3.1, 3.1)
+    assert guess_from_text("pitch 20 mil").pitch == pytest.approx(0.508)
+
+
+def test_scan_text_returns_ranked_candidates():
+    text = "LQFP-64, 64 pins. Package length 10.2 mm; see QFN variant.\n Body\n L: 10 mm, lead pitch 0.5 mm"
+    cands = scan_text(text)
+    assert [c.start for c in cands] == sorted(c.start for c in cands)
+    body = [(c.value, c.rank) for c in cands if c.field == "body_l"]
+    assert body == [(10.2, 1), (10.0, 0)]
+    pitch = [c for c in cands if c.field == "pitch"][0]
+    assert text[pitch.start:pitch.end] == "pitch 0.5 mm"
+    g = guess_from_text(text)
+    assert g.pkg_type == "qfn" and g.body_l == 10.0 and g.pins == 64
+
+
+def test_early_exit_from_end_reads_only_last_page(make_pdf, monkeypatch):
+    pdf = make_pdf(FILLER + [PACKAGE_PAGE])
+    seen = []
+    real = dpe._PdfPages.text
+    monkeypatch.setattr(dpe._PdfPages, "text", lambda self, i: seen.append(i) or real(self, i))
+    g = extract_package_params_from_pdf(pdf, from_end=True)
+    assert g.pkg_type == "qfn" and g.ep_w == 3.1
+    assert seen == [8]
+
+
+def test_full_scan_matches_early_exit(make_pdf):
+    pdf = make_pdf(FILLER + [PACKAGE_PAGE])
+    assert extract_package_params_from_pdf(pdf) == extract_package_params_from_pdf(pdf, early_exit=False)
+
+
+def test_text_cache_avoids_reparsing(make_pdf, tmp_path, monkeypatch):
+    pdf = make_pdf(FILLER + [PACKAGE_PAGE])
+    cache = str(tmp_path / "textcache")
+    first = extract_package_params_from_pdf(pdf, cache_dir=cache, early_exit=False)
+
+    def boom(*a, **k):
+        raise AssertionError("PDF re-parsed")
+
+    monkeypatch.setattr(dpe, "_PdfPages", boom)
+    assert extract_package_params_from_pdf(pdf, cache_dir=cache, early_exit=False) == first
+    assert extract_package_params_from_pdf(pdf, cache_dir=cache, from_end=True) == first
+    key = dpe.PageTextCache.pdf_hash(pdf)
+    assert len(os.listdir(os.path.join(cache, key[:2], key))) == len(FILLER) + 2
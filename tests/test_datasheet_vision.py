@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from pcbai.steps import datasheet_vision as dv
+from pcbai.steps.datasheet_package_extractor import extract_package_params_from_pdf, guess_from_text
+
+FILLER = ["General description page %d. Supply 3.3 V, low quiescent current, thermal shutdown." % i for i in range(6)]
+PACKAGE_PAGE = "Package outline QFN 32 pins\nDimensions in millimeters\nPitch: 0.5 mm  Body length: 5.0 mm"
+
+
+def test_score_text_prefers_package_pages():
+    assert dv.score_text(PACKAGE_PAGE) > dv.score_text(FILLER[0]) == 0
+
+
+def test_score_image_counts_ruled_lines():
+    blank = np.full((200, 160), 255, dtype=np.uint8)
+    table = blank.copy()
+    table[20:180:20, 10:150] = 0   # horizontal rules
+    table[20:161, 10:150:35] = 0   # vertical rules
+    noise = np.where(np.random.default_rng(0).random((200, 160)) < 0.2, 0, 255).astype(np.uint8)
+    assert dv.score_image(blank) == 0
+    assert dv.score_image(table) > dv.score_image(noise)
+
+
+def test_table_rows_become_package_fields():
+    rows = [["SYMBOL", "MIN", "NOM", "MAX"], ["D", "4.90", "5.00", "5.10"], ["E", "4.90 5.00 5.10"],
+            ["e", "0.50 BSC"], ["b", "0.18", "0.25", "0.30"], ["D2", "3.00", "3.10", "3.20"], ["A1", "0", "0.02", "0.05"]]
+    g = guess_from_text("QFN\n" + dv.table_text(rows))
+    assert (g.body_l, g.body_w, g.pitch, g.pad_w, g.ep_l) == (5.0, 5.0, 0.5, 0.25, 3.1)
+
+
+def test_ocr_rows_split_cells_on_wide_gaps():
+    data = {"text": ["D", "4.90", "5.00", "", "Body", "size"], "block_num": [1] * 6, "par_num": [1] * 6,
+            "line_num": [1, 1, 1, 1, 2, 2], "left": [0, 100, 200, 0, 0, 50], "width": [10, 40, 40, 0, 40, 40],
+            "height": [20] * 6}
+    assert dv.ocr_rows(data) == [["D", "4.90", "5.00"], ["Body size"]]
+
+
+def test_vision_cache_round_trip(tmp_path):
+    cache = dv.VisionCache(str(tmp_path))
+    assert cache.get("ab" * 32, "eng") is None
+    cache.put("ab" * 32, "eng", {"text": "QFN", "rows": [["e", "0.5"]]})
+    assert cache.get("ab" * 32, "eng") == {"text": "QFN", "rows": [["e", "0.5"]]}
+    assert cache.get("ab" * 32, "deu") is None
+
+
+def test_rank_pages_puts_the_package_page_first(make_pdf):
+    pytest.importorskip("pdfminer")
+    pdf = make_pdf(FILLER[:3] + [PACKAGE_PAGE] + FILLER[3:])
+    ranked = dv.rank_pages(pdf)
+    assert len(ranked) == 7 and ranked[0].page == 3 and ranked[0].source == "text"
+
+
+def test_scanned_pdf_is_ocrd(tmp_path):
+    pytest.importorskip("pdfminer")
+    Image = pytest.importorskip("PIL.Image")
+    ImageDraw = pytest.importorskip("PIL.ImageDraw")
+    ImageFont = pytest.importorskip("PIL.ImageFont")
+    if not dv.available():
+        pytest.skip("vision extra or tesseract binary not installed")
+    pages = []
+    for lines in (["General description"], ["PACKAGE OUTLINE QFN 32 PINS", "PITCH: 0.5 MM", "BODY LENGTH: 5.0 MM"]):
+        img = Image.new("L", (1700, 2200), 255)
+        draw = ImageDraw.Draw(img)
+        for i, line in enumerate(lines):
+            draw.text((100, 200 + 120 * i), line, fill=0, font=ImageFont.load_default(size=60))
+        pages.append(img)
+    pdf = tmp_path / "scan.pdf"
+    pages[0].save(pdf, save_all=True, append_images=pages[1:])
+    cache = str(tmp_path / "cache")
+    g = extract_package_params_from_pdf(str(pdf), cache_dir=cache)
+    assert (g.pkg_type, g.pitch, g.body_l) == ("qfn", 0.5, 5.0)
+    assert dv.extract_package_params_vision(str(pdf), cache_dir=cache, workers=1) == g  # served from the page cache
+
+
+def test_vision_failure_keeps_the_text_guess(make_pdf, monkeypatch):
+    pytest.importorskip("pdfminer")
+
+    def broken(*args, **kwargs):
+        raise AssertionError("daemonic processes are not allowed to have children")
+
+    monkeypatch.setattr(dv, "available", lambda: True)
+    monkeypatch.setattr(dv, "extract_package_params_vision", broken)
+    pdf = make_pdf(["QFN", "Pitch: 0.5 mm"])  # too little text per page: looks scanned
+    g = extract_package_params_from_pdf(pdf)
+    assert (g.pkg_type, g.pitch) == ("qfn", 0.5)
+
+
+def test_pool_runs_in_process_inside_daemonic_workers(monkeypatch):
+    class Daemon:
+        daemon = True
+
+    monkeypatch.setattr(dv.multiprocessing, "current_process", lambda: Daemon())
+    monkeypatch.setattr(dv, "_init_worker", lambda pdf_path, lang: None)
+    monkeypatch.setattr(dv, "_extract_page", lambda item: (item[0], {"text": "", "rows": []}))
+    monkeypatch.setattr(dv.multiprocessing, "Pool", None)  # any attempt to start a pool fails
+    assert sorted(p for p, _ in dv._run_pool([(0, False), (1, False)], "x.pdf", "eng", None)) == [0, 1]
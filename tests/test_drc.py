@@ -0,0 +1,93 @@
+import random
+
+from pcbai.steps.drc import Drc, DrcRules, check_board, check_footprint, parse_footprint
+from pcbai.steps.footprint_generator import SmdRcParams, SoicParams, generate_smd_rc, generate_soic
+from pcbai.steps.footprint_qfn_qfp import QfnParams, generate_qfn
+from pcbai.steps.maze_router import Pad
+from pcbai.steps.netlist import NetlistBuilder
+
+SOIC8 = generate_soic(SoicParams("SOIC-8", 8, 1.27, 4.9, 3.9, 1.55, 0.6, 2.7))
+
+
+def test_parse_generated_footprint():
+    fp = parse_footprint(generate_qfn(QfnParams("QFN-16", 16, 0.5, 3.0, 3.0, 0.8, 0.25, 1.7, 1.7)))
+    assert fp.name == "QFN-16" and len(fp.pads) == 17
+    assert dict(fp.pads)["EP"] == Pad(0.0, 0.0, 1.7, 1.7, (0,))
+    assert fp.body == (-1.5, -1.5, 1.5, 1.5) and fp.courtyard is None
+    assert fp.bounds(0.25) == (-2.55, -2.55, 2.55, 2.55)
+
+
+def test_footprint_checks_catch_bad_pitch_and_gap():
+    assert check_footprint(SOIC8) == []
+    tight = check_footprint(generate_soic(SoicParams("SOIC-8", 8, 0.5, 4.9, 3.9, 1.55, 0.6, 2.7)))
+    assert len(tight) == 6 and {v.kind for v in tight} == {"clearance"}
+    assert tight[0].distance == -0.1 and tight[0].required == 0.2
+    shorted = check_footprint(generate_smd_rc(SmdRcParams("R0603", 1.6, 0.8, 0.9, 0.95, gap=0.1)))
+    assert [(v.a, v.b, v.distance) for v in shorted] == [("1", "2", 0.1)]
+    assert check_footprint(generate_smd_rc(SmdRcParams("R0603", 1.6, 0.8, 0.9, 0.95, gap=0.1)),
+                           DrcRules(clearance=0.1)) == []
+
+
+def test_board_nets_tracks_and_layers():
+    b = NetlistBuilder()
+    b.connect("A", "U1", "4")
+    b.connect("A", "U2", "1")
+    nl = b.build()
+    # U1.4 (+1.905, +2.7) and U2.1 (-1.905, +2.7) touch when the parts are 3.8 mm apart, but share net A
+    same_net = [v for v in check_board({"U1": (0, 0), "U2": (3.8, 0)}, {"U1": SOIC8, "U2": SOIC8}, nl)
+                if v.kind == "clearance"]
+    assert ("U1:4", "U2:1") not in {(v.a, v.b) for v in same_net}
+    assert ("U1:5", "U2:8") in {(v.a, v.b) for v in same_net}
+
+    track = {"net": "B", "layer": 0, "start": (-5.0, 3.7), "end": (5.0, 3.7), "width": 0.25}
+    hits = check_board({"U1": (0, 0)}, {"U1": SOIC8}, tracks=[track])
+    assert sorted(v.a for v in hits) == ["U1:1", "U1:2", "U1:3", "U1:4"]
+    assert hits[0].b == "track:B" and round(hits[0].distance, 3) == 0.1
+    assert check_board({"U1": (0, 0)}, {"U1": SOIC8}, tracks=[dict(track, layer=1)]) == []
+
+
+def test_incremental_moves_match_full_check():
+    rng = random.Random(3)
+    refs = [f"U{i}" for i in range(40)]
+    positions = {ref: (rng.uniform(0, 30), rng.uniform(0, 30)) for ref in refs}
+    drc = Drc.from_board(positions, {ref: SOIC8 for ref in refs})
+    drc.add_pad(Pad(15, 15, 3.0, 3.0, None), label="H1")
+    drc.check()
+    for _ in range(100):
+        ref = rng.choice(refs)
+        positions[ref] = (rng.uniform(0, 30), rng.uniform(0, 30))
+        involved = drc.move(ref, *positions[ref])
+        assert all(v.a.split(":")[0] == ref or v.b.split(":")[0] == ref for v in involved)
+    fresh = Drc.from_board(positions, {ref: SOIC8 for ref in refs})
+    fresh.add_pad(Pad(15, 15, 3.0, 3.0, None), label="H1")
+    key = lambda v: (v.kind, *sorted((v.a, v.b)))
+    assert sorted(map(key, drc.violations)) == sorted(map(key, fresh.check()))
+    assert any(v.kind == "courtyard" for v in drc.violations)
+
+
+def test_multiline_through_hole_pads_are_on_every_layer():
+    header = '''(footprint "PinHeader_1x02"
+  (layer "F.Cu")
+  (pad "1" thru_hole rect
+    (at 0 0)
+    (size 1.7 1.7)
+    (drill 1.0)
+    (layers "*.Cu" "*.Mask")
+  )
+  (pad "2" thru_hole oval
+    (at 0 2.54)
+    (size 1.7 1.7)
+    (drill 1.0)
+    (layers "*.Cu" "*.Mask")
+  )
+)'''
+    fp = parse_footprint(header)
+    assert [p.layers for _, p in fp.pads] == [None, None]
+    assert [(d.kind, d.drill) for d in fp.details] == [("thru_hole", 1.0)] * 2
+    assert parse_footprint('(module K (pad 1 thru_hole circle (at 0 0) (size 2 2) (drill 1) (layers F&B.Cu)))',
+                           layers=4).pads[0][1].layers == (0, 3)
+    drc = Drc()
+    drc.add_footprint("J1", header, 10, 10)
+    drc.add_track(1, (10.9, 5), (10.9, 15), 0.25, "OTHER")  # B.Cu, 0.025 mm from the pads' edge
+    hits = [v for v in drc.check() if v.kind == "clearance"]
+    assert {(v.a, v.b) for v in hits} == {("J1:1", "track:OTHER"), ("J1:2", "track:OTHER")}
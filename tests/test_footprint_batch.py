@@ -0,0 +1,64 @@
+import json
+import os
+
+from pcbai.steps.footprint_batch import params_from_row, run_batch
+from pcbai.steps.footprint_generator import SoicParams
+
+
+def _write_manifest(path):
+    rows = [
+        {"type": "smd_rc", "name": "R_0603", "body_l": 1.6, "body_w": 0.8, "pad_l": 0.9, "pad_w": 0.8, "gap": 0.8},
+        {"type": "soic", "name": "SOIC-13", "pins": 13, "pitch": 1.27, "body_l": 8.7, "body_w": 3.9, "pad_l": 1.5, "pad_w": 0.6, "row_offset": 2.3},
+        {"type": "qfn", "name": "QFN-32", "pins": 32, "pitch": 0.5, "body_l": 5.0, "body_w": 5.0, "pad_l": 0.6, "pad_w": 0.25},
+        {"type": "bogus", "name": "X"},
+    ]
+    with open(path, "w") as f:
+        for r in rows:
+            f.write(json.dumps(r) + "\n")
+
+
+def test_params_from_csv_row_coerces_strings():
+    row = {"type": "soic", "name": "SOIC-8", "pins": "8", "pitch": "1.27", "body_l": "4.9", "body_w": "3.9",
+           "pad_l": "1.5", "pad_w": "0.6", "row_offset": "2.7", "pin1_marker": "false", "gap": ""}
+    p = params_from_row(row)
+    assert isinstance(p, SoicParams)
+    assert p.pins == 8 and p.pitch == 1.27 and p.pin1_marker is False
+    assert p.mask_expansion == 0.03  # default kept for missing columns
+
+
+def test_run_batch_reports_row_errors(tmp_path):
+    manifest = tmp_path / "lib.jsonl"
+    _write_manifest(manifest)
+    out = tmp_path / "Test.pretty"
+    for workers in (1, 2):
+        summary = run_batch(str(manifest), str(out), workers=workers, chunksize=1)
+        assert summary.total == 4 and summary.ok == 2 and summary.failed == 2
+        assert sorted(e.row for e in summary.errors) == [2, 4]
+    assert sorted(os.listdir(out)) == ["QFN-32.kicad_mod", "R_0603.kicad_mod"]
+
+
+
+def test_malformed_lines_fail_alone(tmp_path):
+    from pcbai.steps.footprint_cache import FootprintCache
+
+    manifest = tmp_path / "lib.jsonl"
+    _write_manifest(manifest)
+    with open(manifest, "a") as f:
+        f.write("{bad json\n[1, 2]\n")
+    for workers, cache in ((1, None), (2, None), (2, FootprintCache(str(tmp_path / "cache")))):
+        summary = run_batch(str(manifest), str(tmp_path / "Test.pretty"), workers=workers, chunksize=1, cache=cache)
+        assert summary.total == 6 and summary.ok == 2 and summary.failed == 4
+        errors = {e.row: e.error for e in summary.errors}
+        assert "invalid JSON" in errors[5] and "got list" in errors[6]
+
+def test_run_batch_with_cache(tmp_path):
+    from pcbai.steps.footprint_cache import FootprintCache
+
+    manifest = tmp_path / "lib.jsonl"
+    _write_manifest(manifest)
+    out = str(tmp_path / "Test.pretty")
+    first = run_batch(str(manifest), out, workers=2, cache=FootprintCache(str(tmp_path / "cache")))
+    cache = FootprintCache(str(tmp_path / "cache"))
+    second = run_batch(str(manifest), out, workers=2, cache=cache)
+    assert first.ok == second.ok == 2 and second.failed == 2
+    assert cache.stats.hits == 2 and cache.stats.misses == 0
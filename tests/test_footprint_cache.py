@@ -0,0 +1,49 @@
+import os
+
+from pcbai.steps.footprint_cache import FootprintCache, params_key
+from pcbai.steps.footprint_generator import SmdRcParams, generate_smd_rc
+
+
+def _params(name="R_0603", gap=0.8):
+    return SmdRcParams(name=name, body_l=1.6, body_w=0.8, pad_l=0.9, pad_w=0.8, gap=gap)
+
+
+def test_params_key_is_canonical():
+    assert params_key(_params()) == params_key(_params())
+    assert params_key(_params()) != params_key(_params(gap=0.7))
+
+
+def test_cache_skips_generation_and_write(tmp_path):
+    calls = []
+
+    def gen(p):
+        calls.append(p.name)
+        return generate_smd_rc(p)
+
+    out = tmp_path / "lib.pretty"
+    with FootprintCache(str(tmp_path / "cache")) as cache:
+        path = cache.write(_params(), str(out), gen)
+    mtime = os.stat(path).st_mtime_ns
+
+    # New process-equivalent: fresh cache instance reading the persisted index
+    cache = FootprintCache(str(tmp_path / "cache"))
+    assert cache.write(_params(), str(out), gen) == path
+    assert calls == ["R_0603"] and os.stat(path).st_mtime_ns == mtime
+    assert cache.stats.hits == 1
+
+    # Output deleted: restored from the object store without regenerating
+    os.unlink(path)
+    cache.write(_params(), str(out), gen)
+    assert calls == ["R_0603"] and cache.stats.restored == 1
+    cache.write(_params(gap=0.7), str(out), gen)
+    assert cache.stats.misses == 1 and len(calls) == 2
+
+
+def test_cache_lru_eviction(tmp_path):
+    cache = FootprintCache(str(tmp_path / "cache"), max_bytes=1)
+    for i in range(3):
+        cache.write(_params(name=f"R{i}"), str(tmp_path / "out"), generate_smd_rc)
+    cache.flush()
+    assert cache.stats.evictions == 3
+    # Outputs stay valid even once their objects are gone
+    assert len(os.listdir(tmp_path / "out")) == 3
@@ -0,0 +1,75 @@
+import os
+import shutil
+
+from pcbai.steps.footprint_generator import SmdRcParams, SoicParams, generate_smd_rc, generate_soic
+from pcbai.steps.footprint_library import FootprintIndex, fingerprint
+
+
+def _soic(name, pitch=1.27):
+    return generate_soic(SoicParams(name, 8, pitch, 4.9, 3.9, 1.55, 0.6, 2.7))
+
+
+def _library(root):
+    lib = root / "Test.pretty"
+    lib.mkdir()
+    footprints = {
+        "SOIC-8": _soic("SOIC-8"),
+        "SOIC-8_copy": _soic("SOIC-8_copy"),
+        "TSSOP-8": _soic("TSSOP-8", pitch=0.65),
+        "R_0603": generate_smd_rc(SmdRcParams("R_0603", 1.6, 0.8, 0.9, 0.8, 0.8)),
+    }
+    for name, text in footprints.items():
+        (lib / f"{name}.kicad_mod").write_text(text)
+    (lib / "broken.kicad_mod").write_text("(footprint broken (pad 1")
+    return lib
+
+
+def test_summary_and_lookups(tmp_path):
+    lib = _library(tmp_path)
+    with FootprintIndex(str(tmp_path / "fp.db")) as index:
+        stats = index.update([str(tmp_path)], workers=1)
+        assert (stats.scanned, stats.parsed, stats.failed) == (5, 5, 1)
+        assert len(index) == 4
+        (soic,) = index.lookup("SOIC-8")
+        assert soic.library == "Test" and soic.pads == 8 and soic.pitch == 1.27
+        assert soic.bbox[1] < -3 and soic.bbox[3] > 3  # pad rows at y = ±2.7
+        assert [i.name for i in index.search(pads=8, pitch=0.65)] == ["TSSOP-8"]
+        # names differ but pads are identical, so both match the freshly generated one
+        assert [i.name for i in index.match(_soic("NEW"))] == ["SOIC-8", "SOIC-8_copy"]
+        assert [[i.name for i in g] for g in index.duplicates()] == [["SOIC-8", "SOIC-8_copy"]]
+        assert [os.path.basename(p) for p, _ in index.errors()] == ["broken.kicad_mod"]
+    assert fingerprint(_soic("A")) != fingerprint(_soic("A", pitch=0.65))
+
+
+def test_update_is_incremental(tmp_path):
+    lib = _library(tmp_path)
+    db = str(tmp_path / "fp.db")
+    with FootprintIndex(db) as index:
+        index.update([str(lib)], workers=1)
+        stats = index.update([str(lib)], workers=1)
+        assert (stats.unchanged, stats.parsed, stats.removed) == (5, 0, 0)
+
+        (lib / "broken.kicad_mod").write_text(_soic("broken"))
+        os.remove(lib / "R_0603.kicad_mod")
+        shutil.copy(lib / "TSSOP-8.kicad_mod", lib / "TSSOP-8_2.kicad_mod")
+        stats = index.update([str(lib)], workers=1)
+        assert (stats.unchanged, stats.parsed, stats.removed, stats.failed) == (3, 2, 1, 0)
+        assert index.errors() == [] and index.lookup("R_0603") == []
+    with FootprintIndex(db, readonly=True) as index:
+        assert len(index) == 5
+        assert [i.name for i in index.lookup("broken")] == ["broken"]
+
+
+def test_padless_footprints_are_not_duplicates(tmp_path):
+    lib = tmp_path / "Graphics.pretty"
+    lib.mkdir()
+    logo = '(footprint Logo (fp_line (start 0 0) (end 5 5) (layer "F.SilkS") (width 0.15)))'
+    fiducial = '(footprint Fiducial (fp_circle (center 0 0) (end 1 0) (layer "F.Mask") (width 0.1)))'
+    (lib / "Logo.kicad_mod").write_text(logo)
+    (lib / "Fiducial.kicad_mod").write_text(fiducial)
+    (lib / "SOIC-8.kicad_mod").write_text(_soic("SOIC-8"))
+    assert fingerprint(logo) is None
+    with FootprintIndex(str(tmp_path / "fp.db")) as index:
+        index.update([str(lib)], workers=1)
+        assert len(index) == 3 and index.lookup("Logo")[0].fingerprint is None
+        assert index.duplicates() == [] and index.match(fiducial) == []
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from pcbai.steps.drc import check_footprint
+from pcbai.steps.footprint_generator import SoicParams, generate_soic
+from pcbai.steps.gerber_exporter import export_gerbers
+from pcbai.steps.gerber_writer import BoardArtwork, iter_layer, write_gerbers
+from pcbai.steps.netlist import NetlistBuilder
+
+SOIC8 = generate_soic(SoicParams("SOIC-8", 8, 1.27, 4.9, 3.9, 1.55, 0.6, 2.7))
+HEADER = ('(footprint J (pad 1 thru_hole circle (at 0 0) (size 1.7 1.7) (drill 1.0) (layers *.Cu *.Mask))\n'
+          '  (pad "" np_thru_hole circle (at 3 0) (size 2 2) (drill 2) (layers *.Cu *.Mask)))')
+ROUTING = {"tracks": [{"net": "SIG", "layer": 1, "start": (11.905, 12.7), "end": (20.0, 20.0), "width": 0.25}],
+           "vias": [{"net": "SIG", "at": (20.0, 20.0), "diameter": 0.6}]}
+
+
+def _artwork():
+    b = NetlistBuilder()
+    b.connect("SIG", "U1", "4")
+    b.connect("SIG", "J1", "1")
+    return BoardArtwork.from_layout({"U1": (10, 10), "J1": (20, 20)}, {"U1": SOIC8, "J1": HEADER}, (30, 30),
+                                    netlist=b.build(), routing=ROUTING)
+
+
+def test_copper_layer_flashes_pads_tracks_and_vias():
+    art = _artwork()
+    assert art.layer_names() == ["F_Cu", "B_Cu", "F_Mask", "B_Mask", "F_Paste", "B_Paste", "F_SilkS", "Edge_Cuts",
+                                 "PTH", "NPTH"]
+    top = "".join(iter_layer(art, "F_Cu"))
+    assert top.startswith("%TF.GenerationSoftware,pcbai,gerber_writer,1*%\n%TF.FileFunction,Copper,L1,Top*%\n")
+    assert "%FSLAX46Y46*%\n%MOMM*%" in top and top.endswith("M02*\n")
+    assert "%TA.AperFunction,SMDPad,CuDef*%\n%ADD10R,0.600000X1.550000*%\n%TD*%" in top
+    assert "%TO.N,SIG*%\n%TO.P,U1,4*%\nX11905000Y-12700000D03*\n%TD*%" in top
+    assert top.count("D03*") == 8 + 1 + 1  # SOIC pads, header pin 1, via; the bare hole is not copper
+    assert "Conductor" not in top
+    bottom = "".join(iter_layer(art, "B_Cu"))
+    assert "%TO.N,SIG*%\nX11905000Y-12700000D02*\nX20000000Y-20000000D01*\n%TD*%" in bottom
+    assert "U1" not in bottom
+
+
+def test_mask_paste_and_drills():
+    art = _artwork()
+    mask = "".join(iter_layer(art, "F_Mask"))
+    assert "%TF.FilePolarity,Negative*%" in mask and "%ADD10R,0.660000X1.610000*%" in mask
+    paste = "".join(iter_layer(art, "F_Paste"))
+    assert paste.count("D03*") == 8  # no paste on the header
+    pth = "".join(iter_layer(art, "PTH"))
+    assert "T1C0.300\nT2C1.000\n" in pth and "T1\nX20.000Y-20.000\nT2\nX20.000Y-20.000\n" in pth
+    npth = "".join(iter_layer(art, "NPTH"))
+    assert "NonPlated,1,2,NPTH" in npth and "T1C2.000" in npth and "X23.000Y-20.000" in npth
+
+
+def test_parallel_write_matches_serial(tmp_path):
+    art = _artwork()
+    serial = write_gerbers(art, str(tmp_path / "a"), workers=1)
+    parallel = write_gerbers(art, str(tmp_path / "b"), workers=4)
+    assert list(serial) == list(parallel) == art.layer_names()
+    for name in serial:
+        with open(serial[name]) as f, open(parallel[name]) as g:
+            assert f.read() == g.read()
+    assert os.path.basename(serial["PTH"]) == "board-PTH.drl"
+    assert not any(p.endswith(".part") for p in os.listdir(tmp_path / "a"))
+
+
+def test_export_gerbers_native_backend(tmp_path):
+    out = export_gerbers(_artwork(), str(tmp_path), workers=1)
+    assert out == str(tmp_path) and "board-Edge_Cuts.gbr" in os.listdir(tmp_path)
+    with pytest.raises(ValueError):
+        export_gerbers("board.kicad_pcb", str(tmp_path), backend="native")
+    with pytest.raises(ValueError):
+        export_gerbers("board.kicad_pcb", str(tmp_path), backend="eagle")
+
+
+def test_multiline_kicad8_through_hole_pads():
+    header = '''(footprint "PinHeader_1x02"
+  (version 20240108)
+  (layer "F.Cu")
+  (pad "1" thru_hole rect
+    (at 0 0)
+    (size 1.7 1.7)
+    (drill 1.0)
+    (layers "*.Cu" "*.Mask")
+    (uuid "4a2d0f3e-0000-0000-0000-000000000001")
+  )
+  (pad "2" thru_hole oval
+    (at 0 2.54 90)
+    (size 1.7 1.7)
+    (drill 1.0)
+    (layers "*.Cu" "*.Mask")
+  )
+)'''
+    art = BoardArtwork.from_layout({"J1": (5, 5)}, {"J1": header}, (10, 10))
+    assert "".join(iter_layer(art, "F_Cu")).count("D03*") == 2
+    assert "".join(iter_layer(art, "B_Cu")).count("D03*") == 2
+    assert "".join(iter_layer(art, "B_Mask")).count("D03*") == 2
+    pth = "".join(iter_layer(art, "PTH"))
+    assert "T1C1.000" in pth and "X5.000Y-5.000" in pth and "X5.000Y-7.540" in pth
+
+
+def test_paste_only_apertures_reach_the_paste_layer():
+    dfn = '''(footprint "DFN-2-1EP"
+  (pad "1" smd rect (at -1 0) (size 0.4 0.8) (layers "F.Cu" "F.Paste" "F.Mask"))
+  (pad "2" smd rect (at 0.5 0) (size 1.2 1.2) (layers "F.Cu" "F.Mask"))
+  (pad "" smd rect (at 0.25 -0.25) (size 0.5 0.5) (layers "F.Paste"))
+  (pad "" smd rect (at 0.75 0.25) (size 0.5 0.5) (layers "F.Paste"))
+)'''
+    art = BoardArtwork.from_layout({"U1": (5, 5)}, {"U1": dfn}, (10, 10))
+    assert "".join(iter_layer(art, "F_Paste")).count("D03*") == 3  # pin 1 and both exposed-pad windows
+    assert "".join(iter_layer(art, "F_Cu")).count("D03*") == 2
+    assert "".join(iter_layer(art, "F_Mask")).count("D03*") == 2
+    assert check_footprint(dfn) == []  # the windows overlap the EP but carry no copper
@@ -0,0 +1,112 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from pcbai.pipeline.cli import main
+from pcbai.steps.gerber_exporter import export_gerbers
+from pcbai.steps.kicad_jobs import KicadError, export_boards, run_job
+
+# Stand-in for kicad-cli: "broken" boards fail, "slow" ones hang, "flaky" ones fail once.
+# Every run records how many runs were active at the same time.
+FAKE = r'''#!{python}
+import os, sys, time
+args = sys.argv[1:]
+out, board = args[args.index("--output") + 1], args[-1]
+name = os.path.splitext(os.path.basename(board))[0]
+running = os.path.join(os.path.dirname(board), "running")
+os.makedirs(running, exist_ok=True)
+me = os.path.join(running, str(os.getpid()))
+open(me, "w").close()
+with open(os.path.join(os.path.dirname(board), "concurrency.log"), "a") as log:
+    log.write(f"{{len(os.listdir(running))}}\n")
+try:
+    time.sleep(0.1)
+    if "slow" in name:
+        time.sleep(30)
+    if "broken" in name:
+        sys.stderr.write("Loading board...\nFailed to load board\n")
+        sys.exit(3)
+    if "flaky" in name and not os.path.exists(board + ".tried"):
+        open(board + ".tried", "w").close()
+        sys.stderr.write("transient\n")
+        sys.exit(1)
+    os.makedirs(out, exist_ok=True)
+    suffix = {{"gerbers": "-F_Cu.gbr", "drill": ".drl"}}[args[2]]
+    with open(os.path.join(out, name + suffix), "w") as f:
+        f.write("G04 fake*\n")
+finally:
+    os.remove(me)
+'''
+
+
+@pytest.fixture
+def fake_cli(tmp_path, monkeypatch):
+    path = tmp_path / "kicad-cli"
+    path.write_text(FAKE.format(python=sys.executable))
+    path.chmod(path.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr("pcbai.core.config.settings.kicad_cli", str(path))
+    return str(path)
+
+
+def _boards(tmp_path, *names):
+    paths = []
+    for name in names:
+        p = tmp_path / f"{name}.kicad_pcb"
+        p.write_text("(kicad_pcb)")
+        paths.append(str(p))
+    return paths
+
+
+def test_bounded_parallel_export_reports_every_board(tmp_path, fake_cli):
+    boards = _boards(tmp_path, *[f"b{i}" for i in range(6)], "broken", "flaky")
+    summary = export_boards(boards, str(tmp_path / "out"), workers=2, retries=1, backoff=0.0,
+                            exports=("gerbers", "drill"))
+    assert (summary.total, summary.ok, summary.failed) == (8, 7, 1)
+    by_name = {os.path.basename(r.board): r for r in summary.results}
+    ok = by_name["b0.kicad_pcb"]
+    assert ok.returncode == 0 and ok.attempts == 2
+    assert [os.path.basename(f) for f in ok.files] == ["b0-F_Cu.gbr", "b0.drl"]
+    assert ok.outdir == str(tmp_path / "out" / "b0")
+    broken = by_name["broken.kicad_pcb"]
+    assert not broken.ok and broken.returncode == 3 and broken.attempts == 2
+    assert broken.error == "gerbers: exit code 3: Failed to load board"
+    assert "Loading board..." in broken.stderr
+    flaky = by_name["flaky.kicad_pcb"]
+    assert flaky.ok and flaky.attempts == 3
+    peak = max(int(line) for line in (tmp_path / "concurrency.log").read_text().split())
+    assert 1 <= peak <= 2
+
+
+def test_timeout_and_missing_binary_are_failures(tmp_path, fake_cli):
+    (slow,) = _boards(tmp_path, "slow")
+    res = run_job(slow, str(tmp_path / "out"), timeout=0.5, retries=0)
+    assert not res.ok and res.returncode is None and res.error == "gerbers: timed out after 0.5s"
+    assert res.seconds < 5
+    res = run_job(slow, str(tmp_path / "out"), kicad_cli=str(tmp_path / "nope"))
+    assert not res.ok and res.error.startswith("cannot run") and res.attempts == 1
+    assert run_job(str(tmp_path / "missing.kicad_pcb"), str(tmp_path / "out")).error == "board file not found"
+
+
+def test_export_gerbers_raises_instead_of_writing_a_marker(tmp_path, fake_cli):
+    good, broken = _boards(tmp_path, "good", "broken")
+    assert export_gerbers(good, str(tmp_path / "g")) == str(tmp_path / "g")
+    assert os.listdir(tmp_path / "g") == ["good-F_Cu.gbr"]
+    with pytest.raises(KicadError) as exc:
+        export_gerbers(broken, str(tmp_path / "b"))
+    assert exc.value.result.returncode == 3
+    assert not os.path.exists(tmp_path / "b" / "GERBERS_READY.txt")
+
+
+def test_export_gerbers_command(tmp_path, fake_cli):
+    boards = _boards(tmp_path, "a", "broken")
+    report = tmp_path / "report.jsonl"
+    result = CliRunner().invoke(main, ["export-gerbers", *boards, "--out", str(tmp_path / "out"),
+                                       "--retries", "0", "--report", str(report)])
+    assert result.exit_code == 1
+    assert "Exported 1/2 boards" in result.output and "1 board(s) failed" in result.output
+    rows = {os.path.basename(r["board"]): r for r in map(json.loads, report.read_text().splitlines())}
+    assert rows["a.kicad_pcb"]["ok"] and not rows["broken.kicad_pcb"]["ok"]
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+
+import pytest
+
+from pcbai.llm.caching import CachingProvider
+from pcbai.llm.openai_compat import OpenAICompatibleProvider
+from pcbai.llm.provider import make_provider
+from pcbai.llm.stub import StubProvider, StubServer
+
+
+def test_persistent_cache_and_params_in_key(tmp_path):
+    stub = StubProvider()
+    llm = CachingProvider(stub, cache_dir=str(tmp_path))
+    assert llm.complete("pinout of NE555") == "stub: pinout of NE555"
+    assert llm.complete("pinout of NE555") == "stub: pinout of NE555"
+    llm.complete("pinout of NE555", temperature=0.7)
+    assert stub.calls == 2
+    # A new wrapper (new process) answers from disk
+    again = CachingProvider(StubProvider(reply="different"), cache_dir=str(tmp_path))
+    assert again.complete("pinout of NE555") == "stub: pinout of NE555"
+    m = again.metrics
+    assert (m.requests, m.cache_hits, m.backend_calls) == (1, 1, 0)
+
+
+def test_complete_many_bounded_and_deduplicated():
+    stub = StubProvider(delay=0.05)
+    llm = CachingProvider(stub, max_concurrency=3)
+    prompts = [f"part {i % 10}" for i in range(40)]
+    assert llm.complete_many(prompts) == [f"stub: {p}" for p in prompts]
+    assert stub.calls == 10 and stub.peak <= 3
+    m = llm.metrics
+    assert m.requests == 40 and m.cache_hits + m.deduped == 30
+    assert m.prompt_tokens > 0 and m.latency(95) >= 0.05
+
+
+def test_inflight_dedupe_across_threads():
+    gate = threading.Event()
+    stub = StubProvider(reply=lambda p: gate.wait(5) and "done")
+    llm = CachingProvider(stub, max_concurrency=8)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(llm.complete("same"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == ["done"] * 5 and stub.calls == 1
+
+
+def test_async_path_limits_and_dedupes():
+    stub = StubProvider(delay=0.05)
+    llm = CachingProvider(stub, max_concurrency=4)
+    prompts = [f"q{i}" for i in range(16)] + ["q0"] * 4
+    out = asyncio.run(llm.acomplete_many(prompts))
+    assert out == [f"stub: {p}" for p in prompts]
+    assert stub.calls == 16 and stub.peak == 4
+    assert llm.metrics.deduped == 4
+
+
+def test_errors_are_not_cached():
+    calls = []
+
+    def flaky(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise RuntimeError("backend down")
+        return "ok"
+
+    llm = CachingProvider(StubProvider(reply=flaky))
+    with pytest.raises(RuntimeError):
+        llm.complete("x")
+    assert llm.complete("x") == "ok"
+    assert llm.metrics.errors == 1
+
+
+def test_openai_compatible_stub_server(tmp_path):
+    with StubServer(reply=lambda p: p.upper()) as server:
+        backend = OpenAICompatibleProvider(server.url, api_key="test", model="stub-model")
+        llm = CachingProvider(backend, cache_dir=str(tmp_path), max_concurrency=4)
+        assert llm.complete_many(["a", "b", "a"]) == ["A", "B", "A"]
+        assert asyncio.run(llm.acomplete("c")) == "C"
+        assert server.requests == 3
+        assert llm.metrics.completion_tokens == 3
+    assert isinstance(make_provider("stub", cache_dir=str(tmp_path)), CachingProvider)
@@ -0,0 +1,82 @@
+import pytest
+
+from pcbai.steps.maze_router import MazeRouter, Pad, RouterConfig
+from pcbai.steps.netlist import Netlist
+from pcbai.steps.pcb_router import route_pcb
+
+# A spans the board edge to edge and is routed first; B can only cross it
+# on a single layer if A is ripped up and detours around B.
+CROSSING = {"A": [Pad(0.5, 5, 0.8, 0.8), Pad(19.5, 5, 0.8, 0.8)], "B": [Pad(10, 2.5), Pad(10, 7.5)]}
+
+
+def _ends(route):
+    pts = [(x1, y1) for _, x1, y1, _, _ in route.segments] + [(x2, y2) for _, _, _, x2, y2 in route.segments]
+    return pts
+
+
+def test_rip_up_and_reroute_on_one_layer():
+    result = MazeRouter(20, 10, RouterConfig(layers=1, order="given")).route(CROSSING)
+    a, b = result.routes["A"], result.routes["B"]
+    assert result.routed == 2 and result.unrouted == 0
+    assert a.ripups == 1 and a.length > 19.5
+    assert b.segments == [(0, 10.05, 7.55, 10.05, 2.55)]
+
+
+def test_without_rip_up_second_net_fails():
+    result = MazeRouter(20, 10, RouterConfig(layers=1, order="given", max_ripups=0)).route(CROSSING)
+    assert result.routes["A"].routed and not result.routes["B"].routed
+    assert result.unrouted == 1
+
+
+def test_second_layer_crossing_uses_vias():
+    result = MazeRouter(20, 10, RouterConfig(order="given")).route(CROSSING)
+    b = result.routes["B"]
+    assert result.unrouted == 0 and result.routes["A"].ripups == 0
+    assert len(b.vias) == 2 and {s[0] for s in b.segments} == {0, 1}
+    ends = _ends(b)
+    assert (10.05, 7.55) in ends and (10.05, 2.55) in ends
+
+
+def test_keepout_forces_detour_and_full_wall_blocks():
+    nets = {"N": [Pad(2, 5), Pad(18, 5)]}
+    router = MazeRouter(20, 10, RouterConfig(layers=1))
+    router.add_keepout(9.5, 0, 10.5, 8)  # wall with a gap at the top
+    route = router.route(nets).routes["N"]
+    assert route.routed and max(max(y1, y2) for _, _, y1, _, y2 in route.segments) > 8
+    walled = MazeRouter(20, 10, RouterConfig(layers=2))
+    walled.add_keepout(9.5, 0, 10.5, 10)
+    assert walled.route(nets).unrouted == 1
+
+
+
+def test_walled_off_window_grows_before_searching_the_whole_board(monkeypatch):
+    router = MazeRouter(60, 60, RouterConfig(layers=1))
+    router.add_keepout(29.5, 22, 30.5, 60)  # the only gap is 8 mm below the pads, outside the first window
+    windows = []
+    masks = MazeRouter._masks
+    monkeypatch.setattr(MazeRouter, "_masks", lambda self, net, win, locked: windows.append(win)
+                        or masks(self, net, win, locked))
+    route = router.route({"N": [Pad(20, 30), Pad(40, 30)]}).routes["N"]
+    assert route.routed and min(min(y1, y2) for _, _, y1, _, y2 in route.segments) < 22
+    assert len(windows) == 2 and (0, router.ny, 0, router.nx) not in windows
+
+def test_net_order_options():
+    seen = []
+    cfg = RouterConfig(order=lambda name, pads: seen.append(name) or -len(name))
+    MazeRouter(20, 10, cfg).route({"S": [Pad(1, 1), Pad(2, 1)], "LONG": [Pad(1, 9), Pad(19, 9)]})
+    assert sorted(seen) == ["LONG", "S"]
+    router = MazeRouter(20, 10, RouterConfig(order="long"))
+    assert router._order({"S": CROSSING["B"], "L": CROSSING["A"]}) == ["L", "S"]
+
+
+def test_route_pcb_with_pin_geometry():
+    nl = Netlist.from_connections([("VCC", "U1", "1"), ("VCC", "U2", "1"), ("GND", "U1", "2"), ("GND", "U2", "2")])
+    pins = {("U1", "1"): Pad(5, 5), ("U1", "2"): Pad(5, 7), ("U1", "3"): Pad(10, 6),
+            ("U2", "1"): Pad(15, 5), ("U2", "2"): Pad(15, 7)}
+    out = route_pcb(nl, pins=pins, board=(20, 12))
+    assert out["status"] == "routed" and (out["routed"], out["unrouted"]) == (2, 0)
+    assert {t["net"] for t in out["tracks"]} == {"VCC", "GND"}
+    assert out["nets"]["VCC"]["length"] >= 10
+    assert route_pcb(nl)["tracks"] == []
+    with pytest.raises(TypeError):
+        route_pcb(nl, pins=pins, bogus=1)
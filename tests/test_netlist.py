@@ -0,0 +1,76 @@
+import io
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+from pcbai.bench import workloads
+from pcbai.steps.netlist import Netlist, NetlistBuilder, iter_kicad, write_json, write_netlist
+from pcbai.steps.schematic_synthesizer import synthesize_schematic
+
+
+def _small():
+    b = NetlistBuilder()
+    b.add_part("R1", "10k", "0603")
+    b.add_part("U1", "LM358", "SOIC-8")
+    b.connect("VCC", "U1", "8")
+    b.connect("GND", "U1", "4")
+    b.connect("OUT", "U1", "1")
+    b.connect("OUT", "R1", "1")
+    b.connect("GND", "R1", "2")
+    b.add_pin("U1", "5")
+    return b.build()
+
+
+def test_lookups_both_directions():
+    nl = _small()
+    assert (nl.n_parts, nl.n_nets, nl.n_pins) == (2, 3, 6)
+    assert nl.nodes("OUT") == [("R1", "1"), ("U1", "1")]
+    assert nl.nodes("GND") == [("R1", "2"), ("U1", "4")]
+    assert nl.net_of("R1", "2") == "GND"
+    assert nl.net_of("U1", "5") is None
+    assert nl.part_nets("U1") == ["VCC", "GND", "OUT"]
+    assert nl.to_dict()["nets"]["OUT"] == ["R1", "U1"]
+    with pytest.raises(KeyError):
+        nl.pin_id("U1", "9")
+
+
+def test_pin_cannot_join_two_nets():
+    b = NetlistBuilder()
+    b.connect("A", "U1", "1")
+    with pytest.raises(ValueError):
+        b.connect("B", "U1", "1")
+
+
+def test_csr_matches_pin_net():
+    nl = workloads.netlist(500, pins_per_part=6)
+    assert nl.n_pins == 3000
+    for n in (0, 7, nl.n_nets - 1):
+        assert np.all(nl.pin_net[nl.net_pins(n)] == n)
+    assert int(np.diff(nl.net_ptr).sum()) == nl.n_pins
+    again = pickle.loads(pickle.dumps(nl))
+    assert again.nodes(3) == nl.nodes(3)
+
+
+def test_kicad_writer_escapes_and_lists_every_node():
+    nl = Netlist.from_connections([("N\"1", "U1", "1"), ("N\"1", "U2", "A1")],
+                                  parts=[("U1", 'say "hi"', "SOIC-8")])
+    text = "".join(iter_kicad(nl))
+    assert text.startswith('(export (version "E")')
+    assert '(value "say \\"hi\\"")' in text
+    assert '(net (code "1") (name "N\\"1")' in text
+    assert '(node (ref "U2") (pin "A1"))' in text
+    assert text.count("(") == text.count(")")
+
+
+def test_json_writer_roundtrip(tmp_path):
+    nl = synthesize_schematic([{"mpn": "A", "package": "SOIC-8"}, {"mpn": "B"}])
+    buf = io.StringIO()
+    write_json(nl, buf)
+    doc = json.loads(buf.getvalue())
+    assert doc["components"][0] == {"ref": "U1", "value": "A", "footprint": "SOIC-8"}
+    assert {n["name"]: n["nodes"] for n in doc["nets"]} == {"GND": [["U1", "2"], ["U2", "2"]],
+                                                           "VCC": [["U1", "1"], ["U2", "1"]]}
+    path = write_netlist(nl, str(tmp_path / "board.json"))
+    assert json.load(open(path)) == doc
@@ -0,0 +1,43 @@
+import numpy as np
+
+from pcbai.steps.footprint_bga import BgaParams, generate_bga
+from pcbai.steps.pad_array import bga_row_labels, depopulation_mask, dual_row, format_smd_pads, grid, quad
+
+
+def test_dual_row_numbering_and_positions():
+    pads = dual_row(8, 1.27, 2.7, 0.6, 1.5)
+    assert pads.numbers == ["1", "8", "2", "7", "3", "6", "4", "5"]
+    assert np.allclose(pads.xy[:2], [[-1.905, 2.7], [-1.905, -2.7]])
+
+
+def test_quad_sides_are_counter_clockwise():
+    pads = quad(16, 0.5, 2.0, 0.6, 0.25)
+    assert pads.numbers[0] == "1" and pads.numbers[-1] == "16"
+    assert np.allclose(pads.xy[[0, 4, 8, 12]], [[-0.75, 2.0], [-2.0, -0.75], [-0.75, -2.0], [2.0, -0.75]])
+    assert np.allclose(pads.size[4], [0.6, 0.25])  # vertical sides swap size
+
+
+def test_bga_row_labels_skip_reserved_letters():
+    labels = bga_row_labels(22)
+    assert "I" not in labels and "O" not in labels
+    assert labels[7] == "H" and labels[8] == "J"
+    assert labels[19] == "Y" and labels[20] == "AA"
+
+
+def test_depopulated_grid():
+    mask = depopulation_mask(6, 6, center=2, missing=["A1"])
+    pads = grid(6, 6, 0.8, 0.4, mask)
+    assert len(pads) == 36 - 4 - 1
+    assert "A1" not in pads.numbers and "A2" in pads.numbers and "C3" not in pads.numbers
+    assert np.allclose(pads.xy[0], [-1.2, -2.0])  # A2
+
+
+def test_generate_bga_1024_balls():
+    p = BgaParams(name="BGA-1024", rows=32, cols=32, pitch=1.0, body_l=33.0, body_w=33.0, pad_d=0.5)
+    text = generate_bga(p)
+    assert text.count("(pad ") == 1024
+    assert "(pad A1 smd circle (at -15.500 -15.500) (size 0.500 0.500)" in text
+
+
+def test_format_smd_pads_empty():
+    assert format_smd_pads(quad(0, 0.5, 1.0, 0.5, 0.2), 0.03, 1.0) == ""
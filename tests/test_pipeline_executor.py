@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from pcbai.pipeline import executor
+from pcbai.pipeline.cli import main
+from pcbai.pipeline.executor import Pipeline, PipelineError
+
+calls = []
+
+
+def source(text):
+    calls.append("source")
+    return text.upper()
+
+
+def left(value):
+    calls.append("left")
+    return value + "-L"
+
+
+def right(value):
+    calls.append("right")
+    return value + "-R"
+
+
+def join(a, b, fail=False):
+    calls.append("join")
+    if fail:
+        raise RuntimeError("boom")
+    return a + "+" + b
+
+
+def _pipe(workdir, text="x", fail=False):
+    pipe = Pipeline(str(workdir), name="t")
+    pipe.add("source", source, params={"text": text})
+    pipe.add("left", left, inputs={"value": "source"})
+    pipe.add("right", right, inputs={"value": "source"})
+    pipe.add("join", join, inputs={"a": "left", "b": "right"}, params={"fail": fail})
+    return pipe
+
+
+def test_skips_unchanged_and_reruns_downstream(tmp_path):
+    calls.clear()
+    assert _pipe(tmp_path).run()["join"] == "X-L+X-R"
+    assert sorted(calls) == ["join", "left", "right", "source"]
+    calls.clear()
+    pipe = _pipe(tmp_path)
+    assert pipe.run()["join"] == "X-L+X-R"
+    assert calls == [] and {r.status for r in pipe.results.values()} == {"skipped"}
+    _pipe(tmp_path, text="y").run()
+    assert sorted(calls) == ["join", "left", "right", "source"]
+
+
+def test_resumes_after_failure(tmp_path):
+    calls.clear()
+    with pytest.raises(PipelineError) as exc:
+        _pipe(tmp_path, fail=True).run()
+    assert exc.value.failed == ["join"]
+    calls.clear()
+    pipe = _pipe(tmp_path)
+    assert pipe.run()["join"] == "X-L+X-R"
+    assert calls == ["join"]
+    assert pipe.results["left"].status == "skipped"
+
+
+def test_independent_steps_run_concurrently(tmp_path):
+    barrier = threading.Barrier(2, timeout=5)
+    pipe = Pipeline(str(tmp_path), name="c")
+    # Each step waits for the other; a sequential executor would time out
+    pipe.add("a", barrier.wait)
+    pipe.add("b", barrier.wait)
+    pipe.run()
+    assert {r.status for r in pipe.results.values()} == {"ran"}
+
+
+def test_code_digest_covers_imported_package_modules(monkeypatch):
+    from pcbai.pipeline.synthesize import bom_step
+    from pcbai.steps import keyword_matcher
+
+    before = executor._code_digest(bom_step)
+    # bom_step -> requirements_parser -> keyword_matcher: editing the matcher must invalidate the step
+    monkeypatch.setitem(executor._CODE_DIGESTS, keyword_matcher.__file__, "edited")
+    assert executor._code_digest(bom_step) != before
+
+
+def test_directory_outputs_force_a_rerun(tmp_path):
+    outdir = tmp_path / "out"
+
+    def write_all(n):
+        calls.append("write")
+        outdir.mkdir(exist_ok=True)
+        for i in range(n):
+            (outdir / f"{i}.txt").write_text(str(i))
+        return n
+
+    def pipe():
+        p = Pipeline(str(tmp_path / "work"), name="d")
+        p.add("write", write_all, params={"n": 3}, outputs=[str(outdir)])
+        return p
+
+    calls.clear()
+    pipe().run()
+    pipe().run()
+    assert calls == ["write"]
+    (outdir / "1.txt").unlink()
+    pipe().run()
+    assert calls == ["write", "write"]
+
+
+def test_synthesize_is_incremental(tmp_path):
+    runner = CliRunner()
+    args = ["synthesize", "--out", str(tmp_path / "out"), "--workdir", str(tmp_path / "work"), "mcu", "with", "wifi"]
+    first = runner.invoke(main, args)
+    assert first.exit_code == 0, first.output
+    assert "netlist: ran" in first.output
+    second = runner.invoke(main, args)
+    assert "bom: skipped" in second.output and "netlist: skipped" in second.output
+    (tmp_path / "out" / "netlist.txt").unlink()
+    third = runner.invoke(main, args)
+    assert "bom: skipped" in third.output and "netlist: ran" in third.output
+    assert (tmp_path / "out" / "netlist.txt").exists()
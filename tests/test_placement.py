@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+
+from pcbai.steps.maze_router import Pad
+from pcbai.steps.netlist import NetlistBuilder
+from pcbai.steps.placement import PlacementConfig, _Annealer, _net_entries, hpwl, overlap_area, place
+
+
+def _grid(side):
+    b = NetlistBuilder()
+    for i in range(side * side):
+        b.add_part(f"U{i}")
+    for i in range(side * side):
+        r, c = divmod(i, side)
+        if c + 1 < side:
+            b.connect(f"H{i}", f"U{i}", "1")
+            b.connect(f"H{i}", f"U{i + 1}", "2")
+        if r + 1 < side:
+            b.connect(f"V{i}", f"U{i}", "3")
+            b.connect(f"V{i}", f"U{i + side}", "4")
+        b.connect("GND", f"U{i}", "5")
+    return b.build()
+
+
+def test_place_shortens_wires_without_overlap():
+    nl = _grid(10)
+    sizes = {ref: (2.0, 1.25) for ref in nl.refs}
+    p = place(nl, sizes, (40, 40), PlacementConfig(moves_per_part=20))
+    assert p.hpwl < 0.3 * p.stats["hpwl_random"]
+    assert p.overlap == 0
+    half = (p.size + 0.25) / 2
+    assert (p.xy - half >= -1e-9).all() and (p.xy + half <= 40 + 1e-9).all()
+    nets, parts = _net_entries(nl, 64)
+    assert p.hpwl == hpwl(p.xy, nets, parts)
+
+
+def test_high_fanout_nets_are_ignored():
+    nets, parts = _net_entries(_grid(3), max_fanout=8)
+    assert nets.max() + 1 == 12 and len(parts) == 24  # GND (9 parts) dropped
+
+
+def test_fixed_parts_stay_put():
+    nl = _grid(4)
+    p = place(nl, {}, (20, 20), PlacementConfig(moves_per_part=10), fixed={"U0": (1.0, 1.0), "U15": (19.0, 19.0)})
+    pos = p.positions()
+    assert pos["U0"] == (1.0, 1.0) and pos["U15"] == (19.0, 19.0)
+    assert overlap_area(p.xy, (p.size + 0.25) / 2) == 0
+
+
+def test_incremental_cost_matches_full_recompute():
+    nl = _grid(6)
+    nets, parts = _net_entries(nl, 64)
+    gen = np.random.default_rng(1)
+    xy = gen.uniform(2, 28, (36, 2))
+    half = np.full((36, 2), 0.75)
+    ann = _Annealer(xy, half, nets, parts, (30, 30), 20.0)
+    rng = random.Random(0)
+
+    def full():
+        cur = np.column_stack([ann.x, ann.y])
+        return hpwl(cur, nets, parts) + 20.0 * overlap_area(cur, half)
+
+    cost = full()
+    for _ in range(200):
+        i, j = rng.randrange(36), rng.randrange(36)
+        moved = [i] if i == j else [i, j]
+        new = [(rng.uniform(1, 29), rng.uniform(1, 29)) for _ in moved]
+        delta, accepted = ann.try_move(moved, new, 5.0, rng)
+        if accepted:
+            cost += delta
+    assert abs(cost - full()) < 1e-6 * max(1.0, cost)
+
+
+def test_pads_are_translated_to_board_coordinates():
+    nl = _grid(2)
+    p = place(nl, {}, (10, 10), fixed={"U0": (3.0, 4.0)})
+    pads = p.pads({"U0": {"1": Pad(-0.5, 0.25, 0.4, 0.6)}})
+    assert pads == {("U0", "1"): Pad(2.5, 4.25, 0.4, 0.6, (0,))}
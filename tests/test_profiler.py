@@ -0,0 +1,50 @@
+import json
+
+from click.testing import CliRunner
+
+from pcbai.core import profiler
+from pcbai.pipeline.cli import main
+
+
+@profiler.traced(items=len)
+def _work(n):
+    with profiler.span("inner", items=n) as s:
+        s.add(1)
+    return list(range(n))
+
+
+def test_disabled_records_nothing():
+    profiler.reset()
+    assert _work(3) == [0, 1, 2]
+    assert profiler.span("x") is profiler.span("y")  # shared no-op
+    assert profiler.records() == []
+
+
+def test_spans_summary_and_trace(tmp_path):
+    profiler.reset()
+    profiler.enable()
+    try:
+        _work(5)
+        _work(7)
+    finally:
+        profiler.disable()
+    rows = {r["name"]: r for r in profiler.summary()}
+    assert rows["_work"]["calls"] == 2 and rows["_work"]["items"] == 12
+    assert rows["inner"]["items"] == 14
+    assert rows["_work"]["wall_ms"] >= rows["inner"]["wall_ms"]
+    assert "_work" in profiler.format_summary()
+    trace = json.loads(open(profiler.write_chrome_trace(str(tmp_path / "t.json"))).read())
+    ev = trace["traceEvents"][0]
+    assert ev["ph"] == "X" and {"ts", "dur", "tid", "pid"} <= set(ev) and "cpu_ms" in ev["args"]
+
+
+def test_cli_profile_flag(tmp_path):
+    profiler.reset()
+    out = tmp_path / "trace.json"
+    result = CliRunner().invoke(main, ["--profile", "--profile-out", str(out), "footprint", "--type", "qfn",
+                                       "--name", "QFN16", "--pins", "16", "--pitch", "0.5", "--body-l", "3",
+                                       "--body-w", "3", "--pad-l", "0.6", "--pad-w", "0.25", "--out", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    names = {e["name"] for e in json.loads(out.read_text())["traceEvents"]}
+    assert "generate_qfn" in names
+    assert not profiler.is_enabled()
@@ -0,0 +1,55 @@
+import pytest
+
+from pcbai.steps.bom_generator import generate_bom
+from pcbai.steps.catalog import Catalog
+from pcbai.steps.keyword_matcher import KeywordMatcher
+from pcbai.steps.requirements_parser import parse_requirements, parse_requirements_batch
+
+
+def test_keywords_synonyms_and_constraints():
+    req = parse_requirements("Microcontroller board with Wi-Fi, USB-C and a step-down from 4.5-28V, at least 500 mA")
+    assert req["keywords"] == ["wifi", "usb", "buck", "mcu"]
+    volts, amps = req["constraints"]
+    assert (volts["quantity"], volts["lo"], volts["hi"]) == ("voltage", 4.5, 28.0)
+    assert (amps["quantity"], amps["hi"], amps["bound"]) == ("current", 0.5, "min")
+    # Whole words only
+    assert parse_requirements("shadcn dashboard")["keywords"] == []
+
+
+def test_si_prefix_case():
+    def values(text):
+        return [(c["quantity"], c["hi"]) for c in parse_requirements(text)["constraints"]]
+    assert values("10 MOhm pullup") == [("resistance", pytest.approx(1e7))]
+    assert values("1 MW, 250 mW") == [("power", pytest.approx(1e6)), ("power", pytest.approx(0.25))]
+    assert values("8 MHz or 16mhz, 100NF") == [("frequency", pytest.approx(8e6)), ("frequency", pytest.approx(16e6)),
+                                                ("capacitance", pytest.approx(1e-7))]
+
+
+def test_custom_vocabulary_overlapping_terms(tmp_path):
+    vocab = tmp_path / "vocab.csv"
+    vocab.write_text("i2c,interface\ni2c eeprom,eeprom\neeprom,eeprom\nMHz crystal,crystal\n")
+    matcher = KeywordMatcher.from_file(str(vocab))
+    reqs = parse_requirements_batch(["I2C EEPROM plus 16 MHz crystal", "nothing here"], matcher)
+    assert reqs[0]["keywords"] == ["interface", "eeprom", "crystal"]
+    assert [t["term"] for t in reqs[0]["terms"]] == ["i2c eeprom", "i2c", "eeprom", "mhz crystal", "crystal"]
+    assert reqs[0]["constraints"][0]["hi"] == pytest.approx(16e6)
+    assert reqs[1]["keywords"] == []
+
+
+def test_constraints_narrow_catalog_query(tmp_path):
+    with Catalog(str(tmp_path / "cat.db")) as cat:
+        cat.import_rows([
+            {"mpn": "SMALL", "category": "buck", "voltage": "4.5-17V", "current": "1A", "stock": 900},
+            {"mpn": "BIG", "category": "buck", "voltage": "4.5-28V", "current": "3A", "stock": 10},
+        ])
+        assert generate_bom(parse_requirements("buck"), catalog=cat)[0]["mpn"] == "SMALL"
+        assert generate_bom(parse_requirements("buck from 24V"), catalog=cat)[0]["mpn"] == "BIG"
+        # Unsatisfiable constraints fall back to the best unconstrained part
+        assert generate_bom(parse_requirements("buck from 48V"), catalog=cat)[0]["mpn"] == "SMALL"
+        # Each constraint narrows only the keyword it sits next to
+        cat.import_rows([
+            {"mpn": "MCU-3V3", "category": "mcu", "voltage": "1.8-3.6V", "current": "0.1A", "stock": 900},
+            {"mpn": "MCU-HV", "category": "mcu", "voltage": "2.7-30V", "current": "3A", "stock": 5},
+        ])
+        bom = generate_bom(parse_requirements("buck 24V 3A and mcu 3.3V"), catalog=cat)
+        assert [p["mpn"] for p in bom] == ["BIG", "MCU-3V3"]
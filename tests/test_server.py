@@ -0,0 +1,81 @@
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from pcbai.pipeline import server as server_mod
+from pcbai.pipeline.server import JobServer, WarmState
+
+SOIC = {"type": "soic", "name": "SOIC-8", "pins": 8, "pitch": 1.27, "body_l": 4.9, "body_w": 3.9,
+        "pad_l": 1.55, "pad_w": 0.6, "row_offset": 2.7}
+
+
+def _call(base, method, path, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base + path, data=data, method=method, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def _serve(tmp_path, scenario, **kwargs):
+    async def main():
+        srv = JobServer(WarmState(workdir=str(tmp_path)), **kwargs)
+        host, port = await srv.start(port=0)
+        try:
+            return await asyncio.to_thread(scenario, f"http://{host}:{port}", srv)
+        finally:
+            await srv.stop()
+    return asyncio.run(main())
+
+
+def test_jobs_run_and_warm_state_is_reused(tmp_path):
+    def scenario(base, srv):
+        status, job = _call(base, "POST", "/jobs?wait=10", {"kind": "bom", "params": {"description": "buck converter and mcu"}})
+        assert status == 200 and job["status"] == "done"
+        assert sorted(p["mpn"] for p in job["result"]["bom"]) == ["MP1584EN", "STM32F103C8T6"]
+
+        status, queued = _call(base, "POST", "/jobs", {"kind": "footprint", "params": SOIC})
+        assert status in (200, 202)
+        _, first = _call(base, "GET", f"/jobs/{queued['id']}?wait=10")
+        _, second = _call(base, "POST", "/jobs?wait=10", {"kind": "footprint", "params": SOIC})
+        assert first["result"]["content"] == second["result"]["content"]
+        assert first["result"]["content"].startswith("(module SOIC-8")
+
+        _, bad = _call(base, "POST", "/jobs?wait=10", {"kind": "footprint", "params": {"type": "nope"}})
+        assert bad["status"] == "failed" and "unknown footprint type" in bad["error"]
+        assert _call(base, "POST", "/jobs", {"kind": "bogus"})[0] == 400
+        assert _call(base, "GET", "/jobs/missing")[0] == 404
+
+        _, metrics = _call(base, "GET", "/metrics")
+        assert metrics["completed"] == 3 and metrics["failed"] == 1 and metrics["running"] == 0
+        assert metrics["kinds"]["footprint"]["count"] == 3
+        assert metrics["warm"]["footprints"] == {"size": 1, "hits": 1, "misses": 1}
+        assert len(_call(base, "GET", "/jobs")[1]) == 4
+    _serve(tmp_path, scenario, workers=2)
+
+
+def test_full_queue_is_refused(tmp_path, monkeypatch):
+    release = threading.Event()
+
+    def slow(state, params):
+        release.wait(10)
+        return params
+
+    monkeypatch.setitem(server_mod.JOB_KINDS, "slow", slow)
+
+    def scenario(base, srv):
+        codes = [_call(base, "POST", "/jobs", {"kind": "slow", "params": {"i": i}})[0] for i in range(4)]
+        # one running, two queued, the fourth is refused
+        assert codes == [202, 202, 202, 429]
+        release.set()
+        deadline = time.time() + 10
+        while _call(base, "GET", "/metrics")[1]["completed"] < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        metrics = _call(base, "GET", "/metrics")[1]
+        assert metrics["completed"] == 3 and metrics["rejected"] == 1 and metrics["queued"] == 0
+    _serve(tmp_path, scenario, workers=1, queue_size=2)
@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+from pcbai.steps.sexpr import SexprError, find, find_all, floats, iter_items, parse
+
+TEXT = '(footprint "R 0603" (layer "F.Cu")\n  (fp_text value "say \\"hi\\"" (at 0 1))\n  (pad "1" smd rect (at -0.8 0) (size 0.9 0.8))\n  (pad "2" smd rect (at 0.8 0 90) (size 0.9 0.8)))\n'
+
+
+def test_parse_unquotes_strings_and_keeps_numbers_as_text():
+    expr = parse(TEXT)
+    assert expr[:2] == ["footprint", "R 0603"]
+    assert find(expr, "fp_text")[2] == 'say "hi"'
+    pads = list(find_all(expr, "pad"))
+    assert [p[1] for p in pads] == ["1", "2"]
+    assert floats(find(pads[1], "at"), 3) == [0.8, 0.0, 90.0]
+    assert floats(find(pads[0], "at"), 3) == [-0.8, 0.0, 0.0]
+    assert floats(find(pads[0], "drill"), 1) == [0.0]
+
+
+def test_iter_items_matches_parse_across_chunk_boundaries():
+    expected = parse(TEXT)  # head atom included
+    for chunk_size in (1, 3, 7, 64):
+        assert list(iter_items(io.StringIO(TEXT), chunk_size=chunk_size)) == expected
+
+
+@pytest.mark.parametrize("bad", ["(a (b)", "(a))", "atom", '(a "open)', ""])
+def test_malformed_input_raises(bad):
+    with pytest.raises(SexprError):
+        parse(bad)
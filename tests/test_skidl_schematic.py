@@ -0,0 +1,32 @@
+import importlib.util
+
+import pytest
+
+from pcbai.steps.skidl_schematic import SKIDL_MISSING, bom_to_schematic
+
+BOM = [{"mpn": "ESP32-WROOM-32", "package": "Module"}, {"mpn": "AP2112K-3.3", "package": "SOT-23-5"}]
+
+
+def test_native_backend_emits_kicad_netlist():
+    text = bom_to_schematic(BOM)
+    assert text.startswith('(export (version "E")')
+    assert '(comp (ref "U2")\n      (value "AP2112K-3.3")\n      (footprint "SOT-23-5"))' in text
+    assert '(name "VCC")\n      (node (ref "U1") (pin "1"))\n      (node (ref "U2") (pin "1")))' in text
+    assert '(node (ref "U2") (pin "2"))' in text
+
+
+def test_native_backend_has_no_state_between_designs():
+    first = bom_to_schematic(BOM)
+    for i in range(200):
+        bom_to_schematic([{"mpn": f"X{i}", "package": "0603"}] * 5)
+    assert bom_to_schematic(BOM) == first
+
+
+@pytest.mark.skipif(importlib.util.find_spec("skidl") is not None, reason="SKiDL installed")
+def test_skidl_backend_without_skidl():
+    assert bom_to_schematic(BOM, backend="skidl") == SKIDL_MISSING
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        bom_to_schematic(BOM, backend="eagle")
@@ -0,0 +1,62 @@
+import csv
+import json
+import os
+
+from pcbai.pipeline import synthesize_batch
+from pcbai.pipeline.synthesize_batch import run_synthesis_batch
+from pcbai.steps.catalog import Catalog
+
+
+def _catalog(path):
+    with Catalog(path) as cat:
+        cat.import_rows([
+            {"mpn": "BUCK-1", "manufacturer": "Acme", "category": "buck", "package": "SOIC-8", "voltage": "4.5-28V",
+             "current": "2A", "price": "0.5", "stock": "100"},
+            {"mpn": "MCU-1", "manufacturer": "Acme", "category": "mcu", "package": "LQFP-48", "voltage": "2-3.6V",
+             "price": "2.0", "stock": "100"},
+        ])
+    return path
+
+
+def _designs(path):
+    rows = [
+        {"name": "node v1", "description": "buck converter and mcu", "quantity": 10},
+        {"name": "node v1", "description": "mcu board", "quantity": 5},
+        {"description": "buck only"},
+        {"name": "empty"},
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+    return str(path)
+
+
+def _read(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_batch_writes_designs_and_rollup(tmp_path):
+    db = _catalog(str(tmp_path / "cat.db"))
+    designs = _designs(tmp_path / "designs.jsonl")
+    for workers in (1, 2):
+        out = tmp_path / f"out{workers}"
+        summary = run_synthesis_batch(designs, str(out), catalog_db=db, workers=workers, chunksize=1)
+        assert (summary.total, summary.ok, summary.failed, summary.parts) == (4, 3, 1, 2)
+        assert summary.errors[0].row == 4 and "description" in summary.errors[0].error
+        assert sorted(os.listdir(out)) == ["bom_lines.csv", "bom_rollup.csv", "design-0003", "node_v1", "node_v1-2"]
+        assert os.path.exists(out / "node_v1" / "netlist.txt")
+        assert sorted(r["mpn"] for r in _read(out / "node_v1" / "bom.csv")) == ["BUCK-1", "MCU-1"]
+        assert len(_read(out / "bom_lines.csv")) == 4
+        rollup = {r["mpn"]: r for r in _read(out / "bom_rollup.csv")}
+        assert rollup["MCU-1"]["quantity"] == "15" and rollup["MCU-1"]["designs"] == "2"
+        assert rollup["BUCK-1"]["quantity"] == "11" and rollup["BUCK-1"]["manufacturer"] == "Acme"
+        assert float(rollup["MCU-1"]["extended_price"]) == 30.0
+        assert synthesize_batch._catalog is None  # the in-process run closed its connection
+
+
+def test_bad_rows_fail_alone(tmp_path):
+    designs = tmp_path / "designs.jsonl"
+    designs.write_text('{"description": "mcu board"}\n{"description": "buck\n[1, 2]\n{"description": "buck"}\n')
+    summary = run_synthesis_batch(str(designs), str(tmp_path / "out"), workers=1)
+    assert (summary.total, summary.ok, summary.failed) == (4, 2, 2)
+    assert [(r.row, r.error.split(":")[0]) for r in summary.errors] == [(2, "ValueError"), (3, "ValueError")]
+    assert "invalid JSON" in summary.errors[0].error and "got list" in summary.errors[1].error